@@ -0,0 +1,76 @@
+"""Benchmark CityLocator: build cost and nearest-city latency.
+
+Compares the 3-d tree with a haversine over every city, on the bundled
+coordinates and on synthetic gazetteers of growing size around Germany.
+
+    python -m benchmarks.bench_city_locator
+"""
+
+import math
+import random
+import statistics
+import time
+from typing import List, Tuple
+
+from src.infrastructure.city_locator import EARTH_RADIUS_KM, CityLocator, parse_city_coordinates
+
+CITY_COORDINATES_PATH = "src/knowledgebase/city_coordinates.csv"
+QUERIES = 2_000
+# The scan is slow enough on large gazetteers to time it on fewer queries
+SCAN_QUERIES = 100
+LIMIT = 3
+
+
+def _haversine_nearest(
+    cities: List[Tuple[str, float, float]], latitude: float, longitude: float
+) -> List[str]:
+    phi = math.radians(latitude)
+    distances = []
+    for name, lat, lon in cities:
+        other = math.radians(lat)
+        a = (
+            math.sin((other - phi) / 2) ** 2
+            + math.cos(phi) * math.cos(other) * math.sin(math.radians(lon - longitude) / 2) ** 2
+        )
+        distances.append((2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a)), name))
+    return [name for _, name in sorted(distances)[:LIMIT]]
+
+
+def _run(label: str, cities: List[Tuple[str, float, float]], rng: random.Random) -> None:
+    started = time.perf_counter()
+    locator = CityLocator(cities)
+    build_ms = (time.perf_counter() - started) * 1000
+    queries = [(rng.uniform(47, 55), rng.uniform(6, 15)) for _ in range(QUERIES)]
+
+    tree_timings: List[float] = []
+    scan_timings: List[float] = []
+    for latitude, longitude in queries:
+        started = time.perf_counter()
+        locator.nearest(latitude, longitude, LIMIT)
+        tree_timings.append((time.perf_counter() - started) * 1_000_000)
+    for latitude, longitude in queries[:SCAN_QUERIES]:
+        started = time.perf_counter()
+        _haversine_nearest(cities, latitude, longitude)
+        scan_timings.append((time.perf_counter() - started) * 1_000_000)
+
+    print(
+        f"{label:>10}: build {build_ms:8.2f} ms, "
+        f"tree median {statistics.median(tree_timings):8.1f} us, "
+        f"haversine scan median {statistics.median(scan_timings):10.1f} us"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    rng = random.Random(42)
+    with open(CITY_COORDINATES_PATH, "rb") as f:
+        _run("bundled", parse_city_coordinates(f.read()), rng)
+    for size in (1_000, 10_000, 100_000):
+        cities = [
+            (f"city{i}", rng.uniform(47, 55), rng.uniform(6, 15)) for i in range(size)
+        ]
+        _run(f"{size:,}", cities, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark format_contents and stream_contents from 10 to 100,000 items.
+
+Compares the fragment generator joined once with the previous formatter,
+which grew the reply with `result += ...`, on list topics and on dict
+topics with three items per section (like /cities_all), and times the
+first chunk of stream_contents and splitting the reply into Telegram
+messages, which is done once per cached rendering.
+
+    python -m benchmarks.bench_formatter
+"""
+
+import statistics
+import time
+from typing import Callable, List, Mapping, Sequence
+
+from src.domain.protocols import GuidebookContent
+from src.infrastructure.guidebook_formatter import (
+    format_contents,
+    iter_contents,
+    message_parts,
+    stream_contents,
+    wrap_with_separator,
+)
+
+ITEM_COUNTS = (10, 100, 1_000, 10_000, 100_000)
+REPEATS = 5
+
+
+def _concatenated(contents: GuidebookContent) -> str:
+    """The formatter before fragments: one new string per line."""
+    result = ""
+    if isinstance(contents, Mapping):
+        for key, values in contents.items():
+            result += f"{key}:\n"
+            for value in values:
+                result += f"- {value}\n"
+    else:
+        items: Sequence[str] = contents
+        for item in items:
+            result += item + "\n"
+    return wrap_with_separator(result)
+
+
+def _median_ms(format_once: Callable[[], object]) -> float:
+    timings: List[float] = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        format_once()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Run the benchmark for each item count."""
+    print(f"{'items':>8} {'kind':>5} {'+= ms':>10} {'join ms':>10} {'1st chunk ms':>13} {'split ms':>10}")
+    for count in ITEM_COUNTS:
+        items = [f"https://t.me/chat_{i} Чат номер {i}" for i in range(count)]
+        sections = {
+            f"Город {i}": tuple(items[i:i + 3]) for i in range(0, count, 3)
+        }
+        for kind, contents in (("list", items), ("dict", sections)):
+            assert _concatenated(contents) == format_contents(contents)
+            print(
+                f"{count:>8} {kind:>5} "
+                f"{_median_ms(lambda: _concatenated(contents)):>10.3f} "
+                f"{_median_ms(lambda: format_contents(contents)):>10.3f} "
+                f"{_median_ms(lambda: next(stream_contents(contents))):>13.3f} "
+                f"{_median_ms(lambda: message_parts(iter_contents(contents))):>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark FuzzyIndex build time and lookup latency.
+
+Indexes synthetic place names (German-looking compounds, plus one alias per
+name) at increasing sizes and times misspelled lookups: one substitution,
+one transposition and one dropped letter per query. "found" is the share of
+queries whose results include the name the typo was made in.
+
+    python -m benchmarks.bench_fuzzy_index
+"""
+
+import random
+import statistics
+import time
+from typing import Dict, List
+
+from src.infrastructure.fuzzy_index import FuzzyIndex
+
+NAME_COUNTS = (100, 10_000, 50_000)
+QUERIES = 500
+
+_PREFIXES = ["bad ", "neu", "alt", "groß", "klein", "ober", "unter", "st. ", ""]
+_STEMS = [
+    "berg", "burg", "dorf", "feld", "hausen", "heim", "ingen", "stadt",
+    "kirchen", "brück", "au", "hagen", "rode", "stein", "wald", "furt",
+]
+
+
+def _names(count: int, rng: random.Random) -> Dict[str, str]:
+    names: Dict[str, str] = {}
+    while len(names) < count * 2:
+        name = rng.choice(_PREFIXES) + "".join(
+            rng.choice("bdfghklmnprstwz") + rng.choice("aeiouäöü")
+            for _ in range(rng.randint(1, 3))
+        ) + rng.choice(_STEMS)
+        if name not in names:
+            names[name] = name
+            # An alias without umlauts, as in vocabulary.yml
+            alias = name.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue")
+            names.setdefault(alias, name)
+    return names
+
+
+def _typo(name: str, rng: random.Random) -> str:
+    i = rng.randrange(1, len(name) - 1)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return name[:i] + rng.choice("aeiou") + name[i + 1:]
+    if kind == 1:
+        return name[:i - 1] + name[i] + name[i - 1] + name[i + 1:]
+    return name[:i] + name[i + 1:]
+
+
+def main() -> None:
+    """Run the benchmark for each index size."""
+    rng = random.Random(42)
+    for count in NAME_COUNTS:
+        names = _names(count, rng)
+        started = time.perf_counter()
+        index = FuzzyIndex(names)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        canonical = sorted(set(names.values()))
+        targets = [rng.choice(canonical) for _ in range(QUERIES)]
+        queries = [_typo(target, rng) for target in targets]
+        timings: List[float] = []
+        matched = found = 0
+        for query, target in zip(queries, targets):
+            started = time.perf_counter()
+            results = index.search(query)
+            timings.append((time.perf_counter() - started) * 1_000_000)
+            matched += bool(results)
+            found += any(name == target for name, _ in results)
+
+        timings.sort()
+        print(
+            f"{len(names):>7} names: build {build_ms:8.1f} ms"
+            f"   lookup median {statistics.median(timings):7.1f} us"
+            f"   p99 {timings[int(len(timings) * 0.99)]:7.1f} us"
+            f"   matched {matched * 100 // QUERIES}%"
+            f"   found {found * 100 // QUERIES}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark guidebook cold-start paths.
+
+Compares constructing YamlGuidebook with the pure-Python YAML loader, the
+libyaml (C) loader and a compiled snapshot.
+
+    python -m benchmarks.bench_guidebook_boot
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+from unittest.mock import patch
+
+from yaml import SafeLoader
+
+from src.infrastructure import yaml_guidebook
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+GUIDEBOOK_PATH = "src/knowledgebase/guidebook.yml"
+VOCABULARY_PATH = "src/knowledgebase/vocabulary.yml"
+ROUNDS = 20
+
+
+def _measure(build: Callable[[], object]) -> List[float]:
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        build()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _report(label: str, timings: List[float]) -> None:
+    print(
+        f"{label:<22} median {statistics.median(timings):7.2f} ms"
+        f"   min {min(timings):7.2f} ms"
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print timings per boot path."""
+    with patch.object(yaml_guidebook, "SafeLoader", SafeLoader):
+        _report(
+            "pure-Python loader",
+            _measure(lambda: YamlGuidebook(GUIDEBOOK_PATH, VOCABULARY_PATH)),
+        )
+
+    _report(
+        f"{yaml_guidebook.SafeLoader.__name__} loader",
+        _measure(lambda: YamlGuidebook(GUIDEBOOK_PATH, VOCABULARY_PATH)),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot_path = os.path.join(tmp_dir, "guidebook.snapshot")
+        YamlGuidebook(GUIDEBOOK_PATH, VOCABULARY_PATH).write_snapshot(snapshot_path)
+        _report(
+            "snapshot",
+            _measure(
+                lambda: YamlGuidebook(
+                    GUIDEBOOK_PATH, VOCABULARY_PATH, snapshot_path=snapshot_path
+                )
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark guidebook load time for the single-file and directory layouts.
+
+Builds synthetic guidebooks of increasing size, splits each into one file
+per topic and measures YamlGuidebook construction from the single file,
+from the directory parsed in-process, and from the directory parsed by a
+process pool (forced on regardless of PARALLEL_MIN_FILES).
+
+    python -m benchmarks.bench_guidebook_layouts
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+from benchmarks.bench_lazy_guidebook import TOPIC_COUNTS, VOCABULARY_PATH, _write_guidebook
+from src.infrastructure import yaml_guidebook
+from src.infrastructure.guidebook_split import split_guidebook
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+REPEATS = 3
+
+
+def _median_ms(build: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        build()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print one line per guidebook size and layout."""
+    workers = max(2, len(os.sched_getaffinity(0)))
+    yaml_guidebook.PARALLEL_MIN_FILES = 0
+    print(f"process pool: {workers} workers, {len(os.sched_getaffinity(0))} CPUs")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for topics in TOPIC_COUNTS:
+            path = os.path.join(tmp_dir, f"guidebook_{topics}.yml")
+            directory = os.path.join(tmp_dir, f"guidebook_{topics}")
+            _write_guidebook(path, topics)
+            split_guidebook(path, directory)
+            for label, build in (
+                ("file", lambda: YamlGuidebook(path, VOCABULARY_PATH)),
+                ("dir", lambda: YamlGuidebook(directory, VOCABULARY_PATH, max_workers=1)),
+                ("dir+pool", lambda: YamlGuidebook(
+                    directory, VOCABULARY_PATH, max_workers=workers
+                )),
+            ):
+                print(f"{topics:>5} topics  {label:<9}  load {_median_ms(build):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark eager vs lazy guidebook startup time and heap growth.
+
+Builds synthetic guidebooks of increasing size and measures construction
+time and traced heap allocations of YamlGuidebook and LazyYamlGuidebook.
+
+    python -m benchmarks.bench_lazy_guidebook
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from src.infrastructure.lazy_yaml_guidebook import LazyYamlGuidebook
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+VOCABULARY_PATH = "src/knowledgebase/vocabulary.yml"
+TOPIC_COUNTS = (50, 500, 5000)
+
+
+def _write_guidebook(path: str, topics: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for n in range(topics):
+            f.write(f"topic_{n}:\n  description: Topic number {n}\n  contents:\n")
+            for item in range(20):
+                f.write(f"    - https://example.org/{n}/{item} (ссылка номер {item})\n")
+
+
+def _measure(build: Callable[[], object]) -> Tuple[float, float]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    guidebook = build()
+    elapsed = (time.perf_counter() - started) * 1000
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del guidebook
+    return elapsed, current / 1024
+
+
+def main() -> None:
+    """Run the benchmark and print one line per guidebook size and loader."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for topics in TOPIC_COUNTS:
+            path = os.path.join(tmp_dir, f"guidebook_{topics}.yml")
+            _write_guidebook(path, topics)
+            for label, build in (
+                ("eager", lambda: YamlGuidebook(path, VOCABULARY_PATH)),
+                ("lazy", lambda: LazyYamlGuidebook(path, VOCABULARY_PATH)),
+            ):
+                elapsed, heap_kib = _measure(build)
+                print(
+                    f"{topics:>5} topics  {label:<5}"
+                    f"  startup {elapsed:8.1f} ms   heap {heap_kib:9.0f} KiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark escaping and rendering guidebook replies for Telegram parse modes.
+
+Compares escaping every item of the bundled guidebook with the
+precompiled replacement tables against str.translate with a translation
+table, times rendering the whole guidebook in each parse mode, and times
+serving a topic from the render cache.
+
+    python -m benchmarks.bench_markup
+"""
+
+import statistics
+import time
+from typing import Callable, List, Mapping
+
+from src.application.berlin_help_service import BerlinHelpService
+from src.infrastructure.guidebook_formatter import HTML, MARKDOWN_V2, escape, format_contents
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+GUIDEBOOK_PATH = "src/knowledgebase/guidebook.yml"
+VOCABULARY_PATH = "src/knowledgebase/vocabulary.yml"
+REPEATS = 20
+_TRANSLATIONS = {
+    HTML: str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"}),
+    MARKDOWN_V2: str.maketrans({char: "\\" + char for char in "\\_*[]()~`>#+-=|{}.!"}),
+}
+
+
+def _translated(text: str, parse_mode: str) -> str:
+    """Escaping in one str.translate pass."""
+    return text.translate(_TRANSLATIONS[parse_mode])
+
+
+def _median_ms(run: Callable[[], object]) -> float:
+    timings: List[float] = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Run the benchmark on the bundled guidebook."""
+    guidebook = YamlGuidebook(GUIDEBOOK_PATH, VOCABULARY_PATH)
+    contents = [guidebook.get_topic_contents(topic) for topic in guidebook.get_topics()]
+    items = [
+        item
+        for topic in contents
+        for item in (
+            [item for values in topic.values() for item in values]
+            if isinstance(topic, Mapping) else topic
+        )
+    ]
+    print(f"{len(items)} items, {sum(map(len, items))} characters")
+    for parse_mode in (None, HTML, MARKDOWN_V2):
+        label = parse_mode or "plain"
+        if parse_mode is not None:
+            assert all(escape(item, parse_mode) == _translated(item, parse_mode) for item in items)
+            print(
+                f"{label:>10}: escape all items: replacement table "
+                f"{_median_ms(lambda: [escape(item, parse_mode) for item in items]):.2f} ms, "
+                f"str.translate "
+                f"{_median_ms(lambda: [_translated(item, parse_mode) for item in items]):.2f} ms"
+            )
+        render_ms = _median_ms(
+            lambda: [format_contents(topic, parse_mode=parse_mode) for topic in contents]
+        )
+        print(f"{label:>10}: render every topic {render_ms:.2f} ms")
+
+    service = BerlinHelpService(guidebook=guidebook, prerender=True, parse_mode=HTML)
+    topics = guidebook.get_topics()
+    lookups_ms = _median_ms(lambda: [service.handle_topic(topic) for topic in topics])
+    print(f"HTML topic from the render cache: {lookups_ms * 1000 / len(topics):.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark PlzIndex: compile and first-lookup cost, lookup latency, memory.
+
+Compares the memory-mapped range index with a dict holding every code of
+the same ranges, which is what a per-code table would cost in memory.
+
+    python -m benchmarks.bench_plz_index
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from src.infrastructure.plz_index import PlzIndex, compile_plz_index, parse_plz_ranges
+
+PLZ_RANGES_PATH = "src/knowledgebase/plz_ranges.csv"
+LOOKUPS = 100_000
+
+
+def main() -> None:
+    """Run the benchmark on the bundled range table."""
+    with open(PLZ_RANGES_PATH, "rb") as f:
+        ranges = parse_plz_ranges(f.read())
+    rng = random.Random(42)
+    codes = [f"{rng.randint(1000, 99999):05d}" for _ in range(LOOKUPS)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        index_path = os.path.join(directory, "plz_ranges.plzidx")
+        started = time.perf_counter()
+        compile_plz_index(PLZ_RANGES_PATH, index_path)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        index = PlzIndex(PLZ_RANGES_PATH, index_path)
+        started = time.perf_counter()
+        index.lookup("10115")
+        open_ms = (time.perf_counter() - started) * 1000
+
+        timings: List[float] = []
+        for code in codes:
+            started = time.perf_counter()
+            index.lookup(code)
+            timings.append((time.perf_counter() - started) * 1_000_000)
+        file_size = os.path.getsize(index_path)
+
+    per_code: Dict[str, str] = {
+        f"{code:05d}": city
+        for first, last, city in ranges
+        for code in range(first, last + 1)
+    }
+    dict_size = sys.getsizeof(per_code) + sum(sys.getsizeof(key) for key in per_code)
+    dict_timings: List[float] = []
+    for code in codes:
+        started = time.perf_counter()
+        per_code.get(code)
+        dict_timings.append((time.perf_counter() - started) * 1_000_000)
+
+    print(f"{len(ranges)} ranges covering {len(per_code)} codes")
+    print(f"compile {compile_ms:.2f} ms, first lookup (hash check + mmap) {open_ms:.2f} ms")
+    print(
+        f"range index: file {file_size / 1024:.1f} KiB, "
+        f"lookup median {statistics.median(timings):.2f} us"
+    )
+    print(
+        f"dict per code: {dict_size / 1024 / 1024:.1f} MiB, "
+        f"lookup median {statistics.median(dict_timings):.2f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark the render cache: pre-render cost and request latency.
+
+Times /topic, /cities NAME and /cities_all requests against the bundled
+guidebook with every reply pre-rendered, and the same replies rendered
+from the guidebook on each request as before the cache.
+
+    python -m benchmarks.bench_render_cache
+"""
+
+import random
+import statistics
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from src.application.berlin_help_service import BerlinHelpService
+from src.infrastructure.guidebook_formatter import format_contents
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+GUIDEBOOK_PATH = "src/knowledgebase/guidebook.yml"
+VOCABULARY_PATH = "src/knowledgebase/vocabulary.yml"
+LANGUAGES = {"uk": ["uk"], "en": ["en"], "de": ["en"], "be": ["ru"]}
+REQUESTS = 20_000
+
+_Request = Callable[[str], object]
+
+
+def _median_us(request: _Request, names: List[str]) -> float:
+    timings = []
+    for name in names:
+        started = time.perf_counter()
+        request(name)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Run the benchmark on the bundled guidebook."""
+    rng = random.Random(42)
+    guidebook = YamlGuidebook(GUIDEBOOK_PATH, VOCABULARY_PATH)
+    started = time.perf_counter()
+    service = BerlinHelpService(
+        guidebook=guidebook, language_fallbacks=LANGUAGES, prerender=True
+    )
+    prerender_ms = (time.perf_counter() - started) * 1000
+    # pylint: disable=protected-access
+    replies = service.render_cache._replies
+    size = sys.getsizeof(replies) + sum(sys.getsizeof(reply) for reply in replies.values())
+
+    topics = [rng.choice(guidebook.get_topics()) for _ in range(REQUESTS)]
+    cities = [rng.choice(list(guidebook.get_topic_contents("cities"))) for _ in range(REQUESTS)]
+    rows: List[Tuple[str, List[str], _Request, _Request]] = [
+        ("/topic", topics,
+         service.handle_topic,
+         lambda topic: f"#{topic}\n{format_contents(guidebook.get_topic_contents(topic))}"),
+        ("/cities NAME", cities,
+         service.handle_cities,
+         lambda name: guidebook.get_cities(name=name)),
+        ("/cities_all", topics,
+         lambda _: service.handle_cities(None, show_all=True),
+         lambda _: format_contents(guidebook.get_topic_contents("cities"))),
+    ]
+
+    print(
+        f"pre-rendered {len(replies)} replies in {prerender_ms:.0f} ms, "
+        f"{size / 1024:.0f} KiB"
+    )
+    for label, names, cached, rendered in rows:
+        print(
+            f"{label:>13}: cached median {_median_us(cached, names):6.2f} us, "
+            f"rendered per request {_median_us(rendered, names):8.2f} us"
+        )
+    cache = service.render_cache
+    print(f"hits {cache.hits}, misses {cache.misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark SearchIndex build time, size and /search latency.
+
+Indexes the bundled guidebook, then synthetic guidebooks of more topics
+built by shuffling its items, and times queries of one to three words
+picked from the indexed texts (so most of them find something).
+
+    python -m benchmarks.bench_search_index
+"""
+
+import random
+import statistics
+import sys
+import time
+from typing import List, Tuple
+
+from src.domain.protocols import GuidebookContent
+from src.infrastructure.search_index import SearchIndex, topic_text
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+GUIDEBOOK_PATH = "src/knowledgebase/guidebook.yml"
+VOCABULARY_PATH = "src/knowledgebase/vocabulary.yml"
+TOPIC_COUNTS = (0, 500, 5_000)
+ITEMS_PER_TOPIC = 12
+QUERIES = 1_000
+
+_Topics = List[Tuple[str, str, GuidebookContent]]
+
+
+def _synthetic(items: List[str], count: int, rng: random.Random) -> _Topics:
+    return [
+        (f"topic_{i}", f"Topic {i}", tuple(rng.sample(items, ITEMS_PER_TOPIC)))
+        for i in range(count)
+    ]
+
+
+def _size(index: SearchIndex) -> int:
+    # pylint: disable=protected-access
+    return (
+        sum(sys.getsizeof(term) for term in index._terms)
+        + sys.getsizeof(index._terms)
+        + sum(
+            array.itemsize * len(array)
+            for array in (index._offsets, index._postings, index._weights)
+        )
+    )
+
+
+def main() -> None:
+    """Run the benchmark for the real and each synthetic guidebook."""
+    rng = random.Random(42)
+    guidebook = YamlGuidebook(GUIDEBOOK_PATH, VOCABULARY_PATH)
+    real: _Topics = [
+        (name, topic.description, topic.contents)
+        for name, topic in guidebook.topics.items()
+    ]
+    items = [text for _, description, contents in real for text in topic_text(description, contents)]
+    words = [word for text in items for word in text.split() if word.isalpha()]
+
+    for count in TOPIC_COUNTS:
+        topics = real + _synthetic(items, count, rng)
+        started = time.perf_counter()
+        index = SearchIndex(topics)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        queries = [" ".join(rng.sample(words, rng.randint(1, 3))) for _ in range(QUERIES)]
+        timings: List[float] = []
+        found = 0
+        for query in queries:
+            started = time.perf_counter()
+            found += bool(index.search(query))
+            timings.append((time.perf_counter() - started) * 1_000_000)
+
+        timings.sort()
+        print(
+            f"{len(index):>6} topics, {index.term_count:>6} words:"
+            f" build {build_ms:7.1f} ms   size {_size(index) / 1024:7.1f} KiB"
+            f"   query median {statistics.median(timings):7.1f} us"
+            f"   p99 {timings[int(len(timings) * 0.99)]:7.1f} us"
+            f"   matched {found * 100 // QUERIES}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark SqliteGuidebook against YamlGuidebook.
+
+Measures lookup latency of get_topic_contents and get_cities, and the
+resident set size each guidebook adds to a fresh interpreter, for the real
+guidebook and a synthetic 5,000-topic one. RSS is measured in a child
+process per backend so the two do not share heap.
+
+    python -m benchmarks.bench_sqlite_guidebook
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+from benchmarks.bench_lazy_guidebook import _write_guidebook
+from src.domain.protocols import IGuidebook
+from src.infrastructure.sqlite_guidebook import SqliteGuidebook, import_guidebook
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+GUIDEBOOK_PATH = "src/knowledgebase/guidebook.yml"
+VOCABULARY_PATH = "src/knowledgebase/vocabulary.yml"
+CALLS = 2000
+
+
+def _rss_kib() -> int:
+    with open("/proc/self/statm", encoding="ascii") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def _latency_us(call: Callable[[int], object]) -> float:
+    timings: List[float] = []
+    for n in range(CALLS):
+        started = time.perf_counter()
+        call(n)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(timings)
+
+
+def _report_latency(label: str, guidebook: IGuidebook) -> None:
+    topics = guidebook.get_topics()
+    contents = _latency_us(lambda n: guidebook.get_topic_contents(topics[n % len(topics)]))
+    cities = _latency_us(lambda n: guidebook.get_cities("munchen"))
+    print(
+        f"  {label:<7} get_topic_contents {contents:7.1f} us"
+        f"   get_cities {cities:7.1f} us"
+    )
+
+
+def _child(backend: str, guidebook_path: str, database_path: str) -> None:
+    """Print the RSS growth caused by opening one guidebook."""
+    before = _rss_kib()
+    guidebook: IGuidebook
+    if backend == "yaml":
+        guidebook = YamlGuidebook(guidebook_path, VOCABULARY_PATH)
+    else:
+        guidebook = SqliteGuidebook(database_path)
+    for topic in guidebook.get_topics():
+        guidebook.get_topic_contents(topic)
+    print(_rss_kib() - before)
+
+
+def _rss_growth(backend: str, guidebook_path: str, database_path: str) -> int:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_sqlite_guidebook",
+         backend, guidebook_path, database_path],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return int(output)
+
+
+def main() -> None:
+    """Run the benchmark for the real and a synthetic guidebook."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        synthetic_path = os.path.join(tmp_dir, "guidebook_5000.yml")
+        _write_guidebook(synthetic_path, 5000)
+        for label, guidebook_path in (("real", GUIDEBOOK_PATH), ("5000", synthetic_path)):
+            database_path = os.path.join(tmp_dir, f"{label}.db")
+            yaml_guidebook = YamlGuidebook(guidebook_path, VOCABULARY_PATH)
+            import_guidebook(yaml_guidebook, database_path)
+
+            print(f"{label} guidebook ({len(yaml_guidebook.topics)} topics,"
+                  f" database {os.path.getsize(database_path) // 1024} KiB)")
+            _report_latency("yaml", yaml_guidebook)
+            _report_latency("sqlite", SqliteGuidebook(database_path))
+            for backend in ("yaml", "sqlite"):
+                growth = _rss_growth(backend, guidebook_path, database_path)
+                print(f"  {backend:<7} RSS after reading every topic +{growth} KiB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4:
+        _child(*sys.argv[1:])
+    else:
+        main()
@@ -1,28 +1,56 @@
 """Telegram bot adapter - Encapsulates all Telegram-specific logic."""
 
+import asyncio
 import logging
-from typing import Awaitable, Callable, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-from telegram import BotCommand, Update
+from telegram import (
+    BotCommand,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    InlineQueryResultArticle,
+    InputTextMessageContent,
+    Update,
+)
 from telegram.error import BadRequest, Forbidden, NetworkError, TelegramError, TimedOut
 from telegram.ext import (
     Application,
+    CallbackQueryHandler,
     CommandHandler,
     ContextTypes,
+    InlineQueryHandler,
     MessageHandler,
     filters,
 )
 from telegram.helpers import effective_message_type
 
+from src.domain.models import ListingPage, TopicChanges
 from src.domain.protocols import (
     GuidebookError,
     IBerlinHelpService,
     IStatisticsService,
+    OverlayStoreError,
     StatisticsServiceError,
 )
 
 logger = logging.getLogger(__name__)
 
+# Commands with their own handlers; anything else may be a chat's local topic
+_STATIC_COMMANDS = frozenset({
+    "help", "topic_stats", "cities", "countries", "cities_all", "countries_all",
+    "search", "local_add", "local_remove", "local_topics",
+})
+
+# Guidebook topics answered by those handlers instead of a topic handler
+_HANDLED_TOPICS = frozenset({"cities", "countries", "search"})
+
+# Seconds Telegram may serve an inline answer from its own cache; guidebook
+# edits reach inline results within this time
+INLINE_CACHE_TIME = 6 * 60 * 60
+
+# Callback data of the listing page buttons: "cities_all:2"
+LISTING_CALLBACK_PATTERN = r"^(cities|countries)_all:\d+$"
+
 
 class TelegramBotAdapter:
     """Adapter that encapsulates all Telegram-specific bot logic."""
@@ -46,6 +74,13 @@ class TelegramBotAdapter:
         self.stats_service = stats_service
         # Cache of chat IDs where bot lacks deletion permissions
         self._deletion_disabled_chats: set[int] = set()
+        # Per-topic command handlers, kept so reloads can add/remove them
+        self._topic_handlers: Dict[str, CommandHandler] = {}
+        # Prev/next keyboards by (topic, page, pages); they do not depend on
+        # the guidebook's text, so each is built once
+        self._listing_keyboards: Dict[Tuple[str, int, int], InlineKeyboardMarkup] = {}
+        self._application: Optional[Application] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     def build_application(self) -> Application:
         """
@@ -65,6 +100,7 @@ class TelegramBotAdapter:
             .build()
         )
         self._register_handlers(application)
+        self._application = application
         return application
 
     def _register_handlers(self, application: Application) -> None:
@@ -75,11 +111,7 @@ class TelegramBotAdapter:
 
         # Dynamic topic handlers
         for topic in self.service.list_topics():
-            # Cities and countries are special - handled separately
-            if topic not in {"cities", "countries"}:
-                application.add_handler(
-                    CommandHandler(topic, self._create_topic_handler(topic))
-                )
+            self._add_topic_handler(application, topic)
 
         # Special handlers for cities and countries
         application.add_handler(CommandHandler("cities", self._handle_cities))
@@ -88,6 +120,44 @@ class TelegramBotAdapter:
         application.add_handler(
             CommandHandler("countries_all", self._handle_countries_all)
         )
+        # Prev/next buttons of the listings
+        application.add_handler(
+            CallbackQueryHandler(self._handle_listing_page, pattern=LISTING_CALLBACK_PATTERN)
+        )
+        # Full-text search; without words it shows the "search" topic
+        application.add_handler(CommandHandler("search", self._handle_search))
+
+        # Local topics maintained by chat admins
+        application.add_handler(CommandHandler("local_add", self._handle_local_add))
+        application.add_handler(CommandHandler("local_remove", self._handle_local_remove))
+        application.add_handler(CommandHandler("local_topics", self._handle_local_topics))
+        # Commands without a handler of their own: a chat's local topics,
+        # legacy commands and typos. A separate group, so topic handlers
+        # added on reload still win.
+        application.add_handler(
+            MessageHandler(filters.COMMAND, self._handle_overlay_command), group=1
+        )
+
+        # "@bot berl" in any chat
+        application.add_handler(InlineQueryHandler(self._handle_inline_query))
+
+        # Questions typed in private chats; an edited question is not
+        # answered again
+        application.add_handler(
+            MessageHandler(
+                filters.ChatType.PRIVATE & filters.TEXT & ~filters.COMMAND
+                & filters.UpdateType.MESSAGE,
+                self._handle_question,
+            )
+        )
+        # Locations shared in private chats; live location updates arrive
+        # as edited messages and are not answered again
+        application.add_handler(
+            MessageHandler(
+                filters.ChatType.PRIVATE & filters.LOCATION & filters.UpdateType.MESSAGE,
+                self._handle_location,
+            )
+        )
 
         # Message handler for deleting greetings
         application.add_handler(
@@ -100,6 +170,60 @@ class TelegramBotAdapter:
 
         # Bot commands are set in _post_init to avoid JobQueue dependency.
 
+    def _add_topic_handler(self, application: Application, topic: str) -> None:
+        """Register the command handler for a single guidebook topic."""
+        # Cities, countries and search are special - handled separately
+        if topic in _HANDLED_TOPICS:
+            return
+        handler = CommandHandler(topic, self._create_topic_handler(topic))
+        application.add_handler(handler)
+        self._topic_handlers[topic] = handler
+
+    def refresh_topics(self, changes: TopicChanges) -> None:
+        """
+        Apply topic changes after a guidebook reload.
+
+        Safe to call from any thread. Once the bot is running the work is
+        scheduled on its event loop; before that, handlers are updated
+        directly and the command menu is set by _post_init as usual.
+
+        Args:
+            changes: Topics added/removed by the reload
+        """
+        if not changes or self._application is None:
+            return
+        if self._loop is None:
+            self._apply_handler_changes(self._application, changes)
+            return
+        asyncio.run_coroutine_threadsafe(
+            self._apply_topic_changes(self._application, changes), self._loop
+        )
+
+    def _apply_handler_changes(
+        self, application: Application, changes: TopicChanges
+    ) -> None:
+        """Add/remove only the handlers of topics that changed."""
+        for topic in changes.removed:
+            handler = self._topic_handlers.pop(topic, None)
+            if handler is not None:
+                application.remove_handler(handler)
+        for topic in changes.added:
+            self._add_topic_handler(application, topic)
+
+    async def _apply_topic_changes(
+        self, application: Application, changes: TopicChanges
+    ) -> None:
+        """Update topic handlers and the command menu on the event loop."""
+        self._apply_handler_changes(application, changes)
+        try:
+            await self._set_bot_commands(application)
+        except TelegramError as e:
+            logger.error("Failed to update bot commands after reload: %s", e)
+        logger.info(
+            "Applied guidebook reload: added=%s removed=%s",
+            list(changes.added), list(changes.removed)
+        )
+
     # Handler methods
     async def _handle_help(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -107,7 +231,7 @@ class TelegramBotAdapter:
         """Handle /help command."""
         try:
             logger.info("Processing /help command from chat_id=%s", update.effective_chat.id if update.effective_chat else "unknown")
-            results = self.service.handle_help()
+            results = self.service.handle_help(language=self._language(update))
             await self._reply_to_message(update, context, results)
             logger.info("Successfully handled /help")
         except GuidebookError as e:
@@ -128,7 +252,16 @@ class TelegramBotAdapter:
 
     async def _post_init(self, application: Application) -> None:
         """Initialize bot commands after the bot is ready."""
+        self._loop = asyncio.get_running_loop()
+        await self._set_bot_commands(application)
+
+    async def _set_bot_commands(self, application: Application) -> None:
+        """Set the default command menu and one per configured language."""
         await application.bot.set_my_commands(self._bot_commands())
+        for language in self.service.list_languages():
+            await application.bot.set_my_commands(
+                self._bot_commands(language), language_code=language
+            )
 
     async def _handle_topic_stats(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -167,9 +300,17 @@ class TelegramBotAdapter:
         ) -> None:
             try:
                 logger.info("Processing /%s command from chat_id=%s", topic, update.effective_chat.id if update.effective_chat else "unknown")
-                results = self.service.handle_topic(topic)
-                self._record_stats(topic)
-                await self._reply_to_message(update, context, results)
+                chat_id = self._chat_id(update)
+                results = self.service.handle_topic(
+                    topic,
+                    section=self._command_argument(update) or None,
+                    chat_id=chat_id,
+                    language=self._language(update),
+                )
+                self._record_stats(topic, chat_id)
+                await self._reply_to_message(
+                    update, context, results, parse_mode=self.service.parse_mode
+                )
                 logger.info("Successfully handled /%s", topic)
             except GuidebookError as e:
                 logger.error("Guidebook error in /%s: %s", topic, e, exc_info=True)
@@ -196,9 +337,12 @@ class TelegramBotAdapter:
         try:
             logger.info("Processing /cities command from chat_id=%s", update.effective_chat.id if update.effective_chat else "unknown")
             city_name = self._extract_parameter(update, "/cities")
-            results = self.service.handle_cities(city_name, show_all=False)
-            self._record_stats("cities")
-            await self._reply_to_message(update, context, results)
+            chat_id = self._chat_id(update)
+            results = self.service.handle_cities(city_name, show_all=False, chat_id=chat_id)
+            self._record_stats("cities", chat_id)
+            await self._reply_to_message(
+                update, context, results, parse_mode=self.service.parse_mode
+            )
             logger.info("Successfully handled /cities")
         except GuidebookError as e:
             logger.error("Guidebook error in /cities: %s", e, exc_info=True)
@@ -222,9 +366,16 @@ class TelegramBotAdapter:
         """Handle /cities_all command."""
         try:
             logger.info("Processing /cities_all command from chat_id=%s", update.effective_chat.id if update.effective_chat else "unknown")
-            results = self.service.handle_cities(None, show_all=True)
-            self._record_stats("cities")
-            await self._reply_to_message(update, context, results)
+            chat_id = self._chat_id(update)
+            listing = self.service.handle_listing_page("cities", chat_id=chat_id)
+            self._record_stats("cities", chat_id)
+            await self._reply_to_message(
+                update,
+                context,
+                listing.text,
+                parse_mode=self.service.parse_mode,
+                reply_markup=self._listing_keyboard(listing),
+            )
             logger.info("Successfully handled /cities_all")
         except GuidebookError as e:
             logger.error("Guidebook error in /cities_all: %s", e, exc_info=True)
@@ -249,9 +400,14 @@ class TelegramBotAdapter:
         try:
             logger.info("Processing /countries command from chat_id=%s", update.effective_chat.id if update.effective_chat else "unknown")
             country_name = self._extract_parameter(update, "/countries")
-            results = self.service.handle_countries(country_name, show_all=False)
-            self._record_stats("countries")
-            await self._reply_to_message(update, context, results)
+            chat_id = self._chat_id(update)
+            results = self.service.handle_countries(
+                country_name, show_all=False, chat_id=chat_id
+            )
+            self._record_stats("countries", chat_id)
+            await self._reply_to_message(
+                update, context, results, parse_mode=self.service.parse_mode
+            )
             logger.info("Successfully handled /countries")
         except GuidebookError as e:
             logger.error("Guidebook error in /countries: %s", e, exc_info=True)
@@ -275,9 +431,16 @@ class TelegramBotAdapter:
         """Handle /countries_all command."""
         try:
             logger.info("Processing /countries_all command from chat_id=%s", update.effective_chat.id if update.effective_chat else "unknown")
-            results = self.service.handle_countries(None, show_all=True)
-            self._record_stats("countries")
-            await self._reply_to_message(update, context, results)
+            chat_id = self._chat_id(update)
+            listing = self.service.handle_listing_page("countries", chat_id=chat_id)
+            self._record_stats("countries", chat_id)
+            await self._reply_to_message(
+                update,
+                context,
+                listing.text,
+                parse_mode=self.service.parse_mode,
+                reply_markup=self._listing_keyboard(listing),
+            )
             logger.info("Successfully handled /countries_all")
         except GuidebookError as e:
             logger.error("Guidebook error in /countries_all: %s", e, exc_info=True)
@@ -295,6 +458,346 @@ class TelegramBotAdapter:
                 update, context, "Sorry, an unexpected error occurred. Please try again later."
             )
 
+    async def _handle_search(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Handle /search command."""
+        try:
+            logger.info("Processing /search command from chat_id=%s", update.effective_chat.id if update.effective_chat else "unknown")
+            query = self._extract_parameter(update, "/search", keep_case=True)
+            chat_id = self._chat_id(update)
+            results = self.service.handle_search(
+                query, chat_id=chat_id, language=self._language(update)
+            )
+            self._record_stats("search", chat_id)
+            await self._reply_to_message(update, context, results)
+            logger.info("Successfully handled /search")
+        except GuidebookError as e:
+            logger.error("Guidebook error in /search: %s", e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, there was an error searching the guidebook. Please try again later."
+            )
+        except (NetworkError, TimedOut) as e:
+            logger.error("Network error in /search: %s", e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, there was a network error. Please try again."
+            )
+        except Exception as e:
+            logger.exception("Unexpected error in /search handler")
+            await self._send_error_message(
+                update, context, "Sorry, an unexpected error occurred. Please try again later."
+            )
+
+    async def _handle_question(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Answer a free-text question in a private chat.
+
+        The question is kept: the answer is sent as a reply to it.
+        """
+        message = update.effective_message
+        if not message or not message.text:
+            return
+        try:
+            logger.info("Processing question from chat_id=%s", message.chat_id)
+            results = self.service.handle_question(
+                message.text, chat_id=message.chat_id, language=self._language(update)
+            )
+            await self._send_reply(
+                context, message.chat_id, results, reply_to_message_id=message.message_id
+            )
+        except GuidebookError as e:
+            logger.error("Guidebook error answering a question: %s", e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, there was an error searching the guidebook. Please try again later."
+            )
+        except (NetworkError, TimedOut) as e:
+            logger.error("Network error answering a question: %s", e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, there was a network error. Please try again."
+            )
+        except Exception as e:
+            logger.exception("Unexpected error in question handler")
+            await self._send_error_message(
+                update, context, "Sorry, an unexpected error occurred. Please try again later."
+            )
+
+    async def _handle_location(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Answer a location shared in a private chat with the nearest cities.
+
+        The location is kept: the answer is sent as a reply to it.
+        """
+        message = update.effective_message
+        if not message or not message.location:
+            return
+        try:
+            logger.info("Processing location from chat_id=%s", message.chat_id)
+            results = self.service.handle_location(
+                message.location.latitude,
+                message.location.longitude,
+                chat_id=message.chat_id,
+            )
+            self._record_stats("cities", message.chat_id)
+            await self._send_reply(
+                context, message.chat_id, results, reply_to_message_id=message.message_id
+            )
+        except GuidebookError as e:
+            logger.error("Guidebook error answering a location: %s", e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, there was an error accessing city information. Please try again later."
+            )
+        except (NetworkError, TimedOut) as e:
+            logger.error("Network error answering a location: %s", e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, there was a network error. Please try again."
+            )
+        except Exception as e:
+            logger.exception("Unexpected error in location handler")
+            await self._send_error_message(
+                update, context, "Sorry, an unexpected error occurred. Please try again later."
+            )
+
+    async def _handle_local_add(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Handle /local_add command (chat admins)."""
+        try:
+            logger.info("Processing /local_add command from chat_id=%s", update.effective_chat.id if update.effective_chat else "unknown")
+            chat_id = self._chat_id(update)
+            # Anyone is the admin of their private chat with the bot, so
+            # local topics are added in groups only
+            if (
+                chat_id is None
+                or not self._is_group_chat(update)
+                or not await self._is_chat_admin(update, context)
+            ):
+                await self._send_error_message(
+                    update, context, "Only group chat admins can add local topics."
+                )
+                return
+            text = self._extract_parameter(update, "/local_add", keep_case=True)
+            results = self.service.add_overlay_topic(chat_id, text)
+            await self._reply_to_message(update, context, results)
+            logger.info("Successfully handled /local_add")
+        except OverlayStoreError as e:
+            logger.error("Overlay store error in /local_add: %s", e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, the local topic could not be saved. Please try again later."
+            )
+        except (NetworkError, TimedOut) as e:
+            logger.error("Network error in /local_add: %s", e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, there was a network error. Please try again."
+            )
+        except Exception as e:
+            logger.exception("Unexpected error in /local_add handler")
+            await self._send_error_message(
+                update, context, "Sorry, an unexpected error occurred. Please try again later."
+            )
+
+    async def _handle_local_remove(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Handle /local_remove command (chat admins)."""
+        try:
+            logger.info("Processing /local_remove command from chat_id=%s", update.effective_chat.id if update.effective_chat else "unknown")
+            chat_id = self._chat_id(update)
+            if chat_id is None or not await self._is_chat_admin(update, context):
+                await self._send_error_message(
+                    update, context, "Only chat admins can remove local topics."
+                )
+                return
+            name = self._extract_parameter(update, "/local_remove")
+            results = self.service.remove_overlay_topic(chat_id, name)
+            await self._reply_to_message(update, context, results)
+            logger.info("Successfully handled /local_remove")
+        except OverlayStoreError as e:
+            logger.error("Overlay store error in /local_remove: %s", e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, the local topic could not be removed. Please try again later."
+            )
+        except (NetworkError, TimedOut) as e:
+            logger.error("Network error in /local_remove: %s", e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, there was a network error. Please try again."
+            )
+        except Exception as e:
+            logger.exception("Unexpected error in /local_remove handler")
+            await self._send_error_message(
+                update, context, "Sorry, an unexpected error occurred. Please try again later."
+            )
+
+    async def _handle_local_topics(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Handle /local_topics command."""
+        try:
+            logger.info("Processing /local_topics command from chat_id=%s", update.effective_chat.id if update.effective_chat else "unknown")
+            chat_id = self._chat_id(update)
+            if chat_id is None:
+                return
+            results = self.service.list_overlay_topics(chat_id)
+            await self._reply_to_message(update, context, results)
+            logger.info("Successfully handled /local_topics")
+        except OverlayStoreError as e:
+            logger.error("Overlay store error in /local_topics: %s", e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, there was an error reading local topics. Please try again later."
+            )
+        except (NetworkError, TimedOut) as e:
+            logger.error("Network error in /local_topics: %s", e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, there was a network error. Please try again."
+            )
+        except Exception as e:
+            logger.exception("Unexpected error in /local_topics handler")
+            await self._send_error_message(
+                update, context, "Sorry, an unexpected error occurred. Please try again later."
+            )
+
+    async def _handle_overlay_command(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Answer local topics of the chat, legacy commands and typos.
+
+        A chat's local topic comes first. A legacy command (/uni) is
+        answered by the handler of the topic it became; any other unknown
+        command gets the closest topic commands as a reply that keeps the
+        command, unless it was addressed to another bot or nothing is close.
+        """
+        chat_id = self._chat_id(update)
+        command = self._command_name(update)
+        if (
+            chat_id is None
+            or not command
+            or command in _STATIC_COMMANDS
+            or command in self._topic_handlers
+        ):
+            return
+        try:
+            results = self.service.handle_overlay_topic(command, chat_id=chat_id)
+            if results is not None:
+                logger.info("Processing local /%s command from chat_id=%s", command, chat_id)
+                await self._reply_to_message(update, context, results)
+                return
+            if self._addressed_to_other_bot(update, context):
+                return
+            topic = self.service.resolve_command(command, chat_id=chat_id)
+            handler = self._topic_handlers.get(topic) if topic else None
+            if handler is not None:
+                logger.info("Answering legacy /%s as /%s", command, topic)
+                await handler.callback(update, context)
+                return
+            suggestions = self.service.suggest_commands(
+                command, chat_id=chat_id, language=self._language(update)
+            )
+            message = update.effective_message
+            if suggestions is not None and message is not None:
+                logger.info("Suggesting commands for unknown /%s", command)
+                # Kept: the command may be a typo to fix or meant for another bot
+                await self._send_reply(
+                    context, message.chat_id, suggestions, reply_to_message_id=message.message_id
+                )
+        except (NetworkError, TimedOut) as e:
+            logger.error("Network error in local /%s: %s", command, e, exc_info=True)
+            await self._send_error_message(
+                update, context, "Sorry, there was a network error. Please try again."
+            )
+        except Exception as e:
+            logger.exception("Unexpected error in local /%s handler", command)
+            await self._send_error_message(
+                update, context, "Sorry, an unexpected error occurred. Please try again later."
+            )
+
+    async def _handle_listing_page(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Flip a /cities_all or /countries_all listing to another page in place."""
+        query = update.callback_query
+        if query is None or not query.data:
+            return
+        listing_command, _, page = query.data.partition(":")
+        topic = listing_command.removesuffix("_all")
+        message = query.message
+        chat_id = message.chat.id if message is not None else None
+        try:
+            listing = self.service.handle_listing_page(topic, int(page), chat_id=chat_id)
+            await query.edit_message_text(
+                listing.text,
+                parse_mode=self.service.parse_mode,
+                disable_web_page_preview=True,
+                reply_markup=self._listing_keyboard(listing),
+            )
+        except BadRequest as e:
+            # A double tap asks for the page already shown
+            if "not modified" not in str(e).lower():
+                logger.warning("Could not flip /%s to page %s: %s", listing_command, page, e)
+        except (NetworkError, TimedOut) as e:
+            logger.error("Network error flipping /%s: %s", listing_command, e, exc_info=True)
+        except Exception:
+            logger.exception("Unexpected error flipping /%s", listing_command)
+        try:
+            # Stops the button's loading indicator
+            await query.answer()
+        except TelegramError as e:
+            logger.debug("Could not answer the /%s callback: %s", listing_command, e)
+
+    def _listing_keyboard(self, listing: ListingPage) -> Optional[InlineKeyboardMarkup]:
+        """
+        Return the prev/next buttons under a listing page.
+
+        Args:
+            listing: The page shown
+
+        Returns:
+            The keyboard, or None if the listing fits on one page
+        """
+        if listing.pages <= 1:
+            return None
+        key = (listing.topic, listing.page, listing.pages)
+        keyboard = self._listing_keyboards.get(key)
+        if keyboard is None:
+            buttons = []
+            if listing.page > 0:
+                buttons.append(InlineKeyboardButton(
+                    "◀", callback_data=f"{listing.topic}_all:{listing.page - 1}"
+                ))
+            if listing.page < listing.pages - 1:
+                buttons.append(InlineKeyboardButton(
+                    "▶", callback_data=f"{listing.topic}_all:{listing.page + 1}"
+                ))
+            keyboard = self._listing_keyboards[key] = InlineKeyboardMarkup([buttons])
+        return keyboard
+
+    async def _handle_inline_query(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Answer inline queries with rendered topics, cities and countries."""
+        inline_query = update.inline_query
+        if inline_query is None:
+            return
+        try:
+            results = [
+                InlineQueryResultArticle(
+                    id=result.id,
+                    title=result.title,
+                    description=result.description,
+                    input_message_content=InputTextMessageContent(
+                        result.text, disable_web_page_preview=True
+                    ),
+                )
+                for result in self.service.handle_inline_query(inline_query.query)
+            ]
+            await inline_query.answer(
+                results, cache_time=INLINE_CACHE_TIME, is_personal=False
+            )
+        except (NetworkError, TimedOut) as e:
+            logger.error("Network error in inline query: %s", e, exc_info=True)
+        except Exception:
+            logger.exception("Unexpected error in inline query handler")
+
     async def _handle_delete_greetings(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
@@ -314,13 +817,27 @@ class TelegramBotAdapter:
             # Don't send error message to user for status updates
 
     # Utility methods
-    def _extract_parameter(self, update: Update, command: str) -> str:
+    @staticmethod
+    def _chat_id(update: Update) -> Optional[int]:
+        """Return the ID of the chat an update came from, if any."""
+        return update.effective_chat.id if update.effective_chat else None
+
+    @staticmethod
+    def _language(update: Update) -> Optional[str]:
+        """Return the Telegram language code of the sender, if known."""
+        user = update.effective_user
+        return user.language_code if user else None
+
+    def _extract_parameter(
+        self, update: Update, command: str, *, keep_case: bool = False
+    ) -> str:
         """
         Extract parameter from command message.
 
         Args:
             update: The Telegram update
             command: The command string (e.g., "/cities")
+            keep_case: Return the parameter as typed instead of lowercased
 
         Returns:
             The parameter string, or empty string if none
@@ -329,8 +846,10 @@ class TelegramBotAdapter:
         if not message or not message.text:
             return ""
 
-        text = message.text.strip().lower()
-        if not text.startswith(command):
+        text = message.text.strip()
+        if not keep_case:
+            text = text.lower()
+        if not text.lower().startswith(command):
             return text
 
         remainder = text[len(command) :]
@@ -339,6 +858,53 @@ class TelegramBotAdapter:
             remainder = remainder[1] if len(remainder) > 1 else ""
         return remainder.strip()
 
+    @staticmethod
+    def _command_name(update: Update) -> str:
+        """Return the lowercase command of a message without slash and @bot."""
+        message = update.effective_message
+        if not message or not message.text or not message.text.startswith("/"):
+            return ""
+        return message.text.split(maxsplit=1)[0][1:].split("@", 1)[0].lower()
+
+    @staticmethod
+    def _command_argument(update: Update) -> str:
+        """Return the text after a message's command, as typed."""
+        message = update.effective_message
+        if not message or not message.text:
+            return ""
+        parts = message.text.split(maxsplit=1)
+        return parts[1].strip() if len(parts) > 1 else ""
+
+    @staticmethod
+    def _addressed_to_other_bot(
+        update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> bool:
+        """Return whether a command is addressed to another bot (/start@other_bot)."""
+        message = update.effective_message
+        if not message or not message.text:
+            return False
+        target = message.text.split(maxsplit=1)[0].partition("@")[2]
+        return bool(target) and target.lower() != (context.bot.username or "").lower()
+
+    @staticmethod
+    def _is_group_chat(update: Update) -> bool:
+        """Check whether a command was sent in a group or supergroup."""
+        chat = update.effective_chat
+        return chat is not None and chat.type in ("group", "supergroup")
+
+    async def _is_chat_admin(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> bool:
+        """Check whether the sender administers the chat (always in private chats)."""
+        chat = update.effective_chat
+        user = update.effective_user
+        if chat is None or user is None:
+            return False
+        if chat.type == "private":
+            return True
+        member = await context.bot.get_chat_member(chat.id, user.id)
+        return member.status in ("administrator", "creator")
+
     def _extract_k_parameter(self, update: Update, command: str) -> int:
         raw = self._extract_parameter(update, command)
         if not raw:
@@ -349,13 +915,15 @@ class TelegramBotAdapter:
             return 10
         return max(1, k)
 
-    def _bot_commands(self) -> List[BotCommand]:
+    def _bot_commands(self, language: Optional[str] = None) -> List[BotCommand]:
         commands = []
 
-        # Add commands for all topics except cities and countries
+        # Add commands for all topics except cities, countries and search
         for topic in self.service.list_topics():
-            if topic not in {"cities", "countries"}:
-                description = self.service.get_topic_description(topic)
+            if topic not in _HANDLED_TOPICS:
+                description = self.service.get_topic_description(
+                    topic, language=language
+                )
                 if description:
                     commands.append(BotCommand(topic, description))
 
@@ -363,7 +931,7 @@ class TelegramBotAdapter:
         commands.extend([
             BotCommand(
                 "cities",
-                "Чаты помощи по городам Германии (введите /cities ГОРОД)",
+                "Чаты помощи по городам Германии (введите /cities ГОРОД или ИНДЕКС)",
             ),
             BotCommand(
                 "cities_all",
@@ -371,7 +939,9 @@ class TelegramBotAdapter:
             ),
             BotCommand("countries", "Чаты по странам (введите /countries СТРАНА)"),
             BotCommand("countries_all", "Список всех чатов по странам"),
+            BotCommand("search", "Поиск по справочнику (введите /search СЛОВА)"),
             BotCommand("topic_stats", "Топ тем по количеству запросов"),
+            BotCommand("local_topics", "Локальные темы этого чата"),
         ])
 
         return commands
@@ -384,11 +954,13 @@ class TelegramBotAdapter:
             lines.append(f"{idx}. {topic_desc} — {count}")
         return "\n".join(lines)
 
-    def _record_stats(self, topic: str) -> None:
+    def _record_stats(self, topic: str, chat_id: Optional[int] = None) -> None:
         try:
             self.stats_service.record_request(
                 topic=topic,
-                topic_description=self.service.get_topic_description(topic),
+                topic_description=self.service.get_topic_description(
+                    topic, chat_id=chat_id
+                ),
             )
         except StatisticsServiceError:
             logger.exception("Failed to record stats for topic %s", topic)
@@ -399,7 +971,9 @@ class TelegramBotAdapter:
         context: ContextTypes.DEFAULT_TYPE,
         reply: str,
         *,
-        disable_web_page_preview: bool = True
+        disable_web_page_preview: bool = True,
+        parse_mode: Optional[str] = None,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
     ) -> None:
         """
         Delete the command message and send a reply.
@@ -409,31 +983,73 @@ class TelegramBotAdapter:
             context: The context
             reply: The reply text
             disable_web_page_preview: Whether to disable web page preview
+            parse_mode: Telegram parse mode the reply is formatted for
+            reply_markup: Inline keyboard under the reply
         """
         message = update.effective_message
         if not message:
             return
 
-        chat_id = message.chat_id
-
         # Delete command FIRST for immediate user feedback
         await self._delete_command(update, context)
 
         # THEN send reply after processing
-        if message.reply_to_message is None:
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text=reply,
-                disable_web_page_preview=disable_web_page_preview,
-            )
-        else:
-            parent_message_id = message.reply_to_message.message_id
+        parent = message.reply_to_message
+        await self._send_reply(
+            context,
+            message.chat_id,
+            reply,
+            reply_to_message_id=parent.message_id if parent is not None else None,
+            disable_web_page_preview=disable_web_page_preview,
+            parse_mode=parse_mode,
+            reply_markup=reply_markup,
+        )
+
+    async def _send_reply(
+        self,
+        context: ContextTypes.DEFAULT_TYPE,
+        chat_id: int,
+        reply: str,
+        *,
+        reply_to_message_id: Optional[int] = None,
+        disable_web_page_preview: bool = True,
+        parse_mode: Optional[str] = None,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+    ) -> None:
+        """
+        Send a reply as one or more messages within Telegram's length limit.
+
+        The messages were split when the reply was rendered. Each is sent
+        as soon as the previous one is accepted: Telegram orders a chat's
+        messages as it processes them, so parts sent concurrently could
+        arrive shuffled. Only the first part is a reply to the parent, and
+        only the last one carries the keyboard.
+
+        Args:
+            context: The context
+            chat_id: Chat to send to
+            reply: The reply text
+            reply_to_message_id: Message the reply answers, if any
+            disable_web_page_preview: Whether to disable web page preview
+            parse_mode: Telegram parse mode the reply is formatted for
+            reply_markup: Inline keyboard under the reply
+        """
+        options: Dict[str, Any] = {}
+        if reply_to_message_id is not None:
+            options["reply_to_message_id"] = reply_to_message_id
+        if parse_mode is not None:
+            options["parse_mode"] = parse_mode
+        parts = self.service.split_reply(reply)
+        for index, part in enumerate(parts):
+            if reply_markup is not None and index == len(parts) - 1:
+                options["reply_markup"] = reply_markup
             await context.bot.send_message(
                 chat_id=chat_id,
-                reply_to_message_id=parent_message_id,
-                text=reply,
+                text=part,
                 disable_web_page_preview=disable_web_page_preview,
+                **options,
             )
+            options.pop("reply_to_message_id", None)
 
     async def _delete_command(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -1,130 +1,1164 @@
 """Berlin help service - Core business logic for handling user requests."""
 
+import hashlib
+import logging
 import os
-from typing import Optional
+import re
+import time
+from itertools import chain
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
-from src.domain.protocols import IGuidebook
-from src.infrastructure.guidebook_formatter import format_contents, wrap_with_separator
+from src.application.render_cache import RenderCache, guidebook_version
+from src.domain.models import InlineResult, ListingPage, Topic, TopicChanges
+from src.domain.protocols import (
+    ICityLocator,
+    IGuidebook,
+    IOverlayStore,
+    IPostalCodeIndex,
+    OverlayStoreError,
+)
+from src.infrastructure.guidebook_formatter import (
+    PARSE_MODES,
+    TELEGRAM_MESSAGE_LIMIT,
+    escape,
+    format_contents,
+    iter_contents,
+    message_parts,
+    utf16_length,
+    wrap_with_separator,
+)
+from src.infrastructure.fuzzy_index import FuzzyIndex
+from src.infrastructure.yaml_guidebook import SECTION_NOT_FOUND
+
+logger = logging.getLogger(__name__)
+
+# Overlay topic names become bot commands
+_OVERLAY_TOPIC_NAME = re.compile(r"^[a-z0-9_]{1,32}$")
+MAX_OVERLAY_TOPICS = 50
+MAX_OVERLAY_TOPIC_LENGTH = 3500
+# Telegram shows at most 50 inline results; a short list fits the screen
+MAX_INLINE_RESULTS = 10
+# Replies of at most this many characters fit into one message: a
+# character is at most two UTF-16 code units
+_SHORT_REPLY_LENGTH = TELEGRAM_MESSAGE_LIMIT // 2
+MAX_SEARCH_RESULTS = 5
+# A question is answered with its best topic when that topic's BM25 score
+# is at least ANSWER_MIN_SCORE and ANSWER_MARGIN times the runner-up's;
+# otherwise the closest topics are suggested
+ANSWER_MIN_SCORE = 4.0
+ANSWER_MARGIN = 1.5
+MAX_QUESTION_SUGGESTIONS = 3
+# Topics answered one section at a time, never sent whole for a question
+_SECTION_TOPICS = frozenset({"cities", "countries"})
+# Commands of earlier guidebook versions, answered as the topic they became
+LEGACY_COMMANDS = {
+    "uni": "university",
+    "disabled": "handicap",
+    "freestuff": "free_stuff",
+    "accomodation": "accommodation",
+    "socialhelp": "social_help",
+}
+MAX_COMMAND_SUGGESTIONS = 3
+# Cities answered for a shared location
+MAX_NEARBY_CITIES = 3
+# Escaped reply parts kept for not-found and suggestion replies in a parse mode
+MAX_ESCAPED_PARTS = 4096
+# Cities or countries on one page of /cities_all and /countries_all
+LISTING_PAGE_SECTIONS = 10
+
+
+def _mode_topic(topic: str, parse_mode: Optional[str]) -> str:
+    """Return the render cache topic of a topic rendered in a parse mode."""
+    return topic if parse_mode is None else f"{topic} {parse_mode}"
+
+# /help text by language; languages without one get all of them
+_HELP_TEXTS = {
+    "ru": (
+        "Привет! 🤖 "
+        + os.linesep
+        + "Я бот для помощи беженцам из Украины 🇺🇦 в Германии. "
+        + os.linesep
+        + "Большинство моих знаний относятся к Берлину, но есть и общая "
+        + "полезная информация. Чтобы увидеть список поддерживаемых команд, "
+        + "введите символ '/'. "
+        + "\n\n"
+        + "Если добавите меня в свой чат, не забудьте дать мне права "
+        + "админа, пожалуйста, чтобы я мог удалять ненужные сообщения с "
+        + "вызванными командами."
+    ),
+    "uk": (
+        "Вітання! 🤖 "
+        + os.linesep
+        + "Я бот для допомоги біженцям з України 🇺🇦 в Німеччині."
+        + os.linesep
+        + "Більшість моїх знань стосуються Берліну, але є й загальна "
+        + "корисна інформація. Щоб побачити список команд, що підтримуються, "
+        + "введіть символ '/'. "
+        + "\n\n"
+        + "Якщо додасте мене до свого чату, будь ласка, не забудьте надати "
+        + "мені права адміна, щоб я зміг видаляти непотрібні повідомлення із "
+        + "викликаними командами."
+    ),
+    "en": (
+        "Hi! 🤖"
+        + os.linesep
+        + "I'm a bot helping refugees from Ukraine 🇺🇦 in Germany. "
+        + os.linesep
+        + "Most of my knowledge focuses on Berlin, but I have some "
+        + "general useful information too. Type '/' to see the list of my "
+        + "available commands."
+        + "\n\n"
+        + "If you add me to your chat, don't forget to grant me admin "
+        + "rights, so that I can delete log messages and keep your chat clean."
+    ),
+}
 
 
 class BerlinHelpService:
     """Service handling business logic for Berlin help requests."""
 
-    def __init__(self, guidebook: IGuidebook) -> None:
+    def __init__(
+        self,
+        guidebook: IGuidebook,
+        regions: Optional[Mapping[str, IGuidebook]] = None,
+        chat_regions: Optional[Mapping[int, str]] = None,
+        overlays: Optional[IOverlayStore] = None,
+        language_fallbacks: Optional[Mapping[str, Sequence[str]]] = None,
+        postal_codes: Optional[IPostalCodeIndex] = None,
+        city_locator: Optional[ICityLocator] = None,
+        prerender: bool = False,
+        parse_mode: Optional[str] = None,
+    ) -> None:
         """
         Initialize the service.
 
         Args:
-            guidebook: Guidebook data access implementation
+            guidebook: Guidebook data access implementation, used for every
+                chat that is not mapped to a region
+            regions: Regional guidebooks by region name
+            chat_regions: Region name by chat ID
+            overlays: Store of local topics added by chat admins
+            language_fallbacks: Languages to try, in order, when a topic has
+                no translation into a user's language ("de" -> ["en"])
+            postal_codes: Resolves `/cities 10115` to the nearest city
+            city_locator: Finds the cities nearest to a shared location
+            prerender: Render every reply of a guidebook into the render
+                cache when it is loaded, instead of on its first request
+            parse_mode: Telegram parse mode (HTML, MarkdownV2) of topic,
+                city and country replies; None sends them as plain text
+
+        Raises:
+            ValueError: If a chat is mapped to an unknown region, or the
+                parse mode is unknown
         """
+        if parse_mode is not None and parse_mode not in PARSE_MODES:
+            raise ValueError(f"Unknown parse mode {parse_mode!r}, expected one of {PARSE_MODES}")
         self.guidebook = guidebook
+        self.regions: Dict[str, IGuidebook] = dict(regions or {})
+        self._chat_regions = dict(chat_regions or {})
+        unknown = set(self._chat_regions.values()) - set(self.regions)
+        if unknown:
+            raise ValueError(f"Chats mapped to unknown regions: {sorted(unknown)}")
+        self._chat_guidebooks = self._resolve_chat_guidebooks()
+        self.overlays = overlays
+        self.postal_codes = postal_codes
+        self.city_locator = city_locator
+        self._language_chains: Dict[str, Tuple[str, ...]] = {
+            language: tuple(dict.fromkeys((language, *fallbacks)))
+            for language, fallbacks in (language_fallbacks or {}).items()
+        }
+        # Replies by (topic, subkey, guidebook version); keys are bounded by
+        # what the guidebooks hold, and versions no longer served are
+        # dropped on every swap
+        self.render_cache = RenderCache()
+        self._prerender = prerender
+        self.parse_mode = parse_mode
+        # Help language ("" for all languages) -> reply
+        self._help_replies: Dict[str, str] = {}
+        # (text, parse mode) -> escaped text, for the fixed parts of
+        # not-found and suggestion replies; the same for every guidebook
+        self._escaped_parts: Dict[Tuple[str, str], str] = {}
+        # Topic names and legacy commands for typo suggestions, built on
+        # the first unknown command and dropped on every swap
+        self._command_index: Optional[FuzzyIndex] = None
+        if prerender:
+            for served in self._served_guidebooks():
+                self.prerender(served)
+
+    def _resolve_chat_guidebooks(self) -> Dict[Optional[int], IGuidebook]:
+        """Map each regional chat straight to its guidebook object."""
+        return {
+            chat_id: self.regions[region]
+            for chat_id, region in self._chat_regions.items()
+        }
+
+    def guidebook_for(self, chat_id: Optional[int] = None) -> IGuidebook:
+        """
+        Return the guidebook serving a chat.
+
+        A single dict lookup; chats without a region (and chat_id None) get
+        the default guidebook.
+
+        Args:
+            chat_id: Telegram chat ID
+
+        Returns:
+            The chat's guidebook
+        """
+        return self._chat_guidebooks.get(chat_id, self.guidebook)
+
+    def _served_guidebooks(self) -> List[IGuidebook]:
+        """Return the default and the regional guidebooks, each once."""
+        served = {id(self.guidebook): self.guidebook}
+        served.update((id(regional), regional) for regional in self.regions.values())
+        return list(served.values())
+
+    def prerender(self, guidebook: IGuidebook) -> int:
+        """
+        Render every reply of a guidebook into the render cache.
+
+        Every topic in the base language and in each configured language,
+        every city and country with their prompts, and the `*_all`
+        listings, as plain text and in the parse mode, and the listing
+        pages; only section matches ("/medical аптеки"), aliases and typos
+        are left to be rendered on request.
+
+        Args:
+            guidebook: The default or a regional guidebook
+
+        Returns:
+            Number of replies rendered
+        """
+        started = time.perf_counter()
+        version = guidebook_version(guidebook)
+        chains = dict.fromkeys(
+            [(), *(self.language_chain(language) for language in self._language_chains)]
+        )
+        topics = guidebook.get_topics()
+        count = 0
+        for parse_mode in dict.fromkeys((None, self.parse_mode)):
+            for topic in topics:
+                for languages in chains:
+                    if self._render_topic(
+                        guidebook, version, topic, languages, parse_mode
+                    ) is not None:
+                        count += 1
+            for topic in _SECTION_TOPICS.intersection(topics):
+                contents = guidebook.get_topic_contents(topic)
+                self._store(
+                    _mode_topic(f"{topic}_all", parse_mode), "", version,
+                    format_contents(contents, parse_mode=parse_mode),
+                    iter_contents(contents, parse_mode=parse_mode),
+                )
+                lookup = guidebook.get_cities if topic == "cities" else guidebook.get_countries
+                mode_topic = _mode_topic(topic, parse_mode)
+                self._store(mode_topic, "", version, escape(lookup(name=None), parse_mode))
+                sections = contents if isinstance(contents, Mapping) else {}
+                for section, items in sections.items():
+                    key = section.lower()
+                    self._store(
+                        mode_topic, key, version,
+                        lookup(name=section) if parse_mode is None
+                        else format_contents(items, title=key, parse_mode=parse_mode),
+                    )
+                    count += 1
+                count += 2
+        for topic in _SECTION_TOPICS.intersection(topics):
+            self.render_cache.put_pages(
+                _mode_topic(f"{topic}_all", self.parse_mode), version,
+                self._render_listing_pages(guidebook, topic),
+            )
+            count += 1
+        logger.info(
+            "Pre-rendered %d replies of guidebook %s in %.0f ms",
+            count, version[:12], (time.perf_counter() - started) * 1000,
+        )
+        return count
+
+    def swap_guidebook(
+        self, guidebook: IGuidebook, region: Optional[str] = None
+    ) -> TopicChanges:
+        """
+        Replace the default or a regional guidebook with a new version.
+
+        The swap is a reference assignment (and a rebuilt chat lookup table
+        for regions), so concurrent requests see either the old or the new
+        guidebook, never a mix of both.
+
+        Args:
+            guidebook: The new guidebook
+            region: Region to replace; None replaces the default guidebook
+
+        Returns:
+            Topics added and removed across all guidebooks
+        """
+        old_topics = self.list_topics()
+        old_descriptions = {t: self.get_topic_description(t) for t in old_topics}
+
+        if region is None:
+            self.guidebook = guidebook
+        else:
+            regions = dict(self.regions)
+            regions[region] = guidebook
+            self.regions = regions
+            self._chat_guidebooks = self._resolve_chat_guidebooks()
+        self.render_cache.retain(
+            {guidebook_version(served) for served in self._served_guidebooks()}
+        )
+        if self._prerender:
+            self.prerender(guidebook)
+        self._command_index = None
 
-    def handle_help(self) -> str:
+        new_topics = self.list_topics()
+        old_set, new_set = set(old_topics), set(new_topics)
+        return TopicChanges(
+            added=tuple(t for t in new_topics if t not in old_set),
+            removed=tuple(t for t in old_topics if t not in new_set),
+            descriptions_changed=any(
+                old_descriptions[t] != self.get_topic_description(t)
+                for t in new_set & old_set
+            ),
+        )
+
+    def handle_help(self, *, language: Optional[str] = None) -> str:
         """
         Handle help command - return help text with available topics.
 
+        Args:
+            language: Telegram language code of the user
+
         Returns:
-            Formatted help text in multiple languages
-        """
-        help_text = (
-            "Привет! 🤖 "
-            + os.linesep
-            + "Я бот для помощи беженцам из Украины 🇺🇦 в Германии. "
-            + os.linesep
-            + "Большинство моих знаний относятся к Берлину, но есть и общая "
-            + "полезная информация. Чтобы увидеть список поддерживаемых команд, "
-            + "введите символ '/'. "
-            + "\n\n"
-            + "Если добавите меня в свой чат, не забудьте дать мне права "
-            + "админа, пожалуйста, чтобы я мог удалять ненужные сообщения с "
-            + "вызванными командами."
-            + "\n\n\n"
-            + "Вітання! 🤖 "
-            + os.linesep
-            + "Я бот для допомоги біженцям з України 🇺🇦 в Німеччині."
-            + os.linesep
-            + "Більшість моїх знань стосуються Берліну, але є й загальна "
-            + "корисна інформація. Щоб побачити список команд, що підтримуються, "
-            + "введіть символ '/'. "
-            + "\n\n"
-            + "Якщо додасте мене до свого чату, будь ласка, не забудьте надати "
-            + "мені права адміна, щоб я зміг видаляти непотрібні повідомлення із "
-            + "викликаними командами."
-            + "\n\n\n"
-            + "Hi! 🤖"
-            + os.linesep
-            + "I'm a bot helping refugees from Ukraine 🇺🇦 in Germany. "
-            + os.linesep
-            + "Most of my knowledge focuses on Berlin, but I have some "
-            + "general useful information too. Type '/' to see the list of my "
-            + "available commands."
-            + "\n\n"
-            + "If you add me to your chat, don't forget to grant me admin "
-            + "rights, so that I can delete log messages and keep your chat clean."
+            Formatted help text in the user's language, or in all languages
+            if there is none for it
+        """
+        help_language = next(
+            (code for code in self.language_chain(language) if code in _HELP_TEXTS), ""
         )
-        return wrap_with_separator(help_text)
+        reply = self._help_replies.get(help_language)
+        if reply is None:
+            text = (
+                _HELP_TEXTS[help_language]
+                if help_language
+                else "\n\n\n".join(_HELP_TEXTS.values())
+            )
+            reply = self._help_replies[help_language] = wrap_with_separator(text)
+        return reply
 
-    def handle_topic(self, topic_name: str) -> str:
+    def handle_topic(
+        self,
+        topic_name: str,
+        *,
+        section: Optional[str] = None,
+        chat_id: Optional[int] = None,
+        language: Optional[str] = None,
+        plain: bool = False,
+    ) -> str:
         """
         Handle topic request - return formatted topic information.
 
+        Guidebook topics are rendered once per language, parse mode and
+        guidebook version, and served from the render cache afterwards.
+        With a section ("/medical аптека"), only the sections of a
+        dict-based topic it matches are sent; when none matches, the whole
+        topic is.
+
         Args:
             topic_name: Name of the topic to retrieve
+            section: Section name, alias or words of it, as typed
+            chat_id: Chat the request came from (selects its region)
+            language: Telegram language code of the user
+            plain: Render plain text whatever the parse mode, for replies
+                made of several renders
 
         Returns:
             Formatted topic information with hashtag prefix
         """
-        contents = self.guidebook.get_topic_contents(topic_name)
-        formatted_info = format_contents(contents)
-        return f"#{topic_name}\n{formatted_info}"
+        parse_mode = None if plain else self.parse_mode
+        overlay = self._overlay_topic(topic_name, chat_id)
+        if overlay is not None:
+            return escape(f"#{topic_name}\n", parse_mode) + format_contents(
+                overlay.contents, parse_mode=parse_mode
+            )
+
+        guidebook = self.guidebook_for(chat_id)
+        languages = self.language_chain(language)
+        if section:
+            rendered_sections = self._render_topic_sections(
+                guidebook, topic_name.lower(), section, languages, parse_mode
+            )
+            if rendered_sections is not None:
+                return rendered_sections
+
+        version = guidebook_version(guidebook)
+        subkey = "@" + (languages[0] if languages else "")
+        rendered = self.render_cache.get(
+            _mode_topic(topic_name.lower(), parse_mode), subkey, version
+        )
+        if rendered is not None:
+            return rendered
+
+        rendered = self._render_topic(guidebook, version, topic_name, languages, parse_mode)
+        if rendered is None:
+            # Topic of another region
+            return escape(
+                "К сожалению, мы пока не располагаем информацией "
+                f"по запросу {topic_name}.",
+                parse_mode,
+            )
+        return rendered
+
+    def _render_topic(
+        self,
+        guidebook: IGuidebook,
+        version: str,
+        topic_name: str,
+        languages: Tuple[str, ...],
+        parse_mode: Optional[str] = None,
+    ) -> Optional[str]:
+        """Render a whole topic into the render cache; None if there is no such topic."""
+        try:
+            contents = guidebook.get_topic_contents(topic_name, languages)
+        except KeyError:
+            return None
+        prefix = escape(f"#{topic_name}\n", parse_mode)
+        return self._store(
+            _mode_topic(topic_name.lower(), parse_mode),
+            "@" + (languages[0] if languages else ""),
+            version,
+            prefix + format_contents(contents, parse_mode=parse_mode),
+            chain((prefix,), iter_contents(contents, parse_mode=parse_mode)),
+        )
+
+    def _store(
+        self,
+        topic: str,
+        subkey: str,
+        version: str,
+        reply: str,
+        fragments: Optional[Iterable[str]] = None,
+    ) -> str:
+        """Put a reply into the render cache, split into messages if it may need it.
+
+        Args:
+            topic: Topic or listing name
+            subkey: What part of the topic the reply shows
+            version: Guidebook version
+            reply: The rendered reply
+            fragments: The reply by item and section, to split it at their
+                boundaries; without them it is split at lines
+
+        Returns:
+            The reply
+        """
+        parts: Tuple[str, ...] = ()
+        if len(reply) > _SHORT_REPLY_LENGTH:
+            parts = message_parts(fragments if fragments is not None else (reply,))
+        return self.render_cache.put(topic, subkey, version, reply, parts)
+
+    def split_reply(self, reply: str) -> Tuple[str, ...]:
+        """
+        Return the Telegram messages a reply is sent as.
+
+        Replies from the render cache were split when they were rendered,
+        at item and section boundaries; other long replies are split at
+        lines here.
+
+        Args:
+            reply: A reply of this service
+
+        Returns:
+            Messages of at most TELEGRAM_MESSAGE_LIMIT UTF-16 code units,
+            in order
+        """
+        if len(reply) <= _SHORT_REPLY_LENGTH:
+            return (reply,)
+        parts = self.render_cache.parts(reply)
+        return parts if parts is not None else message_parts((reply,))
+
+    def _render_topic_sections(
+        self,
+        guidebook: IGuidebook,
+        topic_name: str,
+        name: str,
+        languages: Tuple[str, ...],
+        parse_mode: Optional[str] = None,
+    ) -> Optional[str]:
+        """Render the sections of a topic a name matches; None if none does.
+
+        Sections are found among the base-language section names; a
+        translation whose section names differ is sent whole instead.
+        """
+        keys = guidebook.find_sections(topic_name, name)
+        if not keys:
+            return None
+        # Keyed by the matched sections, not by the text typed, so the
+        # cache stays bounded by what the guidebook holds
+        version = guidebook_version(guidebook)
+        subkey = "@" + "\n".join((languages[0] if languages else "", *keys))
+        mode_topic = _mode_topic(topic_name, parse_mode)
+        rendered = self.render_cache.get(mode_topic, subkey, version)
+        if rendered is not None:
+            return rendered
+
+        contents = guidebook.get_topic_contents(topic_name, languages)
+        if not isinstance(contents, Mapping):
+            return None
+        wanted = set(keys)
+        selected = {
+            section: items for section, items in contents.items()
+            if section.lower() in wanted
+        }
+        if not selected:
+            return None
+        prefix = escape(f"#{topic_name}\n", parse_mode)
+        return self._store(
+            mode_topic, subkey, version, prefix + format_contents(selected, parse_mode=parse_mode),
+            chain((prefix,), iter_contents(selected, parse_mode=parse_mode)),
+        )
+
+    def language_chain(self, language: Optional[str]) -> Tuple[str, ...]:
+        """
+        Return the guidebook languages to try for a Telegram language code.
+
+        The primary subtag of the code comes first ("pt-br" -> "pt"),
+        followed by its configured fallbacks. Anything not found falls back
+        to the guidebook's base language.
+
+        Args:
+            language: Telegram language code of the user, if known
+
+        Returns:
+            Language codes, most preferred first
+        """
+        if not language:
+            return ()
+        primary = language.lower().replace("_", "-").split("-", 1)[0]
+        return self._language_chains.get(primary, (primary,))
 
-    def handle_cities(self, city_name: Optional[str], show_all: bool = False) -> str:
+    def handle_cities(
+        self,
+        city_name: Optional[str],
+        show_all: bool = False,
+        *,
+        chat_id: Optional[int] = None,
+        plain: bool = False,
+    ) -> str:
         """
         Handle cities command - return city information.
 
+        A German postal code ("10115") is answered with the nearest city.
+
         Args:
-            city_name: Name of the city (None to show prompt or all)
+            city_name: Name or postal code of the city (None to show prompt
+                or all)
             show_all: Whether to show all cities
+            chat_id: Chat the request came from (selects its region)
+            plain: Render plain text whatever the parse mode
 
         Returns:
             Formatted city information
         """
+        guidebook = self.guidebook_for(chat_id)
+        parse_mode = None if plain else self.parse_mode
         if show_all:
-            contents = self.guidebook.get_topic_contents("cities")
-            return format_contents(contents)
-        return self.guidebook.get_cities(name=city_name)
+            return self._render_listing(guidebook, "cities", parse_mode)
+        if city_name and city_name.isdigit() and self.postal_codes is not None:
+            city_name = self.postal_codes.lookup(city_name) or city_name
+        return self._render_section(guidebook, "cities", city_name, parse_mode=parse_mode)
 
-    def handle_countries(self, country_name: Optional[str], show_all: bool = False) -> str:
+    def handle_countries(
+        self,
+        country_name: Optional[str],
+        show_all: bool = False,
+        *,
+        chat_id: Optional[int] = None,
+        plain: bool = False,
+    ) -> str:
         """
         Handle countries command - return country information.
 
         Args:
             country_name: Name of the country (None to show prompt or all)
             show_all: Whether to show all countries
+            chat_id: Chat the request came from (selects its region)
+            plain: Render plain text whatever the parse mode
 
         Returns:
             Formatted country information
         """
+        guidebook = self.guidebook_for(chat_id)
+        parse_mode = None if plain else self.parse_mode
         if show_all:
-            contents = self.guidebook.get_topic_contents("countries")
-            return format_contents(contents)
-        return self.guidebook.get_countries(name=country_name)
+            return self._render_listing(guidebook, "countries", parse_mode)
+        return self._render_section(guidebook, "countries", country_name, parse_mode=parse_mode)
+
+    def handle_listing_page(
+        self, topic: str, page: int = 0, *, chat_id: Optional[int] = None
+    ) -> ListingPage:
+        """
+        Return a page of /cities_all or /countries_all.
+
+        The pages of a listing are rendered together in the parse mode,
+        once per guidebook version, so flipping a page is a dict lookup.
+
+        Args:
+            topic: "cities" or "countries"
+            page: Zero-based page number; a page past the end (of a listing
+                shortened by a reload) is the last page
+            chat_id: Chat the request came from (selects its region)
+
+        Returns:
+            The page, with its number and the number of pages
+        """
+        guidebook = self.guidebook_for(chat_id)
+        version = guidebook_version(guidebook)
+        listing = _mode_topic(f"{topic}_all", self.parse_mode)
+        pages = self.render_cache.get_pages(listing, version)
+        if pages is None:
+            pages = self.render_cache.put_pages(
+                listing, version, self._render_listing_pages(guidebook, topic)
+            )
+        return pages[min(max(page, 0), len(pages) - 1)]
 
-    def list_topics(self) -> list[str]:
-        """Return list of all available topic names.
+    def list_topics(self, *, chat_id: Optional[int] = None) -> List[str]:
+        """Return list of available topic names.
+
+        Args:
+            chat_id: Only list the topics of this chat's guidebook; None
+                lists the topics of the default and all regional guidebooks
 
         Returns:
             List of topic names (lowercase)
         """
-        return self.guidebook.get_topics()
+        if chat_id is not None or not self.regions:
+            return self.guidebook_for(chat_id).get_topics()
+        topics = dict.fromkeys(self.guidebook.get_topics())
+        for guidebook in self.regions.values():
+            topics.update(dict.fromkeys(guidebook.get_topics()))
+        return list(topics)
 
-    def get_topic_description(self, topic: str) -> Optional[str]:
+    def get_topic_description(
+        self,
+        topic: str,
+        *,
+        chat_id: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> Optional[str]:
         """Get the description for a given topic.
 
         Args:
             topic: Topic name (case-insensitive)
+            chat_id: Chat whose guidebook to use; None falls back from the
+                default guidebook to the regional ones
+            language: Telegram language code of the user; None returns the
+                base description
 
         Returns:
             Topic description string, or None if topic doesn't exist
         """
-        return self.guidebook.get_topic_description(topic)
+        languages = self.language_chain(language)
+        if chat_id is not None:
+            return self.guidebook_for(chat_id).get_topic_description(topic, languages)
+        for guidebook in (self.guidebook, *self.regions.values()):
+            description = guidebook.get_topic_description(topic, languages)
+            if description is not None:
+                return description
+        return None
+
+    def list_languages(self) -> List[str]:
+        """Return the languages with their own command menu.
+
+        Returns:
+            Configured language codes
+        """
+        return list(self._language_chains)
+
+    def handle_search(
+        self,
+        query: str,
+        *,
+        chat_id: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> str:
+        """
+        Handle /search - list the topics whose texts match a query.
+
+        Without a query, the guidebook's own "search" topic (how to search
+        the web) is shown, as before /search searched the guidebook.
+
+        Args:
+            query: Words to search for
+            chat_id: Chat the request came from (selects its region)
+            language: Telegram language code of the user
+
+        Returns:
+            One line per matching topic, or a message that none matched
+        """
+        guidebook = self.guidebook_for(chat_id)
+        if not query.strip():
+            if guidebook.get_topic_description("search") is not None:
+                return self.handle_topic(
+                    "search", chat_id=chat_id, language=language, plain=True
+                )
+            return "Использование: /search СЛОВА"
+
+        hits = guidebook.search_topics(query, MAX_SEARCH_RESULTS)
+        if not hits:
+            return (
+                f"По запросу «{query}» ничего не найдено. "
+                "Введите '/', чтобы увидеть список команд."
+            )
+        topics = [hit.topic for hit in hits]
+        return "\n".join(
+            [f"По запросу «{query}»:", *self._topic_lines(guidebook, topics, language)]
+        )
+
+    def handle_question(
+        self,
+        text: str,
+        *,
+        chat_id: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> str:
+        """
+        Answer a free-text question ("где найти жильё") with a topic.
+
+        The question is ranked against all topics by the guidebook's
+        search index. A clear winner is answered with its rendered topic
+        from the render cache; otherwise the closest topics are suggested
+        as commands.
+
+        Args:
+            text: Message text as typed
+            chat_id: Chat the question came from (selects its region)
+            language: Telegram language code of the user
+
+        Returns:
+            Rendered topic, suggestions, or a hint when nothing matched
+        """
+        guidebook = self.guidebook_for(chat_id)
+        hits = guidebook.search_topics(text, MAX_QUESTION_SUGGESTIONS)
+        if not hits:
+            return (
+                "Не нашёл ответа на этот вопрос. Попробуйте /search СЛОВА "
+                "или введите '/', чтобы увидеть список команд."
+            )
+        best = hits[0]
+        if (
+            best.topic not in _SECTION_TOPICS
+            and best.score >= ANSWER_MIN_SCORE
+            and (len(hits) == 1 or best.score >= ANSWER_MARGIN * hits[1].score)
+        ):
+            return self.handle_topic(
+                best.topic, chat_id=chat_id, language=language, plain=True
+            )
+
+        topics = [hit.topic for hit in hits]
+        return "\n".join(
+            ["Возможно, вы имели в виду:", *self._topic_lines(guidebook, topics, language)]
+        )
+
+    def handle_location(
+        self,
+        latitude: float,
+        longitude: float,
+        *,
+        chat_id: Optional[int] = None,
+    ) -> str:
+        """
+        Answer a shared location with the nearest cities and their chats.
+
+        Each city is rendered by handle_cities; cities the chat's region
+        has no section for are left out.
+
+        Args:
+            latitude: Degrees, -90 to 90
+            longitude: Degrees, -180 to 180
+            chat_id: Chat the location was shared in (selects its region)
+
+        Returns:
+            Nearest cities with distances, or a hint when none is known
+        """
+        hint = "Не нашёл городов рядом. Введите /cities ГОРОД или /cities_all."
+        if self.city_locator is None:
+            return hint
+        guidebook = self.guidebook_for(chat_id)
+        nearby = [
+            place
+            for place in self.city_locator.nearest(latitude, longitude, MAX_NEARBY_CITIES)
+            if place.name.lower() in guidebook.find_sections("cities", place.name)
+        ]
+        if not nearby:
+            return hint
+        distances = ", ".join(
+            f"{place.name} ({place.distance_km:.0f} км)" for place in nearby
+        )
+        return "\n".join([
+            f"Ближайшие города: {distances}",
+            *(self.handle_cities(place.name, chat_id=chat_id, plain=True) for place in nearby),
+        ])
+
+    def resolve_command(self, command: str, *, chat_id: Optional[int] = None) -> Optional[str]:
+        """
+        Return the topic a legacy command (/uni, /freestuff) became.
+
+        Args:
+            command: Lowercase command without slash
+            chat_id: Chat the command came from (selects its region)
+
+        Returns:
+            Current topic name, or None if the command is not a legacy one
+            or its topic is not in the chat's guidebook
+        """
+        topic = LEGACY_COMMANDS.get(command)
+        if topic is None or self.guidebook_for(chat_id).get_topic_description(topic) is None:
+            return None
+        return topic
+
+    def suggest_commands(
+        self,
+        command: str,
+        *,
+        chat_id: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Suggest the topic commands closest to an unknown one.
+
+        Topic names and legacy commands are looked up by edit distance, so
+        /acommodation and /accomodatoin both suggest /accommodation.
+
+        Args:
+            command: Lowercase command without slash
+            chat_id: Chat the command came from (selects its region)
+            language: Telegram language code of the user
+
+        Returns:
+            "/topic description" suggestions, or None if no topic is close
+        """
+        if self._command_index is None:
+            self._command_index = self._build_command_index()
+        topics = set(self.list_topics(chat_id=chat_id))
+        matches = [
+            topic
+            for topic, _ in self._command_index.search(command, MAX_COMMAND_SUGGESTIONS)
+            if topic in topics
+        ]
+        if not matches:
+            return None
+        guidebook = self.guidebook_for(chat_id)
+        return "\n".join([
+            f"Команды /{command} нет. Возможно, вы имели в виду:",
+            *self._topic_lines(guidebook, matches, language),
+        ])
+
+    def _build_command_index(self) -> FuzzyIndex:
+        """Index the topic names of all guidebooks and the legacy commands."""
+        names = {topic: topic for topic in self.list_topics()}
+        for command, topic in LEGACY_COMMANDS.items():
+            if topic in names:
+                names.setdefault(command, topic)
+        return FuzzyIndex(names)
+
+    def _topic_lines(
+        self, guidebook: IGuidebook, topics: List[str], language: Optional[str]
+    ) -> List[str]:
+        """Return "/topic description" lines."""
+        languages = self.language_chain(language)
+        return [
+            f"/{topic} {guidebook.get_topic_description(topic, languages) or ''}".rstrip()
+            for topic in topics
+        ]
+
+    def handle_inline_query(self, query: str) -> List[InlineResult]:
+        """
+        Answer an inline query ("@bot berl") from any chat.
+
+        Completions come from the default guidebook's prefix trie and are
+        rendered in the base language through the render caches, so the
+        answer is the same for everyone and Telegram can cache it. Replies
+        too long for one message are left out.
+
+        Args:
+            query: Text typed after the bot's username
+
+        Returns:
+            Ready-to-send results, best first
+        """
+        guidebook = self.guidebook
+        results = []
+        for completion in guidebook.complete(query, MAX_INLINE_RESULTS):
+            if completion.section is None:
+                title = f"/{completion.topic}"
+                description = guidebook.get_topic_description(completion.topic) or ""
+                text = self.handle_topic(completion.topic, plain=True)
+            else:
+                title = completion.section.title()
+                description = f"/{completion.topic} {title}"
+                text = self._render_section(
+                    guidebook, completion.topic, completion.section, is_key=True
+                )
+            if utf16_length(text) > TELEGRAM_MESSAGE_LIMIT:
+                continue
+            key = f"{completion.topic}/{completion.section or ''}"
+            results.append(InlineResult(
+                id=hashlib.sha1(key.encode()).hexdigest(),
+                title=title,
+                description=description,
+                text=text,
+            ))
+        return results
+
+    def _render_section(
+        self,
+        guidebook: IGuidebook,
+        topic: str,
+        name: Optional[str],
+        *,
+        is_key: bool = False,
+        parse_mode: Optional[str] = None,
+    ) -> str:
+        """Render one city or country, or the prompt, through the render cache.
+
+        Names that are not a section key (aliases, typos) are rendered on
+        every request: caching them would let users grow the cache.
+        is_key skips checking a name known to be a section key.
+        """
+        version = guidebook_version(guidebook)
+        subkey = name.lower() if name else ""
+        rendered = self.render_cache.get(_mode_topic(topic, parse_mode), subkey, version)
+        if rendered is not None:
+            return rendered
+        if parse_mode is not None:
+            return self._render_section_markup(guidebook, topic, name, is_key, parse_mode)
+        lookup = guidebook.get_cities if topic == "cities" else guidebook.get_countries
+        rendered = lookup(name=name)
+        if not name or is_key or guidebook.find_sections(topic, name) == [subkey]:
+            self._store(topic, subkey, version, rendered)
+        return rendered
+
+    def _render_section_markup(
+        self,
+        guidebook: IGuidebook,
+        topic: str,
+        name: Optional[str],
+        is_key: bool,
+        parse_mode: str,
+    ) -> str:
+        """Render one city or country, or the prompt, in a parse mode.
+
+        A name that resolves to one section (an alias, a typo) is answered
+        with that section's cached reply; replies for names that match
+        nothing or several sections are put together from cached escaped
+        parts, so only the name is escaped on request.
+        """
+        lookup = guidebook.get_cities if topic == "cities" else guidebook.get_countries
+        subkey = name.lower() if name else ""
+        if name and not is_key:
+            keys = guidebook.find_sections(topic, name)
+            if len(keys) != 1:
+                # Not found, or several suggestions
+                return self._escape_not_found(topic, name, lookup(name=name), parse_mode)
+            if keys[0] != subkey:
+                return self._render_section(
+                    guidebook, topic, keys[0], is_key=True, parse_mode=parse_mode
+                )
+        rendered = None
+        if name:
+            contents = guidebook.get_topic_contents(topic)
+            sections = contents if isinstance(contents, Mapping) else {}
+            rendered = next(
+                (
+                    format_contents(items, title=subkey, parse_mode=parse_mode)
+                    for section, items in sections.items() if section.lower() == subkey
+                ),
+                None,
+            )
+        if rendered is None:
+            # The prompt
+            rendered = escape(lookup(name=name), parse_mode)
+        return self._store(
+            _mode_topic(topic, parse_mode), subkey, guidebook_version(guidebook), rendered
+        )
+
+    def _escape_not_found(self, topic: str, name: str, reply: str, parse_mode: str) -> str:
+        """Escape a not-found reply, with its suggestions, escaping only the name anew."""
+        not_found = SECTION_NOT_FOUND.format(topic=topic, name=name)
+        if not reply.startswith(not_found):
+            return self._escaped_part(reply, parse_mode)
+        before, after = SECTION_NOT_FOUND.split("{name}")
+        return (
+            self._escaped_part(before.format(topic=topic), parse_mode)
+            + escape(name, parse_mode)
+            + self._escaped_part(after + reply[len(not_found):], parse_mode)
+        )
+
+    def _escaped_part(self, text: str, parse_mode: str) -> str:
+        """Return escaped text from a bounded dict, escaping it on first use."""
+        key = (text, parse_mode)
+        escaped = self._escaped_parts.get(key)
+        if escaped is None:
+            if len(self._escaped_parts) >= MAX_ESCAPED_PARTS:
+                self._escaped_parts = {}
+            escaped = self._escaped_parts[key] = escape(text, parse_mode)
+        return escaped
+
+    def _render_listing(
+        self, guidebook: IGuidebook, topic: str, parse_mode: Optional[str] = None
+    ) -> str:
+        """Render all cities or countries (/cities_all) through the render cache."""
+        version = guidebook_version(guidebook)
+        mode_topic = _mode_topic(f"{topic}_all", parse_mode)
+        rendered = self.render_cache.get(mode_topic, "", version)
+        if rendered is None:
+            contents = guidebook.get_topic_contents(topic)
+            rendered = self._store(
+                mode_topic, "", version,
+                format_contents(contents, parse_mode=parse_mode),
+                iter_contents(contents, parse_mode=parse_mode),
+            )
+        return rendered
+
+    def _render_listing_pages(self, guidebook: IGuidebook, topic: str) -> List[ListingPage]:
+        """Render all cities or countries into pages of whole sections.
+
+        A page holds at most LISTING_PAGE_SECTIONS sections and, when they
+        fit, at most one message. A listing of one page is the same text
+        as the whole listing.
+        """
+        contents = guidebook.get_topic_contents(topic)
+        fragments = list(iter_contents(contents, parse_mode=self.parse_mode))
+        opening, sections, closing = fragments[0], fragments[1:-1], fragments[-1]
+        # Room for the page header ("Страница 10 из 12")
+        limit = TELEGRAM_MESSAGE_LIMIT - utf16_length(opening + closing) - 64
+        groups: List[List[str]] = [[]]
+        length = 0
+        for section in sections:
+            section_length = utf16_length(section)
+            group = groups[-1]
+            if group and (
+                len(group) == LISTING_PAGE_SECTIONS or length + section_length > limit
+            ):
+                group = []
+                groups.append(group)
+                length = 0
+            group.append(section)
+            length += section_length
+        if len(groups) == 1:
+            return [ListingPage(topic, "".join(fragments), 0, 1)]
+        return [
+            ListingPage(
+                topic,
+                escape(f"Страница {page + 1} из {len(groups)}\n", self.parse_mode)
+                + opening + "".join(group) + closing,
+                page,
+                len(groups),
+            )
+            for page, group in enumerate(groups)
+        ]
+
+    def handle_overlay_topic(self, topic_name: str, *, chat_id: int) -> Optional[str]:
+        """
+        Handle a command that may be a local topic of the chat.
+
+        Args:
+            topic_name: Command name without the slash
+            chat_id: Chat the command was sent in
+
+        Returns:
+            Formatted topic information, or None if the chat has no such topic
+        """
+        overlay = self._overlay_topic(topic_name, chat_id)
+        if overlay is None:
+            return None
+        return f"#{overlay.name}\n{format_contents(overlay.contents)}"
+
+    def add_overlay_topic(self, chat_id: int, text: str) -> str:
+        """
+        Add or replace a local topic of a chat (admins only).
+
+        The first line holds the topic name and description, every further
+        line is one item: "sozialamt Sozialamt Mitte\nhttps://t.me/...".
+
+        Args:
+            chat_id: Chat to add the topic to
+            text: Command parameter as typed
+
+        Returns:
+            Confirmation or usage message
+        """
+        if self.overlays is None:
+            return "Локальные темы не поддерживаются."
+
+        header, _, body = text.strip().partition("\n")
+        name, _, description = header.strip().partition(" ")
+        name = name.lower()
+        items = tuple(line.strip() for line in body.splitlines() if line.strip())
+        if not name or not items:
+            return (
+                "Использование: /local_add НАЗВАНИЕ Описание\n"
+                "первая строка темы\nвторая строка темы"
+            )
+        if not _OVERLAY_TOPIC_NAME.match(name):
+            return (
+                "Название темы может содержать только латинские буквы, "
+                "цифры и _ (до 32 символов)."
+            )
+        if len(text) > MAX_OVERLAY_TOPIC_LENGTH:
+            return f"Тема слишком длинная (максимум {MAX_OVERLAY_TOPIC_LENGTH} символов)."
+
+        existing = self.overlays.get_topics(chat_id)
+        if name not in existing and len(existing) >= MAX_OVERLAY_TOPICS:
+            return (
+                f"В этом чате уже {MAX_OVERLAY_TOPICS} локальных тем. "
+                "Удалите ненужные: /local_remove НАЗВАНИЕ"
+            )
+
+        self.overlays.set_topic(
+            chat_id, Topic(name=name, description=description.strip(), contents=items)
+        )
+        return f"Локальная тема /{name} сохранена."
+
+    def remove_overlay_topic(self, chat_id: int, name: str) -> str:
+        """
+        Remove a local topic of a chat (admins only).
+
+        Args:
+            chat_id: Chat to remove the topic from
+            name: Topic name
+
+        Returns:
+            Confirmation message
+        """
+        name = name.strip().lower()
+        if self.overlays is None or not self.overlays.delete_topic(chat_id, name):
+            return f"Локальной темы /{name} нет в этом чате."
+        return f"Локальная тема /{name} удалена."
+
+    def list_overlay_topics(self, chat_id: int) -> str:
+        """
+        List the local topics of a chat.
+
+        Args:
+            chat_id: Chat to list the topics of
+
+        Returns:
+            One line per topic, or a message that there are none
+        """
+        topics = self.overlays.get_topics(chat_id) if self.overlays else {}
+        if not topics:
+            return "В этом чате пока нет локальных тем."
+        lines = ["Локальные темы этого чата:"]
+        for topic in topics.values():
+            lines.append(f"/{topic.name} {topic.description}".rstrip())
+        return "\n".join(lines)
+
+    def _overlay_topic(self, topic_name: str, chat_id: Optional[int]) -> Optional[Topic]:
+        """Return the chat's local topic, if any; read errors fall back to None."""
+        if self.overlays is None or chat_id is None:
+            return None
+        try:
+            return self.overlays.get_topics(chat_id).get(topic_name.lower())
+        except OverlayStoreError:
+            logger.exception("Failed to read overlay topics of chat %s", chat_id)
+            return None
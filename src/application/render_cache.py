@@ -0,0 +1,175 @@
+"""Replies rendered once per guidebook version.
+
+Every reply that depends only on the guidebook is stored under
+(topic, subkey, version), where version is the guidebook's source hash:
+a reload that changes nothing keeps its replies, and regional guidebooks
+never see each other's. Subkeys are:
+
+- "@" + language: the whole topic ("@" for the base language)
+- "@" + language + "\\n" + section keys: the sections a topic command
+  matched ("/medical аптеки")
+- a lowercase section key: one city or country; "" for the prompt
+- "" under "cities_all" and "countries_all": the listings
+
+Replies in a Telegram parse mode are stored under the topic followed by
+a space and the mode ("cities HTML"), next to their plain text. The pages
+of a listing are stored together under the listing and version.
+
+Replies too long for one Telegram message keep the messages they are
+sent as next to them, split once when they are stored.
+
+The counters show how often the request path is a single dict lookup.
+"""
+
+import logging
+import threading
+from typing import Collection, Dict, Optional, Sequence, Tuple
+
+from src.domain.models import ListingPage
+from src.domain.protocols import IGuidebook
+
+logger = logging.getLogger(__name__)
+
+# Lookups between two log lines with the hit rate
+LOG_EVERY_LOOKUPS = 10_000
+# Version prefix of guidebooks without a source hash
+_ID_VERSION = "id:"
+
+
+def guidebook_version(guidebook: IGuidebook) -> str:
+    """Return the version rendered replies of a guidebook are stored under.
+
+    Args:
+        guidebook: Any guidebook
+
+    Returns:
+        Its source hash; guidebooks without one (test doubles) get a
+        version of their own that does not survive a swap
+    """
+    source_hash = getattr(guidebook, "source_hash", None)
+    return source_hash if isinstance(source_hash, str) else f"{_ID_VERSION}{id(guidebook)}"
+
+
+class RenderCache:
+    """Rendered replies by (topic, subkey, guidebook version), with hit and miss counts."""
+
+    def __init__(self, log_every: int = LOG_EVERY_LOOKUPS) -> None:
+        """
+        Create an empty cache.
+
+        Args:
+            log_every: Log the hit rate every this many lookups
+        """
+        self._replies: Dict[Tuple[str, str, str], str] = {}
+        # Reply -> its messages; a cached reply is always the same str
+        # object, whose hash Python keeps, so lookups do not rehash it
+        self._parts: Dict[str, Tuple[str, ...]] = {}
+        # (listing, version) -> its pages
+        self._pages: Dict[Tuple[str, str], Tuple[ListingPage, ...]] = {}
+        # Writers: the event loop stores misses while the watcher thread
+        # retains; lookups read the dicts without it
+        self._lock = threading.Lock()
+        self._log_every = max(1, log_every)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._replies)
+
+    def get(self, topic: str, subkey: str, version: str) -> Optional[str]:
+        """
+        Return a rendered reply, counting the lookup as a hit or a miss.
+
+        Returns:
+            The reply, or None if it was never rendered
+        """
+        reply = self._replies.get((topic, subkey, version))
+        self._count(reply is not None)
+        return reply
+
+    def get_pages(self, listing: str, version: str) -> Optional[Tuple[ListingPage, ...]]:
+        """
+        Return the pages of a listing, counting the lookup as a hit or a miss.
+
+        Returns:
+            The pages, or None if they were never rendered
+        """
+        pages = self._pages.get((listing, version))
+        self._count(pages is not None)
+        return pages
+
+    def _count(self, hit: bool) -> None:
+        """Count a lookup, logging the hit rate every log_every lookups."""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if (self.hits + self.misses) % self._log_every == 0:
+            logger.info(
+                "Render cache: %d hits, %d misses (%.1f%% hits), %d replies",
+                self.hits, self.misses,
+                100 * self.hits / (self.hits + self.misses), len(self._replies),
+            )
+
+    def put(
+        self,
+        topic: str,
+        subkey: str,
+        version: str,
+        reply: str,
+        parts: Sequence[str] = (),
+    ) -> str:
+        """
+        Store a rendered reply and return it.
+
+        Args:
+            topic: Topic or listing name
+            subkey: What part of the topic the reply shows
+            version: Guidebook version
+            reply: The rendered reply
+            parts: Messages the reply is sent as, if it was split
+        """
+        with self._lock:
+            self._replies[(topic, subkey, version)] = reply
+            if parts:
+                self._parts[reply] = tuple(parts)
+        return reply
+
+    def put_pages(
+        self, listing: str, version: str, pages: Sequence[ListingPage]
+    ) -> Tuple[ListingPage, ...]:
+        """Store the pages of a listing and return them."""
+        stored = tuple(pages)
+        with self._lock:
+            self._pages[(listing, version)] = stored
+        return stored
+
+    def parts(self, reply: str) -> Optional[Tuple[str, ...]]:
+        """Return the messages a stored reply was split into, if it was."""
+        return self._parts.get(reply)
+
+    def retain(self, versions: Collection[str]) -> None:
+        """
+        Drop the replies of every version not listed.
+
+        Versions of guidebooks without a source hash are always dropped:
+        such a guidebook may have changed without a new version. The kept
+        replies go into a new dict, so concurrent lookups see either the
+        old or the new one; replies stored meanwhile wait for the new one.
+
+        Args:
+            versions: Versions still served
+        """
+        with self._lock:
+            replies = {
+                key: reply for key, reply in self._replies.items()
+                if key[2] in versions and not key[2].startswith(_ID_VERSION)
+            }
+            self._parts = {
+                reply: self._parts[reply] for reply in replies.values() if reply in self._parts
+            }
+            self._pages = {
+                key: pages for key, pages in self._pages.items()
+                if key[1] in versions and not key[1].startswith(_ID_VERSION)
+            }
+            self._replies = replies
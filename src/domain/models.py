@@ -1,6 +1,11 @@
 """Domain models - Immutable value objects for the application."""
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+# Frozen guidebook contents: a tuple of items, or a read-only mapping of
+# section/subtopic keys to tuples of items
+TopicContents = Union[Tuple[str, ...], Mapping[str, Tuple[str, ...]]]
 
 
 @dataclass(frozen=True)
@@ -18,3 +23,108 @@ class CommandRequest:
     command: str
     parameter: Optional[str]
     chat_context: ChatContext
+
+
+@dataclass(frozen=True)
+class TopicChanges:
+    """Immutable summary of how the topic set changed after a guidebook swap."""
+    added: Tuple[str, ...] = ()
+    removed: Tuple[str, ...] = ()
+    descriptions_changed: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.descriptions_changed)
+
+
+@dataclass(frozen=True)
+class Completion:
+    """Immutable autocomplete target: a topic, or one section of it."""
+    topic: str
+    section: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class InlineResult:
+    """Immutable inline-mode answer, ready to be sent as a message."""
+    id: str
+    title: str
+    description: str
+    text: str
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """Immutable full-text search result: a topic and its relevance score."""
+    topic: str
+    score: float
+
+
+@dataclass(frozen=True)
+class NearbyPlace:
+    """Immutable result of a location lookup: a guidebook section and how far it is."""
+    name: str
+    distance_km: float
+
+
+@dataclass(frozen=True)
+class ListingPage:
+    """Immutable page of a /cities_all or /countries_all listing, ready to send."""
+    topic: str
+    text: str
+    # Zero-based page number and number of pages
+    page: int
+    pages: int
+
+
+def _no_translations() -> Mapping[str, "Topic"]:
+    return _NO_TRANSLATIONS
+
+
+@dataclass(frozen=True, slots=True)
+class Topic:
+    """Immutable guidebook topic, safe to share across threads and processes.
+
+    The description and contents are in the guidebook's base language;
+    `translations` holds per-language variants keyed by language code.
+    """
+    name: str
+    description: str
+    contents: TopicContents
+    translations: Mapping[str, "Topic"] = field(default_factory=_no_translations)
+
+    def translated(self, languages: Sequence[str]) -> "Topic":
+        """Return the first available variant of `languages`, else this topic."""
+        for language in languages:
+            translation = self.translations.get(language)
+            if translation is not None:
+                return translation
+        return self
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # mappingproxy cannot be pickled; rebuild it on unpickling
+        contents = self.contents
+        if isinstance(contents, MappingProxyType):
+            contents = dict(contents)
+        return (
+            _restore_topic,
+            (self.name, self.description, contents, dict(self.translations)),
+        )
+
+
+_NO_TRANSLATIONS: Mapping[str, Topic] = MappingProxyType({})
+
+
+def _restore_topic(
+    name: str,
+    description: str,
+    contents: Any,
+    translations: Optional[Dict[str, Topic]] = None,
+) -> Topic:
+    if isinstance(contents, dict):
+        contents = MappingProxyType(contents)
+    return Topic(
+        name=name,
+        description=description,
+        contents=contents,
+        translations=MappingProxyType(translations) if translations else _NO_TRANSLATIONS,
+    )
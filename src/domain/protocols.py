@@ -1,8 +1,20 @@
 """Domain protocols - Interfaces for dependency injection."""
-from typing import Protocol, List, Dict, Optional, Union
+from typing import Protocol, List, Mapping, Optional, Sequence, Tuple, Union
 
-# Type alias for guidebook content (can be a list or dict)
-GuidebookContent = Union[List[str], Dict[str, List[str]]]
+from src.domain.models import (
+    Completion,
+    InlineResult,
+    ListingPage,
+    NearbyPlace,
+    SearchHit,
+    Topic,
+)
+
+# Type alias for guidebook content (can be a list or dict).
+# Loaded guidebooks return immutable tuples and read-only mappings. Items
+# are a tuple or list rather than any Sequence, which a bare str would be.
+GuidebookItems = Union[Tuple[str, ...], List[str]]
+GuidebookContent = Union[GuidebookItems, Mapping[str, GuidebookItems]]
 
 
 class StatisticsServiceError(Exception):
@@ -10,6 +22,11 @@ class StatisticsServiceError(Exception):
     ...
 
 
+class OverlayStoreError(Exception):
+    """Raised when chat overlay topics cannot be read or stored."""
+    ...
+
+
 class GuidebookError(Exception):
     """Base exception for guidebook-related errors."""
     ...
@@ -33,22 +50,30 @@ class IGuidebook(Protocol):
     This protocol focuses on data access only.
     """
 
-    def get_topic_description(self, topic: str) -> Optional[str]:
+    def get_topic_description(
+        self, topic: str, languages: Sequence[str] = ()
+    ) -> Optional[str]:
         """Get the description for a given topic.
 
         Args:
             topic: Topic name (case-insensitive)
+            languages: Preferred languages, most preferred first; the base
+                description is used if the topic has none of them
 
         Returns:
             Topic description string, or None if topic doesn't exist
         """
         ...
 
-    def get_topic_contents(self, topic: str) -> GuidebookContent:
+    def get_topic_contents(
+        self, topic: str, languages: Sequence[str] = ()
+    ) -> GuidebookContent:
         """Get the contents for a given topic.
 
         Args:
             topic: Topic name (case-insensitive)
+            languages: Preferred languages, most preferred first; the base
+                contents are used if the topic has none of them
 
         Returns:
             Contents as either a list of strings or a dict mapping keys to lists.
@@ -63,6 +88,53 @@ class IGuidebook(Protocol):
         """Get list of all available topics."""
         ...
 
+    def complete(self, prefix: str, limit: int = 10) -> List[Completion]:
+        """Complete a typed prefix to topics, cities and countries.
+
+        Matches topic names, words of topic descriptions, city and country
+        names and their aliases, in any spelling normalize_name folds.
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of completions
+
+        Returns:
+            Completions, best first
+        """
+        ...
+
+    def search_topics(self, query: str, limit: int = 5) -> List[SearchHit]:
+        """Find the topics whose texts best match a free-text query.
+
+        Descriptions, section keys and items (URLs split into words) of the
+        base-language topics are searched.
+
+        Args:
+            query: Words as typed
+            limit: Maximum number of topics
+
+        Returns:
+            Hits, best first
+        """
+        ...
+
+    def find_sections(self, topic: str, name: str) -> List[str]:
+        """Find the sections of a dict-based topic a name stands for.
+
+        An exact section name or alias wins; otherwise the sections with a
+        word starting with every word of the name, then the one closest
+        name within a few typos.
+
+        Args:
+            topic: Topic name (lowercase)
+            name: Section name, alias or words of it, as typed
+
+        Returns:
+            Lowercase section keys in topic order; empty if nothing matches
+            or the topic has no sections
+        """
+        ...
+
     def get_cities(self, name: Optional[str] = None) -> str:
         """Get city information or prompt for a city.
 
@@ -93,41 +165,156 @@ class IGuidebook(Protocol):
 class IBerlinHelpService(Protocol):
     """Protocol for Berlin help business logic."""
 
-    def handle_help(self) -> str:
+    # Telegram parse mode of topic, city and country replies; None for plain text
+    parse_mode: Optional[str]
+
+    def handle_help(self, *, language: Optional[str] = None) -> str:
         """Handle help command - return help text with available topics."""
         ...
 
-    def handle_topic(self, topic_name: str) -> str:
+    def handle_topic(
+        self,
+        topic_name: str,
+        *,
+        section: Optional[str] = None,
+        chat_id: Optional[int] = None,
+        language: Optional[str] = None,
+        plain: bool = False,
+    ) -> str:
         """Handle topic request - return formatted topic information."""
         ...
 
-    def handle_cities(self, city_name: Optional[str], show_all: bool = False) -> str:
+    def handle_cities(
+        self,
+        city_name: Optional[str],
+        show_all: bool = False,
+        *,
+        chat_id: Optional[int] = None,
+        plain: bool = False,
+    ) -> str:
         """Handle cities command - return city information."""
         ...
 
-    def handle_countries(self, country_name: Optional[str], show_all: bool = False) -> str:
+    def handle_countries(
+        self,
+        country_name: Optional[str],
+        show_all: bool = False,
+        *,
+        chat_id: Optional[int] = None,
+        plain: bool = False,
+    ) -> str:
         """Handle countries command - return country information."""
         ...
 
-    def list_topics(self) -> List[str]:
-        """Return list of all available topic names.
+    def handle_listing_page(
+        self, topic: str, page: int = 0, *, chat_id: Optional[int] = None
+    ) -> ListingPage:
+        """Return a page of /cities_all or /countries_all."""
+        ...
+
+    def handle_search(
+        self,
+        query: str,
+        *,
+        chat_id: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> str:
+        """Handle search command - list the topics matching a query."""
+        ...
+
+    def handle_question(
+        self,
+        text: str,
+        *,
+        chat_id: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> str:
+        """Answer a free-text question with its best topic or suggestions."""
+        ...
+
+    def handle_location(
+        self,
+        latitude: float,
+        longitude: float,
+        *,
+        chat_id: Optional[int] = None,
+    ) -> str:
+        """Answer a shared location with the nearest cities."""
+        ...
+
+    def split_reply(self, reply: str) -> Tuple[str, ...]:
+        """Return the Telegram messages a reply is sent as, in order."""
+        ...
+
+    def list_topics(self, *, chat_id: Optional[int] = None) -> List[str]:
+        """Return list of available topic names.
+
+        Args:
+            chat_id: Only list the topics served to this chat; None lists
+                the topics of all regions
 
         Returns:
             List of topic names (lowercase)
         """
         ...
 
-    def get_topic_description(self, topic: str) -> Optional[str]:
+    def get_topic_description(
+        self,
+        topic: str,
+        *,
+        chat_id: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> Optional[str]:
         """Get the description for a given topic.
 
         Args:
             topic: Topic name (case-insensitive)
+            chat_id: Chat whose region to use; None uses any region
+            language: Telegram language code of the user
 
         Returns:
             Topic description string, or None if topic doesn't exist
         """
         ...
 
+    def list_languages(self) -> List[str]:
+        """Return the language codes with their own command menu."""
+        ...
+
+    def handle_inline_query(self, query: str) -> List[InlineResult]:
+        """Answer an inline query with rendered topics, cities and countries."""
+        ...
+
+    def handle_overlay_topic(self, topic_name: str, *, chat_id: int) -> Optional[str]:
+        """Handle a chat's local topic command; None if the chat has no such topic."""
+        ...
+
+    def resolve_command(self, command: str, *, chat_id: Optional[int] = None) -> Optional[str]:
+        """Return the topic a legacy command became; None if it is not one."""
+        ...
+
+    def suggest_commands(
+        self,
+        command: str,
+        *,
+        chat_id: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> Optional[str]:
+        """Suggest the topic commands closest to an unknown one; None if none is close."""
+        ...
+
+    def add_overlay_topic(self, chat_id: int, text: str) -> str:
+        """Add or replace a local topic of a chat from the admin's command text."""
+        ...
+
+    def remove_overlay_topic(self, chat_id: int, name: str) -> str:
+        """Remove a local topic of a chat."""
+        ...
+
+    def list_overlay_topics(self, chat_id: int) -> str:
+        """List the local topics of a chat."""
+        ...
+
 
 class IStatisticsService(Protocol):
     """Protocol for request statistics logging."""
@@ -145,3 +332,74 @@ class IStatisticsService(Protocol):
     def top_topics(self, k: int) -> List[tuple[str, int]]:
         """Return top-k topic descriptions by request count."""
         ...
+
+
+class IOverlayStore(Protocol):
+    """Protocol for per-chat overlay topics maintained by chat admins."""
+
+    def get_topics(self, chat_id: int) -> Mapping[str, Topic]:
+        """Return the overlay topics of a chat.
+
+        Args:
+            chat_id: Telegram chat ID
+
+        Returns:
+            Read-only mapping of lowercase topic name to topic (empty if none)
+
+        Raises:
+            OverlayStoreError: If the overlay cannot be read
+        """
+        ...
+
+    def set_topic(self, chat_id: int, topic: Topic) -> None:
+        """Add or replace an overlay topic of a chat.
+
+        Raises:
+            OverlayStoreError: If the topic cannot be stored
+        """
+        ...
+
+    def delete_topic(self, chat_id: int, name: str) -> bool:
+        """Remove an overlay topic of a chat.
+
+        Returns:
+            True if the topic existed
+
+        Raises:
+            OverlayStoreError: If the topic cannot be removed
+        """
+        ...
+
+
+class IPostalCodeIndex(Protocol):
+    """Protocol for resolving German postal codes (PLZ) to guidebook cities."""
+
+    def lookup(self, postal_code: str) -> Optional[str]:
+        """Return the guidebook city nearest to a postal code.
+
+        Args:
+            postal_code: Five digits, as typed
+
+        Returns:
+            City name as in the guidebook, or None if the code is unknown
+        """
+        ...
+
+
+class ICityLocator(Protocol):
+    """Protocol for finding the guidebook cities nearest to a location."""
+
+    def nearest(
+        self, latitude: float, longitude: float, limit: int = 1
+    ) -> List[NearbyPlace]:
+        """Return the cities nearest to a location, nearest first.
+
+        Args:
+            latitude: Degrees, -90 to 90
+            longitude: Degrees, -180 to 180
+            limit: Maximum number of cities
+
+        Returns:
+            Cities as named in the guidebook, with their distance
+        """
+        ...
@@ -0,0 +1,127 @@
+"""Name and alias resolution for the sections of dict-structured topics.
+
+vocabulary.yml is one flat list of canonical names and their aliases. An
+AliasIndex gives each dict topic (cities, countries, ...) its own namespace:
+the topic's section keys plus the aliases of those keys, all in
+normalize_name form, in one hash map. Building it checks the namespace, so
+an alias that is also another section's name, or that stands for two
+sections, fails the guidebook load instead of silently answering with the
+wrong section.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from src.domain.protocols import GuidebookValidationError
+from src.infrastructure.fuzzy_index import FuzzyIndex
+from src.infrastructure.name_normalization import normalize_name
+
+
+class AliasIndex:
+    """Normalized section names and aliases of one topic."""
+
+    def __init__(
+        self, topic_name: str, sections: Iterable[str], vocabulary: Mapping[str, str]
+    ) -> None:
+        """
+        Build and check the namespace of a topic.
+
+        Args:
+            topic_name: Name of the topic, for error messages
+            sections: Lowercase section keys of the topic
+            vocabulary: Lowercase alias to lowercase canonical name; aliases
+                of names that are not sections of this topic are ignored
+
+        Raises:
+            GuidebookValidationError: If two sections, or an alias and a
+                section, or one alias of two sections normalize alike
+        """
+        names: Dict[str, str] = {}
+        for section in sections:
+            key = normalize_name(section)
+            if not key:
+                continue
+            if key in names:
+                raise GuidebookValidationError(
+                    f"Topic '{topic_name}': sections '{names[key]}' and "
+                    f"'{section}' have the same name"
+                )
+            names[key] = section
+
+        section_keys = set(names)
+        section_names = set(names.values())
+        for alias, canonical in vocabulary.items():
+            if canonical not in section_names:
+                continue
+            key = normalize_name(alias)
+            if not key:
+                continue
+            current = names.setdefault(key, canonical)
+            if current == canonical:
+                continue
+            if key in section_keys:
+                raise GuidebookValidationError(
+                    f"Topic '{topic_name}': alias '{alias}' of '{canonical}' "
+                    f"is the name of section '{current}'"
+                )
+            raise GuidebookValidationError(
+                f"Topic '{topic_name}': alias '{alias}' is ambiguous, "
+                f"it stands for '{current}' and '{canonical}'"
+            )
+
+        self._names = names
+        # Section key -> position in the topic; sections come first in names
+        self._positions = {
+            section: position for position, section in enumerate(dict.fromkeys(names.values()))
+        }
+        self._fuzzy = FuzzyIndex(names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Return the section key a name or alias stands for.
+
+        Args:
+            name: Name as typed
+
+        Returns:
+            Lowercase section key, or None
+        """
+        return self._names.get(normalize_name(name))
+
+    def prefixed(self, name: str) -> List[str]:
+        """
+        Return the sections with a word starting with every word of a name.
+
+        "аптек" finds "Поиск аптеки экстренной помощи" and "где врач"
+        finds "Где искать врачей". Single letters are ignored.
+
+        Args:
+            name: Words as typed
+
+        Returns:
+            Lowercase section keys in topic order
+        """
+        words = [word for word in normalize_name(name).split() if len(word) > 1]
+        if not words:
+            return []
+        found = {
+            section
+            for key, section in self._names.items()
+            if all(any(part.startswith(word) for part in key.split()) for word in words)
+        }
+        return sorted(found, key=self._positions.__getitem__)
+
+    def suggest(self, name: str, limit: int = 3) -> List[Tuple[str, int]]:
+        """
+        Return the sections whose names or aliases are closest to a name.
+
+        Args:
+            name: Name as typed, usually one resolve() did not find
+            limit: Maximum number of sections
+
+        Returns:
+            (lowercase section key, edit distance) pairs, best first
+        """
+        return self._fuzzy.search(normalize_name(name), limit)
@@ -0,0 +1,44 @@
+"""Atomic replacement of generated files.
+
+Guidebook snapshots, PLZ indexes and guidebook databases are written next
+to their destination and moved into place with os.replace, so a reader
+(another dyno process, an open SqliteGuidebook) sees either the previous
+file or the complete new one, never a partial write.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def atomic_write(path: str) -> Iterator[str]:
+    """Write a file through a temporary path that replaces it on success.
+
+    The temporary file is created in the destination's directory, so the
+    final os.replace is a rename within one filesystem. It is synced to
+    disk and made world-readable before it replaces the destination; if
+    the block raises, it is removed and the destination is left as it was.
+
+    Args:
+        path: Destination path
+
+    Yields:
+        Path of an empty temporary file to write the new contents to
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp_path
+        fd = os.open(tmp_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
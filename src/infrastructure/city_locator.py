@@ -0,0 +1,167 @@
+"""Nearest guidebook cities to a shared location.
+
+city_coordinates.csv places each section of the "cities" topic on the map
+(a state at its capital). The points are turned into unit vectors and put
+into a 3-d tree when the locator is created: straight-line distance
+between unit vectors grows with great-circle distance, so the tree finds
+the nearest cities without a haversine per city and without the seams a
+latitude/longitude grid has at the antimeridian and the poles. A query
+visits O(log n) nodes; only the cities returned get their distance in
+kilometres computed.
+"""
+
+import csv
+import heapq
+import io
+import math
+from typing import List, NamedTuple, Optional, Tuple
+
+from src.domain.models import NearbyPlace
+from src.domain.protocols import GuidebookValidationError
+
+EARTH_RADIUS_KM = 6371.0
+
+_Vector = Tuple[float, float, float]
+
+
+class _Node(NamedTuple):
+    """A tree node: the city at the median of its subtree on one axis."""
+    city: int
+    axis: int
+    left: Optional["_Node"]
+    right: Optional["_Node"]
+
+
+def parse_city_coordinates(source: bytes) -> List[Tuple[str, float, float]]:
+    """Parse and check a city coordinates table.
+
+    Args:
+        source: Contents of the CSV file; lines starting with '#' are comments
+
+    Returns:
+        (section, latitude, longitude) rows, in file order
+
+    Raises:
+        GuidebookValidationError: If a row is malformed or a section repeats
+    """
+    lines = [
+        line for line in source.decode("utf-8").splitlines()
+        if line.strip() and not line.startswith("#")
+    ]
+    rows = []
+    seen = set()
+    for row in csv.DictReader(io.StringIO("\n".join(lines))):
+        section = (row.get("section") or "").strip()
+        try:
+            latitude = float(row.get("latitude") or "")
+            longitude = float(row.get("longitude") or "")
+        except ValueError:
+            latitude = longitude = math.nan
+        if not (section and -90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise GuidebookValidationError(f"City coordinates: invalid row {row}")
+        if section in seen:
+            raise GuidebookValidationError(f"City coordinates: {section} is listed twice")
+        seen.add(section)
+        rows.append((section, latitude, longitude))
+    return rows
+
+
+def _unit_vector(latitude: float, longitude: float) -> _Vector:
+    phi, lam = math.radians(latitude), math.radians(longitude)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+class CityLocator:
+    """3-d tree of guidebook cities, built when it is created."""
+
+    def __init__(self, cities: List[Tuple[str, float, float]]) -> None:
+        """
+        Build the tree.
+
+        Args:
+            cities: (section, latitude, longitude) rows
+        """
+        self._names = [name for name, _, _ in cities]
+        self._vectors = [_unit_vector(lat, lon) for _, lat, lon in cities]
+        self._root = self._build(list(range(len(cities))))
+
+    @classmethod
+    def from_csv(cls, csv_path: str) -> "CityLocator":
+        """
+        Load a city coordinates table.
+
+        Raises:
+            GuidebookValidationError: If the table is invalid
+        """
+        with open(csv_path, "rb") as f:
+            return cls(parse_city_coordinates(f.read()))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def nearest(
+        self, latitude: float, longitude: float, limit: int = 1
+    ) -> List[NearbyPlace]:
+        """
+        Return the cities nearest to a location, nearest first.
+
+        Args:
+            latitude: Degrees, -90 to 90
+            longitude: Degrees, -180 to 180
+            limit: Maximum number of cities
+
+        Returns:
+            Cities as named in the guidebook, with their great-circle
+            distance
+        """
+        if limit <= 0 or self._root is None:
+            return []
+        target = _unit_vector(latitude, longitude)
+        x, y, z = target
+        # Max-heap of the best cities so far: (-squared distance, -city)
+        best: List[Tuple[float, int]] = []
+        # (node, squared distance to the plane that split it off)
+        stack: List[Tuple[_Node, float]] = [(self._root, 0.0)]
+        while stack:
+            node, plane = stack.pop()
+            # The subtree can only hold a closer city if its splitting
+            # plane is closer than the worst city kept
+            if len(best) == limit and plane >= -best[0][0]:
+                continue
+            vector = self._vectors[node.city]
+            dx, dy, dz = vector[0] - x, vector[1] - y, vector[2] - z
+            squared = dx * dx + dy * dy + dz * dz
+            if len(best) < limit:
+                heapq.heappush(best, (-squared, -node.city))
+            elif squared < -best[0][0]:
+                heapq.heapreplace(best, (-squared, -node.city))
+
+            offset = target[node.axis] - vector[node.axis]
+            near, far = (node.left, node.right) if offset < 0 else (node.right, node.left)
+            if far is not None:
+                stack.append((far, offset * offset))
+            if near is not None:
+                stack.append((near, 0.0))
+
+        return [
+            NearbyPlace(
+                name=self._names[city],
+                distance_km=2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(squared) / 2)),
+            )
+            for squared, city in sorted((-negative, -city) for negative, city in best)
+        ]
+
+    def _build(self, cities: List[int]) -> Optional[_Node]:
+        """Split on the axis the cities spread most along, at the median."""
+        if not cities:
+            return None
+        columns = list(zip(*(self._vectors[c] for c in cities)))
+        axis = max(range(3), key=lambda a: max(columns[a]) - min(columns[a]))
+        cities.sort(key=lambda c: self._vectors[c][axis])
+        middle = len(cities) // 2
+        return _Node(
+            city=cities[middle],
+            axis=axis,
+            left=self._build(cities[:middle]),
+            right=self._build(cities[middle + 1:]),
+        )
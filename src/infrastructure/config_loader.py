@@ -2,7 +2,7 @@
 
 import configparser
 from os import environ as env
-from typing import Tuple, Dict, Any
+from typing import Any, Dict, Mapping, Tuple
 import toml
 
 
@@ -40,3 +40,20 @@ def load_toml_settings(filepath: str) -> Dict[str, Any]:
     """
     with open(filepath, "r", encoding="utf-8") as f:
         return toml.load(f)
+
+
+def env_setting(settings: Mapping[str, Any], key: str) -> Any:
+    """
+    Return a setting, overridden by the environment variable of the same name.
+
+    Lets a deployment point a path at persistent storage (a Heroku config
+    var) without editing settings.toml.
+
+    Args:
+        settings: Settings loaded by load_toml_settings
+        key: Setting name
+
+    Returns:
+        The environment value if set, else the setting, else None
+    """
+    return env.get(key, settings.get(key))
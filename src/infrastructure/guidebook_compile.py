@@ -0,0 +1,40 @@
+"""Compile the configured guidebook into a snapshot.
+
+Parses and validates the guidebook named in settings.toml, then writes
+the frozen topics, vocabulary and /search index to
+GUIDEBOOK_SNAPSHOT_PATH (see guidebook_snapshot). Run once per build by
+bin/post_compile:
+
+    python -m src.infrastructure.guidebook_compile
+"""
+
+import logging
+
+from src.infrastructure.config_loader import load_toml_settings
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    """Compile the guidebook configured in settings.toml into a snapshot."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    settings = load_toml_settings("settings.toml")
+    snapshot_path = settings["GUIDEBOOK_SNAPSHOT_PATH"]
+    guidebook = YamlGuidebook(
+        guidebook_path=settings["GUIDEBOOK_PATH"],
+        vocabulary_path=settings["VOCABULARY_PATH"],
+    )
+    guidebook.write_snapshot(snapshot_path)
+    logger.info(
+        "Wrote guidebook snapshot %s (source hash %s)",
+        snapshot_path, guidebook.source_hash
+    )
+
+
+if __name__ == "__main__":
+    main()
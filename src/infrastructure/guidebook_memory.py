@@ -0,0 +1,120 @@
+"""Guidebook memory report.
+
+Compares the heap footprint of the guidebook as plain parsed YAML (dicts of
+mutable lists, plus a lowercase cache of dicts) with the frozen, interned
+Topic representation used by YamlGuidebook.
+
+    python -m src.infrastructure.guidebook_memory
+"""
+
+import sys
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from yaml import load
+
+from src.domain.models import Topic
+from src.infrastructure.config_loader import load_toml_settings
+from src.infrastructure.yaml_guidebook import SafeLoader, YamlGuidebook
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Return the size of an object graph in bytes.
+
+    Objects already in `seen` are not counted again, so passing the same set
+    to successive calls measures only what each object adds.
+
+    Args:
+        obj: Root object
+        seen: Ids of objects already accounted for
+
+    Returns:
+        Size in bytes of the objects reachable from obj not yet in seen
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, Topic):
+        size += sum(
+            deep_sizeof(getattr(obj, field), seen)
+            for field in ("name", "description", "contents", "translations")
+        )
+    elif isinstance(obj, Mapping):
+        # mappingproxy objects report only their own header; count the dict
+        if not isinstance(obj, dict):
+            size += deep_sizeof(dict(obj), seen) - sys.getsizeof(dict(obj))
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def memory_report(guidebook_path: str, vocabulary_path: str) -> List[Tuple[str, int, int]]:
+    """Measure bytes per topic in the plain and the frozen representation.
+
+    Topics are measured in guidebook order with a shared `seen` set, so
+    strings shared with earlier topics (interned links, section headers)
+    are only charged once.
+
+    Args:
+        guidebook_path: Path to guidebook.yml
+        vocabulary_path: Path to vocabulary.yml
+
+    Returns:
+        List of (topic, plain bytes, frozen bytes)
+    """
+    with open(guidebook_path, "rb") as f:
+        raw: Dict[str, Dict[str, Any]] = load(f, Loader=SafeLoader)
+    plain = {
+        name.lower(): {
+            "description": data.get("description", "") or "",
+            "contents": data.get("contents"),
+        }
+        for name, data in raw.items()
+    }
+    plain_lowercase = {
+        name: {key.lower(): value for key, value in info["contents"].items()}
+        for name, info in plain.items()
+        if isinstance(info["contents"], dict)
+    }
+
+    guidebook = YamlGuidebook(guidebook_path, vocabulary_path)
+
+    plain_seen: Set[int] = set()
+    frozen_seen: Set[int] = set()
+    rows = []
+    for name in guidebook.get_topics():
+        plain_bytes = deep_sizeof(plain[name], plain_seen)
+        frozen_bytes = deep_sizeof(guidebook.topics[name], frozen_seen)
+        if name in plain_lowercase:
+            plain_bytes += deep_sizeof(plain_lowercase[name], plain_seen)
+            # pylint: disable-next=protected-access
+            frozen_bytes += deep_sizeof(guidebook._lowercase_cache[name], frozen_seen)
+        rows.append((name, plain_bytes, frozen_bytes))
+    return rows
+
+
+def main() -> None:
+    """Print bytes per topic for the guidebook configured in settings.toml."""
+    settings = load_toml_settings("settings.toml")
+    rows = memory_report(settings["GUIDEBOOK_PATH"], settings["VOCABULARY_PATH"])
+
+    print(f"{'topic':<24}{'plain':>10}{'frozen':>10}")
+    for name, plain_bytes, frozen_bytes in rows:
+        print(f"{name:<24}{plain_bytes:>10}{frozen_bytes:>10}")
+
+    plain_total = sum(row[1] for row in rows)
+    frozen_total = sum(row[2] for row in rows)
+    print(f"{'total':<24}{plain_total:>10}{frozen_total:>10}")
+    print(
+        f"{'per topic':<24}{plain_total // len(rows):>10}"
+        f"{frozen_total // len(rows):>10}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""Guidebook profile report.
+
+Times the phases of loading the guidebook configured in settings.toml
+(reading, YAML parsing, validation, freezing, lowercase cache, vocabulary)
+and renders every topic, city and country, including translations, through
+format_contents to report its length in characters and in UTF-16 code
+units, which is what Telegram's 4,096 limit counts. The report is JSON, so
+successive runs can be stored and compared as the knowledge base grows.
+
+    python -m src.infrastructure.guidebook_profile [--top N] > profile.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, TypeVar
+
+from yaml import load
+
+from src.domain.models import Topic
+from src.domain.protocols import GuidebookContent
+from src.infrastructure.config_loader import load_toml_settings
+from src.infrastructure.guidebook_formatter import (
+    TELEGRAM_MESSAGE_LIMIT,
+    format_contents,
+    utf16_length,
+)
+from src.infrastructure.guidebook_validation import (
+    validate_topic_structure,
+    validate_topic_translations,
+)
+from src.infrastructure.yaml_guidebook import (
+    SafeLoader,
+    YamlGuidebook,
+    freeze_topic,
+    lowercase_sections,
+    read_topic_sources,
+)
+
+# Topics rendered one section at a time by /cities NAME and /countries NAME
+SECTION_TOPICS = {"cities": "city", "countries": "country"}
+
+T = TypeVar("T")
+
+
+def _timed(phases: Dict[str, float], phase: str, call: Callable[[], T]) -> T:
+    started = time.perf_counter()
+    result = call()
+    phases[phase] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+def profile_load(guidebook_path: str, vocabulary_path: str) -> Dict[str, float]:
+    """Time each phase of loading a guidebook, in milliseconds.
+
+    The phases repeat what YamlGuidebook.__init__ does, one at a time; a
+    directory guidebook is parsed sequentially. `total` is a separate, real
+    YamlGuidebook load of the same sources, snapshot not used.
+
+    Args:
+        guidebook_path: Path to guidebook.yml or to a topic directory
+        vocabulary_path: Path to vocabulary.yml
+
+    Returns:
+        Mapping of phase name to milliseconds
+    """
+    phases: Dict[str, float] = {}
+
+    def read() -> Tuple[Any, bytes]:
+        with open(vocabulary_path, "rb") as f:
+            vocabulary_source = f.read()
+        if os.path.isdir(guidebook_path):
+            return read_topic_sources(guidebook_path), vocabulary_source
+        with open(guidebook_path, "rb") as f:
+            return f.read(), vocabulary_source
+
+    guidebook_source, vocabulary_source = _timed(phases, "read", read)
+
+    def parse() -> Dict[str, Dict[str, Any]]:
+        if isinstance(guidebook_source, dict):
+            return {
+                topic_name: load(source, Loader=SafeLoader) or {}
+                for topic_name, source in guidebook_source.items()
+            }
+        # pylint: disable-next=protected-access
+        return YamlGuidebook._parse_topics(guidebook_source)
+
+    raw_topics = _timed(phases, "parse", parse)
+
+    def validate() -> None:
+        for topic_name, topic_info in raw_topics.items():
+            validate_topic_structure(topic_name, topic_info.get("contents"))
+            validate_topic_translations(topic_name, topic_info.get("translations"))
+
+    _timed(phases, "validate", validate)
+    topics = _timed(phases, "freeze", lambda: {
+        topic_name: freeze_topic(
+            topic_name,
+            topic_info.get("description", "") or "",
+            topic_info["contents"],
+            topic_info.get("translations"),
+        )
+        for topic_name, topic_info in raw_topics.items()
+    })
+    _timed(phases, "lowercase_cache", lambda: {
+        topic_name: lowercase_sections(topic.contents)
+        for topic_name, topic in topics.items()
+        if isinstance(topic.contents, Mapping)
+    })
+    # pylint: disable-next=protected-access
+    _timed(phases, "vocabulary", lambda: YamlGuidebook._parse_vocabulary(vocabulary_source))
+    _timed(phases, "total", lambda: YamlGuidebook(guidebook_path, vocabulary_path))
+    return phases
+
+
+def _render(
+    kind: str, name: str, language: Optional[str], render: Callable[[], str]
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    text = render()
+    render_us = (time.perf_counter() - started) * 1_000_000
+    length = utf16_length(text)
+    return {
+        "kind": kind,
+        "name": name,
+        "language": language,
+        "chars": len(text),
+        "utf16": length,
+        "over_limit": length > TELEGRAM_MESSAGE_LIMIT,
+        "render_us": round(render_us, 1),
+    }
+
+
+def _topic_renders(topic: Topic, language: Optional[str]) -> List[Dict[str, Any]]:
+    """Render a topic the way the bot replies with it."""
+    contents: GuidebookContent = topic.contents
+    section_kind = SECTION_TOPICS.get(topic.name)
+    if section_kind is None:
+        return [_render(
+            "topic", topic.name, language,
+            lambda: f"#{topic.name}\n{format_contents(contents)}",
+        )]
+
+    # /cities_all and /countries_all, then /cities NAME for every city
+    renders = [_render(
+        "topic", f"{topic.name}_all", language, lambda: format_contents(contents)
+    )]
+    if isinstance(contents, Mapping):
+        for key, items in contents.items():
+            renders.append(_render(
+                section_kind, key, language, partial(format_contents, items, title=key)
+            ))
+    return renders
+
+
+def profile_renders(guidebook: YamlGuidebook) -> List[Dict[str, Any]]:
+    """Render every topic, city and country, including translations.
+
+    Args:
+        guidebook: Loaded guidebook
+
+    Returns:
+        One record per rendered message, in guidebook order
+    """
+    renders: List[Dict[str, Any]] = []
+    for topic in guidebook.topics.values():
+        renders.extend(_topic_renders(topic, None))
+        for language, translation in topic.translations.items():
+            renders.extend(_topic_renders(translation, language))
+    return renders
+
+
+def profile_report(
+    guidebook_path: str, vocabulary_path: str, top: int = 10
+) -> Dict[str, Any]:
+    """Build the complete profile report.
+
+    Args:
+        guidebook_path: Path to guidebook.yml or to a topic directory
+        vocabulary_path: Path to vocabulary.yml
+        top: Number of largest and slowest renders to list
+
+    Returns:
+        JSON-serializable report
+    """
+    load_ms = profile_load(guidebook_path, vocabulary_path)
+    guidebook = YamlGuidebook(guidebook_path, vocabulary_path)
+    renders = profile_renders(guidebook)
+
+    def summary(record: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            key: record[key]
+            for key in ("kind", "name", "language", "utf16", "render_us")
+        }
+
+    return {
+        "generated_at": int(time.time()),
+        "guidebook_path": guidebook_path,
+        "source_hash": guidebook.source_hash,
+        "counts": {
+            "topics": len(guidebook.topics),
+            "translations": sum(
+                len(topic.translations) for topic in guidebook.topics.values()
+            ),
+            "aliases": len(guidebook.vocabulary),
+            **{
+                f"{kind}_sections": sum(1 for r in renders if r["kind"] == kind)
+                for kind in SECTION_TOPICS.values()
+            },
+        },
+        "load_ms": load_ms,
+        "render": {
+            "limit_utf16": TELEGRAM_MESSAGE_LIMIT,
+            "total_chars": sum(r["chars"] for r in renders),
+            "total_utf16": sum(r["utf16"] for r in renders),
+            "total_render_us": round(sum(r["render_us"] for r in renders), 1),
+            "over_limit": [summary(r) for r in renders if r["over_limit"]],
+            "largest": [
+                summary(r) for r in sorted(renders, key=lambda r: -r["utf16"])[:top]
+            ],
+            "slowest": [
+                summary(r) for r in sorted(renders, key=lambda r: -r["render_us"])[:top]
+            ],
+        },
+        "renders": renders,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print the profile of the guidebook configured in settings.toml."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.infrastructure.guidebook_profile",
+        description=__doc__.split("\n\n")[0] if __doc__ else None,
+    )
+    parser.add_argument("--settings", default="settings.toml")
+    parser.add_argument(
+        "--top", type=int, default=10, help="number of largest/slowest renders"
+    )
+    args = parser.parse_args(argv)
+
+    settings = load_toml_settings(args.settings)
+    report = profile_report(
+        settings["GUIDEBOOK_PATH"], settings["VOCABULARY_PATH"], top=args.top
+    )
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Compiled guidebook snapshots.
+
+A snapshot is a versioned binary dump of an already parsed and validated
+guidebook (frozen topics, vocabulary aliases and the /search index).
+Loading it skips YAML parsing, validation and indexing entirely, which
+keeps cold starts short after a deploy. Each snapshot records a hash of
+the YAML sources it was compiled from; a snapshot whose hash no longer
+matches the sources is ignored.
+
+This module only (de)serializes parsed data; compile a snapshot with:
+
+    python -m src.infrastructure.guidebook_compile
+"""
+
+import hashlib
+import logging
+import pickle
+import struct
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from src.domain.models import Topic
+from src.infrastructure.atomic_file import atomic_write
+from src.infrastructure.search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the pickled payload layout changes, SearchIndex included.
+SNAPSHOT_FORMAT_VERSION = 5
+
+_MAGIC = b"HUBGBSNP"
+# magic, format version, sha256 digest of the sources
+_HEADER = struct.Struct(f"<{len(_MAGIC)}sH32s")
+
+
+@dataclass(frozen=True)
+class GuidebookSnapshot:
+    """Parsed guidebook state as stored in a snapshot file."""
+    source_hash: str
+    topics: Dict[str, Topic]
+    vocabulary: Dict[str, str]
+    search_index: Optional[SearchIndex] = None
+
+
+def compute_source_hash(*sources: bytes) -> str:
+    """Hash the raw bytes of the guidebook source files.
+
+    Args:
+        *sources: Raw file contents, in a fixed order
+
+    Returns:
+        Hex-encoded sha256 digest
+    """
+    digest = hashlib.sha256()
+    for source in sources:
+        # Length prefix keeps ("ab", "c") and ("a", "bc") distinct
+        digest.update(struct.pack("<Q", len(source)))
+        digest.update(source)
+    return digest.hexdigest()
+
+
+def write_snapshot(path: str, snapshot: GuidebookSnapshot) -> None:
+    """Write a snapshot file atomically.
+
+    Args:
+        path: Destination path
+        snapshot: Snapshot to serialize
+    """
+    header = _HEADER.pack(
+        _MAGIC, SNAPSHOT_FORMAT_VERSION, bytes.fromhex(snapshot.source_hash)
+    )
+    payload = pickle.dumps(
+        (snapshot.topics, snapshot.vocabulary, snapshot.search_index),
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+
+    with atomic_write(path) as tmp_path, open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+
+
+def read_snapshot(path: str, expected_hash: str) -> Optional[GuidebookSnapshot]:
+    """Read a snapshot if it exists and matches the current sources.
+
+    Args:
+        path: Snapshot file path
+        expected_hash: Hash of the current YAML sources
+
+    Returns:
+        The snapshot, or None if it is missing, stale or unreadable
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        logger.info("No guidebook snapshot at %s", path)
+        return None
+    except OSError as e:
+        logger.warning("Could not read guidebook snapshot %s: %s", path, e)
+        return None
+
+    if len(data) < _HEADER.size:
+        logger.warning("Guidebook snapshot %s is truncated", path)
+        return None
+
+    magic, version, digest = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        logger.warning("%s is not a guidebook snapshot", path)
+        return None
+    if version != SNAPSHOT_FORMAT_VERSION:
+        logger.info(
+            "Guidebook snapshot %s has format version %s, expected %s",
+            path, version, SNAPSHOT_FORMAT_VERSION
+        )
+        return None
+    if digest.hex() != expected_hash:
+        logger.info("Guidebook snapshot %s is stale", path)
+        return None
+
+    try:
+        topics, vocabulary, search_index = pickle.loads(data[_HEADER.size:])
+    except (
+        pickle.UnpicklingError, EOFError, ValueError, TypeError,
+        AttributeError, ImportError,
+    ) as e:
+        logger.warning("Guidebook snapshot %s is corrupt: %s", path, e)
+        return None
+
+    return GuidebookSnapshot(
+        source_hash=expected_hash,
+        topics=topics,
+        vocabulary=vocabulary,
+        search_index=search_index,
+    )
@@ -0,0 +1,108 @@
+"""Split a single-file guidebook into a directory of topic files.
+
+Each topic of guidebook.yml is written to `<topic>.yml` with its
+description and contents at the top level, the layout YamlGuidebook loads
+when GUIDEBOOK_PATH points to a directory. The original text of each topic
+is kept (comments, block scalars, emoji), only dedented by one level.
+
+    python -m src.infrastructure.guidebook_split src/knowledgebase/guidebook.yml src/knowledgebase/guidebook
+"""
+
+import os
+import re
+import sys
+from typing import Any, Dict, List
+
+from yaml import YAMLError, dump, load
+
+from src.infrastructure.yaml_guidebook import SafeLoader
+
+# A top-level mapping key: no indentation, not a comment or list item
+_TOPIC_KEY = re.compile(r"^[^\s#\-][^:#]*:[ \t]*(?:#.*)?$")
+
+
+def split_guidebook(guidebook_path: str, directory: str) -> List[str]:
+    """Write every topic of a guidebook file to its own file.
+
+    Args:
+        guidebook_path: Path to guidebook.yml
+        directory: Destination directory, created if missing
+
+    Returns:
+        Paths of the written topic files
+    """
+    with open(guidebook_path, encoding="utf-8") as f:
+        text = f.read()
+    raw_guidebook: Dict[str, Dict[str, Any]] = load(text, Loader=SafeLoader)
+
+    os.makedirs(directory, exist_ok=True)
+    bodies = _topic_bodies(text)
+    if len(bodies) != len(raw_guidebook):
+        # Unusual keys (quoted, flow style): re-serialize every topic instead
+        bodies = [""] * len(raw_guidebook)
+
+    paths = []
+    for (topic_name, topic_data), body in zip(raw_guidebook.items(), bodies):
+        expected = {
+            "description": topic_data.get("description", "") or "",
+            "contents": topic_data.get("contents"),
+        }
+        if _parses_to(body, expected):
+            topic_text = body
+        else:
+            topic_text = dump(expected, allow_unicode=True, sort_keys=False)
+
+        path = os.path.join(directory, f"{topic_name.lower()}.yml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(topic_text)
+        paths.append(path)
+    return paths
+
+
+def _topic_bodies(text: str) -> List[str]:
+    """Return the dedented text under each top-level key, in file order."""
+    blocks: List[List[str]] = []
+    for line in text.splitlines(keepends=True):
+        if _TOPIC_KEY.match(line.rstrip("\r\n")):
+            blocks.append([])
+        elif blocks:
+            blocks[-1].append(line)
+
+    bodies = []
+    for lines in blocks:
+        indents = [
+            len(line) - len(line.lstrip(" "))
+            for line in lines
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+        indent = min(indents, default=0)
+        bodies.append("".join(
+            line[min(indent, len(line) - len(line.lstrip(" "))):] for line in lines
+        ).rstrip("\n") + "\n")
+    return bodies
+
+
+def _parses_to(text: str, expected: Dict[str, Any]) -> bool:
+    """Check that a dedented topic body still reads as the original topic."""
+    try:
+        topic_data = load(text, Loader=SafeLoader)
+    except YAMLError:
+        return False
+    if not isinstance(topic_data, dict):
+        return False
+    return {
+        "description": topic_data.get("description", "") or "",
+        "contents": topic_data.get("contents"),
+    } == expected
+
+
+def main() -> None:
+    """Split the guidebook file given on the command line."""
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m src.infrastructure.guidebook_split GUIDEBOOK DIRECTORY")
+    paths = split_guidebook(sys.argv[1], sys.argv[2])
+    print(f"Wrote {len(paths)} topic files to {sys.argv[2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Structural validation of guidebook topics.
+
+Shared by all guidebook loaders so every source format enforces the same
+List[str] / Dict[str, List[str]] contents structure at load time.
+"""
+
+from typing import Any, Dict, List
+
+from src.domain.protocols import GuidebookValidationError
+
+
+def validate_topic_structure(topic_name: str, contents: Any) -> None:
+    """Validate that topic contents match expected structure.
+
+    Args:
+        topic_name: Name of the topic being validated
+        contents: The topic contents to validate
+
+    Raises:
+        GuidebookValidationError: If contents don't match expected structure
+    """
+    if contents is None:
+        raise GuidebookValidationError(
+            f"Topic '{topic_name}': contents must be a list or dict, got NoneType"
+        )
+
+    if isinstance(contents, list):
+        _validate_list_contents(topic_name, contents)
+    elif isinstance(contents, dict):
+        _validate_dict_contents(topic_name, contents)
+    else:
+        raise GuidebookValidationError(
+            f"Topic '{topic_name}': contents must be a list or dict, "
+            f"got {type(contents).__name__}"
+        )
+
+
+def validate_topic_translations(topic_name: str, translations: Any) -> None:
+    """Validate the per-language variants of a topic.
+
+    Translations are optional and map a language code to a mapping with an
+    optional description and optional contents; whatever a translation
+    leaves out is taken from the base topic.
+
+    Args:
+        topic_name: Name of the topic being validated
+        translations: The topic's `translations` value (None if absent)
+
+    Raises:
+        GuidebookValidationError: If translations don't match expected structure
+    """
+    if translations is None:
+        return
+    if not isinstance(translations, dict):
+        raise GuidebookValidationError(
+            f"Topic '{topic_name}': translations must be a dict, "
+            f"got {type(translations).__name__}"
+        )
+
+    for language, translation in translations.items():
+        if not isinstance(language, str) or not language:
+            raise GuidebookValidationError(
+                f"Topic '{topic_name}': translation language must be a non-empty string"
+            )
+        if not isinstance(translation, dict):
+            raise GuidebookValidationError(
+                f"Topic '{topic_name}', translation '{language}': must be a dict, "
+                f"got {type(translation).__name__}"
+            )
+        description = translation.get("description")
+        if description is not None and not isinstance(description, str):
+            raise GuidebookValidationError(
+                f"Topic '{topic_name}', translation '{language}': description "
+                f"must be a string, got {type(description).__name__}"
+            )
+        if "contents" in translation:
+            validate_topic_structure(f"{topic_name}[{language}]", translation["contents"])
+
+
+def _validate_list_contents(topic_name: str, contents: List[Any]) -> None:
+    """Validate list-based topic contents.
+
+    Args:
+        topic_name: Name of the topic being validated
+        contents: List contents to validate
+
+    Raises:
+        GuidebookValidationError: If list items are not all non-empty strings
+    """
+    for index, item in enumerate(contents):
+        if not isinstance(item, str):
+            raise GuidebookValidationError(
+                f"Topic '{topic_name}': list item at index {index} must be a string, "
+                f"got {type(item).__name__}"
+            )
+        if not item:
+            raise GuidebookValidationError(
+                f"Topic '{topic_name}': list item at index {index} is an empty string"
+            )
+
+
+def _validate_dict_contents(topic_name: str, contents: Dict[str, Any]) -> None:
+    """Validate dict-based topic contents.
+
+    Args:
+        topic_name: Name of the topic being validated
+        contents: Dict contents to validate
+
+    Raises:
+        GuidebookValidationError: If dict structure doesn't match Dict[str, List[str]]
+    """
+    if not contents:
+        raise GuidebookValidationError(
+            f"Topic '{topic_name}': dict contents cannot be empty"
+        )
+
+    for section_key, section_value in contents.items():
+        # Validate key is a non-empty string
+        if not isinstance(section_key, str):
+            raise GuidebookValidationError(
+                f"Topic '{topic_name}': section key must be a string, "
+                f"got {type(section_key).__name__}"
+            )
+        if not section_key:
+            raise GuidebookValidationError(
+                f"Topic '{topic_name}': section key is an empty string"
+            )
+
+        # Validate value is a list
+        if not isinstance(section_value, list):
+            raise GuidebookValidationError(
+                f"Topic '{topic_name}', section '{section_key}': value must be a list, "
+                f"got {type(section_value).__name__}"
+            )
+
+        # Validate list items are non-empty strings
+        for index, item in enumerate(section_value):
+            if not isinstance(item, str):
+                raise GuidebookValidationError(
+                    f"Topic '{topic_name}', section '{section_key}': "
+                    f"list item at index {index} must be a string, "
+                    f"got {type(item).__name__}"
+                )
+            if not item:
+                raise GuidebookValidationError(
+                    f"Topic '{topic_name}', section '{section_key}': "
+                    f"list item at index {index} is an empty string"
+                )
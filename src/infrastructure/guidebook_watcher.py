@@ -0,0 +1,217 @@
+"""Hot reload of guidebook content.
+
+GuidebookWatcher watches guidebook.yml and vocabulary.yml from a background
+thread. When either file changes it builds a completely new, fully validated
+guidebook and hands it to a callback, which swaps it in with a single
+reference assignment. A reload that fails leaves the old guidebook serving.
+
+When the guidebook is a directory of topic files, edits that touch only
+topic files re-read just those files via YamlGuidebook.reload_topic.
+
+On Linux the watcher is woken up by inotify; elsewhere (or if inotify is
+unavailable) it polls file metadata every `interval` seconds.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import threading
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from src.domain.protocols import IGuidebook
+from src.infrastructure.yaml_guidebook import YamlGuidebook, topic_file_paths
+
+logger = logging.getLogger(__name__)
+
+# {path: (st_ino, st_size, st_mtime_ns)} of each watched file; None if missing
+_Signature = Dict[str, Optional[Tuple[int, int, int]]]
+
+
+class _Inotify:
+    """Minimal ctypes binding for inotify, used only as a wake-up signal."""
+
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_FROM = 0x00000040
+    _IN_MOVED_TO = 0x00000080
+    _IN_CREATE = 0x00000100
+    _IN_DELETE = 0x00000200
+
+    def __init__(self, directories: Tuple[str, ...]) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # Watch directories rather than files: editors and deploys often
+        # replace a file by renaming a new one over it.
+        mask = (
+            self._IN_CLOSE_WRITE | self._IN_MOVED_FROM | self._IN_MOVED_TO
+            | self._IN_CREATE | self._IN_DELETE
+        )
+        for directory in directories:
+            if libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+                errno = ctypes.get_errno()
+                os.close(self._fd)
+                raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout: float) -> None:
+        """Block until a filesystem event arrives or the timeout expires."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return
+        # Drain the queue; the events themselves are not needed
+        try:
+            while os.read(self._fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class GuidebookWatcher:
+    """Rebuild the guidebook in the background whenever its files change."""
+
+    def __init__(
+        self,
+        guidebook_path: str,
+        vocabulary_path: str,
+        on_reload: Callable[[IGuidebook], None],
+        *,
+        interval: float = 5.0,
+        loader: Callable[[str, str], IGuidebook] = YamlGuidebook,
+        guidebook: Optional[IGuidebook] = None,
+    ) -> None:
+        """
+        Initialize the watcher.
+
+        Args:
+            guidebook_path: Path to guidebook.yml or to a topic directory
+            vocabulary_path: Path to vocabulary.yml
+            on_reload: Called with each successfully loaded guidebook
+            interval: Polling interval (and inotify wait timeout) in seconds
+            loader: Builds a guidebook from (guidebook_path, vocabulary_path)
+            guidebook: The guidebook currently served, if it was loaded from
+                a topic directory single changed files are reloaded on it
+        """
+        self._paths = (guidebook_path, vocabulary_path)
+        self._on_reload = on_reload
+        self._loader = loader
+        self._guidebook = guidebook
+        self._interval = interval
+        self._signature = self._stat()
+        # Changed files of failed reloads, retried with the next change
+        self._pending: Set[str] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start watching in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="guidebook-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching and wait for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def check(self) -> bool:
+        """Reload the guidebook if the watched files changed.
+
+        A reload is done only when on_reload accepts the new guidebook; if
+        loading or on_reload fails, the files are reloaded again, on top of
+        the guidebook still served, with the next change.
+
+        Returns:
+            True if a new guidebook was loaded and handed to on_reload
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        changed = {
+            path for path in signature.keys() | self._signature.keys()
+            if signature.get(path) != self._signature.get(path)
+        }
+        self._signature = signature
+        changed |= self._pending
+
+        try:
+            guidebook = self._reload(changed)
+            self._on_reload(guidebook)
+        except Exception:  # pylint: disable=broad-except
+            # Keep serving the previous version until the files are fixed
+            logger.exception("Guidebook reload failed, keeping previous version")
+            self._pending = changed
+            return False
+
+        self._guidebook = guidebook
+        self._pending = set()
+        logger.info("Reloaded guidebook from %s", self._paths[0])
+        return True
+
+    def _reload(self, changed: Set[str]) -> IGuidebook:
+        """Re-read only the changed topic files if possible, else everything."""
+        current = self._guidebook
+        if (
+            isinstance(current, YamlGuidebook)
+            and current.topic_directory is not None
+            and all(
+                os.path.dirname(path) == current.topic_directory for path in changed
+            )
+        ):
+            for path in sorted(changed):
+                current = current.reload_topic(path)
+            return current
+        return self._loader(*self._paths)
+
+    def _run(self) -> None:
+        inotify: Optional[_Inotify] = None
+        try:
+            directories = tuple(
+                {os.path.dirname(os.path.abspath(path)) for path in self._paths}
+                | {os.path.abspath(path) for path in self._paths if os.path.isdir(path)}
+            )
+            inotify = _Inotify(directories)
+        except (OSError, AttributeError, TypeError) as e:
+            logger.info("inotify unavailable (%s), polling guidebook files", e)
+
+        try:
+            while not self._stop.is_set():
+                if inotify is not None:
+                    inotify.wait(self._interval)
+                else:
+                    self._stop.wait(self._interval)
+                if self._stop.is_set():
+                    break
+                try:
+                    self.check()
+                except Exception:  # pylint: disable=broad-except
+                    # A dead thread would turn hot reload off until a restart
+                    logger.exception("Guidebook watcher check failed")
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _stat(self) -> _Signature:
+        paths = []
+        for path in self._paths:
+            if os.path.isdir(path):
+                paths.extend(topic_file_paths(os.path.abspath(path)))
+            else:
+                paths.append(path)
+
+        signature: _Signature = {}
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                signature[path] = None
+            else:
+                signature[path] = (st.st_ino, st.st_size, st.st_mtime_ns)
+        return signature
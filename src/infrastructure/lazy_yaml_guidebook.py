@@ -0,0 +1,394 @@
+"""Lazily parsed YAML guidebook.
+
+LazyYamlGuidebook reads guidebook.yml once at startup and indexes the byte
+range and description of every top-level topic, then parses and validates a
+topic only when it is first requested. Parsed topics are kept in a bounded
+LRU cache, so startup time and resident memory stay flat as the guidebook
+grows.
+
+The file is read into memory rather than mapped: an edit or truncation of
+the file in place cannot fault a running bot, and the bytes a guidebook
+parses never change under it.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from yaml import YAMLError, load
+
+from src.domain.models import Completion, SearchHit, Topic
+from src.domain.protocols import GuidebookContent, GuidebookError, GuidebookValidationError
+from src.infrastructure.alias_index import AliasIndex
+from src.infrastructure.guidebook_validation import (
+    validate_topic_structure,
+    validate_topic_translations,
+)
+from src.infrastructure.name_normalization import normalize_name
+from src.infrastructure.prefix_trie import PrefixTrie, completion_trie
+from src.infrastructure.search_index import SearchIndex
+from src.infrastructure.yaml_guidebook import (
+    SECTION_PROMPTS,
+    SafeLoader,
+    YamlGuidebook,
+    freeze_topic,
+    lookup_section,
+    lowercase_sections,
+    match_sections,
+)
+
+logger = logging.getLogger(__name__)
+
+# A top-level mapping key: no indentation, not a comment or list item
+_TOPIC_KEY = re.compile(rb"^([^\s#\-][^:#\r\n]*):[ \t]*(?:#[^\r\n]*)?\r?$", re.M)
+_DESCRIPTION = re.compile(rb"^[ \t]+description:([^\r\n]*)", re.M)
+_TRANSLATIONS = re.compile(rb"^[ \t]+translations:", re.M)
+_CONTENTS = re.compile(rb"^[ \t]+contents:", re.M)
+# Keys and scalars that read the same as YAML and as raw text
+_PLAIN_KEY = re.compile(rb"^[A-Za-z0-9_]+$")
+_PLAIN_SCALAR = re.compile(rb"^[^\s'\"&*!|>%@`{}\[\],#?:-](?:(?!: | #)[^\r\n])*$")
+
+# Plain scalars YAML would not read as strings
+_YAML_KEYWORDS = {
+    b"null", b"Null", b"NULL", b"~", b"true", b"True", b"TRUE",
+    b"false", b"False", b"FALSE", b"yes", b"Yes", b"no", b"No", b"on", b"off",
+}
+
+# Parsed topic: (frozen topic, lowercase section cache for dict contents)
+_ParsedTopic = Tuple[Topic, Mapping[str, Tuple[str, ...]]]
+
+
+@dataclass(frozen=True)
+class _TopicEntry:
+    """Location and metadata of one topic in the guidebook file."""
+    key: bytes
+    start: int
+    end: int
+    description: str
+    has_translations: bool = False
+
+
+class LazyYamlGuidebook:
+    """YAML guidebook that parses topics on first access."""
+
+    def __init__(
+        self,
+        guidebook_path: str,
+        vocabulary_path: str,
+        *,
+        cache_size: int = 16,
+        validate: bool = False,
+    ) -> None:
+        """Index the guidebook without parsing topic contents.
+
+        Every topic must have contents, and the cities and countries are
+        parsed to check their aliases; other topics are validated when
+        first parsed, unless `validate` is set.
+
+        Args:
+            guidebook_path: Path to guidebook.yml
+            vocabulary_path: Path to vocabulary.yml (aliases for cities)
+            cache_size: Maximum number of parsed topics kept in memory
+            validate: Parse and validate every topic once now, without
+                caching it, so a broken file is rejected (hot reloads)
+
+        Raises:
+            GuidebookValidationError: If a topic has no contents, the
+                aliases collide or, with `validate`, any topic is invalid
+        """
+        started = time.perf_counter()
+
+        if os.path.isdir(guidebook_path):
+            raise GuidebookError(
+                "LazyYamlGuidebook needs a single guidebook file, "
+                f"{guidebook_path} is a directory"
+            )
+        with open(guidebook_path, "rb") as f:
+            self._data = f.read()
+        self._index = self._build_index(self._data)
+
+        with open(vocabulary_path, "rb") as f:
+            self.vocabulary = YamlGuidebook._parse_vocabulary(f.read())
+
+        self._cache_size = max(1, cache_size)
+        self._cache: "OrderedDict[str, _ParsedTopic]" = OrderedDict()
+        # Kept for the guidebook's lifetime: the guidebook's bytes never change
+        self._alias_indexes: Dict[str, AliasIndex] = {}
+        self._completions: Optional[PrefixTrie[Completion]] = None
+        self._search_index: Optional[SearchIndex] = None
+        self._lock = threading.Lock()
+
+        if validate:
+            for name in self._index:
+                self._parse_topic(name)
+        # Alias collisions are load errors, as in YamlGuidebook, and the
+        # trigram indexes are ready before the first misspelled city
+        for topic in SECTION_PROMPTS:
+            if topic in self._index:
+                self._alias_indexes[topic] = AliasIndex(
+                    topic, self._parse_topic(topic)[1], self.vocabulary
+                )
+
+        logger.info(
+            "Indexed %d guidebook topics from %s in %.1f ms",
+            len(self._index), guidebook_path, (time.perf_counter() - started) * 1000
+        )
+
+    def get_topic_description(
+        self, topic: str, languages: Sequence[str] = ()
+    ) -> Optional[str]:
+        """Get the description for a given topic.
+
+        The base description comes from the index; translated descriptions
+        parse the topic.
+
+        Args:
+            topic: Topic name (case-insensitive)
+            languages: Preferred languages, most preferred first
+
+        Returns:
+            Topic description string, or None if topic doesn't exist
+        """
+        topic_lower = topic.lower()
+        entry = self._index.get(topic_lower)
+        if not entry:
+            return None
+        if languages and entry.has_translations:
+            return self._get_parsed(topic_lower)[0].translated(languages).description
+        return entry.description
+
+    def get_topic_contents(
+        self, topic: str, languages: Sequence[str] = ()
+    ) -> GuidebookContent:
+        """Get the contents for a given topic, parsing it on first access.
+
+        Args:
+            topic: Topic name (case-insensitive)
+            languages: Preferred languages, most preferred first
+
+        Returns:
+            Contents as either a list of strings or a dict mapping keys to lists
+
+        Raises:
+            KeyError: If topic doesn't exist
+        """
+        topic_lower = topic.lower()
+        if topic_lower not in self._index:
+            raise KeyError(f"Topic '{topic}' not found")
+
+        return self._get_parsed(topic_lower)[0].translated(languages).contents
+
+    def get_topics(self) -> List[str]:
+        """Get list of all available topics.
+
+        Returns:
+            List of topic names (lowercase)
+        """
+        return list(self._index.keys())
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Completion]:
+        """Complete a typed prefix to topics, cities and countries.
+
+        The trie is built on the first call, which parses cities and
+        countries.
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of completions
+
+        Returns:
+            Completions, best first
+        """
+        if self._completions is None:
+            self._completions = completion_trie(
+                ((name, entry.description) for name, entry in self._index.items()),
+                {topic: self._get_sections(topic) for topic in SECTION_PROMPTS},
+                self.vocabulary,
+            )
+        return self._completions.complete(normalize_name(prefix), limit)
+
+    def search_topics(self, query: str, limit: int = 5) -> List[SearchHit]:
+        """Find the topics whose texts best match a free-text query.
+
+        The index is built on the first call, which parses every topic
+        once without filling the topic cache.
+
+        Args:
+            query: Words as typed
+            limit: Maximum number of topics
+
+        Returns:
+            Hits, best first
+        """
+        if self._search_index is None:
+            self._search_index = SearchIndex(
+                (name, topic.description, topic.contents)
+                for name, (topic, _) in (
+                    (name, self._parse_topic(name)) for name in self._index
+                )
+            )
+        return self._search_index.search(query, limit)
+
+    def find_sections(self, topic: str, name: str) -> List[str]:
+        """Find the sections of a dict-based topic a name stands for.
+
+        Args:
+            topic: Topic name (lowercase)
+            name: Section name, alias or words of it, as typed
+
+        Returns:
+            Lowercase section keys in topic order, empty if none matches
+        """
+        sections = self._get_sections(topic)
+        if not sections:
+            return []
+        return match_sections(sections, self._get_aliases(topic), name)
+
+    def get_cities(self, name: Optional[str] = None) -> str:
+        """Get city information or prompt for a city.
+
+        Args:
+            name: City name (optional, case-insensitive)
+
+        Returns:
+            Formatted city information or prompt message
+        """
+        cities_cache = self._get_sections("cities") if name else {}
+        aliases = self._get_aliases("cities") if name else None
+        return lookup_section("cities", cities_cache, aliases, name)
+
+    def get_countries(self, name: Optional[str] = None) -> str:
+        """Get country information or prompt for a country.
+
+        Args:
+            name: Country name (optional, case-insensitive)
+
+        Returns:
+            Formatted country information or prompt message
+        """
+        countries_cache = self._get_sections("countries") if name else {}
+        aliases = self._get_aliases("countries") if name else None
+        return lookup_section("countries", countries_cache, aliases, name)
+
+    def cached_topics(self) -> List[str]:
+        """Return the topics currently parsed and cached, oldest first."""
+        with self._lock:
+            return list(self._cache.keys())
+
+    def _get_sections(self, topic: str) -> Mapping[str, Tuple[str, ...]]:
+        if topic not in self._index:
+            return {}
+        return self._get_parsed(topic)[1]
+
+    def _get_aliases(self, topic: str) -> AliasIndex:
+        """Return the alias index of a topic's sections, built on first use."""
+        aliases = self._alias_indexes.get(topic)
+        if aliases is None:
+            aliases = AliasIndex(topic, self._get_sections(topic), self.vocabulary)
+            self._alias_indexes[topic] = aliases
+        return aliases
+
+    def _get_parsed(self, topic: str) -> _ParsedTopic:
+        with self._lock:
+            parsed = self._cache.get(topic)
+            if parsed is not None:
+                self._cache.move_to_end(topic)
+                return parsed
+
+        parsed = self._parse_topic(topic)
+
+        with self._lock:
+            self._cache[topic] = parsed
+            self._cache.move_to_end(topic)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return parsed
+
+    def _parse_topic(self, topic: str) -> _ParsedTopic:
+        """Parse and validate a single topic from its byte range."""
+        entry = self._index[topic]
+        block = self._data[entry.start:entry.end]
+        try:
+            raw: Dict[str, Dict[str, Any]] = load(block, Loader=SafeLoader)
+            topic_data = next(iter(raw.values()))
+            contents: Any = topic_data.get("contents")
+            translations: Any = topic_data.get("translations")
+        except (YAMLError, AttributeError, StopIteration) as e:
+            raise GuidebookError(f"Topic '{topic}': could not be parsed: {e}") from e
+
+        validate_topic_structure(topic, contents)
+        validate_topic_translations(topic, translations)
+
+        frozen = freeze_topic(topic, entry.description, contents, translations)
+        sections: Mapping[str, Tuple[str, ...]] = {}
+        if isinstance(frozen.contents, Mapping):
+            sections = lowercase_sections(frozen.contents)
+        return frozen, sections
+
+    @staticmethod
+    def _build_index(data: bytes) -> Dict[str, _TopicEntry]:
+        """Find the byte range and description of every top-level topic.
+
+        Raises:
+            GuidebookValidationError: If a topic has no contents
+        """
+        starts: List[Tuple[int, bytes, str]] = []
+        for match in _TOPIC_KEY.finditer(data):
+            key = match.group(1)
+            if _PLAIN_KEY.match(key):
+                name = key.decode()
+            else:
+                name = str(next(iter(load(match.group(0), Loader=SafeLoader))))
+            starts.append((match.start(), key, name.lower()))
+
+        index: Dict[str, _TopicEntry] = {}
+        for position, (start, key, name) in enumerate(starts):
+            end = starts[position + 1][0] if position + 1 < len(starts) else len(data)
+            if _CONTENTS.search(data, start, end) is None:
+                raise GuidebookValidationError(f"Topic '{name}': contents are missing")
+            translations = _TRANSLATIONS.search(data, start, end)
+            # Translated descriptions must not be taken for the base one
+            base_end = translations.start() if translations else end
+            index[name] = _TopicEntry(
+                key=key,
+                start=start,
+                end=end,
+                description=LazyYamlGuidebook._read_description(
+                    data, start, end, base_end
+                ),
+                has_translations=translations is not None,
+            )
+        return index
+
+    @staticmethod
+    def _read_description(
+        data: bytes, start: int, end: int, base_end: int
+    ) -> str:
+        """Read a topic description without parsing the topic contents.
+
+        The description line is only looked for before `base_end`, where
+        the topic's translations start.
+        """
+        match = _DESCRIPTION.search(data, start, base_end)
+        if match:
+            value = match.group(1).strip()
+            if _PLAIN_SCALAR.match(value) and value not in _YAML_KEYWORDS:
+                return value.decode("utf-8")
+            # Other one-line scalars can be parsed on their own
+            if value and value[:1] not in (b"|", b">"):
+                try:
+                    description = load(b"d: " + value, Loader=SafeLoader)["d"]
+                except YAMLError:
+                    description = None
+                if isinstance(description, str):
+                    return description
+
+        # Multi-line, missing or unusual descriptions: parse the whole topic once
+        raw = load(data[start:end], Loader=SafeLoader)
+        topic_data = next(iter(raw.values())) or {}
+        return topic_data.get("description", "") or ""
@@ -0,0 +1,59 @@
+"""Normalization of city, country and alias names for lookups.
+
+Users type the same name in many ways: "München", "Muenchen", "munchen",
+"Мюнхен", "🇩🇪 МЮНХЕН!". normalize_name maps all of them to one plain
+Latin form, so that a guidebook key, its aliases and a query compare equal
+(or within a typo or two) without vocabulary.yml listing every spelling.
+Keys and aliases are normalized once when a guidebook's name index is
+built, and each query once.
+
+The steps are:
+    1. NFKC and casefolding ("ß" becomes "ss", full-width letters plain)
+    2. German umlaut transcriptions folded: "ae", "oe", "ue" become "a",
+       "o", "u", like "ä", "ö", "ü" in step 4
+    3. Cyrillic transliterated to Latin, the way German city names are
+       written in Russian and Ukrainian ("Мюнхен" gives "mjunchen")
+    4. Diacritics removed ("ä" gives "a", "é" gives "e")
+    5. Anything but letters and digits (emoji, punctuation, hyphens)
+       becomes a single space
+"""
+
+import re
+import unicodedata
+
+# Russian and Ukrainian letters; German-leaning, since most keys are German
+_CYRILLIC = str.maketrans({
+    "а": "a", "б": "b", "в": "w", "г": "g", "ґ": "g", "д": "d", "е": "e",
+    "ё": "e", "є": "je", "ж": "sch", "з": "s", "и": "i", "і": "i", "ї": "ji",
+    "й": "i", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p",
+    "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "ch", "ц": "z",
+    "ч": "tsch", "ш": "sch", "щ": "schtsch", "ъ": "", "ы": "y", "ь": "",
+    "э": "e", "ю": "ju", "я": "ja", "ʼ": "", "'": "",
+})
+
+# "Штутгарт", "Шпандау": an initial German "st" or "sp" sounds "scht", "schp"
+_GERMAN_ST_SP = re.compile(r"\bш(?=[тп])")
+_UMLAUT_TRANSCRIPTION = re.compile(r"([aou])e")
+_SEPARATORS = re.compile(r"[\W_]+")
+# Combining marks NFD splits off Latin and Cyrillic letters
+_COMBINING_MARKS = re.compile(
+    "[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]+"
+)
+
+
+def normalize_name(name: str) -> str:
+    """Return the lookup form of a name.
+
+    Args:
+        name: Name as written in the guidebook, the vocabulary or a query
+
+    Returns:
+        Lowercase Latin letters, digits and single spaces; empty if the name
+        has no letters or digits
+    """
+    text = unicodedata.normalize("NFKC", name).casefold()
+    text = _UMLAUT_TRANSCRIPTION.sub(r"\1", text)
+    text = _GERMAN_ST_SP.sub("s", text).translate(_CYRILLIC)
+    if not text.isascii():
+        text = _COMBINING_MARKS.sub("", unicodedata.normalize("NFD", text))
+    return _SEPARATORS.sub(" ", text).strip()
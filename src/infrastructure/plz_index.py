@@ -0,0 +1,244 @@
+"""German postal code (PLZ) to guidebook city lookup.
+
+plz_ranges.csv lists ranges of postal codes and the guidebook city each
+is nearest to. It is compiled into a range index file next to it: sorted
+range starts and ends as uint32 arrays, one uint16 city id per range and
+the city names. The file is memory-mapped and searched in place with
+bisect, so a lookup reads a few pages of it and nothing is parsed into
+Python objects but the city names.
+
+Nothing happens at startup: the index is opened on the first lookup,
+compiled first if it is missing or was compiled from another version of
+the CSV. Compile it ahead of time (bin/post_compile does) with:
+
+    python -m src.infrastructure.plz_index
+"""
+
+import csv
+import hashlib
+import io
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from typing import List, NamedTuple, Optional, Tuple
+
+from src.domain.protocols import GuidebookValidationError
+from src.infrastructure.atomic_file import atomic_write
+from src.infrastructure.config_loader import load_toml_settings
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the index file layout changes
+PLZ_INDEX_FORMAT_VERSION = 1
+
+_MAGIC = b"HUBPLZIX"
+# magic, format version, byte order, range count, sha256 of the CSV
+_HEADER = struct.Struct(f"<{len(_MAGIC)}sHcI32s")
+_BYTE_ORDER = b"<" if sys.byteorder == "little" else b">"
+_START_SIZE = array("I").itemsize
+_CITY_ID_SIZE = array("H").itemsize
+_RANGE_SIZE = 2 * _START_SIZE + _CITY_ID_SIZE
+
+
+class _Ranges(NamedTuple):
+    """Views into the mapped index."""
+    starts: memoryview
+    ends: memoryview
+    city_ids: memoryview
+    cities: Tuple[str, ...]
+
+
+def index_path_for(csv_path: str) -> str:
+    """Return the path of the index compiled from a PLZ range table."""
+    return os.path.splitext(csv_path)[0] + ".plzidx"
+
+
+def parse_plz_ranges(source: bytes) -> List[Tuple[int, int, str]]:
+    """Parse and check a PLZ range table.
+
+    Args:
+        source: Contents of the CSV file; lines starting with '#' are comments
+
+    Returns:
+        (first, last, city) ranges, sorted
+
+    Raises:
+        GuidebookValidationError: If a row is malformed or ranges overlap
+    """
+    lines = [
+        line for line in source.decode("utf-8").splitlines()
+        if line.strip() and not line.startswith("#")
+    ]
+    ranges = []
+    for row in csv.DictReader(io.StringIO("\n".join(lines))):
+        first, last, city = row.get("first"), row.get("last"), row.get("city")
+        if not (
+            first and last and city
+            and len(first) == len(last) == 5
+            and (first + last).isascii() and (first + last).isdigit()
+            and first <= last
+        ):
+            raise GuidebookValidationError(f"PLZ ranges: invalid row {row}")
+        ranges.append((int(first), int(last), city.strip()))
+
+    ranges.sort()
+    for (_, previous_last, previous_city), (first, _, city) in zip(ranges, ranges[1:]):
+        if first <= previous_last:
+            raise GuidebookValidationError(
+                f"PLZ ranges: {first:05d} of {city} overlaps the range of {previous_city}"
+            )
+    return ranges
+
+
+def compile_plz_index(csv_path: str, index_path: Optional[str] = None) -> str:
+    """Compile a PLZ range table into an index file, atomically.
+
+    Args:
+        csv_path: Path to the range table
+        index_path: Destination; defaults to index_path_for(csv_path)
+
+    Returns:
+        Path of the written index
+
+    Raises:
+        GuidebookValidationError: If the table is invalid
+    """
+    index_path = index_path or index_path_for(csv_path)
+    with open(csv_path, "rb") as f:
+        source = f.read()
+    ranges = parse_plz_ranges(source)
+
+    cities = list(dict.fromkeys(city for _, _, city in ranges))
+    city_ids = {city: city_id for city_id, city in enumerate(cities)}
+    header = _HEADER.pack(
+        _MAGIC, PLZ_INDEX_FORMAT_VERSION, _BYTE_ORDER, len(ranges),
+        hashlib.sha256(source).digest(),
+    )
+
+    with atomic_write(index_path) as tmp_path, open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(array("I", (first for first, _, _ in ranges)).tobytes())
+        f.write(array("I", (last for _, last, _ in ranges)).tobytes())
+        f.write(array("H", (city_ids[city] for _, _, city in ranges)).tobytes())
+        f.write("\n".join(cities).encode("utf-8"))
+    return index_path
+
+
+class PlzIndex:
+    """Memory-mapped index of PLZ ranges, opened on the first lookup."""
+
+    def __init__(self, csv_path: str, index_path: Optional[str] = None) -> None:
+        """
+        Remember where the range table and its index are; nothing is read.
+
+        Args:
+            csv_path: Path to the range table
+            index_path: Path to its compiled index; defaults to
+                index_path_for(csv_path)
+        """
+        self._csv_path = csv_path
+        self._index_path = index_path or index_path_for(csv_path)
+        self._lock = threading.Lock()
+        self._ranges: Optional[_Ranges] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the index has been opened."""
+        return self._ranges is not None
+
+    def lookup(self, postal_code: str) -> Optional[str]:
+        """
+        Return the guidebook city nearest to a postal code.
+
+        Args:
+            postal_code: Five digits, as typed
+
+        Returns:
+            City name as in the guidebook, or None if the code is malformed
+            or in no range
+        """
+        code = postal_code.strip()
+        if len(code) != 5 or not (code.isascii() and code.isdigit()):
+            return None
+        ranges = self._ranges or self._open()
+        number = int(code)
+        position = bisect_right(ranges.starts, number) - 1
+        if position < 0 or number > ranges.ends[position]:
+            return None
+        return ranges.cities[ranges.city_ids[position]]
+
+    def _open(self) -> _Ranges:
+        """Map the index, compiling it first if it is missing or stale."""
+        with self._lock:
+            if self._ranges is not None:
+                return self._ranges
+            with open(self._csv_path, "rb") as f:
+                source_hash = hashlib.sha256(f.read()).digest()
+            data = self._map()
+            if data is None or not self._is_current(data, source_hash):
+                if data is not None:
+                    data.close()
+                logger.info("Compiling PLZ index %s", self._index_path)
+                compile_plz_index(self._csv_path, self._index_path)
+                data = self._map()
+                if data is None or not self._is_current(data, source_hash):
+                    raise GuidebookValidationError(
+                        f"PLZ index {self._index_path} could not be compiled"
+                    )
+
+            # The views keep the mapping open for the life of the process
+            count = _HEADER.unpack_from(data)[3]
+            view = memoryview(data)
+            ends_at = _HEADER.size + count * _START_SIZE
+            ids_at = ends_at + count * _START_SIZE
+            names_at = ids_at + count * _CITY_ID_SIZE
+            self._ranges = _Ranges(
+                starts=view[_HEADER.size:ends_at].cast("I"),
+                ends=view[ends_at:ids_at].cast("I"),
+                city_ids=view[ids_at:names_at].cast("H"),
+                cities=tuple(bytes(view[names_at:]).decode("utf-8").split("\n")),
+            )
+            return self._ranges
+
+    def _map(self) -> Optional[mmap.mmap]:
+        try:
+            with open(self._index_path, "rb") as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError: an empty file cannot be mapped
+            return None
+
+    @staticmethod
+    def _is_current(data: mmap.mmap, source_hash: bytes) -> bool:
+        if len(data) < _HEADER.size:
+            return False
+        magic, version, byte_order, count, digest = _HEADER.unpack_from(data)
+        return (
+            magic == _MAGIC
+            and version == PLZ_INDEX_FORMAT_VERSION
+            and byte_order == _BYTE_ORDER
+            and digest == source_hash
+            and len(data) >= _HEADER.size + count * _RANGE_SIZE
+        )
+
+
+def main() -> None:
+    """Compile the PLZ range table configured in settings.toml into its index."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    csv_path = load_toml_settings("settings.toml").get("PLZ_RANGES_PATH")
+    if not csv_path:
+        logger.info("PLZ_RANGES_PATH is not set, no PLZ index to compile")
+        return
+    logger.info("Wrote PLZ index %s", compile_plz_index(csv_path))
+
+
+if __name__ == "__main__":
+    main()
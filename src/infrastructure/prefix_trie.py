@@ -0,0 +1,131 @@
+"""Prefix trie for inline-mode autocomplete.
+
+Every node keeps the best few values of all keys below it, ranked when the
+trie is built, so a completion is one dict lookup per typed character and
+never walks a subtree. Keys are stored in normalize_name form, so "berl",
+"Берл" and "BERL" complete alike.
+"""
+
+from typing import Dict, Generic, Iterable, List, Mapping, Optional, Set, Tuple, TypeVar
+
+from src.domain.models import Completion
+from src.infrastructure.name_normalization import normalize_name
+
+T = TypeVar("T")
+
+# Ranks: names before aliases before words of descriptions
+RANK_NAME = 0
+RANK_ALIAS = 1
+RANK_DESCRIPTION = 2
+
+
+class _Node(Generic[T]):
+    __slots__ = ("children", "best")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node[T]"] = {}
+        self.best: List[Tuple[int, int, T]] = []
+
+
+class PrefixTrie(Generic[T]):
+    """Map key prefixes to the best-ranked values of the keys."""
+
+    def __init__(self, limit: int = 20) -> None:
+        """
+        Create an empty trie.
+
+        Args:
+            limit: Number of values kept per prefix
+        """
+        self._limit = limit
+        self._root: _Node[T] = _Node()
+        self._count = 0
+
+    def add(self, key: str, value: T, rank: int = RANK_NAME) -> None:
+        """
+        Add a key; call freeze() once all keys are added.
+
+        Args:
+            key: Key, normalized by the caller
+            value: Value completed for every prefix of the key
+            rank: Lower ranks come first, then keys added earlier
+        """
+        entry = (rank, self._count, value)
+        self._count += 1
+        node = self._root
+        node.best.append(entry)
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            node.best.append(entry)
+
+    def freeze(self) -> None:
+        """Keep the best `limit` distinct values of every node."""
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            node.best.sort(key=lambda entry: entry[:2])
+            seen: Set[T] = set()
+            best: List[Tuple[int, int, T]] = []
+            for entry in node.best:
+                if entry[2] not in seen:
+                    seen.add(entry[2])
+                    best.append(entry)
+                    if len(best) == self._limit:
+                        break
+            node.best = best
+            stack.extend(node.children.values())
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[T]:
+        """
+        Return the best values of the keys starting with a prefix.
+
+        Args:
+            prefix: Normalized prefix; "" completes to the best values overall
+            limit: Maximum number of values (at most the trie's limit)
+
+        Returns:
+            Values, best first
+        """
+        node = self._root
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                return []
+            node = child
+        return [entry[2] for entry in node.best[:limit]]
+
+
+def completion_trie(
+    descriptions: Iterable[Tuple[str, Optional[str]]],
+    sections: Mapping[str, Iterable[str]],
+    vocabulary: Mapping[str, str],
+) -> PrefixTrie[Completion]:
+    """
+    Build the autocomplete trie of a guidebook.
+
+    Args:
+        descriptions: (topic name, description) of every topic
+        sections: Lowercase section keys of the topics with section
+            commands (cities, countries)
+        vocabulary: Lowercase alias to lowercase section key
+
+    Returns:
+        Frozen trie completing topic names, every word of topic
+        descriptions, section keys and their aliases
+    """
+    trie: PrefixTrie[Completion] = PrefixTrie()
+    for topic, description in descriptions:
+        trie.add(normalize_name(topic), Completion(topic))
+        words = normalize_name(description or "").split()
+        for start in range(len(words)):
+            trie.add(" ".join(words[start:]), Completion(topic), RANK_DESCRIPTION)
+
+    for topic, keys in sections.items():
+        topic_sections = dict.fromkeys(keys)
+        for key in topic_sections:
+            trie.add(normalize_name(key), Completion(topic, key))
+        for alias, canonical in vocabulary.items():
+            if canonical in topic_sections:
+                trie.add(normalize_name(alias), Completion(topic, canonical), RANK_ALIAS)
+    trie.freeze()
+    return trie
@@ -0,0 +1,190 @@
+"""Inverted index for /search and free-text questions over guidebook topics.
+
+Every topic is one document: its description, section keys and items,
+URLs included ("https://www.berlin.de/jobcenter-mitte" gives the words
+"berlin", "jobcenter", "mitte", ...). Words are in normalize_name form with
+trailing vowels dropped, a light stemming that lets "жильё", "жилья" and
+"жилье" meet; question words ("где", "как") are dropped. A query word of
+four or more letters also matches the words it starts, so "квартир" finds
+"квартирах".
+
+Topics are ranked by BM25. Its weight for every (word, topic) pair depends
+only on the guidebook, so it is computed when the index is built: the
+postings are a word-by-topic sparse matrix of final weights, and scoring a
+query adds up the rows of its words and nothing else.
+
+The index is compact: the vocabulary is one sorted tuple of interned
+strings, a word's id is its position in it, and the postings of all words
+are two flat arrays (topic ids and float32 weights) sliced by an offsets
+array. Words sharing a prefix are neighbours, so a prefix match is one
+bisect and one contiguous slice of postings.
+"""
+
+import math
+import sys
+from array import array
+from collections import Counter
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
+
+from src.domain.models import SearchHit
+from src.domain.protocols import GuidebookContent
+from src.infrastructure.name_normalization import normalize_name
+
+# BM25 parameters: term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+# Description words count as this many occurrences
+DESCRIPTION_WEIGHT = 3
+
+_VOWELS = "aeiouyj"
+# Shortest query word that also matches longer words starting with it
+MIN_PREFIX = 4
+
+
+def _stem(word: str) -> str:
+    stem = word.rstrip(_VOWELS)
+    return stem if len(stem) >= 3 else word[:3]
+
+
+# Question and function words of Russian and Ukrainian questions
+_STOPWORDS = frozenset(_stem(word) for word in normalize_name(
+    "где как что кто куда когда зачем почему какой какая какие который можно "
+    "нужно надо нужен хочу мне меня мой моя мы вы он она они или но не ни ли "
+    "же бы да нет это этот эта есть для по на во со ко от до из за об про при "
+    "под над чтобы если то так уже еще все очень "
+    "де як що хто коли чи мені ми ви або але із від це є треба потрібно"
+).split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Return the index words of a text, in order.
+
+    Single letters and question words ("где", "как") are dropped; every
+    other word is normalized and loses its trailing vowels, keeping at
+    least three letters.
+    """
+    words = []
+    for word in normalize_name(text).split():
+        if len(word) < 2:
+            continue
+        stem = _stem(word)
+        if stem not in _STOPWORDS:
+            words.append(stem)
+    return words
+
+
+def topic_text(description: str, contents: GuidebookContent) -> Iterable[str]:
+    """Yield the searchable texts of a topic: description, section keys, items."""
+    yield description
+    if isinstance(contents, Mapping):
+        for key, items in contents.items():
+            yield key
+            yield from items
+    else:
+        yield from contents
+
+
+class SearchIndex:
+    """Inverted index of topic texts, ranked by BM25."""
+
+    def __init__(self, topics: Iterable[Tuple[str, str, GuidebookContent]]) -> None:
+        """
+        Build the index.
+
+        Args:
+            topics: (name, description, contents) of every topic
+        """
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        names: List[str] = []
+        lengths: List[int] = []
+        for topic_id, (name, description, contents) in enumerate(topics):
+            names.append(name)
+            words = Counter(
+                word for text in topic_text(description, contents) for word in tokenize(text)
+            )
+            # The description says what the topic is about: count it more
+            for word in tokenize(description):
+                words[word] += DESCRIPTION_WEIGHT - 1
+            lengths.append(sum(words.values()))
+            for word, count in words.items():
+                postings.setdefault(word, []).append((topic_id, count))
+
+        self._topics: Tuple[str, ...] = tuple(names)
+        self._terms: Tuple[str, ...] = tuple(sys.intern(term) for term in sorted(postings))
+        average_length = sum(lengths) / len(lengths) if lengths else 0.0
+        # BM25 length normalization of each topic, k1 * (1 - b + b * dl / avgdl)
+        norms = [
+            K1 * (1 - B + B * length / average_length) if average_length else K1
+            for length in lengths
+        ]
+        offsets = [0]
+        topic_ids: List[int] = []
+        weights: List[float] = []
+        for term in self._terms:
+            term_postings = postings[term]
+            frequency = len(term_postings)
+            idf = math.log(1 + (len(names) - frequency + 0.5) / (frequency + 0.5))
+            for topic_id, count in term_postings:
+                topic_ids.append(topic_id)
+                weights.append(idf * count * (K1 + 1) / (count + norms[topic_id]))
+            offsets.append(len(topic_ids))
+        self._offsets = array("I", offsets)
+        self._postings = array("H" if len(names) <= 0xFFFF else "I", topic_ids)
+        self._weights = array("f", weights)
+
+    def __len__(self) -> int:
+        return len(self._topics)
+
+    @property
+    def term_count(self) -> int:
+        """Number of distinct words indexed."""
+        return len(self._terms)
+
+    def search(self, query: str, limit: int = 5) -> List[SearchHit]:
+        """
+        Return the topics best matching a query.
+
+        A topic scores the sum of the BM25 weights of the query's words
+        in it, computed when the index was built; only the postings of
+        those words are read.
+
+        Args:
+            query: Words as typed
+            limit: Maximum number of topics
+
+        Returns:
+            Hits, best first
+        """
+        scores: Dict[int, float] = {}
+        for word in dict.fromkeys(tokenize(query)):
+            first, last = self._term_range(word)
+            start, end = self._offsets[first], self._offsets[last]
+            postings: Iterator[Tuple[int, float]] = zip(
+                self._postings[start:end], self._weights[start:end]
+            )
+            if last - first > 1:
+                # A topic containing several words with this prefix counts
+                # its best one
+                best: Dict[int, float] = {}
+                for topic_id, weight in postings:
+                    if weight > best.get(topic_id, 0.0):
+                        best[topic_id] = weight
+                postings = iter(best.items())
+            for topic_id, weight in postings:
+                scores[topic_id] = scores.get(topic_id, 0.0) + weight
+
+        ranked = sorted(scores, key=lambda topic_id: (-scores[topic_id], topic_id))
+        return [
+            SearchHit(self._topics[topic_id], scores[topic_id])
+            for topic_id in ranked[:limit]
+        ]
+
+    def _term_range(self, word: str) -> Tuple[int, int]:
+        """Return the ids of the indexed words a query word matches."""
+        first = bisect_left(self._terms, word)
+        if len(word) < MIN_PREFIX:
+            exact = first < len(self._terms) and self._terms[first] == word
+            return first, first + exact
+        # Every word starting with `word` sorts before word + U+10FFFF
+        return first, bisect_left(self._terms, word + "\U0010ffff", first)
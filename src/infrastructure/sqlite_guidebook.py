@@ -0,0 +1,538 @@
+"""SQLite-backed guidebook.
+
+SqliteGuidebook serves topics from an on-disk SQLite database instead of
+holding the whole guidebook in every worker's heap, so the knowledge base
+can grow well beyond Berlin. Topics, sections and aliases are read through
+indexed lookups, and /search ranks topics with an FTS5 table instead of an
+in-memory index.
+
+The database is imported from the YAML guidebook (single file or topic
+directory) and records the source hash of the YAML it was built from, so it
+is only rebuilt when the YAML changes. Import it explicitly with:
+
+    python -m src.infrastructure.sqlite_guidebook
+"""
+
+import logging
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from src.domain.models import Completion, SearchHit, Topic
+from src.domain.protocols import GuidebookContent, GuidebookError
+from src.infrastructure.alias_index import AliasIndex
+from src.infrastructure.atomic_file import atomic_write
+from src.infrastructure.config_loader import load_toml_settings
+from src.infrastructure.name_normalization import normalize_name
+from src.infrastructure.prefix_trie import PrefixTrie, completion_trie
+from src.infrastructure.search_index import (
+    DESCRIPTION_WEIGHT,
+    MIN_PREFIX,
+    tokenize,
+    topic_text,
+)
+from src.infrastructure.yaml_guidebook import (
+    SECTION_PROMPTS,
+    YamlGuidebook,
+    guidebook_source_hash,
+    lookup_section,
+    match_sections,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the schema changes; older databases are re-imported.
+SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+
+-- Base topics have an empty language; translations are topics of their own
+CREATE TABLE topics (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    language TEXT NOT NULL,
+    description TEXT NOT NULL,
+    is_dict INTEGER NOT NULL,
+    UNIQUE (name, language)
+);
+
+-- A list topic has a single section with a NULL key
+CREATE TABLE sections (
+    id INTEGER PRIMARY KEY,
+    topic_id INTEGER NOT NULL REFERENCES topics(id),
+    key TEXT,
+    key_lower TEXT
+);
+CREATE INDEX idx_sections_topic_key ON sections(topic_id, key_lower);
+
+CREATE TABLE items (
+    section_id INTEGER NOT NULL REFERENCES sections(id),
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (section_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE aliases (
+    alias TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+) WITHOUT ROWID;
+
+-- One document per base topic, holding its words in search_index.tokenize
+-- form, so queries match after the same normalization and stemming as the
+-- in-memory index
+CREATE VIRTUAL TABLE topics_fts USING fts5(
+    topic UNINDEXED,
+    description,
+    text,
+    tokenize = 'unicode61',
+    prefix = '4'
+);
+"""
+
+# Ranks topics by BM25, description words weighing DESCRIPTION_WEIGHT times
+_SEARCH_TOPICS = f"""
+SELECT topic, -bm25(topics_fts, 0, {DESCRIPTION_WEIGHT}, 1) AS score FROM topics_fts
+WHERE topics_fts MATCH ?
+ORDER BY score DESC, rowid LIMIT ?
+"""
+
+_SECTION_ID = """
+SELECT s.id FROM sections s JOIN topics t ON t.id = s.topic_id
+WHERE t.name = ? AND t.language = '' AND s.key_lower = ?
+ORDER BY s.id DESC LIMIT 1
+"""
+
+
+class SqliteGuidebook:
+    """Guidebook served from an imported SQLite database."""
+
+    def __init__(self, database_path: str) -> None:
+        """Open an imported guidebook database read-only.
+
+        Args:
+            database_path: Path to the database written by import_guidebook
+
+        Raises:
+            GuidebookError: If the database is missing, unreadable or was
+                written with another schema version
+        """
+        uri = pathlib.Path(database_path).absolute().as_uri() + "?mode=ro"
+        try:
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+        except sqlite3.Error as e:
+            raise GuidebookError(
+                f"Could not open guidebook database {database_path}: {e}"
+            ) from e
+        if meta.get("schema_version") != str(SCHEMA_VERSION):
+            self._conn.close()
+            raise GuidebookError(
+                f"Guidebook database {database_path} has schema version "
+                f"{meta.get('schema_version')}, expected {SCHEMA_VERSION}"
+            )
+
+        self.source_hash = meta["source_hash"]
+        self._lock = threading.Lock()
+        self.vocabulary = _AliasView(self)
+        self._alias_indexes: Dict[str, AliasIndex] = {}
+        self._completions: Optional[PrefixTrie[Completion]] = None
+        # Built at load, so the first misspelled city does not wait for
+        # the trigram index
+        for topic in SECTION_PROMPTS:
+            self._aliases(topic)
+
+    def get_topic_description(
+        self, topic: str, languages: Sequence[str] = ()
+    ) -> Optional[str]:
+        """Get the description for a given topic.
+
+        Args:
+            topic: Topic name (case-insensitive)
+            languages: Preferred languages, most preferred first
+
+        Returns:
+            Topic description string, or None if topic doesn't exist
+        """
+        rows = self._query(
+            "SELECT language, description FROM topics WHERE name = ?",
+            (topic.lower(),),
+        )
+        if rows:
+            return _translated(rows, languages)[1]
+        return None
+
+    def get_topic_contents(
+        self, topic: str, languages: Sequence[str] = ()
+    ) -> GuidebookContent:
+        """Get the contents for a given topic.
+
+        Args:
+            topic: Topic name (case-insensitive)
+            languages: Preferred languages, most preferred first
+
+        Returns:
+            Contents as either a tuple of strings or a read-only mapping of
+            section keys to tuples
+
+        Raises:
+            KeyError: If topic doesn't exist
+        """
+        rows = self._query(
+            "SELECT language, id, is_dict FROM topics WHERE name = ?",
+            (topic.lower(),),
+        )
+        if not rows:
+            raise KeyError(f"Topic '{topic}' not found")
+        _, topic_id, is_dict = _translated(rows, languages)
+
+        sections: Dict[Optional[str], List[str]] = {}
+        for key, text in self._query(
+            """
+            SELECT s.key, i.text FROM sections s
+            LEFT JOIN items i ON i.section_id = s.id
+            WHERE s.topic_id = ?
+            ORDER BY s.id, i.position
+            """,
+            (topic_id,),
+        ):
+            items = sections.setdefault(key, [])
+            if text is not None:
+                items.append(text)
+
+        if not is_dict:
+            return tuple(sections.get(None, ()))
+        return MappingProxyType({
+            str(key): tuple(items) for key, items in sections.items()
+        })
+
+    def get_topics(self) -> List[str]:
+        """Get list of all available topics.
+
+        Returns:
+            List of topic names (lowercase)
+        """
+        return [
+            name for (name,) in self._query(
+                "SELECT name FROM topics WHERE language = '' ORDER BY id"
+            )
+        ]
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Completion]:
+        """Complete a typed prefix to topics, cities and countries.
+
+        The trie is built on the first call.
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of completions
+
+        Returns:
+            Completions, best first
+        """
+        if self._completions is None:
+            self._completions = completion_trie(
+                self._query(
+                    "SELECT name, description FROM topics WHERE language = '' ORDER BY id"
+                ),
+                {topic: list(_SectionView(self, topic)) for topic in SECTION_PROMPTS},
+                dict(self._query("SELECT alias, name FROM aliases")),
+            )
+        return self._completions.complete(normalize_name(prefix), limit)
+
+    def search_topics(self, query: str, limit: int = 5) -> List[SearchHit]:
+        """Find the topics whose texts best match a free-text query.
+
+        Query words are normalized and stemmed as in the YAML guidebooks,
+        and words of MIN_PREFIX or more letters also match the words they
+        start; topics are ranked by FTS5's BM25, so scores differ a little
+        from the in-memory index. Any word is enough for a topic to match.
+
+        Args:
+            query: Words as typed
+            limit: Maximum number of topics
+
+        Returns:
+            Hits, best first
+        """
+        words = dict.fromkeys(tokenize(query))
+        if not words:
+            return []
+        match = " OR ".join(
+            f'"{word}"*' if len(word) >= MIN_PREFIX else f'"{word}"' for word in words
+        )
+        return [
+            SearchHit(topic, score)
+            for topic, score in self._query(_SEARCH_TOPICS, (match, limit))
+        ]
+
+    def find_sections(self, topic: str, name: str) -> List[str]:
+        """Find the sections of a dict-based topic a name stands for.
+
+        Args:
+            topic: Topic name (lowercase)
+            name: Section name, alias or words of it, as typed
+
+        Returns:
+            Lowercase section keys in topic order, empty if none matches
+        """
+        aliases = self._aliases(topic)
+        if not aliases:
+            return []
+        return match_sections(_SectionView(self, topic), aliases, name)
+
+    def get_cities(self, name: Optional[str] = None) -> str:
+        """Get city information or prompt for a city.
+
+        Special handler for cities with formatting and vocabulary alias support.
+
+        Args:
+            name: City name (optional, case-insensitive)
+
+        Returns:
+            Formatted city information or prompt message
+        """
+        return lookup_section(
+            "cities", _SectionView(self, "cities"), self._aliases("cities"), name
+        )
+
+    def get_countries(self, name: Optional[str] = None) -> str:
+        """Get country information or prompt for a country.
+
+        Special handler for countries with formatting and vocabulary alias support.
+
+        Args:
+            name: Country name (optional, case-insensitive)
+
+        Returns:
+            Formatted country information or prompt message
+        """
+        return lookup_section(
+            "countries", _SectionView(self, "countries"), self._aliases("countries"), name
+        )
+
+    @classmethod
+    def from_yaml(
+        cls, guidebook_path: str, vocabulary_path: str, database_path: str
+    ) -> "SqliteGuidebook":
+        """Open the database, re-importing it first if the YAML changed.
+
+        Args:
+            guidebook_path: Path to guidebook.yml or to a topic directory
+            vocabulary_path: Path to vocabulary.yml
+            database_path: Path to the guidebook database
+
+        Returns:
+            The opened guidebook
+        """
+        source_hash = guidebook_source_hash(guidebook_path, vocabulary_path)
+        if read_source_hash(database_path) != source_hash:
+            import_guidebook(YamlGuidebook(guidebook_path, vocabulary_path), database_path)
+        return cls(database_path)
+
+    def _aliases(self, topic: str) -> AliasIndex:
+        """Return the alias index of a topic's sections, built on first use."""
+        aliases = self._alias_indexes.get(topic)
+        if aliases is None:
+            vocabulary = dict(self._query("SELECT alias, name FROM aliases"))
+            aliases = AliasIndex(topic, _SectionView(self, topic), vocabulary)
+            self._alias_indexes[topic] = aliases
+        return aliases
+
+    def _query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Any]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+
+class _SectionView(Mapping[str, Tuple[str, ...]]):
+    """Read-only mapping of lowercase section key to items, queried on access."""
+
+    def __init__(self, guidebook: SqliteGuidebook, topic: str) -> None:
+        self._guidebook = guidebook
+        self._topic = topic
+
+    def __getitem__(self, key: str) -> Tuple[str, ...]:
+        # pylint: disable=protected-access
+        rows = self._guidebook._query(_SECTION_ID, (self._topic, key))
+        if not rows:
+            raise KeyError(key)
+        return tuple(
+            text for (text,) in self._guidebook._query(
+                "SELECT text FROM items WHERE section_id = ? ORDER BY position",
+                (rows[0][0],),
+            )
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        # pylint: disable=protected-access
+        return iter(dict.fromkeys(
+            key for (key,) in self._guidebook._query(
+                """
+                SELECT s.key_lower FROM sections s JOIN topics t ON t.id = s.topic_id
+                WHERE t.name = ? AND t.language = '' AND s.key_lower IS NOT NULL
+                ORDER BY s.id
+                """,
+                (self._topic,),
+            )
+        ))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class _AliasView(Mapping[str, str]):
+    """Read-only mapping of lowercase alias to lowercase canonical name."""
+
+    def __init__(self, guidebook: SqliteGuidebook) -> None:
+        self._guidebook = guidebook
+
+    def __getitem__(self, alias: str) -> str:
+        # pylint: disable=protected-access
+        rows = self._guidebook._query("SELECT name FROM aliases WHERE alias = ?", (alias,))
+        if not rows:
+            raise KeyError(alias)
+        return rows[0][0]
+
+    def __iter__(self) -> Iterator[str]:
+        # pylint: disable=protected-access
+        return iter([alias for (alias,) in self._guidebook._query(
+            "SELECT alias FROM aliases"
+        )])
+
+    def __len__(self) -> int:
+        # pylint: disable=protected-access
+        return self._guidebook._query("SELECT COUNT(*) FROM aliases")[0][0]
+
+
+def _translated(rows: List[Any], languages: Sequence[str]) -> Any:
+    """Pick the row of the first available language, else the base row."""
+    by_language = {row[0]: row for row in rows}
+    for language in languages:
+        if language in by_language:
+            return by_language[language]
+    return by_language[""]
+
+
+def read_source_hash(database_path: str) -> Optional[str]:
+    """Return the source hash recorded in a guidebook database.
+
+    Args:
+        database_path: Path to the guidebook database
+
+    Returns:
+        The hash, or None if the database is missing, unreadable or has
+        another schema version
+    """
+    if not os.path.exists(database_path):
+        return None
+    try:
+        guidebook = SqliteGuidebook(database_path)
+    except GuidebookError as e:
+        logger.info("Guidebook database will be re-imported: %s", e)
+        return None
+    # pylint: disable-next=protected-access
+    guidebook._conn.close()
+    return guidebook.source_hash
+
+
+def import_guidebook(guidebook: YamlGuidebook, database_path: str) -> None:
+    """Write a loaded guidebook to a new database.
+
+    The database is built in a temporary file and moved into place, so open
+    SqliteGuidebook instances keep reading the previous version.
+
+    Args:
+        guidebook: Parsed and validated guidebook
+        database_path: Destination path of the database
+    """
+    started = time.perf_counter()
+    with atomic_write(database_path) as tmp_path:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            with conn:
+                conn.executescript(_SCHEMA)
+                _insert_guidebook(conn, guidebook)
+            conn.execute("INSERT INTO topics_fts(topics_fts) VALUES ('optimize')")
+            conn.commit()
+        finally:
+            conn.close()
+    logger.info(
+        "Imported %d guidebook topics into %s in %.1f ms",
+        len(guidebook.topics), database_path, (time.perf_counter() - started) * 1000
+    )
+
+
+def _insert_guidebook(conn: sqlite3.Connection, guidebook: YamlGuidebook) -> None:
+    conn.executemany(
+        "INSERT INTO meta (key, value) VALUES (?, ?)",
+        [("schema_version", str(SCHEMA_VERSION)), ("source_hash", guidebook.source_hash)],
+    )
+    conn.executemany(
+        "INSERT INTO aliases (alias, name) VALUES (?, ?)",
+        guidebook.vocabulary.items(),
+    )
+    for base_topic in guidebook.topics.values():
+        _insert_topic(conn, "", base_topic)
+        for language, topic in base_topic.translations.items():
+            _insert_topic(conn, language, topic)
+        # Searched in the base language, like the in-memory index
+        conn.execute(
+            "INSERT INTO topics_fts (topic, description, text) VALUES (?, ?, ?)",
+            (
+                base_topic.name,
+                " ".join(tokenize(base_topic.description)),
+                " ".join(
+                    word
+                    for text in topic_text("", base_topic.contents)
+                    for word in tokenize(text)
+                ),
+            ),
+        )
+
+
+def _insert_topic(conn: sqlite3.Connection, language: str, topic: Topic) -> None:
+    topic_id = conn.execute(
+        """
+        INSERT INTO topics (name, language, description, is_dict)
+        VALUES (?, ?, ?, ?)
+        """,
+        (topic.name, language, topic.description, isinstance(topic.contents, Mapping)),
+    ).lastrowid
+    if isinstance(topic.contents, Mapping):
+        sections: List[Tuple[Optional[str], Tuple[str, ...]]] = list(
+            topic.contents.items()
+        )
+    else:
+        sections = [(None, tuple(topic.contents))]
+
+    for key, items in sections:
+        section_id = conn.execute(
+            "INSERT INTO sections (topic_id, key, key_lower) VALUES (?, ?, ?)",
+            (topic_id, key, key.lower() if key is not None else None),
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO items (section_id, position, text) VALUES (?, ?, ?)",
+            [(section_id, position, text) for position, text in enumerate(items)],
+        )
+
+
+def main() -> None:
+    """Import the guidebook configured in settings.toml."""
+    logging.basicConfig(level=logging.INFO)
+    settings = load_toml_settings("settings.toml")
+    database_path = settings.get("GUIDEBOOK_DATABASE_PATH") or "src/knowledgebase/guidebook.db"
+    import_guidebook(
+        YamlGuidebook(settings["GUIDEBOOK_PATH"], settings["VOCABULARY_PATH"]),
+        database_path,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""SQLite-backed store of per-chat overlay topics.
+
+Chat admins can add local topics (their Sozialamt chat, a volunteer rota)
+on top of the shared guidebook. Topics are persisted to a local SQLite file
+and read through a bounded in-memory cache: the overlay of each chat is
+loaded once as a whole, and the least recently used chats are evicted when
+more than `cache_size` chats are cached. Chats without overlays are cached
+too, so the common case costs one dict lookup and no query.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Mapping
+
+from src.domain.models import Topic
+from src.domain.protocols import IOverlayStore, OverlayStoreError
+
+_NO_TOPICS: Mapping[str, Topic] = MappingProxyType({})
+
+
+class SqliteOverlayStore(IOverlayStore):
+    """Persist chat overlay topics to SQLite behind an LRU read-through cache."""
+
+    def __init__(self, database_path: str, *, cache_size: int = 1024) -> None:
+        """
+        Open (or create) the overlay database.
+
+        Args:
+            database_path: Path to the SQLite file (":memory:" for tests)
+            cache_size: Maximum number of chats whose overlays are cached
+        """
+        self._conn = sqlite3.connect(database_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._cache_size = max(1, cache_size)
+        self._cache: "OrderedDict[int, Mapping[str, Topic]]" = OrderedDict()
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS overlay_topics (
+                    chat_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    contents TEXT NOT NULL,
+                    updated_at INTEGER NOT NULL,
+                    PRIMARY KEY (chat_id, name)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.commit()
+
+    def get_topics(self, chat_id: int) -> Mapping[str, Topic]:
+        with self._lock:
+            topics = self._cache.get(chat_id)
+            if topics is not None:
+                self._cache.move_to_end(chat_id)
+                return topics
+
+            try:
+                rows = self._conn.execute(
+                    """
+                    SELECT name, description, contents FROM overlay_topics
+                    WHERE chat_id = ? ORDER BY name
+                    """,
+                    (chat_id,),
+                ).fetchall()
+                topics = MappingProxyType({
+                    name: Topic(
+                        name=name,
+                        description=description,
+                        contents=tuple(json.loads(contents)),
+                    )
+                    for name, description, contents in rows
+                }) if rows else _NO_TOPICS
+            except (sqlite3.Error, ValueError, TypeError) as exc:
+                raise OverlayStoreError(
+                    f"Failed to read overlay topics of chat {chat_id}"
+                ) from exc
+
+            self._cache[chat_id] = topics
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            return topics
+
+    def set_topic(self, chat_id: int, topic: Topic) -> None:
+        try:
+            with self._lock:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO overlay_topics (
+                        chat_id,
+                        name,
+                        description,
+                        contents,
+                        updated_at
+                    )
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (
+                        chat_id,
+                        topic.name,
+                        topic.description,
+                        json.dumps(list(topic.contents), ensure_ascii=False),
+                        int(time.time()),
+                    ),
+                )
+                self._conn.commit()
+                # Reload the whole chat overlay on next read
+                self._cache.pop(chat_id, None)
+        except (sqlite3.Error, TypeError, ValueError) as exc:
+            raise OverlayStoreError(
+                f"Failed to store overlay topic {topic.name} of chat {chat_id}"
+            ) from exc
+
+    def delete_topic(self, chat_id: int, name: str) -> bool:
+        try:
+            with self._lock:
+                cursor = self._conn.execute(
+                    "DELETE FROM overlay_topics WHERE chat_id = ? AND name = ?",
+                    (chat_id, name),
+                )
+                self._conn.commit()
+                self._cache.pop(chat_id, None)
+                return cursor.rowcount > 0
+        except sqlite3.Error as exc:
+            raise OverlayStoreError(
+                f"Failed to delete overlay topic {name} of chat {chat_id}"
+            ) from exc
+
+    def cached_chats(self) -> int:
+        """Return the number of chats whose overlays are cached."""
+        with self._lock:
+            return len(self._cache)
@@ -1,81 +1,391 @@
 """YAML-based guidebook implementation."""
 
+import copy
 import logging
-from typing import Any, Dict, List, Optional
-
-from yaml import safe_load
-
-from src.domain.protocols import GuidebookContent, GuidebookValidationError
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from yaml import load
+
+try:
+    # libyaml bindings are several times faster than the pure-Python loader
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+from src.domain.models import Completion, SearchHit, Topic, TopicContents
+from src.domain.protocols import (
+    GuidebookContent,
+    GuidebookError,
+    GuidebookValidationError,
+)
+from src.infrastructure.alias_index import AliasIndex
 from src.infrastructure.guidebook_formatter import format_contents, wrap_with_separator
+from src.infrastructure.guidebook_snapshot import (
+    GuidebookSnapshot,
+    compute_source_hash,
+    read_snapshot,
+    write_snapshot,
+)
+from src.infrastructure.guidebook_validation import (
+    validate_topic_structure,
+    validate_topic_translations,
+)
+from src.infrastructure.name_normalization import normalize_name
+from src.infrastructure.prefix_trie import PrefixTrie, completion_trie
+from src.infrastructure.search_index import SearchIndex
 
 logger = logging.getLogger(__name__)
 
+TOPIC_FILE_SUFFIXES = (".yml", ".yaml")
+# Reply to a section command without a name
+SECTION_PROMPTS = {
+    "cities": "Пожалуйста, уточните название города или почтовый индекс: /cities Name\n",
+    "countries": "Пожалуйста, уточните название страны: /countries Name\n",
+}
+# Below this many topic files starting a process pool costs more than it saves
+PARALLEL_MIN_FILES = 200
+# Shorter section names ("b", "ap") match only exactly, not by prefix or typo
+SECTION_MATCH_MIN_LENGTH = 3
+# Reply to a section name that matches no section, or several
+SECTION_NOT_FOUND = (
+    "К сожалению, мы пока не располагаем информацией по запросу {topic}, {name}."
+)
+SECTION_SUGGESTIONS = "\nВозможно, вы имели в виду:\n"
+# Sections suggested for a name that starts several of them
+MAX_SECTION_SUGGESTIONS = 3
+
 
 class YamlGuidebook:
     """YAML-based implementation of guidebook data access."""
 
-    def __init__(self, guidebook_path: str, vocabulary_path: str) -> None:
+    def __init__(
+        self,
+        guidebook_path: str,
+        vocabulary_path: str,
+        snapshot_path: Optional[str] = None,
+        *,
+        max_workers: Optional[int] = None,
+    ) -> None:
         """Initialize the guidebook from YAML files.
 
         Args:
-            guidebook_path: Path to guidebook.yml
+            guidebook_path: Path to guidebook.yml, or to a directory with one
+                `<topic>.yml` file per topic
             vocabulary_path: Path to vocabulary.yml (aliases for cities)
+            snapshot_path: Optional compiled snapshot of the same sources.
+                Used instead of parsing the YAML when its source hash matches.
+            max_workers: Processes used to parse a topic directory
+                (default: available CPUs); 1 parses in this process
+        """
+        started = time.perf_counter()
+
+        self._vocabulary_path = vocabulary_path
+        self.topic_directory: Optional[str] = None
+        topic_sources: Optional[Dict[str, bytes]] = None
+        with open(vocabulary_path, "rb") as f:
+            vocabulary_source = f.read()
+        if os.path.isdir(guidebook_path):
+            self.topic_directory = os.path.abspath(guidebook_path)
+            topic_sources = read_topic_sources(self.topic_directory)
+            self.source_hash = _directory_hash(topic_sources, vocabulary_source)
+        else:
+            with open(guidebook_path, "rb") as f:
+                guidebook_source = f.read()
+            self.source_hash = compute_source_hash(guidebook_source, vocabulary_source)
+
+        snapshot = (
+            read_snapshot(snapshot_path, self.source_hash) if snapshot_path else None
+        )
+        self.topics: Mapping[str, Topic]
+        # Built on the first complete() call: only inline mode needs it
+        self._completions: Optional[PrefixTrie[Completion]] = None
+        if snapshot is not None:
+            self.topics = MappingProxyType(snapshot.topics)
+            self._lowercase_cache = self._build_lowercase_cache(self.topics)
+            self.vocabulary = snapshot.vocabulary
+            self._alias_indexes = self._build_alias_indexes()
+            self._search_index = snapshot.search_index or self._build_search_index()
+            logger.info(
+                "Loaded guidebook from snapshot %s in %.1f ms",
+                snapshot_path, (time.perf_counter() - started) * 1000
+            )
+            return
+
+        if topic_sources is not None:
+            # Topic files are validated by the workers that parse them
+            raw_topics = parse_topic_files(topic_sources, max_workers)
+        else:
+            raw_topics = self._parse_topics(guidebook_source)
+
+            # Validate all topic contents match expected structure
+            for topic_name, topic_info in raw_topics.items():
+                validate_topic_structure(topic_name, topic_info["contents"])
+                validate_topic_translations(topic_name, topic_info["translations"])
+
+        self.topics = MappingProxyType({
+            topic_name: freeze_topic(
+                topic_name,
+                topic_info["description"],
+                topic_info["contents"],
+                topic_info["translations"],
+            )
+            for topic_name, topic_info in raw_topics.items()
+        })
+
+        self._lowercase_cache = self._build_lowercase_cache(self.topics)
+        self.vocabulary = self._parse_vocabulary(vocabulary_source)
+        self._alias_indexes = self._build_alias_indexes()
+        self._search_index = self._build_search_index()
+        logger.info(
+            "Loaded %d guidebook topics from %s in %.1f ms",
+            len(self.topics), guidebook_path, (time.perf_counter() - started) * 1000
+        )
+
+    def reload_topic(self, topic_path: str) -> "YamlGuidebook":
+        """Build a copy of this guidebook with a single topic file re-read.
+
+        Only the given file is parsed; all other topics are shared with this
+        guidebook, which itself is left unchanged. A topic whose file no
+        longer exists is removed.
+
+        Args:
+            topic_path: Path of a topic file in the guidebook directory
+
+        Returns:
+            The updated guidebook
+
+        Raises:
+            GuidebookError: If this guidebook was not loaded from a directory,
+                or the file is outside of it
+            GuidebookValidationError: If the topic file is invalid
+        """
+        directory = os.path.dirname(os.path.abspath(topic_path))
+        if self.topic_directory is None or directory != self.topic_directory:
+            raise GuidebookError(
+                f"{topic_path} is not a topic file of this guidebook"
+            )
+
+        topic_sources = read_topic_sources(self.topic_directory)
+        reloaded_name = topic_file_name(topic_path)
+        topics: Dict[str, Topic] = {}
+        for topic_name, source in topic_sources.items():
+            if topic_name == reloaded_name:
+                topic_info = parse_topic_file(topic_name, source)
+                topics[topic_name] = freeze_topic(
+                    topic_name,
+                    topic_info["description"],
+                    topic_info["contents"],
+                    topic_info["translations"],
+                )
+            elif topic_name in self.topics:
+                topics[topic_name] = self.topics[topic_name]
+
+        with open(self._vocabulary_path, "rb") as f:
+            vocabulary_source = f.read()
+
+        reloaded = copy.copy(self)
+        reloaded.topics = MappingProxyType(topics)
+        reloaded.source_hash = _directory_hash(topic_sources, vocabulary_source)
+        reloaded._lowercase_cache = self._build_lowercase_cache(reloaded.topics)
+        # pylint: disable-next=protected-access
+        reloaded._alias_indexes = reloaded._build_alias_indexes()
+        # pylint: disable-next=protected-access
+        reloaded._search_index = reloaded._build_search_index()
+        reloaded._completions = None
+        logger.info("Reloaded guidebook topic %s", reloaded_name)
+        return reloaded
+
+    def for_region(self, guidebook_path: str, vocabulary_path: str) -> "YamlGuidebook":
+        """Build a regional guidebook: this guidebook with a region's topics on top.
+
+        The region's YAML only needs the topics that are new or different
+        for the region. Every other topic, and every topic the region
+        repeats unchanged, is the same Topic object (and lowercase section
+        view) as in this guidebook, so shared content is stored once.
+        The region gets its own lowercase and alias indexes.
+
+        Args:
+            guidebook_path: Path to the region's guidebook file or directory
+            vocabulary_path: Path to the region's vocabulary.yml; its aliases
+                are added to this guidebook's
+
+        Returns:
+            The regional guidebook
         """
-        with open(guidebook_path, "r", encoding="utf-8") as f:
-            raw_guidebook: Dict[str, Dict[str, Any]] = safe_load(f)
+        local = YamlGuidebook(guidebook_path, vocabulary_path)
+
+        topics = dict(self.topics)
+        for topic_name, topic in local.topics.items():
+            if topics.get(topic_name) != topic:
+                topics[topic_name] = topic
+
+        regional = copy.copy(self)
+        regional.topics = MappingProxyType(topics)
+        regional._lowercase_cache = {
+            topic_name: (
+                self._lowercase_cache[topic_name]
+                if self.topics.get(topic_name) is topic
+                else lowercase_sections(topic.contents)
+            )
+            for topic_name, topic in topics.items()
+            if isinstance(topic.contents, Mapping)
+        }
+        regional.vocabulary = {**self.vocabulary, **local.vocabulary}
+        # pylint: disable-next=protected-access
+        regional._alias_indexes = regional._build_alias_indexes()
+        # pylint: disable-next=protected-access
+        regional._search_index = regional._build_search_index()
+        regional._completions = None
+        regional.source_hash = compute_source_hash(
+            self.source_hash.encode(), local.source_hash.encode()
+        )
+        # Single-file reloads would drop the region's topics
+        regional.topic_directory = None
+        return regional
+
+    @staticmethod
+    def _parse_topics(source: bytes) -> Dict[str, Dict[str, Any]]:
+        """Parse guidebook YAML into unified topic structures.
+
+        Args:
+            source: Raw guidebook.yml contents
+
+        Returns:
+            Mapping of {topic_name: {description: ..., contents: ...,
+            translations: ...}}
+        """
+        raw_guidebook: Dict[str, Dict[str, Any]] = load(source, Loader=SafeLoader)
 
-        # Store topics as unified structures: {topic_name: {description: ..., contents: ...}}
         # Topic names are stored in lowercase for case-insensitive lookups
-        self.topics: Dict[str, Dict[str, Any]] = {
+        return {
             topic_name.lower(): {
                 "description": topic_data.get("description", "") or "",
-                "contents": topic_data.get("contents")
+                "contents": topic_data.get("contents"),
+                "translations": topic_data.get("translations"),
             }
             for topic_name, topic_data in raw_guidebook.items()
         }
 
-        # Validate all topic contents match expected structure
-        for topic_name, topic_info in self.topics.items():
-            self._validate_topic_structure(topic_name, topic_info["contents"])
+    @staticmethod
+    def _build_lowercase_cache(
+        topics: Mapping[str, Topic]
+    ) -> Dict[str, Mapping[str, Tuple[str, ...]]]:
+        """Cache lowercase versions of dict keys for case-insensitive lookups.
 
-        # Cache lowercase versions of dict keys for case-insensitive subtopic/section lookups
-        # This is used for all dict-based topics (cities, countries, animals, etc.)
-        self._lowercase_cache: Dict[str, Dict[str, List[str]]] = {
-            topic_name: {
-                key.lower(): value
-                for key, value in topic_info["contents"].items()
-            }
-            for topic_name, topic_info in self.topics.items()
-            if isinstance(topic_info["contents"], dict)
+        This is used for all dict-based topics (cities, countries, animals, etc.)
+        The cached values are the topics' own tuples, not copies.
+        """
+        return {
+            topic_name: lowercase_sections(topic.contents)
+            for topic_name, topic in topics.items()
+            if isinstance(topic.contents, Mapping)
         }
 
-        # Load vocabulary aliases (currently only used for cities)
-        with open(vocabulary_path, "r", encoding="utf-8") as f:
-            self.vocabulary: Dict[str, str] = {
-                alias.lower(): name.lower()
-                for name, aliases in safe_load(f).items()
-                for alias in aliases
-            }
+    def _build_alias_indexes(self) -> Dict[str, AliasIndex]:
+        """Index the section names and aliases of every dict-based topic.
+
+        Raises:
+            GuidebookValidationError: If an alias collides with a section
+                name or stands for two sections of one topic
+        """
+        return {
+            topic_name: AliasIndex(topic_name, sections, self.vocabulary)
+            for topic_name, sections in self._lowercase_cache.items()
+        }
+
+    def _build_search_index(self) -> SearchIndex:
+        """Build the /search index of all base-language topics."""
+        return SearchIndex(
+            (name, topic.description, topic.contents)
+            for name, topic in self.topics.items()
+        )
+
+    def _build_completions(self) -> PrefixTrie[Completion]:
+        """Build the autocomplete trie of topics, cities, countries and aliases."""
+        return completion_trie(
+            ((name, topic.description) for name, topic in self.topics.items()),
+            {
+                topic_name: self._lowercase_cache[topic_name]
+                for topic_name in SECTION_PROMPTS
+                if topic_name in self._lowercase_cache
+            },
+            self.vocabulary,
+        )
+
+    @staticmethod
+    def _parse_vocabulary(source: bytes) -> Dict[str, str]:
+        """Parse vocabulary aliases of section names (cities, countries, ...).
+
+        Args:
+            source: Raw vocabulary.yml contents
 
-    def get_topic_description(self, topic: str) -> Optional[str]:
+        Returns:
+            Mapping of lowercase alias to lowercase canonical name
+
+        Raises:
+            GuidebookValidationError: If an alias is listed for two names
+        """
+        vocabulary: Dict[str, str] = {}
+        for name, aliases in load(source, Loader=SafeLoader).items():
+            for alias in aliases:
+                current = vocabulary.setdefault(alias.lower(), name.lower())
+                if current != name.lower():
+                    raise GuidebookValidationError(
+                        f"Vocabulary alias '{alias}' is listed for both "
+                        f"'{current}' and '{name.lower()}'"
+                    )
+        return vocabulary
+
+    def write_snapshot(self, snapshot_path: str) -> None:
+        """Write the loaded guidebook to a compiled snapshot file.
+
+        Args:
+            snapshot_path: Destination path of the snapshot
+        """
+        write_snapshot(
+            snapshot_path,
+            GuidebookSnapshot(
+                source_hash=self.source_hash,
+                topics=dict(self.topics),
+                vocabulary=self.vocabulary,
+                search_index=self._search_index,
+            ),
+        )
+
+    def get_topic_description(
+        self, topic: str, languages: Sequence[str] = ()
+    ) -> Optional[str]:
         """Get the description for a given topic.
 
         Args:
             topic: Topic name (case-insensitive)
+            languages: Preferred languages, most preferred first; the base
+                description is used if the topic has none of them
 
         Returns:
             Topic description string, or None if topic doesn't exist
         """
         topic_info = self.topics.get(topic.lower())
         if topic_info:
-            return topic_info["description"]
+            return topic_info.translated(languages).description
         return None
 
-    def get_topic_contents(self, topic: str) -> GuidebookContent:
+    def get_topic_contents(
+        self, topic: str, languages: Sequence[str] = ()
+    ) -> GuidebookContent:
         """Get the contents for a given topic.
 
         Args:
             topic: Topic name (case-insensitive)
+            languages: Preferred languages, most preferred first; the base
+                contents are used if the topic has none of them
 
         Returns:
             Contents as either a list of strings or a dict mapping keys to lists
@@ -87,7 +397,7 @@ class YamlGuidebook:
         if topic_lower not in self.topics:
             raise KeyError(f"Topic '{topic}' not found")
 
-        return self.topics[topic_lower]["contents"]
+        return self.topics[topic_lower].translated(languages).contents
 
     def get_topics(self) -> List[str]:
         """Get list of all available topics.
@@ -97,10 +407,52 @@ class YamlGuidebook:
         """
         return list(self.topics.keys())
 
+    def complete(self, prefix: str, limit: int = 10) -> List[Completion]:
+        """Complete a typed prefix to topics, cities and countries.
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of completions
+
+        Returns:
+            Completions, best first
+        """
+        if self._completions is None:
+            self._completions = self._build_completions()
+        return self._completions.complete(normalize_name(prefix), limit)
+
+    def search_topics(self, query: str, limit: int = 5) -> List[SearchHit]:
+        """Find the topics whose texts best match a free-text query.
+
+        Args:
+            query: Words as typed
+            limit: Maximum number of topics
+
+        Returns:
+            Hits, best first
+        """
+        return self._search_index.search(query, limit)
+
+    def find_sections(self, topic: str, name: str) -> List[str]:
+        """Find the sections of a dict-based topic a name stands for.
+
+        Args:
+            topic: Topic name (lowercase)
+            name: Section name, alias or words of it, as typed
+
+        Returns:
+            Lowercase section keys in topic order, empty if none matches
+        """
+        sections = self._lowercase_cache.get(topic)
+        if sections is None:
+            return []
+        return match_sections(sections, self._alias_indexes.get(topic), name)
+
     def get_cities(self, name: Optional[str] = None) -> str:
         """Get city information or prompt for a city.
 
-        Special handler for cities with formatting and vocabulary alias support.
+        Special handler for cities with formatting, vocabulary alias support
+        and typo-tolerant matching.
 
         Args:
             name: City name (optional, case-insensitive)
@@ -108,32 +460,18 @@ class YamlGuidebook:
         Returns:
             Formatted city information or prompt message
         """
-        if not name:
-            return wrap_with_separator(
-                "Пожалуйста, уточните название города: /cities Name\n"
-            )
-
-        # Resolve vocabulary alias if present
-        name_lower = name.lower()
-        if name_lower in self.vocabulary:
-            name_lower = self.vocabulary[name_lower]
-
-        # Look up city in lowercase cache
-        cities_cache = self._lowercase_cache.get("cities", {})
-        if name_lower not in cities_cache:
-            return (
-                "К сожалению, мы пока не располагаем информацией "
-                f"по запросу cities, {name}."
-            )
-
-        # Format city contents with title
-        city_contents = cities_cache[name_lower]
-        return format_contents(city_contents, title=name)
+        return lookup_section(
+            "cities",
+            self._lowercase_cache.get("cities", {}),
+            self._alias_indexes.get("cities"),
+            name,
+        )
 
     def get_countries(self, name: Optional[str] = None) -> str:
         """Get country information or prompt for a country.
 
-        Special handler for countries with formatting.
+        Special handler for countries with formatting, vocabulary alias
+        support and typo-tolerant matching.
 
         Args:
             name: Country name (optional, case-insensitive)
@@ -141,114 +479,313 @@ class YamlGuidebook:
         Returns:
             Formatted country information or prompt message
         """
-        if not name:
-            return wrap_with_separator(
-                "Пожалуйста, уточните название страны: /countries Name\n"
-            )
+        return lookup_section(
+            "countries",
+            self._lowercase_cache.get("countries", {}),
+            self._alias_indexes.get("countries"),
+            name,
+        )
 
-        # Look up country in lowercase cache
-        name_lower = name.lower()
-        countries_cache = self._lowercase_cache.get("countries", {})
-        if name_lower not in countries_cache:
-            return (
-                "К сожалению, мы пока не располагаем информацией "
-                f"по запросу countries, {name}."
-            )
 
-        # Format country contents with title
-        country_contents = countries_cache[name_lower]
-        return format_contents(country_contents, title=name)
+def topic_file_name(path: str) -> str:
+    """Return the lowercase topic name of a topic file path."""
+    return os.path.splitext(os.path.basename(path))[0].lower()
 
-    def _validate_topic_structure(self, topic_name: str, contents: Any) -> None:
-        """Validate that topic contents match expected structure.
 
-        Args:
-            topic_name: Name of the topic being validated
-            contents: The topic contents to validate
+def topic_file_paths(directory: str) -> List[str]:
+    """List the topic files of a guidebook directory, sorted by name.
 
-        Raises:
-            GuidebookValidationError: If contents don't match expected structure
-        """
-        if contents is None:
-            raise GuidebookValidationError(
-                f"Topic '{topic_name}': contents must be a list or dict, got NoneType"
-            )
+    Hidden files (editor swap and backup files) are skipped.
+    """
+    return sorted(
+        os.path.join(directory, entry)
+        for entry in os.listdir(directory)
+        if entry.endswith(TOPIC_FILE_SUFFIXES) and not entry.startswith(".")
+    )
 
-        if isinstance(contents, list):
-            self._validate_list_contents(topic_name, contents)
-        elif isinstance(contents, dict):
-            self._validate_dict_contents(topic_name, contents)
-        else:
-            raise GuidebookValidationError(
-                f"Topic '{topic_name}': contents must be a list or dict, "
-                f"got {type(contents).__name__}"
-            )
 
-    def _validate_list_contents(self, topic_name: str, contents: List[Any]) -> None:
-        """Validate list-based topic contents.
+def read_topic_sources(directory: str) -> Dict[str, bytes]:
+    """Read the raw contents of every topic file in a guidebook directory.
 
-        Args:
-            topic_name: Name of the topic being validated
-            contents: List contents to validate
+    Args:
+        directory: Guidebook directory
 
-        Raises:
-            GuidebookValidationError: If list items are not all non-empty strings
-        """
-        for index, item in enumerate(contents):
-            if not isinstance(item, str):
-                raise GuidebookValidationError(
-                    f"Topic '{topic_name}': list item at index {index} must be a string, "
-                    f"got {type(item).__name__}"
-                )
-            if not item:
-                raise GuidebookValidationError(
-                    f"Topic '{topic_name}': list item at index {index} is an empty string"
-                )
-
-    def _validate_dict_contents(self, topic_name: str, contents: Dict[str, Any]) -> None:
-        """Validate dict-based topic contents.
-
-        Args:
-            topic_name: Name of the topic being validated
-            contents: Dict contents to validate
+    Returns:
+        Mapping of {topic_name: file contents}, sorted by topic name
 
-        Raises:
-            GuidebookValidationError: If dict structure doesn't match Dict[str, List[str]]
-        """
-        if not contents:
-            raise GuidebookValidationError(
-                f"Topic '{topic_name}': dict contents cannot be empty"
+    Raises:
+        GuidebookError: If two files map to the same topic name
+    """
+    sources: Dict[str, bytes] = {}
+    for path in topic_file_paths(directory):
+        topic_name = topic_file_name(path)
+        if topic_name in sources:
+            raise GuidebookError(
+                f"Topic '{topic_name}' is defined by more than one file in {directory}"
             )
+        with open(path, "rb") as f:
+            sources[topic_name] = f.read()
+    return dict(sorted(sources.items()))
+
+
+def parse_topic_file(topic_name: str, source: bytes) -> Dict[str, Any]:
+    """Parse and validate one topic file.
+
+    Runs in pool worker processes, so it only takes and returns plain,
+    picklable values.
+
+    Args:
+        topic_name: Lowercase topic name
+        source: Raw topic file contents
+
+    Returns:
+        {description: ..., contents: ..., translations: ...}
+
+    Raises:
+        GuidebookError: If the file is not a mapping
+        GuidebookValidationError: If the contents are invalid
+    """
+    topic_data = load(source, Loader=SafeLoader)
+    if not isinstance(topic_data, dict):
+        raise GuidebookError(
+            f"Topic '{topic_name}': file must contain description and contents"
+        )
+    contents = topic_data.get("contents")
+    translations = topic_data.get("translations")
+    validate_topic_structure(topic_name, contents)
+    validate_topic_translations(topic_name, translations)
+    return {
+        "description": topic_data.get("description", "") or "",
+        "contents": contents,
+        "translations": translations,
+    }
+
+
+def parse_topic_files(
+    sources: Dict[str, bytes], max_workers: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Parse and validate topic files, in a process pool for large directories.
+
+    Args:
+        sources: Mapping of {topic_name: file contents}
+        max_workers: Maximum worker processes (default: available CPUs)
+
+    Returns:
+        Mapping of {topic_name: {description: ..., contents: ...}} in the
+        order of `sources`
+    """
+    if max_workers is None:
+        max_workers = _available_cpus()
+    workers = min(max_workers, len(sources))
+    if workers <= 1 or len(sources) < PARALLEL_MIN_FILES:
+        return {
+            topic_name: parse_topic_file(topic_name, source)
+            for topic_name, source in sources.items()
+        }
 
-        for section_key, section_value in contents.items():
-            # Validate key is a non-empty string
-            if not isinstance(section_key, str):
-                raise GuidebookValidationError(
-                    f"Topic '{topic_name}': section key must be a string, "
-                    f"got {type(section_key).__name__}"
-                )
-            if not section_key:
-                raise GuidebookValidationError(
-                    f"Topic '{topic_name}': section key is an empty string"
-                )
-
-            # Validate value is a list
-            if not isinstance(section_value, list):
-                raise GuidebookValidationError(
-                    f"Topic '{topic_name}', section '{section_key}': value must be a list, "
-                    f"got {type(section_value).__name__}"
-                )
-
-            # Validate list items are non-empty strings
-            for index, item in enumerate(section_value):
-                if not isinstance(item, str):
-                    raise GuidebookValidationError(
-                        f"Topic '{topic_name}', section '{section_key}': "
-                        f"list item at index {index} must be a string, "
-                        f"got {type(item).__name__}"
-                    )
-                if not item:
-                    raise GuidebookValidationError(
-                        f"Topic '{topic_name}', section '{section_key}': "
-                        f"list item at index {index} is an empty string"
-                    )
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+        parsed = pool.map(
+            parse_topic_file,
+            sources.keys(),
+            sources.values(),
+            chunksize=max(1, len(sources) // (workers * 4)),
+        )
+        return dict(zip(sources.keys(), parsed))
+
+
+def guidebook_source_hash(guidebook_path: str, vocabulary_path: str) -> str:
+    """Hash guidebook sources without parsing them.
+
+    Matches YamlGuidebook.source_hash of a guidebook loaded from the same
+    paths, for either layout.
+
+    Args:
+        guidebook_path: Path to guidebook.yml or to a topic directory
+        vocabulary_path: Path to vocabulary.yml
+
+    Returns:
+        Hex-encoded sha256 digest
+    """
+    with open(vocabulary_path, "rb") as f:
+        vocabulary_source = f.read()
+    if os.path.isdir(guidebook_path):
+        return _directory_hash(
+            read_topic_sources(os.path.abspath(guidebook_path)), vocabulary_source
+        )
+    with open(guidebook_path, "rb") as f:
+        return compute_source_hash(f.read(), vocabulary_source)
+
+
+def _available_cpus() -> int:
+    """Return the number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _pool_context() -> Any:
+    """Pick the cheapest safe way to start pool workers.
+
+    Forking is an order of magnitude faster than a fork server, but a child
+    forked while other threads run (the reload watcher, the bot's event loop)
+    can inherit locks held by them. Startup loads run single-threaded.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if "fork" in methods and threading.active_count() == 1:
+        return multiprocessing.get_context("fork")
+    if "forkserver" in methods:
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context()
+
+
+def _directory_hash(topic_sources: Dict[str, bytes], vocabulary_source: bytes) -> str:
+    """Hash a topic directory, including its file names, and the vocabulary."""
+    parts: List[bytes] = []
+    for topic_name, source in topic_sources.items():
+        parts.extend((topic_name.encode("utf-8"), source))
+    return compute_source_hash(*parts, vocabulary_source)
+
+
+def freeze_topic(
+    name: str,
+    description: str,
+    contents: Any,
+    translations: Optional[Mapping[str, Mapping[str, Any]]] = None,
+) -> Topic:
+    """Build an immutable Topic from validated, freshly parsed contents.
+
+    Lists become tuples and dicts become read-only mappings. Section headers
+    and items are interned, so links repeated across topics are stored once.
+    A translation without its own contents shares the base topic's.
+
+    Args:
+        name: Lowercase topic name
+        description: Topic description
+        contents: Validated list or dict contents
+        translations: Validated {language: {description, contents}} variants
+
+    Returns:
+        The frozen topic
+    """
+    frozen = _freeze_contents(contents)
+    frozen_translations: Dict[str, Topic] = {}
+    for language, translation in (translations or {}).items():
+        frozen_translations[sys.intern(language.lower())] = Topic(
+            name=sys.intern(name),
+            description=translation.get("description") or description,
+            contents=(
+                _freeze_contents(translation["contents"])
+                if "contents" in translation else frozen
+            ),
+        )
+    if not frozen_translations:
+        return Topic(name=sys.intern(name), description=description, contents=frozen)
+    return Topic(
+        name=sys.intern(name),
+        description=description,
+        contents=frozen,
+        translations=MappingProxyType(frozen_translations),
+    )
+
+
+def _freeze_contents(contents: Any) -> TopicContents:
+    intern = sys.intern
+    if isinstance(contents, dict):
+        return MappingProxyType({
+            intern(key): tuple(intern(item) for item in items)
+            for key, items in contents.items()
+        })
+    return tuple(intern(item) for item in contents)
+
+
+def lowercase_sections(
+    contents: Mapping[str, Tuple[str, ...]]
+) -> Mapping[str, Tuple[str, ...]]:
+    """Return a read-only view of dict contents keyed by lowercase key."""
+    return MappingProxyType({
+        sys.intern(key.lower()): value for key, value in contents.items()
+    })
+
+
+def match_sections(
+    sections_cache: Mapping[str, Tuple[str, ...]],
+    aliases: Optional[AliasIndex],
+    name: str,
+) -> List[str]:
+    """Return the sections of a dict-based topic a name stands for.
+
+    Args:
+        sections_cache: Lowercase section key to section contents
+        aliases: Names and aliases of the topic's sections
+        name: Section name, alias or words of it, as typed
+
+    Returns:
+        The exact section or alias; else, for names of at least
+        SECTION_MATCH_MIN_LENGTH characters, the sections with a word
+        starting with every word of the name, else the one closest name.
+        Lowercase keys in topic order, empty if nothing matches.
+    """
+    section = name.strip().lower()
+    if section in sections_cache:
+        return [section]
+    if aliases is None:
+        return []
+    resolved = aliases.resolve(name)
+    if resolved is not None:
+        return [resolved]
+    if not _matchable(name):
+        return []
+    prefixed = aliases.prefixed(name)
+    if prefixed:
+        return prefixed
+    matches = aliases.suggest(name)
+    if len(matches) == 1 or (matches and matches[0][1] < matches[1][1]):
+        return [matches[0][0]]
+    return []
+
+
+def _matchable(name: str) -> bool:
+    """Return whether a name is long enough to match sections by prefix or typo."""
+    return len(normalize_name(name).replace(" ", "")) >= SECTION_MATCH_MIN_LENGTH
+
+
+def lookup_section(
+    topic_name: str,
+    sections_cache: Mapping[str, Tuple[str, ...]],
+    aliases: Optional[AliasIndex],
+    name: Optional[str],
+) -> str:
+    """Format one section of a dict-based topic, resolving aliases and typos.
+
+    The name is resolved by match_sections, as for topic commands; a name
+    that starts several sections or is equally close to several gets them
+    as suggestions.
+
+    Args:
+        topic_name: Name of the topic (cities, countries, ...)
+        sections_cache: Lowercase section key to section contents
+        aliases: Names and aliases of the topic's sections
+        name: Section name or alias (optional, case-insensitive)
+
+    Returns:
+        Formatted section, suggestions or prompt message
+    """
+    if not name:
+        return wrap_with_separator(
+            SECTION_PROMPTS.get(topic_name, f"Пожалуйста, уточните: /{topic_name} Name\n")
+        )
+
+    sections = match_sections(sections_cache, aliases, name)
+    if len(sections) == 1:
+        return format_contents(sections_cache[sections[0]], title=sections[0])
+
+    not_found = SECTION_NOT_FOUND.format(topic=topic_name, name=name)
+    if not sections and aliases is not None and _matchable(name):
+        # Equally close names
+        sections = [section for section, _ in aliases.suggest(name)]
+    if not sections:
+        return not_found
+    suggestions = "\n".join(
+        f"/{topic_name} {section.title()}" for section in sections[:MAX_SECTION_SUGGESTIONS]
+    )
+    return f"{not_found}{SECTION_SUGGESTIONS}{suggestions}"
@@ -1,14 +1,40 @@
 """main module running the bot"""
 
+import functools
 import logging
+from typing import Any, Callable, Dict, Mapping
 
-from src.infrastructure.config_loader import load_env_config, load_toml_settings
+from src.infrastructure.config_loader import env_setting, load_env_config, load_toml_settings
+from src.domain.protocols import GuidebookError, IGuidebook
+from src.infrastructure.city_locator import CityLocator
+from src.infrastructure.lazy_yaml_guidebook import LazyYamlGuidebook
+from src.infrastructure.plz_index import PlzIndex
+from src.infrastructure.sqlite_guidebook import SqliteGuidebook
+from src.infrastructure.sqlite_overlay_store import SqliteOverlayStore
 from src.infrastructure.yaml_guidebook import YamlGuidebook
+from src.infrastructure.guidebook_watcher import GuidebookWatcher
 from src.infrastructure.sqlite_statistics import StatisticsServiceSQLite
 from src.application.berlin_help_service import BerlinHelpService
 from src.adapters.telegram_adapter import TelegramBotAdapter
 
 
+def load_region(base: IGuidebook, guidebook_path: str, vocabulary_path: str) -> IGuidebook:
+    """Build a regional guidebook on top of the base guidebook."""
+    if not isinstance(base, YamlGuidebook):
+        raise GuidebookError("Regional guidebooks need the in-memory YAML guidebook")
+    return base.for_region(guidebook_path, vocabulary_path)
+
+
+def load_regions(
+    base: IGuidebook, regions_config: Mapping[str, Mapping[str, Any]]
+) -> Dict[str, IGuidebook]:
+    """Build every configured regional guidebook on top of the base guidebook."""
+    return {
+        name: load_region(base, region["GUIDEBOOK_PATH"], region["VOCABULARY_PATH"])
+        for name, region in regions_config.items()
+    }
+
+
 def main() -> None:
     """Start the bot with dependency injection."""
     # 0. Configure logging
@@ -22,13 +48,70 @@ def main() -> None:
     settings = load_toml_settings("settings.toml")
 
     # 2. Create infrastructure (concrete implementations)
-    guidebook = YamlGuidebook(
-        guidebook_path=settings["GUIDEBOOK_PATH"],
-        vocabulary_path=settings["VOCABULARY_PATH"]
-    )
+    guidebook: IGuidebook
+    guidebook_loader: Callable[[str, str], IGuidebook]
+    database_path = settings.get("GUIDEBOOK_DATABASE_PATH", "")
+    lazy = not database_path and settings.get("GUIDEBOOK_LAZY", False)
+    prerender = settings.get("PRERENDER_REPLIES", False)
+    if database_path:
+        # Serve topics from SQLite, re-imported whenever the YAML changes
+        def guidebook_loader(guidebook_path: str, vocabulary_path: str) -> IGuidebook:
+            return SqliteGuidebook.from_yaml(guidebook_path, vocabulary_path, database_path)
+
+        guidebook = guidebook_loader(settings["GUIDEBOOK_PATH"], settings["VOCABULARY_PATH"])
+    elif lazy:
+        # Parse topics on first use instead of at startup; reloads validate
+        # every topic so a broken file keeps the previous version serving
+        guidebook_loader = functools.partial(LazyYamlGuidebook, validate=True)
+        guidebook = LazyYamlGuidebook(
+            guidebook_path=settings["GUIDEBOOK_PATH"],
+            vocabulary_path=settings["VOCABULARY_PATH"],
+        )
+    else:
+        guidebook_loader = YamlGuidebook
+        guidebook = YamlGuidebook(
+            guidebook_path=settings["GUIDEBOOK_PATH"],
+            vocabulary_path=settings["VOCABULARY_PATH"],
+            snapshot_path=settings.get("GUIDEBOOK_SNAPSHOT_PATH"),
+        )
+
+    if lazy and prerender:
+        # Prerendering would parse every topic at startup
+        logging.getLogger(__name__).warning(
+            "PRERENDER_REPLIES is ignored with GUIDEBOOK_LAZY; replies render on request"
+        )
+        prerender = False
+
+    # Regional guidebooks, selected per chat
+    regions_config: Dict[str, Dict[str, Any]] = settings.get("REGIONS", {})
+    chat_regions = {
+        chat_id: name
+        for name, region in regions_config.items()
+        for chat_id in region.get("CHATS", [])
+    }
+
+    # Local topics must outlive restarts: the environment can move them to
+    # persistent storage
+    overlay_database_path = env_setting(settings, "OVERLAY_DATABASE_PATH")
 
     # 3. Create application services
-    berlin_help_service = BerlinHelpService(guidebook=guidebook)
+    berlin_help_service = BerlinHelpService(
+        guidebook=guidebook,
+        regions=load_regions(guidebook, regions_config) if regions_config else None,
+        chat_regions=chat_regions,
+        overlays=SqliteOverlayStore(
+            overlay_database_path,
+            cache_size=settings.get("OVERLAY_CACHE_CHATS", 1024),
+        ) if overlay_database_path else None,
+        language_fallbacks=settings.get("LANGUAGES", {}),
+        # Opened on the first /cities 12345, not here
+        postal_codes=PlzIndex(settings["PLZ_RANGES_PATH"])
+        if settings.get("PLZ_RANGES_PATH") else None,
+        city_locator=CityLocator.from_csv(settings["CITY_COORDINATES_PATH"])
+        if settings.get("CITY_COORDINATES_PATH") else None,
+        prerender=prerender,
+        parse_mode=settings.get("REPLY_PARSE_MODE") or None,
+    )
     stats_service = StatisticsServiceSQLite()
 
     # 4. Create adapter (only depends on service, not guidebook directly)
@@ -38,9 +121,49 @@ def main() -> None:
         stats_service=stats_service,
     )
 
-    # 5. Build and run
+    # 5. Build the application
     application = telegram_adapter.build_application()
 
+    # 6. Hot-reload guidebook edits without a restart
+    reload_interval = float(settings.get("GUIDEBOOK_RELOAD_INTERVAL", 0))
+    if reload_interval > 0:
+        def on_reload(new_guidebook: IGuidebook) -> None:
+            # Regions share the base guidebook's topics, so rebuild them too
+            regions = load_regions(new_guidebook, regions_config) if regions_config else {}
+            telegram_adapter.refresh_topics(
+                berlin_help_service.swap_guidebook(new_guidebook)
+            )
+            for name, regional in regions.items():
+                telegram_adapter.refresh_topics(
+                    berlin_help_service.swap_guidebook(regional, region=name)
+                )
+
+        GuidebookWatcher(
+            guidebook_path=settings["GUIDEBOOK_PATH"],
+            vocabulary_path=settings["VOCABULARY_PATH"],
+            on_reload=on_reload,
+            interval=reload_interval,
+            loader=guidebook_loader,
+            guidebook=guidebook,
+        ).start()
+
+        for name, region in regions_config.items():
+            def on_region_reload(regional: IGuidebook, name: str = name) -> None:
+                telegram_adapter.refresh_topics(
+                    berlin_help_service.swap_guidebook(regional, region=name)
+                )
+
+            GuidebookWatcher(
+                guidebook_path=region["GUIDEBOOK_PATH"],
+                vocabulary_path=region["VOCABULARY_PATH"],
+                on_reload=on_region_reload,
+                interval=reload_interval,
+                loader=lambda guidebook_path, vocabulary_path: load_region(
+                    berlin_help_service.guidebook, guidebook_path, vocabulary_path
+                ),
+            ).start()
+
+    # 7. Run
     if app_name == "TESTING":
         application.run_polling(
             poll_interval=1.0,           # Poll every 1 second
@@ -1,8 +1,18 @@
 """Integration tests using real YamlGuidebook with actual YAML files."""
 
+import re
+from html.parser import HTMLParser
 import pytest
+from src.infrastructure.city_locator import CityLocator
+from src.infrastructure.guidebook_formatter import (
+    HTML,
+    MARKDOWN_V2,
+    TELEGRAM_MESSAGE_LIMIT,
+    escape,
+    utf16_length,
+)
 from src.infrastructure.yaml_guidebook import YamlGuidebook
-from src.application.berlin_help_service import BerlinHelpService
+from src.application.berlin_help_service import LEGACY_COMMANDS, BerlinHelpService
 
 
 @pytest.fixture
@@ -14,6 +24,41 @@ def real_guidebook():
     )
 
 
+class _TelegramHtml(HTMLParser):
+    """Collects the errors Telegram would reject an HTML message for."""
+
+    def __init__(self):
+        super().__init__()
+        self.open_tags = []
+        self.errors = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in ("b", "a") or (tag == "a" and [name for name, _ in attrs] != ["href"]):
+            self.errors.append(tag)
+        self.open_tags.append(tag)
+
+    def handle_endtag(self, tag):
+        if not self.open_tags or self.open_tags.pop() != tag:
+            self.errors.append(f"/{tag}")
+
+
+def _is_telegram_html(text):
+    parser = _TelegramHtml()
+    parser.feed(text)
+    parser.close()
+    unknown_entity = re.search(r"&(?!(?:amp|lt|gt|quot);)", text)
+    return not parser.errors and not parser.open_tags and unknown_entity is None
+
+
+_MARKDOWN_V2_LINK = re.compile(r"\[((?:\\.|[^\\\]])*)\]\((?:\\.|[^\\)])*\)")
+
+
+def _is_markdown_v2(text):
+    """Check every reserved character is escaped or bold or link markup."""
+    text = re.sub(r"\\.", "", _MARKDOWN_V2_LINK.sub(r"\1", text))
+    return text.count("*") % 2 == 0 and re.search(r"[_\[\]()~`>#+\-=|{}.!\\]", text) is None
+
+
 @pytest.fixture
 def service(real_guidebook):
     """Create a BerlinHelpService with real guidebook."""
@@ -108,3 +153,154 @@ class TestServiceWithRealGuidebook:
             assert len(result) > len(f"#{topic}\n")
             # Should not be an error message
             assert "не располагаем информацией" not in result
+
+    def test_questions_are_routed_to_topics(self, service):
+        """Test clear questions get their topic and vague ones suggestions."""
+        assert service.handle_question("Где найти жильё?").startswith("#accommodation\n")
+        assert service.handle_question("курсы немецкого").startswith("#deutsch\n")
+        assert service.handle_question("потерял паспорт").startswith("Возможно")
+
+    def test_topic_sections(self, service):
+        """Test a topic command with words sends only the matching sections."""
+        whole = service.handle_topic("medical")
+        section = service.handle_topic("medical", section="аптеки")
+
+        assert section.startswith("#medical\n")
+        assert "aponet.de" in section
+        assert len(section) < len(whole) // 5
+        assert service.handle_topic("medical", section="qqq") == whole
+
+    def test_legacy_and_misspelled_commands(self, service):
+        """Test renamed commands resolve and typos get the closest topics."""
+        for command, topic in LEGACY_COMMANDS.items():
+            assert service.resolve_command(command) == topic
+        assert "/accommodation" in service.suggest_commands("acommodation")
+        assert "/kindergeld" in service.suggest_commands("kindergled")
+
+    def test_locations_are_answered_with_nearest_cities(self, real_guidebook):
+        """Test a shared location lists the nearest cities and their chats."""
+        service = BerlinHelpService(
+            guidebook=real_guidebook,
+            city_locator=CityLocator.from_csv("src/knowledgebase/city_coordinates.csv"),
+        )
+
+        result = service.handle_location(52.5163, 13.3777)
+
+        assert result.startswith("Ближайшие города: Berlin (2 км), Potsdam (")
+        assert "https://t.me/berlinhelpsukrainians" in result
+
+    def test_prerendered_replies_match_rendering_on_request(self, real_guidebook):
+        """Test pre-rendered replies are the ones requests would render."""
+        languages = {"uk": ["uk"], "de": ["en"]}
+        prerendered = BerlinHelpService(
+            guidebook=real_guidebook, language_fallbacks=languages, prerender=True
+        )
+        on_request = BerlinHelpService(guidebook=real_guidebook, language_fallbacks=languages)
+
+        for topic in real_guidebook.get_topics():
+            for language in (None, "uk", "de"):
+                assert prerendered.handle_topic(topic, language=language) == (
+                    on_request.handle_topic(topic, language=language)
+                )
+        for name in [None, *real_guidebook.get_topic_contents("cities")]:
+            assert prerendered.handle_cities(name) == on_request.handle_cities(name)
+        for name in [None, *real_guidebook.get_topic_contents("countries")]:
+            assert prerendered.handle_countries(name) == on_request.handle_countries(name)
+        assert prerendered.handle_cities(None, show_all=True) == (
+            on_request.handle_cities(None, show_all=True)
+        )
+        assert prerendered.handle_countries(None, show_all=True) == (
+            on_request.handle_countries(None, show_all=True)
+        )
+        assert prerendered.render_cache.misses == 0
+
+    def test_long_replies_split_into_telegram_messages(self, real_guidebook):
+        """Test every topic and listing is sent in messages within Telegram's limit."""
+        service = BerlinHelpService(guidebook=real_guidebook, prerender=True)
+        replies = [service.handle_topic(topic) for topic in real_guidebook.get_topics()]
+        replies.append(service.handle_cities(None, show_all=True))
+        replies.append(service.handle_countries(None, show_all=True))
+
+        for reply in replies:
+            parts = service.split_reply(reply)
+            assert "".join(parts) == reply
+            assert all(utf16_length(part) <= TELEGRAM_MESSAGE_LIMIT for part in parts)
+            if len(reply) > TELEGRAM_MESSAGE_LIMIT // 2:
+                assert service.render_cache.parts(reply) is parts
+
+    @pytest.mark.parametrize(
+        "parse_mode, is_valid", [(HTML, _is_telegram_html), (MARKDOWN_V2, _is_markdown_v2)]
+    )
+    def test_replies_in_parse_mode_are_valid_markup(self, real_guidebook, parse_mode, is_valid):
+        """Test every topic, city, country and listing is valid markup, message by message."""
+        service = BerlinHelpService(
+            guidebook=real_guidebook, prerender=True, parse_mode=parse_mode
+        )
+        replies = [service.handle_topic(topic) for topic in real_guidebook.get_topics()]
+        replies += [service.handle_cities(name) for name in [None, "Berlni", "Atlantis"]]
+        replies += [service.handle_countries(name) for name in [None, "Polen"]]
+        replies.append(service.handle_cities(None, show_all=True))
+        replies.append(service.handle_countries(None, show_all=True))
+        replies.append(service.handle_topic("medical", section="аптеки"))
+
+        for reply in replies:
+            assert all(is_valid(part) for part in service.split_reply(reply)), reply
+        assert "@berlinhelpsukrainians" in service.handle_cities("Berlin")
+        assert service.handle_cities("Berlin", plain=True) == (
+            BerlinHelpService(guidebook=real_guidebook).handle_cities("Berlin")
+        )
+
+    def test_parse_modes_pick_the_same_section(self, real_guidebook):
+        """Test plain text and HTML answer every section name prefix with the same section."""
+        plain = BerlinHelpService(guidebook=real_guidebook)
+        html = BerlinHelpService(guidebook=real_guidebook, parse_mode=HTML)
+
+        for topic, handle in (("cities", "handle_cities"), ("countries", "handle_countries")):
+            for section in real_guidebook.get_topic_contents(topic):
+                for name in {section[:3], section[:4], section[:6]}:
+                    keys = real_guidebook.find_sections(topic, name)
+                    plain_reply = getattr(plain, handle)(name)
+                    html_reply = getattr(html, handle)(name)
+                    if len(keys) == 1:
+                        assert plain_reply == getattr(plain, handle)(keys[0]), name
+                        assert html_reply == getattr(html, handle)(keys[0]), name
+                    else:
+                        assert html_reply == escape(plain_reply, HTML), name
+        assert "Augsburg" in plain.handle_cities("Aug")
+
+    def test_unchanged_reload_keeps_rendered_replies(self, real_guidebook):
+        """Test a reload with the same sources serves the rendered replies."""
+        service = BerlinHelpService(guidebook=real_guidebook)
+        service.handle_topic("accommodation")
+        service.handle_cities("Berlin")
+
+        service.swap_guidebook(YamlGuidebook(
+            guidebook_path="src/knowledgebase/guidebook.yml",
+            vocabulary_path="src/knowledgebase/vocabulary.yml",
+        ))
+        service.handle_topic("accommodation")
+        service.handle_cities("berlin")
+        service.handle_cities("Берлин")
+
+        assert (service.render_cache.hits, service.render_cache.misses) == (2, 3)
+
+    @pytest.mark.parametrize(
+        "parse_mode, is_valid", [(HTML, _is_telegram_html), (MARKDOWN_V2, _is_markdown_v2)]
+    )
+    def test_listing_pages_cover_the_listing(self, real_guidebook, parse_mode, is_valid):
+        """Test every listing page is one valid message and the pages show every section."""
+        service = BerlinHelpService(guidebook=real_guidebook, parse_mode=parse_mode)
+
+        for topic in ("cities", "countries"):
+            first = service.handle_listing_page(topic)
+            pages = [service.handle_listing_page(topic, page) for page in range(first.pages)]
+
+            assert [page.page for page in pages] == list(range(first.pages))
+            for page in pages:
+                assert utf16_length(page.text) <= TELEGRAM_MESSAGE_LIMIT
+                assert is_valid(page.text), page.text
+            shown = "".join(page.text for page in pages).replace("\\", "")
+            positions = [
+                shown.find(f"{section}:") for section in real_guidebook.get_topic_contents(topic)
+            ]
+            assert -1 not in positions and positions == sorted(positions)
@@ -0,0 +1,94 @@
+"""Unit tests for AliasIndex."""
+
+import pytest
+from src.domain.protocols import GuidebookValidationError
+from src.infrastructure import alias_index
+from src.infrastructure.alias_index import AliasIndex
+
+VOCABULARY = {
+    "munchen": "münchen",
+    "munich": "münchen",
+    "мюнхен": "münchen",
+    "ua": "ukraine",
+    "fam": "frankfurt am main",
+}
+
+
+@pytest.fixture
+def cities():
+    return AliasIndex(
+        "cities", ["berlin", "münchen", "frankfurt am main", "frankfurt oder"], VOCABULARY
+    )
+
+
+class TestAliasIndex:
+    """Test resolution within a topic's namespace."""
+
+    def test_resolves_normalized_names_and_aliases(self, cities):
+        assert cities.resolve("BERLIN") == "berlin"
+        assert cities.resolve("Muenchen") == "münchen"
+        assert cities.resolve("Munich") == "münchen"
+        assert cities.resolve("FAM") == "frankfurt am main"
+        assert cities.resolve("Hamburg") is None
+
+    def test_aliases_of_other_topics_are_ignored(self, cities):
+        assert cities.resolve("UA") is None
+        countries = AliasIndex("countries", ["ukraine"], VOCABULARY)
+        assert countries.resolve("UA") == "ukraine"
+        assert countries.resolve("Munich") is None
+        assert len(countries) == 2
+
+    def test_sections_with_words_starting_with_every_word(self):
+        medical = AliasIndex(
+            "medical",
+            ["где искать врачей", "поиск аптеки экстренной помощи", "врачи онлайн"],
+            {"apotheke": "поиск аптеки экстренной помощи"},
+        )
+
+        assert medical.prefixed("аптек") == ["поиск аптеки экстренной помощи"]
+        assert medical.prefixed("Apoth") == ["поиск аптеки экстренной помощи"]
+        assert medical.prefixed("врач") == ["где искать врачей", "врачи онлайн"]
+        assert medical.prefixed("врач онл") == ["врачи онлайн"]
+        assert medical.prefixed("в") == []
+        assert medical.prefixed("зубной") == []
+
+    def test_suggests_close_sections(self, cities):
+        assert cities.suggest("Berln") == [("berlin", 1)]
+        assert cities.suggest("Мюнхн") == [("münchen", 1)]
+        assert [name for name, _ in cities.suggest("Frankfrut")] == [
+            "frankfurt am main", "frankfurt oder"
+        ]
+
+
+    def test_trigram_index_is_built_with_the_namespace(self, cities, monkeypatch):
+        monkeypatch.setattr(alias_index, "FuzzyIndex", pytest.fail)
+
+        assert cities.suggest("Berln") == [("berlin", 1)]
+
+
+class TestAliasIndexCollisions:
+    """Test that ambiguous names fail when the index is built."""
+
+    def test_alias_naming_another_section(self):
+        with pytest.raises(GuidebookValidationError, match="alias 'sachsen' of 'sachsen-anhalt'"):
+            AliasIndex(
+                "cities", ["sachsen", "sachsen-anhalt"], {"sachsen": "sachsen-anhalt"}
+            )
+
+    def test_alias_of_two_sections(self):
+        with pytest.raises(GuidebookValidationError, match="'Frankfurt!' is ambiguous"):
+            AliasIndex(
+                "cities",
+                ["frankfurt am main", "frankfurt oder"],
+                {"frankfurt": "frankfurt am main", "Frankfurt!": "frankfurt oder"},
+            )
+
+    def test_sections_with_the_same_name(self):
+        with pytest.raises(GuidebookValidationError, match="sections 'zurich' and 'zürich'"):
+            AliasIndex("cities", ["zurich", "zürich"], {})
+
+    def test_same_alias_in_two_topics_is_allowed(self):
+        vocabulary = {"lux": "luxembourg"}
+
+        assert AliasIndex("cities", ["luxembourg"], vocabulary).resolve("lux") == "luxembourg"
+        assert AliasIndex("countries", ["luxembourg"], vocabulary).resolve("lux") == "luxembourg"
@@ -0,0 +1,37 @@
+"""Unit tests for atomic file replacement."""
+
+import os
+import stat
+
+import pytest
+from src.infrastructure.atomic_file import atomic_write
+
+
+class TestAtomicWrite:
+    """Test that a destination is replaced whole or not at all."""
+
+    def test_replaces_destination(self, tmp_path):
+        path = tmp_path / "index.bin"
+        path.write_bytes(b"old")
+
+        with atomic_write(str(path)) as tmp:
+            assert os.path.dirname(tmp) == str(tmp_path)
+            with open(tmp, "wb") as f:
+                f.write(b"new")
+
+        assert path.read_bytes() == b"new"
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+        assert os.listdir(tmp_path) == ["index.bin"]
+
+    def test_failed_write_keeps_destination(self, tmp_path):
+        path = tmp_path / "index.bin"
+        path.write_bytes(b"old")
+
+        with pytest.raises(RuntimeError):
+            with atomic_write(str(path)) as tmp:
+                with open(tmp, "wb") as f:
+                    f.write(b"partial")
+                raise RuntimeError("interrupted")
+
+        assert path.read_bytes() == b"old"
+        assert os.listdir(tmp_path) == ["index.bin"]
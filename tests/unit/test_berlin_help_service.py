@@ -2,8 +2,17 @@
 
 from unittest.mock import Mock, patch
 import pytest
+from src.application import berlin_help_service
 from src.application.berlin_help_service import BerlinHelpService
-from src.domain.protocols import IGuidebook
+from src.domain.models import Completion, NearbyPlace, SearchHit
+from src.domain.protocols import ICityLocator, IGuidebook, IPostalCodeIndex, OverlayStoreError
+from src.infrastructure.guidebook_formatter import (
+    HTML,
+    MARKDOWN_V2,
+    TELEGRAM_MESSAGE_LIMIT,
+    utf16_length,
+)
+from src.infrastructure.sqlite_overlay_store import SqliteOverlayStore
 
 
 @pytest.fixture
@@ -46,8 +55,113 @@ class TestBerlinHelpService:
         result = service.handle_topic("accommodation")
 
         assert result == "#accommodation\n=== Formatted content ==="
-        mock_guidebook.get_topic_contents.assert_called_once_with("accommodation")
-        mock_format.assert_called_once_with(["Item 1", "Item 2"])
+        mock_guidebook.get_topic_contents.assert_called_once_with("accommodation", ())
+        mock_format.assert_called_once_with(["Item 1", "Item 2"], parse_mode=None)
+
+    def test_split_reply_of_long_topic(self, service, mock_guidebook):
+        """Test a long topic is split at its items once, when it is rendered."""
+        items = [f"https://t.me/chat_{i} Чат номер {i} 🇺🇦" for i in range(300)]
+        mock_guidebook.get_topic_contents.return_value = items
+
+        reply = service.handle_topic("accommodation")
+        parts = service.split_reply(reply)
+
+        assert service.split_reply(reply) is parts
+        assert "".join(parts) == reply
+        assert len(parts) > 1
+        assert all(utf16_length(part) <= TELEGRAM_MESSAGE_LIMIT for part in parts)
+        assert all(part.split("\n", 1)[0] in items for part in parts[1:])
+
+    def test_split_reply_of_other_text(self, service):
+        """Test short replies are one message and long uncached ones are cut at lines."""
+        reply = "Строка ответа\n" * 1000
+
+        parts = service.split_reply(reply)
+
+        assert service.split_reply("Short") == ("Short",)
+        assert "".join(parts) == reply
+        assert all(utf16_length(part) <= TELEGRAM_MESSAGE_LIMIT for part in parts)
+        assert all(part.endswith("\n") for part in parts)
+
+    def test_parse_mode_replies_are_cached_per_mode(self, mock_guidebook):
+        """Test topics are rendered once in the parse mode and once as plain text."""
+        mock_guidebook.get_topic_contents.return_value = ["https://t.me/berlin_ua"]
+        service = BerlinHelpService(guidebook=mock_guidebook, parse_mode=HTML)
+
+        html = service.handle_topic("social_help")
+        plain = service.handle_topic("social_help", plain=True)
+
+        assert html.splitlines()[2] == '<a href="https://t.me/berlin_ua">@berlin_ua</a>'
+        assert plain.splitlines()[2] == "https://t.me/berlin_ua"
+        assert service.handle_topic("social_help") is html
+        assert mock_guidebook.get_topic_contents.call_count == 2
+
+    def test_parse_mode_aliases_are_answered_with_section_reply(self, mock_guidebook):
+        """Test aliases share the cached section reply and other names are escaped."""
+        mock_guidebook.find_sections.side_effect = lambda topic, name: (
+            ["berlin"] if name.lower() in ("berlin", "берлин") else []
+        )
+        mock_guidebook.get_topic_contents.return_value = {"Berlin": ["https://t.me/berlin_ua"]}
+        mock_guidebook.get_cities.side_effect = lambda name: f"Нет {name}."
+        service = BerlinHelpService(guidebook=mock_guidebook, parse_mode=MARKDOWN_V2)
+
+        reply = service.handle_cities("Берлин")
+
+        assert service.handle_cities("Berlin") is reply
+        assert reply.splitlines()[1:3] == ["*Berlin*", "[@berlin\\_ua](https://t.me/berlin_ua)"]
+        assert service.handle_cities("Atlantis") == "Нет Atlantis\\."
+        mock_guidebook.get_cities.assert_called_once_with(name="Atlantis")
+
+    def test_listing_pages(self, mock_guidebook):
+        """Test listings are paged by whole sections and page numbers are clamped."""
+        mock_guidebook.get_topic_contents.return_value = {
+            f"City {n}": [f"https://t.me/city_{n}"] for n in range(25)
+        }
+        service = BerlinHelpService(guidebook=mock_guidebook)
+
+        first = service.handle_listing_page("cities")
+        last = service.handle_listing_page("cities", 2)
+
+        assert (first.page, first.pages) == (0, 3)
+        assert first.text.startswith("Страница 1 из 3\n")
+        assert "City 9" in first.text and "City 10" not in first.text
+        assert service.handle_listing_page("cities", 7) is last
+        assert service.handle_listing_page("cities", -1) is first
+        mock_guidebook.get_topic_contents.assert_called_once_with("cities")
+
+    def test_single_listing_page_is_the_listing(self, mock_guidebook):
+        """Test a listing that fits on one page is sent as it is, without a header."""
+        mock_guidebook.get_topic_contents.return_value = {"Berlin": ["https://t.me/berlin_ua"]}
+        service = BerlinHelpService(guidebook=mock_guidebook)
+
+        listing = service.handle_listing_page("cities")
+
+        assert (listing.page, listing.pages) == (0, 1)
+        assert listing.text == service.handle_cities(None, show_all=True)
+
+    def test_not_found_replies_escape_only_the_name(self, mock_guidebook):
+        """Test not-found replies in a parse mode reuse their escaped fixed parts."""
+        mock_guidebook.find_sections.return_value = []
+        mock_guidebook.get_cities.side_effect = lambda name: (
+            "К сожалению, мы пока не располагаем информацией "
+            f"по запросу cities, {name}."
+        )
+        service = BerlinHelpService(guidebook=mock_guidebook, parse_mode=MARKDOWN_V2)
+        service.handle_cities("Atlantis")
+
+        with patch.object(berlin_help_service, "escape", wraps=berlin_help_service.escape) as spy:
+            reply = service.handle_cities("Mu.")
+
+        spy.assert_called_once_with("Mu.", MARKDOWN_V2)
+        assert reply == (
+            "К сожалению, мы пока не располагаем информацией "
+            "по запросу cities, Mu\\.\\."
+        )
+
+    def test_unknown_parse_mode(self, mock_guidebook):
+        """Test the service rejects a parse mode Telegram does not have."""
+        with pytest.raises(ValueError, match="Markdown"):
+            BerlinHelpService(guidebook=mock_guidebook, parse_mode="Markdown")
 
     def test_handle_cities_with_name(self, service, mock_guidebook):
         """Test handle_cities with a city name."""
@@ -58,6 +172,65 @@ class TestBerlinHelpService:
         assert result == "Berlin info"
         mock_guidebook.get_cities.assert_called_once_with(name="Berlin")
 
+    def test_handle_cities_with_postal_code(self, mock_guidebook):
+        """Test handle_cities resolves a postal code to its nearest city."""
+        postal_codes = Mock(spec=IPostalCodeIndex)
+        postal_codes.lookup.side_effect = {"10115": "Berlin"}.get
+        service = BerlinHelpService(guidebook=mock_guidebook, postal_codes=postal_codes)
+
+        service.handle_cities("10115")
+        service.handle_cities("05123")
+        service.handle_cities("Bochum")
+
+        assert [c.kwargs["name"] for c in mock_guidebook.get_cities.call_args_list] == [
+            "Berlin", "05123", "Bochum"
+        ]
+        assert postal_codes.lookup.call_count == 2
+
+    def test_handle_cities_caches_section_keys_only(self, service, mock_guidebook):
+        """Test aliases and typos are rendered on every request, cities once."""
+        mock_guidebook.find_sections.side_effect = lambda topic, name: (
+            ["berlin"] if name.lower() in ("berlin", "берлин") else []
+        )
+        mock_guidebook.get_cities.side_effect = lambda name: f"{name} info"
+
+        for name in ("Berlin", "berlin", "Берлин", "Берлин", "Brelin", "Brelin"):
+            service.handle_cities(name)
+
+        assert [c.kwargs["name"] for c in mock_guidebook.get_cities.call_args_list] == [
+            "Berlin", "Берлин", "Берлин", "Brelin", "Brelin"
+        ]
+        assert (service.render_cache.hits, service.render_cache.misses) == (1, 5)
+
+    def test_handle_location(self, mock_guidebook):
+        """Test a location is answered with the nearest cities the region has."""
+        city_locator = Mock(spec=ICityLocator)
+        city_locator.nearest.return_value = [
+            NearbyPlace("Berlin", 2.4), NearbyPlace("Zurich", 650.0),
+            NearbyPlace("Potsdam", 26.9),
+        ]
+        mock_guidebook.find_sections.side_effect = lambda topic, name: (
+            [] if name == "Zurich" else [name.lower()]
+        )
+        mock_guidebook.get_cities.side_effect = lambda name: f"{name} chats"
+        service = BerlinHelpService(guidebook=mock_guidebook, city_locator=city_locator)
+
+        result = service.handle_location(52.52, 13.40)
+
+        assert result == (
+            "Ближайшие города: Berlin (2 км), Potsdam (27 км)\nBerlin chats\nPotsdam chats"
+        )
+        city_locator.nearest.assert_called_once_with(
+            52.52, 13.40, berlin_help_service.MAX_NEARBY_CITIES
+        )
+
+    def test_handle_location_without_locator(self, service, mock_guidebook):
+        """Test a location gets a hint when no coordinates are configured."""
+        result = service.handle_location(52.52, 13.40)
+
+        assert "/cities" in result
+        mock_guidebook.get_cities.assert_not_called()
+
     def test_handle_cities_without_name(self, service, mock_guidebook):
         """Test handle_cities without a city name."""
         mock_guidebook.get_cities.return_value = "Please specify city"
@@ -131,7 +304,7 @@ class TestBerlinHelpService:
         result = service.get_topic_description("accommodation")
 
         assert result == "Housing information"
-        mock_guidebook.get_topic_description.assert_called_once_with("accommodation")
+        mock_guidebook.get_topic_description.assert_called_once_with("accommodation", ())
 
     def test_get_topic_description_nonexistent(self, service, mock_guidebook):
         """Test get_topic_description returns None for nonexistent topic."""
@@ -140,4 +313,426 @@ class TestBerlinHelpService:
         result = service.get_topic_description("nonexistent")
 
         assert result is None
-        mock_guidebook.get_topic_description.assert_called_once_with("nonexistent")
+        mock_guidebook.get_topic_description.assert_called_once_with("nonexistent", ())
+
+    def test_swap_guidebook(self, service, mock_guidebook):
+        """Test swap_guidebook replaces the guidebook and reports topic changes."""
+        mock_guidebook.get_topics.return_value = ["accommodation", "transport"]
+        mock_guidebook.get_topic_description.return_value = "Description"
+        new_guidebook = Mock(spec=IGuidebook)
+        new_guidebook.get_topics.return_value = ["accommodation", "jobs"]
+        new_guidebook.get_topic_description.return_value = "Description"
+
+        changes = service.swap_guidebook(new_guidebook)
+
+        assert service.guidebook is new_guidebook
+        assert changes.added == ("jobs",)
+        assert changes.removed == ("transport",)
+        assert not changes.descriptions_changed
+
+    def test_swap_guidebook_detects_description_change(self, service, mock_guidebook):
+        """Test swap_guidebook flags changed topic descriptions."""
+        mock_guidebook.get_topics.return_value = ["accommodation"]
+        mock_guidebook.get_topic_description.return_value = "Old"
+        new_guidebook = Mock(spec=IGuidebook)
+        new_guidebook.get_topics.return_value = ["accommodation"]
+        new_guidebook.get_topic_description.return_value = "New"
+
+        changes = service.swap_guidebook(new_guidebook)
+
+        assert changes.added == ()
+        assert changes.removed == ()
+        assert changes
+
+
+class TestBerlinHelpServiceInline:
+    """Test inline-mode answers."""
+
+    def test_completions_are_rendered(self, service, mock_guidebook):
+        mock_guidebook.complete.return_value = [
+            Completion("cities", "berlin"), Completion("food")
+        ]
+        mock_guidebook.get_cities.return_value = "Berlin chats"
+        mock_guidebook.get_topic_contents.return_value = ("Free food",)
+        mock_guidebook.get_topic_description.return_value = "Бесплатная еда"
+
+        city, topic = service.handle_inline_query("berl")
+
+        mock_guidebook.complete.assert_called_once_with(
+            "berl", berlin_help_service.MAX_INLINE_RESULTS
+        )
+        assert (city.title, city.description, city.text) == (
+            "Berlin", "/cities Berlin", "Berlin chats"
+        )
+        assert (topic.title, topic.description) == ("/food", "Бесплатная еда")
+        assert topic.text.startswith("#food\n")
+        assert city.id != topic.id
+
+    def test_renders_are_cached_until_swap(self, service, mock_guidebook):
+        mock_guidebook.complete.return_value = [Completion("cities", "berlin")]
+        mock_guidebook.get_cities.return_value = "Berlin chats"
+        mock_guidebook.get_topics.return_value = []
+
+        service.handle_inline_query("berl")
+        service.handle_inline_query("berli")
+        assert mock_guidebook.get_cities.call_count == 1
+
+        service.swap_guidebook(mock_guidebook)
+        service.handle_inline_query("berl")
+        assert mock_guidebook.get_cities.call_count == 2
+
+    def test_replies_over_message_limit_are_skipped(self, service, mock_guidebook):
+        mock_guidebook.complete.return_value = [Completion("cities", "berlin")]
+        mock_guidebook.get_cities.return_value = "x" * 5000
+
+        assert service.handle_inline_query("berl") == []
+
+
+class TestBerlinHelpServiceSearch:
+    """Test the /search command."""
+
+    def test_hits_are_listed_with_descriptions(self, service, mock_guidebook):
+        mock_guidebook.search_topics.return_value = [
+            SearchHit("jobcenter", 3.0), SearchHit("legal", 1.0)
+        ]
+        mock_guidebook.get_topic_description.side_effect = {
+            "jobcenter": "Джобцентр", "legal": None
+        }.get
+
+        result = service.handle_search("Bürgergeld Antrag")
+
+        mock_guidebook.search_topics.assert_called_once_with(
+            "Bürgergeld Antrag", berlin_help_service.MAX_SEARCH_RESULTS
+        )
+        assert result == "По запросу «Bürgergeld Antrag»:\n/jobcenter Джобцентр\n/legal"
+
+    def test_no_hits(self, service, mock_guidebook):
+        mock_guidebook.search_topics.return_value = []
+
+        assert "ничего не найдено" in service.handle_search("qqq")
+
+    @patch("src.application.berlin_help_service.format_contents", return_value="Google it")
+    def test_without_words_shows_search_topic(self, _, service, mock_guidebook):
+        mock_guidebook.get_topic_description.return_value = "Как искать"
+        mock_guidebook.get_topic_contents.return_value = ("Google it",)
+
+        assert service.handle_search("  ") == "#search\nGoogle it"
+        mock_guidebook.search_topics.assert_not_called()
+
+
+class TestBerlinHelpServiceQuestions:
+    """Test free-text questions."""
+
+    @patch("src.application.berlin_help_service.format_contents", return_value="Wohnungen")
+    def test_clear_winner_is_answered_with_rendered_topic(self, _, service, mock_guidebook):
+        mock_guidebook.search_topics.return_value = [
+            SearchHit("accommodation", 8.0), SearchHit("apartments", 4.0)
+        ]
+        mock_guidebook.get_topic_contents.return_value = ("Wohnungen",)
+
+        assert service.handle_question("где найти жильё?") == "#accommodation\nWohnungen"
+        mock_guidebook.search_topics.assert_called_once_with(
+            "где найти жильё?", berlin_help_service.MAX_QUESTION_SUGGESTIONS
+        )
+
+    @pytest.mark.parametrize("hits", [
+        [SearchHit("animals", 6.6), SearchHit("transport", 6.0)],
+        [SearchHit("passport", 2.0)],
+        [SearchHit("cities", 9.0)],
+    ])
+    def test_unclear_questions_get_suggestions(self, service, mock_guidebook, hits):
+        mock_guidebook.search_topics.return_value = hits
+        mock_guidebook.get_topic_description.return_value = "Описание"
+
+        result = service.handle_question("вопрос")
+
+        assert result.splitlines() == [
+            "Возможно, вы имели в виду:", *(f"/{hit.topic} Описание" for hit in hits)
+        ]
+        mock_guidebook.get_topic_contents.assert_not_called()
+
+    def test_unmatched_question_gets_hint(self, service, mock_guidebook):
+        mock_guidebook.search_topics.return_value = []
+
+        assert "/search" in service.handle_question("привет")
+
+
+class TestBerlinHelpServiceSections:
+    """Test topic commands asking for some sections only."""
+
+    CONTENTS = {"Врачи": ("https://doctolib.de",), "Аптеки": ("https://aponet.de",)}
+
+    def test_matching_sections_are_rendered_and_cached(self, service, mock_guidebook):
+        mock_guidebook.find_sections.return_value = ["аптеки"]
+        mock_guidebook.get_topic_contents.return_value = self.CONTENTS
+
+        result = service.handle_topic("Medical", section="аптек")
+
+        assert result.startswith("#medical\n")
+        assert "Аптеки:\n- https://aponet.de" in result
+        assert "Врачи" not in result
+        assert service.handle_topic("medical", section="Аптеки") is result
+        mock_guidebook.find_sections.assert_called_with("medical", "Аптеки")
+        mock_guidebook.get_topic_contents.assert_called_once_with("medical", ())
+
+    def test_unmatched_section_sends_whole_topic(self, service, mock_guidebook):
+        mock_guidebook.find_sections.return_value = []
+        mock_guidebook.get_topic_contents.return_value = self.CONTENTS
+
+        result = service.handle_topic("medical", section="qqq")
+
+        assert "Врачи" in result and "Аптеки" in result
+
+    def test_translation_with_other_section_names_is_sent_whole(self, mock_guidebook):
+        service = BerlinHelpService(mock_guidebook, language_fallbacks={"uk": []})
+        mock_guidebook.find_sections.return_value = ["аптеки"]
+        mock_guidebook.get_topic_contents.return_value = {"Аптеки (uk)": ("https://aponet.de",)}
+
+        result = service.handle_topic("medical", section="аптек", language="uk")
+
+        assert "Аптеки (uk):" in result
+
+
+class TestBerlinHelpServiceCommands:
+    """Test legacy commands and suggestions for unknown ones."""
+
+    @pytest.fixture
+    def command_service(self, service, mock_guidebook):
+        mock_guidebook.get_topics.return_value = [
+            "accommodation", "apartments", "university", "handicap", "education"
+        ]
+        mock_guidebook.get_topic_description.side_effect = (
+            lambda topic, languages=(): topic.title() if topic in mock_guidebook.get_topics() else None
+        )
+        return service
+
+    def test_legacy_commands_resolve_to_their_topics(self, command_service):
+        assert command_service.resolve_command("uni") == "university"
+        assert command_service.resolve_command("disabled") == "handicap"
+        # Its topic is not in the guidebook
+        assert command_service.resolve_command("freestuff") is None
+        assert command_service.resolve_command("university") is None
+
+    @pytest.mark.parametrize("command", ["acommodation", "accomodatoin", "accommodatio"])
+    def test_misspelled_commands_get_suggestions(self, command_service, command):
+        assert command_service.suggest_commands(command).splitlines() == [
+            f"Команды /{command} нет. Возможно, вы имели в виду:",
+            "/accommodation Accommodation",
+        ]
+
+    def test_short_prefixes_and_distant_commands_get_nothing(self, command_service):
+        assert command_service.suggest_commands("uni") is None
+        assert command_service.suggest_commands("start") is None
+
+    def test_index_is_rebuilt_on_swap(self, command_service, mock_guidebook):
+        assert command_service.suggest_commands("jbos") is None
+        new_guidebook = Mock(spec=IGuidebook)
+        new_guidebook.get_topics.return_value = ["jobs"]
+        new_guidebook.get_topic_description.return_value = "Работа"
+        mock_guidebook.get_topic_description.side_effect = None
+
+        command_service.swap_guidebook(new_guidebook)
+
+        assert command_service.suggest_commands("jbos").splitlines()[1:] == ["/jobs Работа"]
+
+
+class TestBerlinHelpServiceRegions:
+    """Test routing chats to regional guidebooks."""
+
+    @pytest.fixture
+    def hamburg(self):
+        guidebook = Mock(spec=IGuidebook)
+        guidebook.get_topics.return_value = ["accommodation", "hafen"]
+        guidebook.get_topic_description.side_effect = lambda t, languages=(): {
+            "accommodation": "Wohnen", "hafen": "Hafen"
+        }.get(t)
+        return guidebook
+
+    @pytest.fixture
+    def regional_service(self, mock_guidebook, hamburg):
+        mock_guidebook.get_topics.return_value = ["accommodation", "animals"]
+        mock_guidebook.get_topic_description.side_effect = lambda t, languages=(): {
+            "accommodation": "Housing", "animals": "Animals"
+        }.get(t)
+        return BerlinHelpService(
+            guidebook=mock_guidebook,
+            regions={"hamburg": hamburg},
+            chat_regions={-100: "hamburg"},
+        )
+
+    def test_unknown_region_is_rejected(self, mock_guidebook):
+        with pytest.raises(ValueError):
+            BerlinHelpService(guidebook=mock_guidebook, chat_regions={-100: "hamburg"})
+
+    def test_guidebook_for_chat(self, regional_service, mock_guidebook, hamburg):
+        assert regional_service.guidebook_for(-100) is hamburg
+        assert regional_service.guidebook_for(42) is mock_guidebook
+        assert regional_service.guidebook_for(None) is mock_guidebook
+
+    @patch("src.application.berlin_help_service.format_contents", return_value="info")
+    def test_handle_topic_uses_chat_region(self, _, regional_service, mock_guidebook, hamburg):
+        regional_service.handle_topic("accommodation", chat_id=-100)
+
+        hamburg.get_topic_contents.assert_called_once_with("accommodation", ())
+        mock_guidebook.get_topic_contents.assert_not_called()
+
+    def test_handle_topic_of_other_region(self, regional_service, mock_guidebook):
+        mock_guidebook.get_topic_contents.side_effect = KeyError("hafen")
+
+        result = regional_service.handle_topic("hafen", chat_id=42)
+
+        assert "К сожалению" in result
+
+    def test_handle_cities_uses_chat_region(self, regional_service, hamburg):
+        hamburg.get_cities.return_value = "Hamburg chats"
+
+        assert regional_service.handle_cities("hh", chat_id=-100) == "Hamburg chats"
+
+    def test_list_topics(self, regional_service):
+        assert regional_service.list_topics() == ["accommodation", "animals", "hafen"]
+        assert regional_service.list_topics(chat_id=-100) == ["accommodation", "hafen"]
+
+    def test_get_topic_description(self, regional_service):
+        assert regional_service.get_topic_description("accommodation") == "Housing"
+        assert regional_service.get_topic_description("accommodation", chat_id=-100) == "Wohnen"
+        assert regional_service.get_topic_description("hafen") == "Hafen"
+
+    def test_swap_region(self, regional_service, hamburg):
+        new_hamburg = Mock(spec=IGuidebook)
+        new_hamburg.get_topics.return_value = ["accommodation", "fischmarkt"]
+        new_hamburg.get_topic_description.return_value = "Wohnen"
+
+        changes = regional_service.swap_guidebook(new_hamburg, region="hamburg")
+
+        assert regional_service.guidebook_for(-100) is new_hamburg
+        assert changes.added == ("fischmarkt",)
+        assert changes.removed == ("hafen",)
+
+
+class TestBerlinHelpServiceOverlays:
+    """Test local topics added by chat admins."""
+
+    @pytest.fixture
+    def overlay_service(self, mock_guidebook):
+        return BerlinHelpService(
+            guidebook=mock_guidebook, overlays=SqliteOverlayStore(":memory:")
+        )
+
+    def test_overlay_topic_is_checked_first(self, overlay_service, mock_guidebook):
+        overlay_service.add_overlay_topic(7, "accommodation Wohnen\nhttps://t.me/local")
+
+        result = overlay_service.handle_topic("accommodation", chat_id=7)
+
+        assert "https://t.me/local" in result
+        mock_guidebook.get_topic_contents.assert_not_called()
+
+    @patch("src.application.berlin_help_service.format_contents", return_value="global")
+    def test_other_chats_use_guidebook(self, _, overlay_service, mock_guidebook):
+        overlay_service.add_overlay_topic(7, "accommodation Wohnen\nhttps://t.me/local")
+
+        assert overlay_service.handle_topic("accommodation", chat_id=8) == "#accommodation\nglobal"
+        assert overlay_service.handle_topic("accommodation") == "#accommodation\nglobal"
+
+    def test_handle_overlay_topic(self, overlay_service):
+        overlay_service.add_overlay_topic(7, "rota Volunteer rota\nMo: Anna\nDi: Oleh")
+
+        assert "Mo: Anna" in overlay_service.handle_overlay_topic("ROTA", chat_id=7)
+        assert overlay_service.handle_overlay_topic("rota", chat_id=8) is None
+
+    def test_add_overlay_topic_validation(self, overlay_service):
+        assert "Использование" in overlay_service.add_overlay_topic(7, "rota")
+        assert "латинские" in overlay_service.add_overlay_topic(7, "ротa Rota\nitem")
+        assert "слишком длинная" in overlay_service.add_overlay_topic(
+            7, "rota Rota\n" + "x" * 4000
+        )
+
+    def test_overlay_topics_per_chat_are_limited(self, overlay_service, monkeypatch):
+        monkeypatch.setattr(berlin_help_service, "MAX_OVERLAY_TOPICS", 1)
+        overlay_service.add_overlay_topic(7, "one One\nitem")
+
+        assert "уже 1" in overlay_service.add_overlay_topic(7, "two Two\nitem")
+        # Replacing an existing topic is still allowed
+        assert "сохранена" in overlay_service.add_overlay_topic(7, "one One\nnew item")
+
+    def test_remove_and_list_overlay_topics(self, overlay_service):
+        overlay_service.add_overlay_topic(7, "rota Volunteer rota\nMo: Anna")
+
+        assert overlay_service.list_overlay_topics(7) == (
+            "Локальные темы этого чата:\n/rota Volunteer rota"
+        )
+        assert "удалена" in overlay_service.remove_overlay_topic(7, "rota")
+        assert "нет" in overlay_service.remove_overlay_topic(7, "rota")
+        assert overlay_service.list_overlay_topics(7) == "В этом чате пока нет локальных тем."
+
+    def test_overlay_read_errors_fall_back_to_guidebook(self, mock_guidebook):
+        overlays = Mock()
+        overlays.get_topics.side_effect = OverlayStoreError("broken")
+        service = BerlinHelpService(guidebook=mock_guidebook, overlays=overlays)
+        mock_guidebook.get_topic_contents.return_value = ["item"]
+
+        assert "item" in service.handle_topic("accommodation", chat_id=7)
+
+
+class TestBerlinHelpServiceLanguages:
+    """Test choosing guidebook languages from Telegram language codes."""
+
+    @pytest.fixture
+    def language_service(self, mock_guidebook):
+        return BerlinHelpService(
+            guidebook=mock_guidebook, language_fallbacks={"de": ["en"], "be": ["ru"]}
+        )
+
+    def test_language_chain(self, language_service):
+        assert language_service.language_chain(None) == ()
+        assert language_service.language_chain("uk") == ("uk",)
+        assert language_service.language_chain("pt-BR") == ("pt",)
+        assert language_service.language_chain("de") == ("de", "en")
+
+    def test_handle_topic_passes_languages(self, language_service, mock_guidebook):
+        mock_guidebook.get_topic_contents.return_value = ("item",)
+
+        language_service.handle_topic("accommodation", language="de-AT")
+
+        mock_guidebook.get_topic_contents.assert_called_once_with("accommodation", ("de", "en"))
+
+    @patch("src.application.berlin_help_service.format_contents", return_value="info")
+    def test_topics_are_rendered_once_per_language(
+        self, mock_format, language_service, mock_guidebook
+    ):
+        for language in ("uk", "uk-UA", "de", None, "uk"):
+            language_service.handle_topic("accommodation", language=language)
+        language_service.handle_topic("Accommodation", language="uk")
+
+        assert mock_format.call_count == 3
+        assert mock_guidebook.get_topic_contents.call_count == 3
+
+    @patch("src.application.berlin_help_service.format_contents", return_value="info")
+    def test_swap_drops_rendered_topics(self, mock_format, language_service, mock_guidebook):
+        mock_guidebook.get_topics.return_value = []
+        language_service.handle_topic("accommodation")
+
+        language_service.swap_guidebook(mock_guidebook)
+        language_service.handle_topic("accommodation")
+
+        assert mock_format.call_count == 2
+
+    def test_handle_help_in_user_language(self, language_service):
+        uk_help = language_service.handle_help(language="uk")
+        all_help = language_service.handle_help()
+
+        assert "Вітання" in uk_help and "Привет" not in uk_help
+        assert "Hi!" in language_service.handle_help(language="de")
+        assert "Привет" in language_service.handle_help(language="be")
+        assert language_service.handle_help(language="fr") == all_help
+        assert all(greeting in all_help for greeting in ("Привет", "Вітання", "Hi!"))
+        assert len(uk_help) < len(all_help)
+
+    def test_get_topic_description_in_user_language(self, language_service, mock_guidebook):
+        mock_guidebook.get_topic_description.return_value = "Housing"
+
+        language_service.get_topic_description("accommodation", language="de")
+
+        mock_guidebook.get_topic_description.assert_called_once_with(
+            "accommodation", ("de", "en")
+        )
+        assert language_service.list_languages() == ["de", "be"]
@@ -0,0 +1,102 @@
+"""Unit tests for the city locator."""
+
+import math
+import random
+
+import pytest
+from src.domain.protocols import GuidebookValidationError
+from src.infrastructure.city_locator import (
+    EARTH_RADIUS_KM,
+    CityLocator,
+    parse_city_coordinates,
+)
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+CITY_COORDINATES_PATH = "src/knowledgebase/city_coordinates.csv"
+
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+@pytest.fixture(scope="module")
+def locator():
+    return CityLocator.from_csv(CITY_COORDINATES_PATH)
+
+
+class TestCityLocator:
+    """Test nearest-city lookups."""
+
+    @pytest.mark.parametrize("latitude, longitude, city", [
+        (52.5200, 13.4050, "Berlin"),
+        (52.4000, 13.0500, "Potsdam"),
+        (51.5400, 7.3300, "Castrop-Rauxel"),
+        (49.2300, 7.0000, "Saarland"),
+        (47.3700, 8.5400, "Zurich"),
+    ])
+    def test_nearest_city(self, locator, latitude, longitude, city):
+        assert locator.nearest(latitude, longitude)[0].name == city
+
+    def test_distances_are_great_circle_km(self, locator):
+        berlin, potsdam = locator.nearest(52.5200, 13.4050, 2)
+
+        assert berlin.distance_km == pytest.approx(0, abs=0.01)
+        assert potsdam.distance_km == pytest.approx(
+            _haversine_km(52.5200, 13.4050, 52.3906, 13.0645), rel=1e-9
+        )
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        cities = [
+            (f"city{i}", rng.uniform(-90, 90), rng.uniform(-180, 180)) for i in range(500)
+        ]
+        locator = CityLocator(cities)
+
+        for _ in range(200):
+            latitude, longitude = rng.uniform(-90, 90), rng.uniform(-180, 180)
+            expected = sorted(
+                cities, key=lambda c: _haversine_km(latitude, longitude, c[1], c[2])
+            )[:5]
+
+            assert [place.name for place in locator.nearest(latitude, longitude, 5)] == [
+                name for name, _, _ in expected
+            ]
+
+    def test_nearest_across_antimeridian(self):
+        locator = CityLocator([("West", 0.0, -179.5), ("East", 0.0, 178.0)])
+
+        assert locator.nearest(0.0, 179.9)[0].name == "West"
+
+    def test_limits(self, locator):
+        assert locator.nearest(52.52, 13.40, 0) == []
+        assert len(locator.nearest(52.52, 13.40, 100)) == len(locator)
+        assert CityLocator([]).nearest(52.52, 13.40) == []
+
+    def test_sections_are_guidebook_cities(self):
+        guidebook = YamlGuidebook(
+            "src/knowledgebase/guidebook.yml", "src/knowledgebase/vocabulary.yml"
+        )
+        with open(CITY_COORDINATES_PATH, "rb") as f:
+            sections = {section for section, _, _ in parse_city_coordinates(f.read())}
+
+        assert sections <= set(guidebook.get_topic_contents("cities"))
+
+
+class TestCityCoordinates:
+    """Test parsing coordinates tables."""
+
+    @pytest.mark.parametrize("rows, match", [
+        ("Berlin,Berlin,52.52,\n", "invalid row"),
+        ("Berlin,Berlin,95,13.4\n", "invalid row"),
+        ("Berlin,Berlin,north,13.4\n", "invalid row"),
+        (",Berlin,52.52,13.4\n", "invalid row"),
+        ("Berlin,Berlin,52.52,13.4\nBerlin,Spandau,52.53,13.2\n", "listed twice"),
+    ])
+    def test_invalid_tables_are_rejected(self, rows, match):
+        with pytest.raises(GuidebookValidationError, match=match):
+            parse_city_coordinates(f"section,place,latitude,longitude\n{rows}".encode())
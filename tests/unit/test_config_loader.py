@@ -0,0 +1,22 @@
+"""Unit tests for configuration loading."""
+
+from src.infrastructure.config_loader import env_setting
+
+
+class TestEnvSetting:
+    """Test environment overrides of settings.toml values."""
+
+    def test_environment_overrides_setting(self, monkeypatch):
+        monkeypatch.setenv("OVERLAY_DATABASE_PATH", "/data/overlays.db")
+
+        assert env_setting({"OVERLAY_DATABASE_PATH": "overlays.db"}, "OVERLAY_DATABASE_PATH") == (
+            "/data/overlays.db"
+        )
+
+    def test_setting_without_environment_variable(self, monkeypatch):
+        monkeypatch.delenv("OVERLAY_DATABASE_PATH", raising=False)
+
+        assert env_setting({"OVERLAY_DATABASE_PATH": "overlays.db"}, "OVERLAY_DATABASE_PATH") == (
+            "overlays.db"
+        )
+        assert env_setting({}, "OVERLAY_DATABASE_PATH") is None
@@ -0,0 +1,67 @@
+"""Unit tests for the typo-tolerant FuzzyIndex."""
+
+import pytest
+from src.infrastructure import fuzzy_index
+from src.infrastructure.fuzzy_index import FuzzyIndex, edit_distance, max_distance
+
+
+class TestEditDistance:
+    """Test the bit-parallel optimal string alignment distance."""
+
+    @pytest.mark.parametrize("a, b, expected", [
+        ("berlin", "berlin", 0),
+        ("berln", "berlin", 1),
+        ("bxrlin", "berlin", 1),
+        ("berlinn", "berlin", 1),
+        ("düsseldrof", "düsseldorf", 1),
+        ("ca", "abc", 3),
+        ("", "abc", 3),
+        ("abc", "", 3),
+    ])
+    def test_distances(self, a, b, expected):
+        assert edit_distance(a, b) == expected
+
+    def test_max_distance_grows_with_length(self):
+        assert [max_distance(text) for text in ("bad", "halle", "düsseldorf", "mönchengladbach")] == [0, 1, 2, 3]
+
+
+class TestFuzzyIndex:
+    """Test candidate ranking of FuzzyIndex.search."""
+
+    @pytest.fixture
+    def index(self):
+        names = {
+            name: name
+            for name in ["berlin", "bern", "münchen", "frankfurt am main", "frankfurt oder"]
+        }
+        names["munich"] = "münchen"
+        return FuzzyIndex(names)
+
+    def test_aliases_resolve_to_canonical_name(self, index):
+        assert len(index) == 6
+        assert index.search("münchn") == [("münchen", 1)]
+        assert index.search("munihc") == [("münchen", 1)]
+
+    def test_transposition_in_short_name(self):
+        index = FuzzyIndex({name: name for name in ["jobs", "jobcenter", "food"]})
+
+        assert index.search("jbos") == [("jobs", 1)]
+
+    def test_closest_name_first(self, index):
+        assert index.search("bernin") == [("berlin", 1), ("bern", 2)]
+
+    def test_prefix_matches_longer_names(self, index):
+        assert index.search("frankfrut") == [("frankfurt am main", 2), ("frankfurt oder", 2)]
+        assert index.search("frankfrut", limit=1) == [("frankfurt am main", 2)]
+
+    def test_short_and_distant_queries_match_nothing(self, index):
+        assert index.search("brn") == []
+        assert index.search("hamburg") == []
+        assert index.search("") == []
+
+    def test_counting_stops_after_the_rarest_trigrams(self, monkeypatch):
+        monkeypatch.setattr(fuzzy_index, "_MAX_POSTINGS", 0)
+        index = FuzzyIndex({name: name for name in ["bernau", "bergen", "berlin"]})
+
+        assert index.search("berlni") == [("berlin", 1)]
+        assert index.search("bregen") == [("bergen", 1)]
@@ -0,0 +1,136 @@
+"""Unit tests for guidebooks loaded from a directory of topic files."""
+
+import os
+
+import pytest
+from src.domain.protocols import GuidebookError, GuidebookValidationError
+from src.infrastructure import yaml_guidebook
+from src.infrastructure.guidebook_split import split_guidebook
+from src.infrastructure.lazy_yaml_guidebook import LazyYamlGuidebook
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+GUIDEBOOK_PATH = "src/knowledgebase/guidebook.yml"
+VOCABULARY_PATH = "src/knowledgebase/vocabulary.yml"
+
+
+@pytest.fixture
+def topic_dir(tmp_path):
+    """Split the real guidebook into one file per topic."""
+    directory = tmp_path / "guidebook"
+    split_guidebook(GUIDEBOOK_PATH, str(directory))
+    return str(directory)
+
+
+@pytest.fixture
+def from_file():
+    return YamlGuidebook(GUIDEBOOK_PATH, VOCABULARY_PATH)
+
+
+def _write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+class TestDirectoryLoading:
+    """Test that a topic directory loads like the single guidebook file."""
+
+    def test_directory_matches_single_file(self, topic_dir, from_file):
+        from_dir = YamlGuidebook(topic_dir, VOCABULARY_PATH, max_workers=1)
+
+        assert sorted(from_dir.get_topics()) == sorted(from_file.get_topics())
+        assert dict(from_dir.topics) == dict(from_file.topics)
+        assert from_dir.get_cities("munchen") == from_file.get_cities("munchen")
+
+    def test_process_pool_matches_in_process(self, topic_dir, monkeypatch):
+        monkeypatch.setattr(yaml_guidebook, "PARALLEL_MIN_FILES", 0)
+
+        parallel = YamlGuidebook(topic_dir, VOCABULARY_PATH, max_workers=2)
+        serial = YamlGuidebook(topic_dir, VOCABULARY_PATH, max_workers=1)
+
+        assert dict(parallel.topics) == dict(serial.topics)
+
+    def test_invalid_file_fails_in_pool(self, topic_dir, monkeypatch):
+        monkeypatch.setattr(yaml_guidebook, "PARALLEL_MIN_FILES", 0)
+        _write(os.path.join(topic_dir, "bad.yml"), "description: Bad\ncontents:\n  - 42\n")
+
+        with pytest.raises(GuidebookValidationError) as exc_info:
+            YamlGuidebook(topic_dir, VOCABULARY_PATH, max_workers=2)
+        assert "bad" in str(exc_info.value)
+
+    def test_non_mapping_file_is_rejected(self, topic_dir):
+        _write(os.path.join(topic_dir, "bad.yml"), "- just a list\n")
+
+        with pytest.raises(GuidebookError):
+            YamlGuidebook(topic_dir, VOCABULARY_PATH, max_workers=1)
+
+    def test_duplicate_topic_files_are_rejected(self, topic_dir):
+        _write(os.path.join(topic_dir, "Cities.yaml"), "contents:\n  - item\n")
+
+        with pytest.raises(GuidebookError) as exc_info:
+            YamlGuidebook(topic_dir, VOCABULARY_PATH, max_workers=1)
+        assert "cities" in str(exc_info.value)
+
+    def test_hidden_and_other_files_are_ignored(self, topic_dir, from_file):
+        _write(os.path.join(topic_dir, ".cities.yml.swp"), "garbage")
+        _write(os.path.join(topic_dir, "README.md"), "# Topics")
+
+        from_dir = YamlGuidebook(topic_dir, VOCABULARY_PATH, max_workers=1)
+
+        assert sorted(from_dir.get_topics()) == sorted(from_file.get_topics())
+
+    def test_snapshot_of_directory(self, topic_dir, tmp_path):
+        snapshot_path = str(tmp_path / "guidebook.snapshot")
+        YamlGuidebook(topic_dir, VOCABULARY_PATH).write_snapshot(snapshot_path)
+        _write(os.path.join(topic_dir, "new_topic.yml"), "contents:\n  - item\n")
+
+        guidebook = YamlGuidebook(topic_dir, VOCABULARY_PATH, snapshot_path=snapshot_path)
+
+        assert "new_topic" in guidebook.get_topics()
+
+    def test_lazy_guidebook_rejects_directory(self, topic_dir):
+        with pytest.raises(GuidebookError):
+            LazyYamlGuidebook(topic_dir, VOCABULARY_PATH)
+
+
+class TestReloadTopic:
+    """Test single-file reloads of directory guidebooks."""
+
+    def test_reload_replaces_one_topic(self, topic_dir):
+        guidebook = YamlGuidebook(topic_dir, VOCABULARY_PATH)
+        path = os.path.join(topic_dir, "animals.yml")
+        _write(path, "description: Pets\ncontents:\n  - new item\n")
+
+        reloaded = guidebook.reload_topic(path)
+
+        assert reloaded.get_topic_contents("animals") == ("new item",)
+        assert reloaded.get_topic_description("animals") == "Pets"
+        assert reloaded.topics["cities"] is guidebook.topics["cities"]
+        # The original guidebook is left unchanged
+        assert guidebook.get_topic_contents("animals") != ("new item",)
+        assert reloaded.source_hash != guidebook.source_hash
+
+    def test_reload_adds_and_removes_topics(self, topic_dir):
+        guidebook = YamlGuidebook(topic_dir, VOCABULARY_PATH)
+        new_path = os.path.join(topic_dir, "new_topic.yml")
+        _write(new_path, "contents:\n  - item\n")
+        os.unlink(os.path.join(topic_dir, "animals.yml"))
+
+        reloaded = guidebook.reload_topic(new_path)
+        reloaded = reloaded.reload_topic(os.path.join(topic_dir, "animals.yml"))
+
+        assert "new_topic" in reloaded.get_topics()
+        assert "animals" not in reloaded.get_topics()
+
+    def test_reload_updates_sections(self, topic_dir):
+        guidebook = YamlGuidebook(topic_dir, VOCABULARY_PATH)
+        path = os.path.join(topic_dir, "cities.yml")
+        _write(path, "contents:\n  Hamburg:\n    - port\n")
+
+        reloaded = guidebook.reload_topic(path)
+
+        assert "port" in reloaded.get_cities("hamburg")
+        assert "К сожалению" in reloaded.get_cities("Berlin")
+
+    def test_reload_of_single_file_guidebook_fails(self, from_file):
+        with pytest.raises(GuidebookError):
+            from_file.reload_topic(GUIDEBOOK_PATH)
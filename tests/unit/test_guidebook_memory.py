@@ -0,0 +1,49 @@
+"""Unit tests for the guidebook memory report."""
+
+from types import MappingProxyType
+from typing import Set
+
+from src.infrastructure.guidebook_memory import deep_sizeof
+from src.infrastructure.yaml_guidebook import freeze_topic
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    shared = "x" * 1000
+    seen = set()
+
+    first = deep_sizeof([shared], seen)
+    second = deep_sizeof([shared], seen)
+
+    assert first > 1000
+    assert second < 1000
+
+
+def test_deep_sizeof_includes_mappingproxy_contents():
+    contents = {"key": ("value" * 100,)}
+
+    assert deep_sizeof(MappingProxyType(contents)) > 500
+
+
+def test_frozen_topics_share_equal_strings():
+    plain_seen: Set[int] = set()
+    frozen_seen: Set[int] = set()
+    plain_topics = []
+    frozen_topics = []
+    rows = []
+    for name in ("first", "second"):
+        # Built at runtime like parsed YAML: equal, but distinct objects per topic
+        contents = ["".join(["https://example.org/", str(i), "/links" * 10]) for i in range(20)]
+        # Both topics stay alive, so no object id is reused between them
+        plain_topics.append({"description": "Links", "contents": contents})
+        frozen_topics.append(freeze_topic(name, "Links", contents))
+        rows.append((
+            deep_sizeof(plain_topics[-1], plain_seen),
+            deep_sizeof(frozen_topics[-1], frozen_seen),
+        ))
+
+    (first_plain, first_frozen), (second_plain, second_frozen) = rows
+    # Only the second topic's tuple and Topic are new: its items are the
+    # first topic's interned strings
+    assert 0 < second_frozen < first_frozen / 4
+    assert second_frozen < second_plain / 4
+    assert first_frozen + second_frozen < first_plain + second_plain
@@ -0,0 +1,77 @@
+"""Unit tests for the guidebook profile report."""
+
+import json
+
+from src.infrastructure import guidebook_profile
+from src.infrastructure.guidebook_profile import (
+    TELEGRAM_MESSAGE_LIMIT,
+    profile_load,
+    profile_report,
+    utf16_length,
+)
+from src.infrastructure.guidebook_split import split_guidebook
+
+GUIDEBOOK_PATH = "src/knowledgebase/guidebook.yml"
+VOCABULARY_PATH = "src/knowledgebase/vocabulary.yml"
+
+
+def test_utf16_length_counts_surrogate_pairs():
+    assert utf16_length("Житло") == 5
+    assert utf16_length("🇺🇦") == 4
+
+
+def test_load_phases_are_reported():
+    phases = profile_load(GUIDEBOOK_PATH, VOCABULARY_PATH)
+
+    assert list(phases) == [
+        "read", "parse", "validate", "freeze", "lowercase_cache", "vocabulary", "total"
+    ]
+    assert all(ms >= 0 for ms in phases.values())
+
+
+def test_load_phases_of_topic_directory(tmp_path):
+    split_guidebook(GUIDEBOOK_PATH, str(tmp_path))
+
+    assert profile_load(str(tmp_path), VOCABULARY_PATH)["parse"] > 0
+
+
+def test_report_renders_topics_cities_and_countries():
+    report = profile_report(GUIDEBOOK_PATH, VOCABULARY_PATH, top=3)
+
+    kinds = {record["kind"] for record in report["renders"]}
+    assert kinds == {"topic", "city", "country"}
+    assert report["counts"]["city_sections"] > 0
+    assert len(report["render"]["largest"]) == 3
+    assert report["render"]["largest"][0]["utf16"] == max(
+        record["utf16"] for record in report["renders"]
+    )
+    json.dumps(report)
+
+
+def test_report_flags_messages_over_telegram_limit(tmp_path):
+    guidebook_path = tmp_path / "guidebook.yml"
+    guidebook_path.write_text(
+        "long:\n  description: Long\n  contents:\n"
+        f"    - {'я' * TELEGRAM_MESSAGE_LIMIT}\n"
+        "short:\n  description: Short\n  contents:\n    - item\n"
+        "  translations:\n    uk:\n      contents:\n        - пункт\n",
+        encoding="utf-8",
+    )
+
+    report = profile_report(str(guidebook_path), VOCABULARY_PATH)
+
+    assert [r["name"] for r in report["render"]["over_limit"]] == ["long"]
+    assert ("short", "uk") in {(r["name"], r["language"]) for r in report["renders"]}
+
+
+def test_main_prints_json(capsys, tmp_path):
+    settings_path = tmp_path / "settings.toml"
+    settings_path.write_text(
+        f'GUIDEBOOK_PATH = "{GUIDEBOOK_PATH}"\nVOCABULARY_PATH = "{VOCABULARY_PATH}"\n',
+        encoding="utf-8",
+    )
+
+    guidebook_profile.main(["--settings", str(settings_path), "--top", "1"])
+
+    report = json.loads(capsys.readouterr().out)
+    assert len(report["render"]["slowest"]) == 1
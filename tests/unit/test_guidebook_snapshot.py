@@ -0,0 +1,188 @@
+"""Unit tests for compiled guidebook snapshots."""
+
+import os
+import shutil
+from types import MappingProxyType
+
+import pytest
+from src.domain.models import Topic
+from src.infrastructure import guidebook_snapshot
+from src.infrastructure.guidebook_snapshot import (
+    GuidebookSnapshot,
+    compute_source_hash,
+    read_snapshot,
+    write_snapshot,
+)
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+GUIDEBOOK_PATH = "src/knowledgebase/guidebook.yml"
+VOCABULARY_PATH = "src/knowledgebase/vocabulary.yml"
+
+
+@pytest.fixture
+def sources(tmp_path):
+    """Copy the real guidebook sources to a temporary directory."""
+    guidebook_path = tmp_path / "guidebook.yml"
+    vocabulary_path = tmp_path / "vocabulary.yml"
+    shutil.copy(GUIDEBOOK_PATH, guidebook_path)
+    shutil.copy(VOCABULARY_PATH, vocabulary_path)
+    return str(guidebook_path), str(vocabulary_path)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, sources):
+    """Compile a snapshot of the temporary sources."""
+    path = str(tmp_path / "guidebook.snapshot")
+    YamlGuidebook(*sources).write_snapshot(path)
+    return path
+
+
+class TestSourceHash:
+    """Test compute_source_hash."""
+
+    def test_hash_is_stable(self):
+        assert compute_source_hash(b"a", b"b") == compute_source_hash(b"a", b"b")
+
+    def test_hash_depends_on_boundaries(self):
+        assert compute_source_hash(b"ab", b"c") != compute_source_hash(b"a", b"bc")
+
+
+class TestSnapshotRoundTrip:
+    """Test writing and reading snapshots."""
+
+    def test_snapshot_matches_yaml_load(self, sources, snapshot_path):
+        """A guidebook loaded from a snapshot equals one parsed from YAML."""
+        from_yaml = YamlGuidebook(*sources)
+        from_snapshot = YamlGuidebook(*sources, snapshot_path=snapshot_path)
+
+        assert dict(from_snapshot.topics) == dict(from_yaml.topics)
+        assert from_snapshot._lowercase_cache == from_yaml._lowercase_cache
+        assert from_snapshot.vocabulary == from_yaml.vocabulary
+        assert from_snapshot.get_cities("Berlin") == from_yaml.get_cities("Berlin")
+        assert from_snapshot.search_topics("jobcenter") == from_yaml.search_topics("jobcenter")
+
+    def test_snapshot_skips_search_indexing(self, sources, snapshot_path, monkeypatch):
+        """The /search index is loaded from the snapshot, not rebuilt."""
+        def fail(*args, **kwargs):
+            raise AssertionError("search index should not be rebuilt")
+
+        monkeypatch.setattr(YamlGuidebook, "_build_search_index", fail)
+
+        guidebook = YamlGuidebook(*sources, snapshot_path=snapshot_path)
+
+        assert guidebook.search_topics("jobcenter")
+
+    def test_snapshot_skips_yaml_parsing(self, sources, snapshot_path, monkeypatch):
+        """A matching snapshot is used without parsing the YAML."""
+        def fail(*args, **kwargs):
+            raise AssertionError("YAML should not be parsed")
+
+        monkeypatch.setattr(YamlGuidebook, "_parse_topics", staticmethod(fail))
+
+        guidebook = YamlGuidebook(*sources, snapshot_path=snapshot_path)
+
+        assert "cities" in guidebook.get_topics()
+
+    def test_snapshot_preserves_shared_tuples(self, sources, snapshot_path):
+        """Lowercase cache entries still point at the topic contents tuples."""
+        guidebook = YamlGuidebook(*sources, snapshot_path=snapshot_path)
+
+        berlin = guidebook.topics["cities"].contents["Berlin"]
+        assert guidebook._lowercase_cache["cities"]["berlin"] is berlin
+
+    def test_stale_snapshot_falls_back_to_yaml(self, sources, snapshot_path):
+        """Editing the sources invalidates the snapshot."""
+        guidebook_path, vocabulary_path = sources
+        with open(guidebook_path, "a", encoding="utf-8") as f:
+            f.write(
+                "\nnew_topic:\n  description: New topic\n  contents:\n    - item\n"
+            )
+
+        guidebook = YamlGuidebook(
+            guidebook_path, vocabulary_path, snapshot_path=snapshot_path
+        )
+
+        assert "new_topic" in guidebook.get_topics()
+
+    def test_missing_snapshot_falls_back_to_yaml(self, sources, tmp_path):
+        guidebook = YamlGuidebook(
+            *sources, snapshot_path=str(tmp_path / "missing.snapshot")
+        )
+
+        assert "cities" in guidebook.get_topics()
+
+
+class TestReadSnapshot:
+    """Test read_snapshot rejection of unusable files."""
+
+    def _snapshot(self, source_hash):
+        return GuidebookSnapshot(
+            source_hash=source_hash,
+            topics={"topic": Topic(name="topic", description="", contents=("item",))},
+            vocabulary={},
+        )
+
+    def test_read_valid_snapshot(self, tmp_path):
+        path = str(tmp_path / "gb.snapshot")
+        source_hash = compute_source_hash(b"source")
+        write_snapshot(path, self._snapshot(source_hash))
+
+        snapshot = read_snapshot(path, source_hash)
+
+        assert snapshot is not None
+        assert snapshot.topics["topic"].contents == ("item",)
+
+    def test_translations_survive_round_trip(self, tmp_path):
+        path = str(tmp_path / "gb.snapshot")
+        source_hash = compute_source_hash(b"source")
+        snapshot = self._snapshot(source_hash)
+        translated = Topic(
+            name="topic",
+            description="",
+            contents=("item",),
+            translations=MappingProxyType(
+                {"uk": Topic(name="topic", description="Тема", contents=("пункт",))}
+            ),
+        )
+        snapshot.topics["topic"] = translated
+        write_snapshot(path, snapshot)
+
+        loaded = read_snapshot(path, source_hash)
+
+        assert loaded is not None
+        assert loaded.topics["topic"] == translated
+        assert loaded.topics["topic"].translated(("uk",)).contents == ("пункт",)
+
+    def test_rejects_hash_mismatch(self, tmp_path):
+        path = str(tmp_path / "gb.snapshot")
+        write_snapshot(path, self._snapshot(compute_source_hash(b"old")))
+
+        assert read_snapshot(path, compute_source_hash(b"new")) is None
+
+    def test_rejects_other_format_version(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "gb.snapshot")
+        source_hash = compute_source_hash(b"source")
+        write_snapshot(path, self._snapshot(source_hash))
+        monkeypatch.setattr(
+            guidebook_snapshot,
+            "SNAPSHOT_FORMAT_VERSION",
+            guidebook_snapshot.SNAPSHOT_FORMAT_VERSION + 1,
+        )
+
+        assert read_snapshot(path, source_hash) is None
+
+    def test_rejects_garbage(self, tmp_path):
+        path = str(tmp_path / "gb.snapshot")
+        with open(path, "wb") as f:
+            f.write(b"not a snapshot at all, just some bytes")
+
+        assert read_snapshot(path, compute_source_hash(b"source")) is None
+
+    def test_rejects_corrupt_payload(self, tmp_path):
+        path = str(tmp_path / "gb.snapshot")
+        source_hash = compute_source_hash(b"source")
+        write_snapshot(path, self._snapshot(source_hash))
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 10)
+
+        assert read_snapshot(path, source_hash) is None
@@ -0,0 +1,207 @@
+"""Unit tests for GuidebookWatcher hot reload."""
+
+import os
+import shutil
+
+import pytest
+from src.application.berlin_help_service import BerlinHelpService
+from src.infrastructure.guidebook_split import split_guidebook
+from src.infrastructure.guidebook_watcher import GuidebookWatcher
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+NEW_TOPIC = "\nnew_topic:\n  description: New topic\n  contents:\n    - item\n"
+
+
+@pytest.fixture
+def sources(tmp_path):
+    """Copy the real guidebook sources to a temporary directory."""
+    guidebook_path = tmp_path / "guidebook.yml"
+    vocabulary_path = tmp_path / "vocabulary.yml"
+    shutil.copy("src/knowledgebase/guidebook.yml", guidebook_path)
+    shutil.copy("src/knowledgebase/vocabulary.yml", vocabulary_path)
+    return str(guidebook_path), str(vocabulary_path)
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+class TestGuidebookWatcher:
+    """Test GuidebookWatcher change detection and reload."""
+
+    def test_check_without_changes(self, sources):
+        reloaded = []
+        watcher = GuidebookWatcher(*sources, on_reload=reloaded.append)
+
+        assert watcher.check() is False
+        assert reloaded == []
+
+    def test_check_reloads_changed_guidebook(self, sources):
+        reloaded = []
+        watcher = GuidebookWatcher(*sources, on_reload=reloaded.append)
+
+        _append(sources[0], NEW_TOPIC)
+
+        assert watcher.check() is True
+        assert len(reloaded) == 1
+        assert "new_topic" in reloaded[0].get_topics()
+        # The same change is not picked up twice
+        assert watcher.check() is False
+
+    def test_invalid_guidebook_is_not_swapped_in(self, sources):
+        reloaded = []
+        watcher = GuidebookWatcher(*sources, on_reload=reloaded.append)
+
+        _append(sources[0], "\nbroken:\n  description: Broken\n  contents: null\n")
+
+        assert watcher.check() is False
+        assert reloaded == []
+
+    def test_missing_file_is_not_swapped_in(self, sources):
+        reloaded = []
+        watcher = GuidebookWatcher(*sources, on_reload=reloaded.append)
+
+        os.unlink(sources[1])
+
+        assert watcher.check() is False
+        assert reloaded == []
+
+    def test_reload_swaps_service_guidebook(self, sources):
+        service = BerlinHelpService(guidebook=YamlGuidebook(*sources))
+        changes = []
+        watcher = GuidebookWatcher(
+            *sources,
+            on_reload=lambda gb: changes.append(service.swap_guidebook(gb)),
+        )
+
+        _append(sources[0], NEW_TOPIC)
+        watcher.check()
+
+        assert "new_topic" in service.list_topics()
+        assert changes[0].added == ("new_topic",)
+        assert changes[0].removed == ()
+
+    def test_failed_callback_is_retried_with_next_change(self, sources):
+        reloaded = []
+
+        def on_reload(guidebook):
+            if not reloaded:
+                reloaded.append(None)
+                raise ValueError("swap failed")
+            reloaded.append(guidebook)
+
+        watcher = GuidebookWatcher(*sources, on_reload=on_reload)
+
+        _append(sources[0], NEW_TOPIC)
+        assert watcher.check() is False
+        assert watcher._guidebook is None
+
+        _append(sources[0], "\n")
+        assert watcher.check() is True
+        assert "new_topic" in reloaded[1].get_topics()
+        assert watcher._guidebook is reloaded[1]
+
+    def test_watcher_thread_survives_failed_check(self, sources, monkeypatch):
+        checks = []
+
+        def check():
+            checks.append(None)
+            raise OSError("stat failed")
+
+        watcher = GuidebookWatcher(*sources, on_reload=lambda gb: None, interval=0.01)
+        monkeypatch.setattr(watcher, "check", check)
+
+        watcher.start()
+        for _ in range(500):
+            if len(checks) >= 2:
+                break
+            watcher._stop.wait(0.01)
+        watcher.stop()
+
+        assert len(checks) >= 2
+
+    def test_start_and_stop(self, sources):
+        watcher = GuidebookWatcher(*sources, on_reload=lambda gb: None, interval=0.01)
+
+        watcher.start()
+        watcher.stop()
+
+        assert watcher._thread is not None
+        assert not watcher._thread.is_alive()
+
+
+class TestGuidebookWatcherDirectory:
+    """Test hot reload of guidebooks split into topic files."""
+
+    @pytest.fixture
+    def topic_sources(self, tmp_path):
+        directory = tmp_path / "guidebook"
+        split_guidebook("src/knowledgebase/guidebook.yml", str(directory))
+        vocabulary_path = tmp_path / "vocabulary.yml"
+        shutil.copy("src/knowledgebase/vocabulary.yml", vocabulary_path)
+        return str(directory), str(vocabulary_path)
+
+    def test_changed_topic_file_is_reloaded_alone(self, topic_sources, monkeypatch):
+        guidebook = YamlGuidebook(*topic_sources)
+        reloaded = []
+        watcher = GuidebookWatcher(
+            *topic_sources, on_reload=reloaded.append, guidebook=guidebook
+        )
+        monkeypatch.setattr(
+            YamlGuidebook, "_parse_topics", staticmethod(pytest.fail)
+        )
+
+        with open(os.path.join(topic_sources[0], "furniture.yml"), "w", encoding="utf-8") as f:
+            f.write("contents:\n  - one item\n")
+
+        assert watcher.check() is True
+        assert reloaded[0].get_topic_contents("furniture") == ("one item",)
+        assert reloaded[0].topics["cities"] is guidebook.topics["cities"]
+
+    def test_added_topic_file_is_picked_up(self, topic_sources):
+        reloaded = []
+        watcher = GuidebookWatcher(
+            *topic_sources,
+            on_reload=reloaded.append,
+            guidebook=YamlGuidebook(*topic_sources),
+        )
+
+        _append(os.path.join(topic_sources[0], "new_topic.yml"), "contents:\n  - item\n")
+
+        assert watcher.check() is True
+        assert "new_topic" in reloaded[0].get_topics()
+
+    def test_failed_topic_reload_is_retried_on_served_guidebook(self, topic_sources):
+        guidebook = YamlGuidebook(*topic_sources)
+        reloaded = []
+
+        def on_reload(new_guidebook):
+            if not reloaded:
+                reloaded.append(None)
+                raise ValueError("swap failed")
+            reloaded.append(new_guidebook)
+
+        watcher = GuidebookWatcher(*topic_sources, on_reload=on_reload, guidebook=guidebook)
+
+        with open(os.path.join(topic_sources[0], "furniture.yml"), "w", encoding="utf-8") as f:
+            f.write("contents:\n  - one item\n")
+        assert watcher.check() is False
+        _append(os.path.join(topic_sources[0], "new_topic.yml"), "contents:\n  - item\n")
+
+        assert watcher.check() is True
+        assert reloaded[1].get_topic_contents("furniture") == ("one item",)
+        assert "new_topic" in reloaded[1].get_topics()
+
+    def test_vocabulary_change_reloads_everything(self, topic_sources):
+        guidebook = YamlGuidebook(*topic_sources)
+        reloaded = []
+        watcher = GuidebookWatcher(
+            *topic_sources, on_reload=reloaded.append, guidebook=guidebook
+        )
+
+        _append(topic_sources[1], "\nHamburg:\n  - hh\n")
+
+        assert watcher.check() is True
+        assert reloaded[0].vocabulary["hh"] == "hamburg"
+        assert reloaded[0].topics["cities"] is not guidebook.topics["cities"]
@@ -2,7 +2,15 @@
 
 import pytest
 from src.infrastructure.guidebook_formatter import (
+    HTML,
+    MARKDOWN_V2,
+    escape,
     format_contents,
+    iter_contents,
+    link_label,
+    message_parts,
+    stream_contents,
+    utf16_length,
     wrap_with_separator,
 )
 
@@ -110,6 +118,17 @@ class TestFormatContents:
         assert "- https://tasso.net" in result
         assert "- https://example.com" in result
 
+    def test_format_tuple_and_read_only_mapping(self):
+        """Test that frozen guidebook contents format like lists and dicts."""
+        from types import MappingProxyType
+
+        assert format_contents(("Item 1", "Item 2")) == format_contents(
+            ["Item 1", "Item 2"]
+        )
+        assert format_contents(
+            MappingProxyType({"Berlin": ("link1",)})
+        ) == format_contents({"Berlin": ["link1"]})
+
     def test_format_empty_list(self):
         """Test formatting empty list."""
         contents = []
@@ -133,3 +152,166 @@ class TestFormatContents:
 
         with pytest.raises(TypeError):
             format_contents(123)  # type: ignore[arg-type]
+
+
+class TestStreamContents:
+    """Test formatting contents fragment by fragment."""
+
+    def test_fragments_are_items_and_sections(self):
+        """Test each list item and each dict section is one fragment."""
+        sections = {"Berlin": ["link1", "link2"], "Munich": ["link3"]}
+
+        fragments = list(iter_contents(sections))
+
+        assert fragments[1:-1] == ["Berlin:\n- link1\n- link2\n", "Munich:\n- link3\n"]
+        assert "".join(fragments) == format_contents(sections)
+        assert list(iter_contents(["a", "b"], title="x"))[1:-1] == ["X\n", "a\n", "b\n"]
+
+    def test_chunks_join_to_formatted_contents(self):
+        """Test chunks stay under the size in UTF-16 code units and add up."""
+        items = [f"Item {i} 🇺🇦" for i in range(200)]
+
+        chunks = list(stream_contents(items, title="Berlin", chunk_size=100))
+
+        assert "".join(chunks) == format_contents(items, title="Berlin")
+        assert len(chunks) > 1
+        assert all(utf16_length(chunk) <= 100 for chunk in chunks)
+        assert all(chunk.endswith("\n") for chunk in chunks[:-1])
+
+    def test_oversized_fragment_is_a_chunk_of_its_own(self):
+        """Test a section longer than a chunk is not cut."""
+        sections = {"Small": ["a"], "Large": ["b" * 50], "Last": ["c"]}
+
+        chunks = list(stream_contents(sections, chunk_size=40))
+
+        assert "Large:\n- " + "b" * 50 + "\n" in chunks
+        assert "".join(chunks) == format_contents(sections)
+
+    def test_chunks_are_yielded_as_formatted(self):
+        """Test the first chunk comes before later items are formatted."""
+        formatted = []
+
+        class Items(list):
+            def __iter__(self):
+                for item in super().__iter__():
+                    formatted.append(item)
+                    yield item
+
+        chunks = stream_contents(Items(f"item {i}" for i in range(1000)), chunk_size=100)
+        next(chunks)
+
+        assert len(formatted) < 20
+
+
+class TestMessageParts:
+    """Test splitting replies into Telegram messages."""
+
+    def test_short_reply_is_one_message(self):
+        """Test a reply within the limit is not split."""
+        assert message_parts(["#topic\n", "a\n", "b\n"]) == ("#topic\na\nb\n",)
+
+    def test_split_at_items_in_utf16_code_units(self):
+        """Test messages end at items and count emoji as two code units."""
+        items = [f"Item {i} 🇺🇦" for i in range(200)]
+        fragments = ["#topic\n", *iter_contents(items)]
+
+        parts = message_parts(fragments, limit=100)
+
+        assert "".join(parts) == "".join(fragments)
+        assert len(parts) > 1
+        assert all(utf16_length(part) <= 100 for part in parts)
+        assert all(len(part) < 100 for part in parts)
+        assert all(part.endswith("\n") for part in parts[:-1])
+
+    def test_oversized_section_is_cut_before_bullet_points(self):
+        """Test a section longer than a message is cut between its items."""
+        sections = {"Small": ["a"], "Large": [f"link{i}" for i in range(20)]}
+
+        parts = message_parts(iter_contents(sections), limit=60)
+
+        assert "".join(parts) == format_contents(sections)
+        assert all(utf16_length(part) <= 60 for part in parts)
+        assert all(part.startswith("- ") for part in parts[2:])
+
+    def test_whole_reply_is_cut_at_lines(self):
+        """Test a reply given as one fragment is cut after its lines."""
+        line = "x" * 30
+        reply = "\n".join([line] * 10)
+
+        parts = message_parts([reply], limit=70)
+
+        assert parts == (f"{line}\n{line}\n",) * 4 + (f"{line}\n{line}",)
+
+    def test_line_longer_than_limit_is_cut_between_characters(self):
+        """Test text without line breaks is cut at the limit, never inside a surrogate pair."""
+        flags = "🇺🇦" * 10
+
+        parts = message_parts([flags], limit=9)
+
+        assert "".join(parts) == flags
+        assert [utf16_length(part) for part in parts] == [8] * 5
+
+
+class TestParseModes:
+    """Test formatting for Telegram HTML and MarkdownV2."""
+
+    def test_escape(self):
+        """Test only the characters a parse mode reserves are escaped."""
+        assert escape("a < b & c > d.", HTML) == "a &lt; b &amp; c &gt; d."
+        assert escape("#social_help (1+1=2)!", MARKDOWN_V2) == (
+            "\\#social\\_help \\(1\\+1\\=2\\)\\!"
+        )
+        assert escape("a < b.", None) == "a < b."
+
+    @pytest.mark.parametrize("url, label", [
+        ("https://t.me/berlinhelpsukrainians", "@berlinhelpsukrainians"),
+        ("https://t.me/+isy_Cw5MrptmZjlk", "t.me/+isy_Cw5MrptmZjlk"),
+        ("https://www.berlin.de/", "berlin.de"),
+        ("https://handbookgermany.de/ru/disability", "handbookgermany.de/ru/disability"),
+        (
+            "https://www.berlin.de/ba-pankow/politik-und-verwaltung/aemter/amt-fuer-soziales/",
+            "berlin.de/…",
+        ),
+    ])
+    def test_link_label(self, url, label):
+        """Test links are labelled with a Telegram username or a short address."""
+        assert link_label(url) == label
+
+    def test_html_dict_contents(self):
+        """Test bold section headers, escaped text and labelled links."""
+        sections = {"Berlin <Mitte>": ["https://t.me/berlin_ua", "Сайт: https://www.berlin.de/."]}
+
+        result = format_contents(sections, parse_mode=HTML)
+
+        assert result.splitlines()[1:-1] == [
+            "<b>Berlin &lt;Mitte&gt;:</b>",
+            '- <a href="https://t.me/berlin_ua">@berlin_ua</a>',
+            '- Сайт: <a href="https://www.berlin.de/">berlin.de</a>.',
+        ]
+
+    def test_markdown_v2_list_contents(self):
+        """Test MarkdownV2 escapes text, separators and link targets."""
+        result = format_contents(["Тел. 030-123", "https://a.de/x_(1)"], title="köln",
+                                 parse_mode=MARKDOWN_V2)
+
+        assert result.splitlines() == [
+            "\\=" * 30,
+            "*Köln*",
+            "Тел\\. 030\\-123",
+            "[a\\.de/x\\_\\(1\\)](https://a.de/x_(1\\))",
+            "\\=" * 30,
+        ]
+
+    def test_fragments_in_parse_mode_join_to_formatted_contents(self):
+        """Test the fragments of a parse mode add up to its formatted contents."""
+        sections = {"Berlin": ["a.b", "https://t.me/berlin_ua"], "Bonn": []}
+
+        for parse_mode in (HTML, MARKDOWN_V2):
+            assert "".join(iter_contents(sections, parse_mode=parse_mode)) == (
+                format_contents(sections, parse_mode=parse_mode)
+            )
+
+    def test_unknown_parse_mode(self):
+        """Test an unknown parse mode is rejected."""
+        with pytest.raises(ValueError, match="Markdown"):
+            format_contents(["a"], parse_mode="Markdown")
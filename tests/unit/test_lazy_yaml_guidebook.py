@@ -0,0 +1,196 @@
+"""Unit tests for LazyYamlGuidebook."""
+
+import os
+import tempfile
+
+import pytest
+from src.domain.protocols import GuidebookValidationError
+from src.infrastructure.lazy_yaml_guidebook import LazyYamlGuidebook
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+GUIDEBOOK_PATH = "src/knowledgebase/guidebook.yml"
+VOCABULARY_PATH = "src/knowledgebase/vocabulary.yml"
+
+
+@pytest.fixture
+def eager():
+    return YamlGuidebook(GUIDEBOOK_PATH, VOCABULARY_PATH)
+
+
+@pytest.fixture
+def lazy():
+    return LazyYamlGuidebook(GUIDEBOOK_PATH, VOCABULARY_PATH, cache_size=2)
+
+
+class TestLazyYamlGuidebook:
+    """Test that lazy loading matches the eager YamlGuidebook."""
+
+    def test_startup_parses_no_topics(self, lazy):
+        assert lazy.cached_topics() == []
+
+    def test_index_matches_eager_guidebook(self, lazy, eager):
+        """Topics and descriptions come from the index alone."""
+        assert lazy.get_topics() == eager.get_topics()
+        for topic in eager.get_topics():
+            assert lazy.get_topic_description(topic) == eager.get_topic_description(topic)
+        assert lazy.cached_topics() == []
+
+    def test_contents_match_eager_guidebook(self, lazy, eager):
+        for topic in eager.get_topics():
+            assert lazy.get_topic_contents(topic) == eager.get_topic_contents(topic)
+
+    def test_description_case_insensitive(self, lazy):
+        assert lazy.get_topic_description("ACCOMMODATION") is not None
+        assert lazy.get_topic_description("nonexistent_topic") is None
+
+    def test_get_topic_contents_nonexistent_topic(self, lazy):
+        with pytest.raises(KeyError):
+            lazy.get_topic_contents("nonexistent_topic")
+
+    def test_cities_and_countries_match_eager_guidebook(self, lazy, eager):
+        for name in ["Berlin", "munchen", "Dusseldrof", "Frankfrut", "Саксония", "NonexistentCity", None]:
+            assert lazy.get_cities(name) == eager.get_cities(name)
+        for name in ["Poland", "Polnd", "Украина", "NonexistentCountry", None]:
+            assert lazy.get_countries(name) == eager.get_countries(name)
+
+    def test_sections_match_eager_guidebook(self, lazy, eager):
+        for topic, name in [("medical", "аптек"), ("deutsch", "курсы"), ("animals", "Полезные сылки"),
+                            ("medical", "qqq"), ("transport", "bvg"), ("nonexistent", "bvg")]:
+            assert lazy.find_sections(topic, name) == eager.find_sections(topic, name)
+
+    def test_completions_match_eager_guidebook(self, lazy, eager):
+        for prefix in ["", "berl", "Мюн", "жил", "ukr", "qqq"]:
+            assert lazy.complete(prefix) == eager.complete(prefix)
+
+    def test_search_matches_eager_guidebook(self, lazy, eager):
+        for query in ["jobcenter", "где найти жильё", "квартир", "qqq", ""]:
+            assert lazy.search_topics(query) == eager.search_topics(query)
+        # Indexing parses every topic without evicting the cached ones
+        assert lazy.cached_topics() == []
+
+    def test_prompt_does_not_parse_topic(self, lazy):
+        lazy.get_cities()
+        assert lazy.cached_topics() == []
+
+    def test_cache_is_bounded_lru(self, lazy):
+        lazy.get_topic_contents("accommodation")
+        lazy.get_topic_contents("animals")
+        lazy.get_topic_contents("accommodation")
+        lazy.get_topic_contents("cities")
+
+        assert lazy.cached_topics() == ["accommodation", "cities"]
+
+
+class TestLazyYamlGuidebookValidation:
+    """Test that topics are validated when first parsed."""
+
+    def _write(self, content):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as f:
+            f.write(content)
+            return f.name
+
+    def test_invalid_topic_fails_on_first_access(self):
+        guidebook_path = self._write(
+            "good:\n  description: Good\n  contents:\n    - item\n"
+            "bad:\n  description: Bad\n  contents:\n    - 42\n"
+        )
+        vocabulary_path = self._write("Berlin:\n  - berlin\n")
+        try:
+            guidebook = LazyYamlGuidebook(guidebook_path, vocabulary_path)
+
+            assert guidebook.get_topic_contents("good") == ("item",)
+            with pytest.raises(GuidebookValidationError) as exc_info:
+                guidebook.get_topic_contents("bad")
+            assert "bad" in str(exc_info.value)
+        finally:
+            os.unlink(guidebook_path)
+            os.unlink(vocabulary_path)
+
+    def test_validate_rejects_invalid_topic_at_load(self):
+        guidebook_path = self._write(
+            "good:\n  description: Good\n  contents:\n    - item\n"
+            "bad:\n  description: Bad\n  contents:\n    - 42\n"
+        )
+        vocabulary_path = self._write("Berlin:\n  - berlin\n")
+        try:
+            with pytest.raises(GuidebookValidationError, match="bad"):
+                LazyYamlGuidebook(guidebook_path, vocabulary_path, validate=True)
+        finally:
+            os.unlink(guidebook_path)
+            os.unlink(vocabulary_path)
+
+    def test_missing_contents_and_alias_collisions_fail_at_load(self):
+        # An alias of Bernau that is the name of the Berlin section
+        vocabulary_path = self._write("Bernau:\n  - berlin\n")
+        missing_path = self._write("good:\n  contents:\n    - item\nbad:\n  description: Bad\n")
+        cities_path = self._write(
+            "cities:\n  contents:\n    Berlin:\n      - item\n    Bernau:\n      - item\n"
+        )
+        try:
+            with pytest.raises(GuidebookValidationError, match="bad"):
+                LazyYamlGuidebook(missing_path, vocabulary_path)
+            with pytest.raises(GuidebookValidationError, match="alias 'berlin'"):
+                LazyYamlGuidebook(cities_path, vocabulary_path)
+        finally:
+            for path in (vocabulary_path, missing_path, cities_path):
+                os.unlink(path)
+
+    def test_file_rewritten_in_place_does_not_change_guidebook(self):
+        guidebook_path = self._write("topic:\n  description: Topic\n  contents:\n    - item\n")
+        vocabulary_path = self._write("Berlin:\n  - berlin\n")
+        try:
+            guidebook = LazyYamlGuidebook(guidebook_path, vocabulary_path)
+            with open(guidebook_path, "w", encoding="utf-8"):
+                pass
+
+            assert guidebook.get_topic_contents("topic") == ("item",)
+        finally:
+            os.unlink(guidebook_path)
+            os.unlink(vocabulary_path)
+
+    def test_multiline_description(self):
+        guidebook_path = self._write(
+            "topic:\n  description: |\n    Line one\n  contents:\n    - item\n"
+            "other:\n  contents:\n    - item\n"
+        )
+        vocabulary_path = self._write("Berlin:\n  - berlin\n")
+        try:
+            guidebook = LazyYamlGuidebook(guidebook_path, vocabulary_path)
+
+            assert guidebook.get_topic_description("topic") == "Line one\n"
+            assert guidebook.get_topic_description("other") == ""
+        finally:
+            os.unlink(guidebook_path)
+            os.unlink(vocabulary_path)
+
+
+class TestLazyYamlGuidebookTranslations:
+    """Test per-language topic variants in the lazy guidebook."""
+
+    def test_translations_match_eager_guidebook(self, tmp_path):
+        guidebook_path = tmp_path / "guidebook.yml"
+        # Translations listed before the base description
+        guidebook_path.write_text(
+            "accommodation:\n"
+            "  translations:\n"
+            "    uk:\n      description: Житло\n      contents:\n        - Житло\n"
+            "  description: Жильё\n"
+            "  contents:\n    - Жильё\n"
+            "animals:\n  description: Животные\n  contents:\n    - Кошки\n",
+            encoding="utf-8",
+        )
+        lazy = LazyYamlGuidebook(str(guidebook_path), VOCABULARY_PATH)
+        eager = YamlGuidebook(str(guidebook_path), VOCABULARY_PATH)
+
+        assert lazy.get_topic_description("accommodation") == "Жильё"
+        for languages in ((), ("uk",), ("en",)):
+            for topic in eager.get_topics():
+                assert lazy.get_topic_description(topic, languages) == (
+                    eager.get_topic_description(topic, languages)
+                )
+        # Untranslated topics are not parsed for their description
+        assert lazy.cached_topics() == ["accommodation"]
+        for topic in eager.get_topics():
+            assert lazy.get_topic_contents(topic, ("uk",)) == (
+                eager.get_topic_contents(topic, ("uk",))
+            )
@@ -0,0 +1,35 @@
+"""Unit tests for name normalization."""
+
+import pytest
+from src.infrastructure.name_normalization import normalize_name
+
+
+class TestNormalizeName:
+    """Test that spellings of one name normalize alike."""
+
+    @pytest.mark.parametrize("spelling", [
+        "München", "MÜNCHEN", "Muenchen", "munchen", "München", "🇩🇪 München!",
+    ])
+    def test_umlaut_spellings(self, spelling):
+        assert normalize_name(spelling) == "munchen"
+
+    @pytest.mark.parametrize("name, expected", [
+        ("Берлин", "berlin"),
+        ("Берлін", "berlin"),
+        ("Дрезден", "dresden"),
+        ("Лейпциг", "leipzig"),
+        ("Штутгарт", "stutgart"),
+        ("Пушкин", "puschkin"),
+        ("Кёльн", "keln"),
+        ("Кельн", "keln"),
+    ])
+    def test_cyrillic_is_transliterated(self, name, expected):
+        assert normalize_name(name) == expected
+
+    def test_separators_and_compatibility_forms(self):
+        assert normalize_name("Halle (Saale)") == "halle saale"
+        assert normalize_name("Baden-Württemberg") == "baden wurttemberg"
+        assert normalize_name("Нижняя_саксония") == normalize_name("нижняя-саксония")
+        assert normalize_name("Ｂｅｒｌｉｎ") == "berlin"
+        assert normalize_name("Gießen") == "giessen"
+        assert normalize_name("🇺🇦") == ""
@@ -0,0 +1,89 @@
+"""Unit tests for the PLZ range index."""
+
+import pytest
+from src.domain.protocols import GuidebookValidationError
+from src.infrastructure.plz_index import PlzIndex, compile_plz_index, parse_plz_ranges
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+PLZ_RANGES_PATH = "src/knowledgebase/plz_ranges.csv"
+
+
+@pytest.fixture
+def index(tmp_path):
+    return PlzIndex(PLZ_RANGES_PATH, str(tmp_path / "plz_ranges.plzidx"))
+
+
+class TestPlzIndex:
+    """Test lookups in the bundled range table."""
+
+    @pytest.mark.parametrize("postal_code, city", [
+        ("10115", "Berlin"),
+        ("14469", "Potsdam"),
+        ("44575", "Castrop-Rauxel"),
+        ("44581", "Castrop-Rauxel"),
+        ("44582", "Bochum"),
+        ("80331", "München"),
+        ("01000", "Dresden"),
+        ("99999", "Thüringen"),
+    ])
+    def test_codes_resolve_to_nearest_city(self, index, postal_code, city):
+        assert index.lookup(postal_code) == city
+
+    @pytest.mark.parametrize("postal_code", ["00999", "05123", "1011", "101150", "1O115", "１０１１５"])
+    def test_unassigned_and_malformed_codes(self, index, postal_code):
+        assert index.lookup(postal_code) is None
+
+    def test_index_is_opened_on_first_code(self, index, tmp_path):
+        assert index.lookup("Berlin") is None
+        assert not index.loaded
+        assert not (tmp_path / "plz_ranges.plzidx").exists()
+
+        index.lookup("10115")
+
+        assert index.loaded
+        assert (tmp_path / "plz_ranges.plzidx").exists()
+
+    def test_cities_are_guidebook_cities(self):
+        guidebook = YamlGuidebook(
+            "src/knowledgebase/guidebook.yml", "src/knowledgebase/vocabulary.yml"
+        )
+        with open(PLZ_RANGES_PATH, "rb") as f:
+            cities = {city for _, _, city in parse_plz_ranges(f.read())}
+
+        assert cities <= set(guidebook.get_topic_contents("cities"))
+
+
+class TestPlzIndexCompilation:
+    """Test compiling and recompiling range tables."""
+
+    def test_stale_index_is_recompiled(self, tmp_path):
+        csv_path = tmp_path / "plz.csv"
+        csv_path.write_text("first,last,city\n10000,14199,Berlin\n", encoding="utf-8")
+        compile_plz_index(str(csv_path))
+        csv_path.write_text("first,last,city\n10000,14199,Potsdam\n", encoding="utf-8")
+
+        assert PlzIndex(str(csv_path)).lookup("10115") == "Potsdam"
+
+    def test_corrupt_index_is_recompiled(self, tmp_path):
+        csv_path = tmp_path / "plz.csv"
+        csv_path.write_text("first,last,city\n10000,14199,Berlin\n", encoding="utf-8")
+        (tmp_path / "plz.plzidx").write_bytes(b"garbage")
+
+        assert PlzIndex(str(csv_path)).lookup("10115") == "Berlin"
+
+    def test_rows_are_sorted(self):
+        source = "# comment\nfirst,last,city\n20000,22999,Hamburg\n10000,14199,Berlin\n"
+
+        assert parse_plz_ranges(source.encode()) == [
+            (10000, 14199, "Berlin"), (20000, 22999, "Hamburg")
+        ]
+
+    @pytest.mark.parametrize("rows, match", [
+        ("10000,14199,Berlin\n14000,14999,Potsdam\n", "overlaps the range of Berlin"),
+        ("1000,14199,Berlin\n", "invalid row"),
+        ("14199,10000,Berlin\n", "invalid row"),
+        ("10000,14199,\n", "invalid row"),
+    ])
+    def test_invalid_tables_are_rejected(self, rows, match):
+        with pytest.raises(GuidebookValidationError, match=match):
+            parse_plz_ranges(f"first,last,city\n{rows}".encode())
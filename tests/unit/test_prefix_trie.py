@@ -0,0 +1,54 @@
+"""Unit tests for the autocomplete prefix trie."""
+
+from src.domain.models import Completion
+from src.infrastructure.name_normalization import normalize_name
+from src.infrastructure.prefix_trie import (
+    RANK_ALIAS,
+    RANK_DESCRIPTION,
+    PrefixTrie,
+    completion_trie,
+)
+
+
+class TestPrefixTrie:
+    """Test ranking and lookup of PrefixTrie."""
+
+    def test_ranked_then_in_insertion_order(self):
+        trie = PrefixTrie(limit=3)
+        trie.add("bern", "description", RANK_DESCRIPTION)
+        trie.add("berlin", "berlin")
+        trie.add("bernau", "alias", RANK_ALIAS)
+        trie.add("bernburg", "bernburg")
+        trie.freeze()
+
+        assert trie.complete("ber") == ["berlin", "bernburg", "alias"]
+        assert trie.complete("bern") == ["bernburg", "alias", "description"]
+        assert trie.complete("berl", limit=1) == ["berlin"]
+        assert trie.complete("x") == []
+
+    def test_values_are_listed_once(self):
+        trie = PrefixTrie()
+        trie.add("munchen", "münchen")
+        trie.add("munich", "münchen", RANK_ALIAS)
+        trie.freeze()
+
+        assert trie.complete("mun") == ["münchen"]
+
+
+class TestCompletionTrie:
+    """Test the guidebook completion trie."""
+
+    def test_completes_topics_sections_and_aliases(self):
+        trie = completion_trie(
+            [("accommodation", "Поиск жилья"), ("free_stuff", "Гуманитарная помощь в Берлине")],
+            {"cities": ["berlin", "münchen"]},
+            {"munich": "münchen", "ua": "ukraine"},
+        )
+
+        assert trie.complete("acc") == [Completion("accommodation")]
+        assert trie.complete("free s") == [Completion("free_stuff")]
+        assert trie.complete("berl") == [Completion("cities", "berlin"), Completion("free_stuff")]
+        assert trie.complete("munic") == [Completion("cities", "münchen")]
+        # Any word of a description, in normalized form like the keys
+        assert trie.complete(normalize_name("Жил")) == [Completion("accommodation")]
+        assert trie.complete("ua") == []
@@ -0,0 +1,101 @@
+"""Unit tests for the render cache."""
+
+import logging
+import sys
+import threading
+from unittest.mock import Mock
+
+from src.application.render_cache import RenderCache, guidebook_version
+from src.domain.models import ListingPage
+from src.domain.protocols import IGuidebook
+
+
+class TestRenderCache:
+    """Test storing replies by guidebook version."""
+
+    def test_hits_and_misses_are_counted(self):
+        cache = RenderCache()
+
+        assert cache.get("accommodation", "@", "v1") is None
+        cache.put("accommodation", "@", "v1", "#accommodation\n...")
+
+        assert cache.get("accommodation", "@", "v1") == "#accommodation\n..."
+        assert cache.get("accommodation", "@", "v2") is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_retain_keeps_served_versions(self):
+        cache = RenderCache()
+        cache.put("cities", "berlin", "v1", "old")
+        cache.put("cities", "berlin", "v2", "new")
+        cache.put("cities", "berlin", "id:1", "double")
+
+        cache.retain({"v2", "id:1"})
+
+        assert len(cache) == 1
+        assert cache.get("cities", "berlin", "v2") == "new"
+
+    def test_puts_during_retain_are_kept(self):
+        cache = RenderCache()
+        for n in range(20_000):
+            cache.put("cities", str(n), "v1", "old")
+        stored = []
+
+        def put_replies():
+            for n in range(2_000):
+                stored.append(cache.put("cities", f"new {n}", "v2", "new"))
+
+        writer = threading.Thread(target=put_replies)
+        # Switch threads often enough to put in the middle of a retain
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            writer.start()
+            for _ in range(20):
+                cache.retain({"v1", "v2"})
+            writer.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        assert len(stored) == 2_000
+        assert all(cache.get("cities", f"new {n}", "v2") == "new" for n in range(2_000))
+
+    def test_parts_are_kept_with_their_reply(self):
+        cache = RenderCache()
+        reply = cache.put("cities_all", "", "v1", "ab", parts=("a", "b"))
+        cache.put("cities", "", "v1", "short")
+
+        assert cache.parts(reply) == ("a", "b")
+        assert cache.parts("short") is None
+
+        cache.retain({"v2"})
+
+        assert cache.parts(reply) is None
+
+    def test_pages_are_kept_by_version(self):
+        cache = RenderCache()
+        pages = cache.put_pages("cities_all", "v1", [ListingPage("cities", "all", 0, 1)])
+
+        assert cache.get_pages("cities_all", "v1") is pages
+        assert cache.get_pages("cities_all", "v2") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        cache.retain({"v2"})
+
+        assert cache.get_pages("cities_all", "v1") is None
+
+    def test_hit_rate_is_logged(self, caplog):
+        cache = RenderCache(log_every=2)
+        cache.put("cities_all", "", "v1", "all")
+
+        with caplog.at_level(logging.INFO, logger="src.application.render_cache"):
+            cache.get("cities_all", "", "v1")
+            cache.get("cities_all", "", "v2")
+
+        assert "1 hits, 1 misses (50.0% hits), 1 replies" in caplog.text
+
+    def test_guidebook_version_is_source_hash(self):
+        guidebook = Mock(spec=IGuidebook)
+        guidebook.source_hash = "abc"
+
+        assert guidebook_version(guidebook) == "abc"
+        assert guidebook_version(Mock(spec=IGuidebook)).startswith("id:")
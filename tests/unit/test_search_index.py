@@ -0,0 +1,84 @@
+"""Unit tests for the /search inverted index."""
+
+from types import MappingProxyType
+
+from src.infrastructure.search_index import SearchIndex, tokenize
+
+
+class TestTokenize:
+    """Test index word extraction."""
+
+    def test_urls_are_split_into_words(self):
+        assert tokenize("https://www.berlin.de/jobcenter-mitte/") == [
+            "https", "www", "berlin", "jobcenter", "mitt"
+        ]
+
+    def test_word_forms_meet(self):
+        assert tokenize("жильё") == tokenize("жилья") == tokenize("Жилье")
+        assert tokenize("квартира") == tokenize("квартиры")
+
+    def test_single_letters_and_question_words_are_dropped(self):
+        assert tokenize("Где в Berlin Kita для ребёнка?") == ["berlin", "kit", "rebenk"]
+        assert tokenize("де знайти") == ["snait"]
+
+
+class TestSearchIndex:
+    """Test ranking and lookup of SearchIndex."""
+
+    @staticmethod
+    def _index():
+        return SearchIndex([
+            ("accommodation", "Поиск жилья", ("Жильё на https://wohnung.de",)),
+            ("jobcenter", "Джобцентр", ("Jobcenter Mitte: https://jobcenter.de", "Bürgergeld")),
+            ("cities", "Чаты городов", MappingProxyType({
+                "Leipzig": ("https://t.me/leipzig",),
+                "Berlin": ("https://t.me/berlin_jobcenter",),
+            })),
+        ])
+
+    def test_topics_matching_more_query_words_score_higher(self):
+        hits = self._index().search("jobcenter bürgergeld")
+
+        assert [hit.topic for hit in hits] == ["jobcenter", "cities"]
+        assert hits[0].score > hits[1].score
+
+    def test_descriptions_section_keys_and_word_forms_are_found(self):
+        index = self._index()
+
+        assert [hit.topic for hit in index.search("где жилье")] == ["accommodation"]
+        assert [hit.topic for hit in index.search("LEIPZIG")] == ["cities"]
+
+    def test_long_query_words_match_as_prefixes(self):
+        index = self._index()
+
+        assert [hit.topic for hit in index.search("jobcent")] == ["jobcenter", "cities"]
+        # Short words only match whole words
+        assert index.search("job") == []
+
+    def test_short_topics_and_descriptions_weigh_more(self):
+        index = SearchIndex([
+            ("food", "Бесплатная еда", ("Tafel",)),
+            ("social", "Социальные услуги", ("Tafel, Kleiderkammer, Beratung, Sozialamt",)),
+            ("lists", "Списки", ("Бесплатная одежда, Kleiderkammer, Beratung",)),
+        ])
+
+        assert [hit.topic for hit in index.search("tafel")] == ["food", "social"]
+        assert [hit.topic for hit in index.search("бесплатно")] == ["food", "lists"]
+
+    def test_unknown_words_find_nothing(self):
+        index = self._index()
+
+        assert index.search("где это") == []
+        assert index.search("qqq") == []
+        assert index.search("") == []
+        assert len(index.search("jobcenter", limit=1)) == 1
+
+    def test_index_size(self):
+        index = self._index()
+
+        assert len(index) == 3
+        assert index.term_count == len(set(
+            tokenize("Поиск жилья Жильё на https://wohnung.de Джобцентр "
+                     "Jobcenter Mitte: https://jobcenter.de Bürgergeld Чаты городов "
+                     "Leipzig https://t.me/leipzig Berlin https://t.me/berlin_jobcenter")
+        ))
@@ -0,0 +1,188 @@
+"""Unit tests for SqliteGuidebook."""
+
+import shutil
+
+import pytest
+from src.domain.protocols import GuidebookError
+from src.infrastructure import sqlite_guidebook
+from src.infrastructure.sqlite_guidebook import (
+    SqliteGuidebook,
+    import_guidebook,
+    read_source_hash,
+)
+from src.infrastructure.yaml_guidebook import YamlGuidebook
+
+GUIDEBOOK_PATH = "src/knowledgebase/guidebook.yml"
+VOCABULARY_PATH = "src/knowledgebase/vocabulary.yml"
+
+
+@pytest.fixture(scope="module")
+def yaml_guidebook():
+    return YamlGuidebook(GUIDEBOOK_PATH, VOCABULARY_PATH)
+
+
+@pytest.fixture
+def database_path(tmp_path, yaml_guidebook):
+    path = str(tmp_path / "guidebook.db")
+    import_guidebook(yaml_guidebook, path)
+    return path
+
+
+@pytest.fixture
+def guidebook(database_path):
+    return SqliteGuidebook(database_path)
+
+
+class TestSqliteGuidebook:
+    """Test that the imported database serves the same content as the YAML."""
+
+    def test_topics_match_yaml(self, guidebook, yaml_guidebook):
+        assert guidebook.get_topics() == yaml_guidebook.get_topics()
+
+    def test_contents_and_descriptions_match_yaml(self, guidebook, yaml_guidebook):
+        for topic in yaml_guidebook.get_topics():
+            assert guidebook.get_topic_contents(topic) == yaml_guidebook.get_topic_contents(topic)
+            assert (
+                guidebook.get_topic_description(topic)
+                == yaml_guidebook.get_topic_description(topic)
+            )
+
+    def test_case_insensitive_topics(self, guidebook):
+        assert guidebook.get_topic_description("ACCOMMODATION") is not None
+        assert guidebook.get_topic_description("nonexistent_topic") is None
+
+    def test_get_topic_contents_nonexistent_topic(self, guidebook):
+        with pytest.raises(KeyError):
+            guidebook.get_topic_contents("nonexistent_topic")
+
+    def test_cities_and_countries_match_yaml(self, guidebook, yaml_guidebook):
+        for name in ["Berlin", "BERLIN", "munchen", "Dusseldrof", "Frankfrut", "NonexistentCity", None]:
+            assert guidebook.get_cities(name) == yaml_guidebook.get_cities(name)
+        for name in ["Poland", "Polnd", "Украина", "NonexistentCountry", None]:
+            assert guidebook.get_countries(name) == yaml_guidebook.get_countries(name)
+
+    def test_section_topics_are_indexed_at_load(self, guidebook, yaml_guidebook, monkeypatch):
+        monkeypatch.setattr(sqlite_guidebook, "AliasIndex", pytest.fail)
+
+        assert guidebook.get_cities("Dusseldrof") == yaml_guidebook.get_cities("Dusseldrof")
+        assert guidebook.get_countries("Polnd") == yaml_guidebook.get_countries("Polnd")
+
+    def test_sections_match_yaml(self, guidebook, yaml_guidebook):
+        for topic, name in [("medical", "аптек"), ("deutsch", "курсы"), ("animals", "Полезные сылки"),
+                            ("medical", "qqq"), ("transport", "bvg"), ("nonexistent", "bvg")]:
+            assert guidebook.find_sections(topic, name) == yaml_guidebook.find_sections(topic, name)
+
+    def test_completions_match_yaml(self, guidebook, yaml_guidebook):
+        for prefix in ["", "berl", "Мюн", "жил", "ukr", "qqq"]:
+            assert guidebook.complete(prefix) == yaml_guidebook.complete(prefix)
+
+    def test_topic_search_ranks_like_yaml(self, guidebook, yaml_guidebook):
+        for query in ["jobcenter", "где найти жильё", "квартир", "школа для детей"]:
+            hits = guidebook.search_topics(query)
+            assert hits[0].topic == yaml_guidebook.search_topics(query)[0].topic
+            assert hits[0].score == pytest.approx(
+                yaml_guidebook.search_topics(query)[0].score, rel=0.5
+            )
+
+    def test_vocabulary_view(self, guidebook, yaml_guidebook):
+        assert dict(guidebook.vocabulary) == yaml_guidebook.vocabulary
+
+
+class TestSqliteGuidebookSearch:
+    """Test topic search served by the FTS5 table."""
+
+    def test_search_reads_no_topic_contents(self, guidebook, monkeypatch):
+        monkeypatch.setattr(guidebook, "get_topic_contents", pytest.fail)
+
+        assert guidebook.search_topics("квартир")[0].topic == "apartment_approval"
+
+    def test_search_respects_limit(self, guidebook):
+        assert len(guidebook.search_topics("https", limit=3)) == 3
+
+    def test_search_ignores_query_syntax(self, guidebook):
+        assert guidebook.search_topics('"qqq OR NEAR(') == []
+        assert guidebook.search_topics("   ") == []
+        assert guidebook.search_topics("qqq") == []
+
+
+class TestSqliteGuidebookImport:
+    """Test importing and re-importing the database."""
+
+    def test_source_hash_is_recorded(self, database_path, yaml_guidebook):
+        assert read_source_hash(database_path) == yaml_guidebook.source_hash
+
+    def test_missing_database(self, tmp_path):
+        assert read_source_hash(str(tmp_path / "missing.db")) is None
+        with pytest.raises(GuidebookError):
+            SqliteGuidebook(str(tmp_path / "missing.db"))
+
+    def test_other_schema_version_is_rejected(self, database_path, monkeypatch):
+        monkeypatch.setattr(sqlite_guidebook, "SCHEMA_VERSION", sqlite_guidebook.SCHEMA_VERSION + 1)
+
+        with pytest.raises(GuidebookError):
+            SqliteGuidebook(database_path)
+        assert read_source_hash(database_path) is None
+
+    def test_from_yaml_reuses_current_database(self, database_path, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("database should not be re-imported")
+
+        monkeypatch.setattr(sqlite_guidebook, "import_guidebook", fail)
+
+        guidebook = SqliteGuidebook.from_yaml(GUIDEBOOK_PATH, VOCABULARY_PATH, database_path)
+
+        assert "cities" in guidebook.get_topics()
+
+    def test_from_yaml_reimports_changed_yaml(self, tmp_path, database_path):
+        guidebook_path = str(tmp_path / "guidebook.yml")
+        shutil.copy(GUIDEBOOK_PATH, guidebook_path)
+        with open(guidebook_path, "a", encoding="utf-8") as f:
+            f.write("\nnew_topic:\n  description: New topic\n  contents:\n    - item\n")
+
+        guidebook = SqliteGuidebook.from_yaml(guidebook_path, VOCABULARY_PATH, database_path)
+
+        assert guidebook.get_topic_contents("new_topic") == ("item",)
+
+    def test_open_guidebook_keeps_reading_replaced_database(
+        self, tmp_path, guidebook, database_path
+    ):
+        guidebook_path = str(tmp_path / "guidebook.yml")
+        with open(guidebook_path, "w", encoding="utf-8") as f:
+            f.write("new_topic:\n  description: New topic\n  contents:\n    - item\n")
+
+        import_guidebook(YamlGuidebook(guidebook_path, VOCABULARY_PATH), database_path)
+
+        assert "cities" in guidebook.get_topics()
+        assert SqliteGuidebook(database_path).get_topics() == ["new_topic"]
+
+
+class TestSqliteGuidebookTranslations:
+    """Test per-language topic variants imported from the YAML."""
+
+    @pytest.fixture
+    def translated(self, tmp_path):
+        guidebook_path = tmp_path / "guidebook.yml"
+        guidebook_path.write_text(
+            "accommodation:\n  description: Жильё\n  contents:\n    - Жильё\n"
+            "  translations:\n"
+            "    uk:\n      description: Житло\n      contents:\n        - Житло\n"
+            "    en:\n      description: Housing\n"
+            "cities:\n  description: Города\n  contents:\n"
+            "    Berlin:\n      - https://t.me/berlin\n",
+            encoding="utf-8",
+        )
+        database_path = str(tmp_path / "guidebook.db")
+        import_guidebook(YamlGuidebook(str(guidebook_path), VOCABULARY_PATH), database_path)
+        return SqliteGuidebook(database_path)
+
+    def test_translations(self, translated):
+        assert translated.get_topics() == ["accommodation", "cities"]
+        assert translated.get_topic_contents("accommodation", ("uk",)) == ("Житло",)
+        assert translated.get_topic_contents("accommodation", ("en",)) == ("Жильё",)
+        assert translated.get_topic_description("accommodation", ("de", "en")) == "Housing"
+        assert translated.get_topic_description("accommodation") == "Жильё"
+        assert "https://t.me/berlin" in translated.get_cities("berlin")
+
+    def test_topics_are_searched_in_base_language(self, translated):
+        assert [hit.topic for hit in translated.search_topics("Жильё")] == ["accommodation"]
+        assert translated.search_topics("Житло") == []
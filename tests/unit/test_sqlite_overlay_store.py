@@ -0,0 +1,71 @@
+"""Unit tests for SqliteOverlayStore."""
+
+import pytest
+from src.domain.models import Topic
+from src.domain.protocols import OverlayStoreError
+from src.infrastructure.sqlite_overlay_store import SqliteOverlayStore
+
+
+def _topic(name, *items):
+    return Topic(name=name, description=f"{name} description", contents=items)
+
+
+def test_set_and_get_topics():
+    store = SqliteOverlayStore(":memory:")
+
+    store.set_topic(1, _topic("sozialamt", "https://t.me/sozialamt"))
+
+    topics = store.get_topics(1)
+    assert topics["sozialamt"] == _topic("sozialamt", "https://t.me/sozialamt")
+    assert store.get_topics(2) == {}
+
+
+def test_topics_persist_to_file(tmp_path):
+    path = str(tmp_path / "overlays.db")
+    SqliteOverlayStore(path).set_topic(1, _topic("rota", "Mo: Anna", "Di: Олег"))
+
+    assert SqliteOverlayStore(path).get_topics(1)["rota"].contents == ("Mo: Anna", "Di: Олег")
+
+
+def test_writes_invalidate_cached_chat():
+    store = SqliteOverlayStore(":memory:")
+    store.set_topic(1, _topic("rota", "old"))
+    assert store.get_topics(1)["rota"].contents == ("old",)
+
+    store.set_topic(1, _topic("rota", "new"))
+    assert store.get_topics(1)["rota"].contents == ("new",)
+
+    assert store.delete_topic(1, "rota") is True
+    assert store.get_topics(1) == {}
+    assert store.delete_topic(1, "rota") is False
+
+
+def test_cache_evicts_least_recently_used_chats():
+    store = SqliteOverlayStore(":memory:", cache_size=2)
+    store.set_topic(1, _topic("one", "item"))
+
+    store.get_topics(1)
+    store.get_topics(2)
+    store.get_topics(1)
+    store.get_topics(3)
+
+    assert list(store._cache) == [1, 3]
+    assert store.get_topics(1)["one"].contents == ("item",)
+
+
+def test_cached_topics_are_read_only():
+    store = SqliteOverlayStore(":memory:")
+    store.set_topic(1, _topic("one", "item"))
+
+    with pytest.raises(TypeError):
+        store.get_topics(1)["two"] = _topic("two", "item")
+
+
+def test_read_errors_raise_overlay_store_error():
+    store = SqliteOverlayStore(":memory:")
+    store._conn.execute(
+        "INSERT INTO overlay_topics VALUES (1, 'bad', '', 'not json', 0)"
+    )
+
+    with pytest.raises(OverlayStoreError):
+        store.get_topics(1)
@@ -1,9 +1,10 @@
 """Unit tests for TelegramBotAdapter."""
 
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import ANY, AsyncMock, Mock, call, patch
 import pytest
-from src.adapters.telegram_adapter import TelegramBotAdapter
+from src.adapters.telegram_adapter import INLINE_CACHE_TIME, TelegramBotAdapter
+from src.domain.models import InlineResult, ListingPage, TopicChanges
 from src.domain.protocols import (
     IBerlinHelpService,
     IStatisticsService,
@@ -25,6 +26,10 @@ def mock_service():
         "countries",
     ]
     service.get_topic_description.return_value = "Topic description"
+    service.list_languages.return_value = []
+    service.split_reply.side_effect = lambda reply: (reply,)
+    service.parse_mode = None
+    service.handle_listing_page.return_value = ListingPage("cities", "All cities", 0, 1)
     return service
 
 
@@ -181,6 +186,32 @@ class TestTelegramBotAdapter:
             disable_web_page_preview=True,
         )
 
+    @pytest.mark.anyio
+    async def test_reply_to_message_sends_split_parts_in_order(self, adapter, mock_service):
+        """Test that a long reply is sent as its parts, only the first one as a reply."""
+        mock_service.split_reply.side_effect = lambda reply: ("part 1", "part 2")
+        update = SimpleNamespace(
+            effective_message=SimpleNamespace(
+                chat_id=123,
+                message_id=456,
+                reply_to_message=SimpleNamespace(message_id=789),
+            )
+        )
+        context = SimpleNamespace(bot=AsyncMock())
+
+        await adapter._reply_to_message(update, context, "part 1part 2")
+
+        mock_service.split_reply.assert_called_once_with("part 1part 2")
+        assert context.bot.send_message.await_args_list == [
+            call(
+                chat_id=123,
+                reply_to_message_id=789,
+                text="part 1",
+                disable_web_page_preview=True,
+            ),
+            call(chat_id=123, text="part 2", disable_web_page_preview=True),
+        ]
+
     @pytest.mark.anyio
     async def test_handle_cities_records_stats(
         self, adapter, mock_service, mock_stats_service
@@ -234,7 +265,9 @@ class TestTelegramBotAdapter:
         mock_service.get_topic_description.return_value = "Housing info"
         update = SimpleNamespace(
             effective_chat=SimpleNamespace(id=123),
-            effective_user=SimpleNamespace(id=7, first_name="User", last_name="Seven"),
+            effective_user=SimpleNamespace(
+                id=7, first_name="User", last_name="Seven", language_code="uk"
+            ),
             effective_message=SimpleNamespace(text="/accommodation", chat_id=123),
         )
         context = SimpleNamespace()
@@ -247,6 +280,45 @@ class TestTelegramBotAdapter:
             topic_description="Housing info",
         )
 
+    @pytest.mark.anyio
+    async def test_handle_topic_passes_chat_id(self, adapter, mock_service):
+        """Topic handlers ask the service for the chat's region."""
+        adapter._reply_to_message = AsyncMock()
+        update = SimpleNamespace(
+            effective_chat=SimpleNamespace(id=-100500),
+            effective_user=SimpleNamespace(id=7, language_code="en"),
+            effective_message=SimpleNamespace(text="/accommodation", chat_id=-100500),
+        )
+
+        handler = adapter._create_topic_handler("accommodation")
+        await handler(update, SimpleNamespace())
+
+        mock_service.handle_topic.assert_called_once_with(
+            "accommodation", section=None, chat_id=-100500, language="en"
+        )
+        mock_service.get_topic_description.assert_called_once_with(
+            "accommodation", chat_id=-100500
+        )
+
+    @pytest.mark.anyio
+    async def test_handle_topic_passes_section(self, adapter, mock_service):
+        """Words after a topic command ask for matching sections only."""
+        adapter._reply_to_message = AsyncMock()
+        update = SimpleNamespace(
+            effective_chat=SimpleNamespace(id=-100500),
+            effective_user=SimpleNamespace(id=7, language_code=None),
+            effective_message=SimpleNamespace(
+                text="/medical@berlinhelpbot  Где врач ", chat_id=-100500
+            ),
+        )
+
+        handler = adapter._create_topic_handler("medical")
+        await handler(update, SimpleNamespace())
+
+        mock_service.handle_topic.assert_called_once_with(
+            "medical", section="Где врач", chat_id=-100500, language=None
+        )
+
     @pytest.mark.anyio
     async def test_handle_topic_stats_default_k(self, adapter, mock_stats_service):
         """Ensure /topic_stats defaults to k=10."""
@@ -270,6 +342,7 @@ class TestTelegramBotAdapter:
         """Test handling /help command."""
         update = SimpleNamespace(
             effective_chat=SimpleNamespace(id=123),
+            effective_user=SimpleNamespace(id=7, language_code="uk"),
             effective_message=SimpleNamespace(
                 chat_id=123, message_id=456, reply_to_message=None, text="/help"
             ),
@@ -278,7 +351,7 @@ class TestTelegramBotAdapter:
 
         await adapter._handle_help(update, context)
 
-        mock_service.handle_help.assert_called_once()
+        mock_service.handle_help.assert_called_once_with(language="uk")
         context.bot.send_message.assert_called_once()
 
     @pytest.mark.anyio
@@ -297,9 +370,32 @@ class TestTelegramBotAdapter:
 
         await adapter._handle_cities(update, context)
 
-        mock_service.handle_cities.assert_called_once_with("berlin", show_all=False)
+        mock_service.handle_cities.assert_called_once_with(
+            "berlin", show_all=False, chat_id=123
+        )
         context.bot.send_message.assert_called_once()
 
+    @pytest.mark.anyio
+    async def test_handle_cities_sends_parse_mode(self, adapter, mock_service):
+        """Test city replies are sent in the parse mode the service renders them in."""
+        mock_service.parse_mode = "HTML"
+        update = SimpleNamespace(
+            effective_chat=SimpleNamespace(id=123),
+            effective_message=SimpleNamespace(
+                chat_id=123,
+                message_id=456,
+                reply_to_message=None,
+                text="/cities Berlin",
+            ),
+        )
+        context = SimpleNamespace(bot=AsyncMock())
+
+        await adapter._handle_cities(update, context)
+
+        context.bot.send_message.assert_called_once_with(
+            chat_id=123, text="City info", disable_web_page_preview=True, parse_mode="HTML"
+        )
+
     @pytest.mark.anyio
     async def test_handle_cities_all(self, adapter, mock_service):
         """Test handling /cities_all command."""
@@ -313,7 +409,167 @@ class TestTelegramBotAdapter:
 
         await adapter._handle_cities_all(update, context)
 
-        mock_service.handle_cities.assert_called_once_with(None, show_all=True)
+        mock_service.handle_listing_page.assert_called_once_with("cities", chat_id=123)
+        context.bot.send_message.assert_called_once_with(
+            chat_id=123, text="All cities", disable_web_page_preview=True
+        )
+
+    @pytest.mark.anyio
+    async def test_handle_countries_all_sends_first_page_with_keyboard(
+        self, adapter, mock_service
+    ):
+        """Test a listing of several pages is sent with a cached next button."""
+        mock_service.handle_listing_page.return_value = ListingPage(
+            "countries", "Page 1 of 3", 0, 3
+        )
+        update = SimpleNamespace(
+            effective_chat=SimpleNamespace(id=123),
+            effective_message=SimpleNamespace(
+                chat_id=123, message_id=456, reply_to_message=None, text="/countries_all"
+            ),
+        )
+        context = SimpleNamespace(bot=AsyncMock())
+
+        await adapter._handle_countries_all(update, context)
+        await adapter._handle_countries_all(update, context)
+
+        first, second = context.bot.send_message.await_args_list
+        keyboard = first.kwargs["reply_markup"]
+        assert second.kwargs["reply_markup"] is keyboard
+        (buttons,) = keyboard.inline_keyboard
+        assert [button.callback_data for button in buttons] == ["countries_all:1"]
+
+    @pytest.mark.anyio
+    async def test_listing_page_callback_edits_message(self, adapter, mock_service):
+        """Test a page button edits the listing in place and answers the query."""
+        mock_service.parse_mode = "HTML"
+        mock_service.handle_listing_page.return_value = ListingPage(
+            "cities", "Page 3 of 3", 2, 3
+        )
+        query = AsyncMock()
+        query.data = "cities_all:2"
+        query.message = SimpleNamespace(chat=SimpleNamespace(id=123))
+        update = SimpleNamespace(callback_query=query)
+
+        await adapter._handle_listing_page(update, SimpleNamespace(bot=AsyncMock()))
+
+        mock_service.handle_listing_page.assert_called_once_with("cities", 2, chat_id=123)
+        query.edit_message_text.assert_awaited_once()
+        assert query.edit_message_text.await_args.args == ("Page 3 of 3",)
+        options = query.edit_message_text.await_args.kwargs
+        assert options["parse_mode"] == "HTML"
+        (buttons,) = options["reply_markup"].inline_keyboard
+        assert [button.callback_data for button in buttons] == ["cities_all:1"]
+        query.answer.assert_awaited_once_with()
+
+    @pytest.mark.anyio
+    async def test_listing_page_callback_answers_when_page_unchanged(
+        self, adapter, mock_service
+    ):
+        """Test a double tap on a page button is still answered."""
+        from telegram.error import BadRequest
+
+        query = AsyncMock()
+        query.data = "cities_all:0"
+        query.message = SimpleNamespace(chat=SimpleNamespace(id=123))
+        query.edit_message_text.side_effect = BadRequest("Message is not modified")
+
+        await adapter._handle_listing_page(
+            SimpleNamespace(callback_query=query), SimpleNamespace(bot=AsyncMock())
+        )
+
+        query.answer.assert_awaited_once_with()
+
+    def test_listing_keyboard_single_page(self, adapter):
+        """Test a listing that fits on one page gets no keyboard."""
+        assert adapter._listing_keyboard(ListingPage("cities", "All cities", 0, 1)) is None
+
+    @pytest.mark.anyio
+    async def test_handle_search(self, adapter, mock_service, mock_stats_service):
+        """Test /search passes the words as typed and records stats."""
+        mock_service.handle_search.return_value = "/jobcenter Джобцентр"
+        update = SimpleNamespace(
+            effective_chat=SimpleNamespace(id=123),
+            effective_user=SimpleNamespace(language_code="uk"),
+            effective_message=SimpleNamespace(
+                chat_id=123,
+                message_id=456,
+                reply_to_message=None,
+                text="/search@hub_bot Bürgergeld Antrag",
+            ),
+        )
+        context = SimpleNamespace(bot=AsyncMock())
+
+        await adapter._handle_search(update, context)
+
+        mock_service.handle_search.assert_called_once_with(
+            "Bürgergeld Antrag", chat_id=123, language="uk"
+        )
+        assert mock_stats_service.record_request.call_args.kwargs["topic"] == "search"
+        context.bot.send_message.assert_called_once()
+
+    @pytest.mark.anyio
+    async def test_handle_question_replies_without_deleting(self, adapter, mock_service):
+        """Test questions are answered as replies and kept."""
+        mock_service.handle_question.return_value = "#accommodation\nWohnungen"
+        update = SimpleNamespace(
+            effective_chat=SimpleNamespace(id=123),
+            effective_user=SimpleNamespace(language_code="ru"),
+            effective_message=SimpleNamespace(
+                chat_id=123, message_id=456, text="где найти жильё?"
+            ),
+        )
+        context = SimpleNamespace(bot=AsyncMock())
+
+        await adapter._handle_question(update, context)
+
+        mock_service.handle_question.assert_called_once_with(
+            "где найти жильё?", chat_id=123, language="ru"
+        )
+        context.bot.delete_message.assert_not_called()
+        context.bot.send_message.assert_called_once_with(
+            chat_id=123,
+            reply_to_message_id=456,
+            text="#accommodation\nWohnungen",
+            disable_web_page_preview=True,
+        )
+
+    @pytest.mark.anyio
+    async def test_handle_location_replies_with_nearest_cities(
+        self, adapter, mock_service, mock_stats_service
+    ):
+        """Test shared locations are answered as replies and counted as /cities."""
+        mock_service.handle_location.return_value = "Ближайшие города: Berlin (2 км)"
+        update = SimpleNamespace(
+            effective_chat=SimpleNamespace(id=123),
+            effective_message=SimpleNamespace(
+                chat_id=123, message_id=456,
+                location=SimpleNamespace(latitude=52.52, longitude=13.40),
+            ),
+        )
+        context = SimpleNamespace(bot=AsyncMock())
+
+        await adapter._handle_location(update, context)
+
+        mock_service.handle_location.assert_called_once_with(52.52, 13.40, chat_id=123)
+        mock_stats_service.record_request.assert_called_once()
+        assert mock_stats_service.record_request.call_args.kwargs["topic"] == "cities"
+        context.bot.delete_message.assert_not_called()
+        context.bot.send_message.assert_called_once_with(
+            chat_id=123,
+            reply_to_message_id=456,
+            text="Ближайшие города: Berlin (2 км)",
+            disable_web_page_preview=True,
+        )
+
+    def test_search_topic_has_no_topic_handler(self, adapter, mock_service):
+        """Test the "search" topic is served by the /search handler."""
+        mock_service.list_topics.return_value = ["accommodation", "search"]
+
+        adapter._register_handlers(Mock())
+
+        assert set(adapter._topic_handlers) == {"accommodation"}
+        assert "search" in {command.command for command in adapter._bot_commands()}
 
     @pytest.mark.anyio
     async def test_handle_countries(self, adapter, mock_service):
@@ -332,7 +588,7 @@ class TestTelegramBotAdapter:
         await adapter._handle_countries(update, context)
 
         mock_service.handle_countries.assert_called_once_with(
-            "poland", show_all=False
+            "poland", show_all=False, chat_id=123
         )
 
     @pytest.mark.anyio
@@ -402,3 +658,234 @@ class TestTelegramBotAdapter:
 
         # Should not attempt deletion
         context.bot.delete_message.assert_not_called()
+
+    def test_refresh_topics_before_build_is_noop(self, adapter):
+        """Test refresh_topics does nothing before the application exists."""
+        adapter.refresh_topics(TopicChanges(added=("jobs",)))
+
+        assert adapter._topic_handlers == {}
+
+    def test_edited_questions_and_locations_are_not_answered_again(self, adapter):
+        """Test private-chat questions and locations are answered for new messages only."""
+        from datetime import datetime, timezone
+
+        from telegram import Chat, Location, Message, Update
+
+        application = Mock()
+        adapter._register_handlers(application)
+        handlers = {
+            handler.callback: handler
+            for (handler,), _ in application.add_handler.call_args_list
+        }
+        chat = Chat(id=123, type=Chat.PRIVATE)
+        date = datetime.now(timezone.utc)
+        question = Message(1, date, chat, text="где найти жильё?")
+        location = Message(2, date, chat, location=Location(13.4, 52.5))
+
+        for callback, message in (
+            (adapter._handle_question, question),
+            (adapter._handle_location, location),
+        ):
+            handler = handlers[callback]
+            assert handler.check_update(Update(1, message=message))
+            assert not handler.check_update(Update(2, edited_message=message))
+
+    def test_register_handlers_tracks_topic_handlers(self, adapter):
+        """Test per-topic handlers are tracked, excluding cities/countries."""
+        application = Mock()
+
+        adapter._register_handlers(application)
+
+        assert set(adapter._topic_handlers) == {"accommodation", "transport"}
+
+    @pytest.mark.anyio
+    async def test_apply_topic_changes_only_touches_changed_topics(self, adapter):
+        """Test reloads add/remove only the affected handlers."""
+        application = Mock()
+        application.bot = AsyncMock()
+        adapter._register_handlers(application)
+        transport_handler = adapter._topic_handlers["transport"]
+        accommodation_handler = adapter._topic_handlers["accommodation"]
+        application.add_handler.reset_mock()
+
+        await adapter._apply_topic_changes(
+            application, TopicChanges(added=("jobs",), removed=("transport",))
+        )
+
+        application.remove_handler.assert_called_once_with(transport_handler)
+        application.add_handler.assert_called_once_with(adapter._topic_handlers["jobs"])
+        assert adapter._topic_handlers["accommodation"] is accommodation_handler
+        assert "transport" not in adapter._topic_handlers
+        application.bot.set_my_commands.assert_awaited_once()
+
+    @pytest.mark.anyio
+    async def test_command_menus_per_language(self, adapter, mock_service):
+        """A translated command menu is set for every configured language."""
+        mock_service.list_topics.return_value = ["accommodation"]
+        mock_service.list_languages.return_value = ["uk"]
+        mock_service.get_topic_description.side_effect = (
+            lambda topic, language=None: "Житло" if language == "uk" else "Жильё"
+        )
+        application = Mock()
+        application.bot = AsyncMock()
+
+        await adapter._set_bot_commands(application)
+
+        default_call, uk_call = application.bot.set_my_commands.await_args_list
+        assert default_call.args[0][0].description == "Жильё"
+        assert uk_call.args[0][0].description == "Житло"
+        assert uk_call.kwargs == {"language_code": "uk"}
+
+    @pytest.mark.anyio
+    async def test_inline_query_answers_with_cached_results(self, adapter, mock_service):
+        mock_service.handle_inline_query.return_value = [
+            InlineResult(id="abc", title="Berlin", description="/cities Berlin", text="City info")
+        ]
+        update = Mock()
+        update.inline_query = AsyncMock()
+        update.inline_query.query = "berl"
+
+        await adapter._handle_inline_query(update, Mock())
+
+        mock_service.handle_inline_query.assert_called_once_with("berl")
+        (results,), kwargs = update.inline_query.answer.await_args
+        assert results[0].id == "abc"
+        assert results[0].input_message_content.message_text == "City info"
+        assert kwargs == {"cache_time": INLINE_CACHE_TIME, "is_personal": False}
+
+
+class TestTelegramBotAdapterOverlays:
+    """Test local topic commands."""
+
+    def _update(self, text, chat_type="supergroup"):
+        return SimpleNamespace(
+            effective_chat=SimpleNamespace(id=-100500, type=chat_type),
+            effective_user=SimpleNamespace(id=1, username="admin", language_code=None),
+            effective_message=SimpleNamespace(text=text, chat_id=-100500, message_id=1),
+        )
+
+    def test_extract_parameter_keep_case(self, adapter):
+        update = SimpleNamespace(
+            effective_message=SimpleNamespace(text="/local_add@botname rota Volunteer Rota")
+        )
+
+        result = adapter._extract_parameter(update, "/local_add", keep_case=True)
+
+        assert result == "rota Volunteer Rota"
+
+    @pytest.mark.anyio
+    async def test_local_add_requires_chat_admin(self, adapter, mock_service):
+        adapter._send_error_message = AsyncMock()
+        context = SimpleNamespace(bot=AsyncMock())
+        context.bot.get_chat_member.return_value = SimpleNamespace(status="member")
+
+        await adapter._handle_local_add(self._update("/local_add rota Rota\nitem"), context)
+
+        mock_service.add_overlay_topic.assert_not_called()
+        adapter._send_error_message.assert_awaited_once()
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("chat_type", ["private", "channel"])
+    async def test_local_add_outside_groups_is_refused(self, adapter, mock_service, chat_type):
+        adapter._send_error_message = AsyncMock()
+        context = SimpleNamespace(bot=AsyncMock())
+        context.bot.get_chat_member.return_value = SimpleNamespace(status="creator")
+
+        await adapter._handle_local_add(
+            self._update("/local_add rota Rota\nitem", chat_type=chat_type), context
+        )
+
+        mock_service.add_overlay_topic.assert_not_called()
+        adapter._send_error_message.assert_awaited_once_with(
+            ANY, context, "Only group chat admins can add local topics."
+        )
+
+    @pytest.mark.anyio
+    async def test_local_add_by_admin(self, adapter, mock_service):
+        mock_service.add_overlay_topic.return_value = "saved"
+        adapter._reply_to_message = AsyncMock()
+        context = SimpleNamespace(bot=AsyncMock())
+        context.bot.get_chat_member.return_value = SimpleNamespace(status="administrator")
+
+        await adapter._handle_local_add(self._update("/local_add rota Rota\nMo: Anna"), context)
+
+        mock_service.add_overlay_topic.assert_called_once_with(-100500, "rota Rota\nMo: Anna")
+        adapter._reply_to_message.assert_awaited_once()
+
+    @pytest.mark.anyio
+    async def test_overlay_command_replies_with_local_topic(self, adapter, mock_service):
+        mock_service.handle_overlay_topic.return_value = "#rota\nMo: Anna"
+        adapter._reply_to_message = AsyncMock()
+
+        await adapter._handle_overlay_command(self._update("/rota@botname"), SimpleNamespace())
+
+        mock_service.handle_overlay_topic.assert_called_once_with("rota", chat_id=-100500)
+        adapter._reply_to_message.assert_awaited_once()
+
+    @pytest.mark.anyio
+    async def test_overlay_command_ignores_known_commands(self, adapter, mock_service):
+        adapter._register_handlers(Mock())
+
+        for text in ("/help", "/cities Berlin", "/accommodation"):
+            await adapter._handle_overlay_command(self._update(text), SimpleNamespace())
+
+        mock_service.handle_overlay_topic.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_overlay_command_ignores_unknown_topics(self, adapter, mock_service):
+        mock_service.handle_overlay_topic.return_value = None
+        mock_service.resolve_command.return_value = None
+        mock_service.suggest_commands.return_value = None
+        adapter._reply_to_message = AsyncMock()
+
+        await adapter._handle_overlay_command(self._update("/unknown"), SimpleNamespace())
+
+        adapter._reply_to_message.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_legacy_command_is_answered_by_its_topic_handler(
+        self, adapter, mock_service, mock_stats_service
+    ):
+        adapter._register_handlers(Mock())
+        mock_service.handle_overlay_topic.return_value = None
+        mock_service.resolve_command.return_value = "accommodation"
+        adapter._reply_to_message = AsyncMock()
+
+        await adapter._handle_overlay_command(self._update("/accomodation"), SimpleNamespace())
+
+        mock_service.resolve_command.assert_called_once_with("accomodation", chat_id=-100500)
+        mock_service.handle_topic.assert_called_once_with(
+            "accommodation", section=None, chat_id=-100500, language=None
+        )
+        mock_stats_service.record_request.assert_called_once()
+        mock_service.suggest_commands.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_unknown_command_gets_suggestions(self, adapter, mock_service):
+        mock_service.handle_overlay_topic.return_value = None
+        mock_service.resolve_command.return_value = None
+        mock_service.suggest_commands.return_value = "Возможно, вы имели в виду:\n/transport"
+        context = SimpleNamespace(bot=AsyncMock(username="BerlinHelpBot"))
+
+        await adapter._handle_overlay_command(self._update("/transprot@berlinhelpbot"), context)
+
+        mock_service.suggest_commands.assert_called_once_with(
+            "transprot", chat_id=-100500, language=None
+        )
+        context.bot.delete_message.assert_not_called()
+        assert context.bot.send_message.await_args.kwargs["text"] == (
+            "Возможно, вы имели в виду:\n/transport"
+        )
+        assert context.bot.send_message.await_args.kwargs["reply_to_message_id"] == 1
+
+    @pytest.mark.anyio
+    async def test_commands_for_other_bots_get_no_suggestions(self, adapter, mock_service):
+        mock_service.handle_overlay_topic.return_value = None
+        adapter._reply_to_message = AsyncMock()
+        context = SimpleNamespace(bot=SimpleNamespace(username="BerlinHelpBot"))
+
+        await adapter._handle_overlay_command(self._update("/start@other_bot"), context)
+
+        mock_service.resolve_command.assert_not_called()
+        mock_service.suggest_commands.assert_not_called()
+        adapter._reply_to_message.assert_not_called()
@@ -3,7 +3,9 @@
 import pytest
 import tempfile
 import os
+from collections.abc import Mapping
 from src.infrastructure.yaml_guidebook import YamlGuidebook
+from src.domain.models import Completion
 from src.domain.protocols import GuidebookValidationError
 
 
@@ -53,7 +55,7 @@ class TestYamlGuidebook:
         """Test getting contents for a list-based topic."""
         # apartment_approval is a list-based topic
         contents = guidebook.get_topic_contents("apartment_approval")
-        assert isinstance(contents, list)
+        assert isinstance(contents, tuple)
         assert len(contents) > 0
         # All items should be strings
         assert all(isinstance(item, str) for item in contents)
@@ -62,7 +64,7 @@ class TestYamlGuidebook:
         """Test getting contents for a dict-based topic."""
         # cities is a dict-based topic
         contents = guidebook.get_topic_contents("cities")
-        assert isinstance(contents, dict)
+        assert isinstance(contents, Mapping)
         assert len(contents) > 0
         # Should have Berlin
         assert any("berlin" in key.lower() for key in contents.keys())
@@ -513,3 +515,282 @@ test_topic:
             assert "dict" in str(exc_info.value)
         finally:
             os.unlink(guidebook_path)
+
+
+class TestYamlGuidebookAliases:
+    """Test per-topic alias resolution and load-time collision checks."""
+
+    def test_country_aliases_are_resolved(self, guidebook):
+        for alias in ("Украина", "UA", "Україна"):
+            assert guidebook.get_countries(alias) == guidebook.get_countries("Ukraine")
+
+    def test_alias_colliding_with_section_fails_load(self, tmp_path):
+        guidebook_path = tmp_path / "guidebook.yml"
+        vocabulary_path = tmp_path / "vocabulary.yml"
+        guidebook_path.write_text(
+            "cities:\n  description: Города\n  contents:\n"
+            "    Sachsen:\n      - a\n    Sachsen-Anhalt:\n      - b\n",
+            encoding="utf-8",
+        )
+        vocabulary_path.write_text("Sachsen-Anhalt:\n  - Sachsen\n", encoding="utf-8")
+
+        with pytest.raises(GuidebookValidationError, match="is the name of section 'sachsen'"):
+            YamlGuidebook(str(guidebook_path), str(vocabulary_path))
+
+    def test_alias_listed_twice_fails_load(self, tmp_path):
+        vocabulary_path = tmp_path / "vocabulary.yml"
+        vocabulary_path.write_text(
+            "Berlin:\n  - BER\nBern:\n  - ber\n", encoding="utf-8"
+        )
+
+        with pytest.raises(GuidebookValidationError, match="'ber' is listed for both"):
+            YamlGuidebook("src/knowledgebase/guidebook.yml", str(vocabulary_path))
+
+
+class TestYamlGuidebookSections:
+    """Test section lookups in dict-based topics."""
+
+    def test_exact_prefix_and_fuzzy_matches(self, guidebook):
+        assert guidebook.find_sections("animals", "ПОЛЕЗНЫЕ ССЫЛКИ") == ["полезные ссылки"]
+        assert guidebook.find_sections("medical", "аптек") == ["поиск аптеки экстренной помощи"]
+        assert guidebook.find_sections("deutsch", "курсы") == [
+            "бесплатные онлайн курсы с приложениями",
+            "бесплатные курсы немецкого в берлине",
+        ]
+        assert guidebook.find_sections("animals", "Полезные сылки") == ["полезные ссылки"]
+
+    def test_short_names_match_only_exactly(self, guidebook):
+        assert guidebook.find_sections("medical", "ap") == []
+        assert guidebook.find_sections("medical", "b") == []
+        assert guidebook.find_sections("medical", "апт") == ["поиск аптеки экстренной помощи"]
+        assert guidebook.get_cities("Be").startswith("К сожалению")
+
+    def test_unknown_sections_and_list_topics_match_nothing(self, guidebook):
+        assert guidebook.find_sections("medical", "qqq") == []
+        assert guidebook.find_sections("transport", "bvg") == []
+        assert guidebook.find_sections("nonexistent", "bvg") == []
+
+
+class TestYamlGuidebookCompletions:
+    """Test inline-mode completion."""
+
+    def test_city_prefix_in_any_script(self, guidebook):
+        for prefix in ("berl", "BERL", "Берл"):
+            assert guidebook.complete(prefix)[0] == Completion("cities", "berlin")
+
+    def test_topic_name_and_description_words(self, guidebook):
+        assert guidebook.complete("accomm") == [Completion("accommodation")]
+        assert Completion("accommodation") in guidebook.complete("жил")
+        assert guidebook.complete("qqq") == []
+        assert len(guidebook.complete("", limit=5)) == 5
+
+
+class TestYamlGuidebookSearch:
+    """Test /search over the real guidebook."""
+
+    def test_questions_find_their_topics(self, guidebook):
+        assert guidebook.search_topics("где найти жильё")[0].topic == "accommodation"
+        assert "medical" in [hit.topic for hit in guidebook.search_topics("врач")]
+        assert guidebook.search_topics("leipzig")[0].topic == "cities"
+
+    def test_unknown_words_find_nothing(self, guidebook):
+        assert guidebook.search_topics("qqqzzz") == []
+        assert len(guidebook.search_topics("berlin", limit=2)) == 2
+
+    def test_reloaded_topic_is_searchable(self, tmp_path):
+        (tmp_path / "topics").mkdir()
+        topic_path = tmp_path / "topics" / "jobs.yml"
+        topic_path.write_text("description: Jobs\ncontents:\n  - Werkstudent\n")
+        (tmp_path / "topics" / "food.yml").write_text(
+            "description: Food\ncontents:\n  - Tafel\n"
+        )
+        vocabulary_path = tmp_path / "vocabulary.yml"
+        vocabulary_path.write_text("{}\n")
+        guidebook = YamlGuidebook(
+            str(tmp_path / "topics"), str(vocabulary_path), max_workers=1
+        )
+        assert guidebook.search_topics("minijob") == []
+
+        topic_path.write_text("description: Jobs\ncontents:\n  - Minijob\n")
+        reloaded = guidebook.reload_topic(str(topic_path))
+
+        assert [hit.topic for hit in reloaded.search_topics("minijob")] == ["jobs"]
+
+
+class TestYamlGuidebookImmutability:
+    """Test that loaded topics are immutable and share interned strings."""
+
+    def test_topics_are_frozen(self, guidebook):
+        """Topics are frozen dataclasses with tuple / read-only contents."""
+        topic = guidebook.topics["cities"]
+        with pytest.raises(AttributeError):
+            topic.description = "changed"
+        with pytest.raises(TypeError):
+            topic.contents["Berlin"] = ("changed",)
+        assert isinstance(topic.contents["Berlin"], tuple)
+
+    def test_topics_mapping_is_read_only(self, guidebook):
+        with pytest.raises(TypeError):
+            guidebook.topics["new_topic"] = guidebook.topics["cities"]
+
+    def test_lowercase_cache_shares_topic_tuples(self, guidebook):
+        """The lowercase cache points at the topic's own tuples."""
+        berlin = guidebook.topics["cities"].contents["Berlin"]
+        assert guidebook._lowercase_cache["cities"]["berlin"] is berlin
+        with pytest.raises(TypeError):
+            guidebook._lowercase_cache["cities"]["berlin"] = ()
+
+    def test_repeated_strings_are_interned(self, tmp_path):
+        """Links repeated across topics are stored once."""
+        guidebook_path = tmp_path / "guidebook.yml"
+        vocabulary_path = tmp_path / "vocabulary.yml"
+        guidebook_path.write_text(
+            "first:\n  description: First\n  contents:\n"
+            "    Links:\n      - https://example.org/shared\n"
+            "second:\n  description: Second\n  contents:\n"
+            "    - https://example.org/shared\n"
+            "third:\n  description: Third\n  contents:\n"
+            "    Links:\n      - other\n",
+            encoding="utf-8",
+        )
+        vocabulary_path.write_text("Berlin:\n  - berlin\n", encoding="utf-8")
+
+        gb = YamlGuidebook(str(guidebook_path), str(vocabulary_path))
+
+        first = gb.topics["first"].contents
+        third = gb.topics["third"].contents
+        assert first["Links"][0] is gb.topics["second"].contents[0]
+        assert next(iter(first)) is next(iter(third))
+
+
+class TestYamlGuidebookRegions:
+    """Test regional guidebooks layered over a base guidebook."""
+
+    @pytest.fixture
+    def regional(self, guidebook, tmp_path):
+        region_path = tmp_path / "hamburg.yml"
+        vocabulary_path = tmp_path / "vocabulary.yml"
+        region_path.write_text(
+            "accommodation:\n  description: Wohnen in Hamburg\n  contents:\n"
+            "    - https://hamburg.de/wohnen\n"
+            "cities:\n  description: Hamburg chats\n  contents:\n"
+            "    Hamburg:\n      - https://t.me/hamburg\n"
+            "hafen:\n  description: Hafen\n  contents:\n    - Port info\n",
+            encoding="utf-8",
+        )
+        vocabulary_path.write_text("Hamburg:\n  - hh\n", encoding="utf-8")
+        return guidebook.for_region(str(region_path), str(vocabulary_path))
+
+    def test_region_overrides_and_adds_topics(self, guidebook, regional):
+        assert regional.get_topic_contents("accommodation") == ("https://hamburg.de/wohnen",)
+        assert regional.get_topic_contents("hafen") == ("Port info",)
+        assert "hafen" not in guidebook.get_topics()
+        assert guidebook.get_topic_contents("accommodation") != regional.get_topic_contents(
+            "accommodation"
+        )
+
+    def test_shared_topics_are_not_copied(self, guidebook, regional):
+        assert regional.topics["animals"] is guidebook.topics["animals"]
+        assert regional._lowercase_cache["animals"] is guidebook._lowercase_cache["animals"]
+
+    def test_unchanged_region_topics_are_deduplicated(self, guidebook):
+        """Topics a region repeats unchanged are the base guidebook's objects."""
+        copied = guidebook.for_region(
+            "src/knowledgebase/guidebook.yml", "src/knowledgebase/vocabulary.yml"
+        )
+
+        assert all(
+            copied.topics[name] is topic for name, topic in guidebook.topics.items()
+        )
+
+    def test_region_gets_own_alias_index(self, guidebook, regional):
+        assert "https://t.me/hamburg" in regional.get_cities("hh")
+        assert "К сожалению" in guidebook.get_cities("hh")
+        # Base aliases still resolve, against the region's own cities
+        assert regional.vocabulary["fam"] == guidebook.vocabulary["fam"]
+
+
+TRANSLATED_GUIDEBOOK = """\
+accommodation:
+  description: Жильё
+  contents:
+    - Жильё в Берлине
+  translations:
+    uk:
+      description: Житло
+      contents:
+        - Житло в Берліні
+    en:
+      description: Housing
+cities:
+  description: Города
+  contents:
+    Berlin:
+      - https://t.me/berlin
+"""
+
+
+class TestYamlGuidebookTranslations:
+    """Test per-language topic variants."""
+
+    @pytest.fixture
+    def translated(self, tmp_path):
+        guidebook_path = tmp_path / "guidebook.yml"
+        vocabulary_path = tmp_path / "vocabulary.yml"
+        guidebook_path.write_text(TRANSLATED_GUIDEBOOK, encoding="utf-8")
+        vocabulary_path.write_text("Berlin:\n  - berlin\n", encoding="utf-8")
+        return YamlGuidebook(str(guidebook_path), str(vocabulary_path))
+
+    def test_first_available_language_is_used(self, translated):
+        assert translated.get_topic_contents("accommodation", ("uk",)) == ("Житло в Берліні",)
+        assert translated.get_topic_description("accommodation", ("de", "uk")) == "Житло"
+
+    def test_missing_language_falls_back_to_base(self, translated):
+        assert translated.get_topic_contents("accommodation", ("de",)) == ("Жильё в Берлине",)
+        assert translated.get_topic_description("cities", ("uk",)) == "Города"
+        assert translated.get_topic_description("accommodation") == "Жильё"
+
+    def test_partial_translation_shares_base_contents(self, translated):
+        topic = translated.topics["accommodation"]
+
+        assert topic.translations["en"].description == "Housing"
+        assert topic.translations["en"].contents is topic.contents
+
+    def test_invalid_translation_is_rejected(self, tmp_path):
+        guidebook_path = tmp_path / "guidebook.yml"
+        guidebook_path.write_text(
+            "topic:\n  description: D\n  contents:\n    - item\n"
+            "  translations:\n    uk:\n      contents:\n        - 42\n",
+            encoding="utf-8",
+        )
+
+        with pytest.raises(GuidebookValidationError, match=r"topic\[uk\]"):
+            YamlGuidebook(str(guidebook_path), "src/knowledgebase/vocabulary.yml")
+
+
+class TestYamlGuidebookFuzzyLookup:
+    """Test typo-tolerant /cities and /countries lookups."""
+
+    def test_single_close_city_is_shown(self, guidebook):
+        assert guidebook.get_cities("Dusseldrof") == guidebook.get_cities("Düsseldorf")
+
+    def test_country_typo_is_shown(self, guidebook):
+        assert guidebook.get_countries("Polnd") == guidebook.get_countries("Poland")
+
+    def test_equally_close_cities_are_suggested(self, guidebook):
+        reply = guidebook.get_cities("Frankfrut")
+
+        assert reply.startswith("К сожалению, мы пока не располагаем информацией")
+        assert "Возможно, вы имели в виду:\n/cities Frankfurt Am Main\n/cities Frankfurt Oder" in reply
+
+    def test_unknown_city_keeps_not_found_reply(self, guidebook):
+        assert guidebook.get_cities("Xyzzyqq") == (
+            "К сожалению, мы пока не располагаем информацией по запросу cities, Xyzzyqq."
+        )
+
+    def test_spellings_without_aliases_are_found(self, guidebook):
+        """Umlaut transcriptions and Cyrillic spellings need no vocabulary entry."""
+        assert "muenchen" not in guidebook.vocabulary
+        for spelling in ("Muenchen", "MUNCHEN", "Мюнхен", "🇩🇪 München"):
+            assert guidebook.get_cities(spelling) == guidebook.get_cities("München")
+        assert guidebook.get_cities("Zürich") == guidebook.get_cities("Zurich")